@@ -49,6 +49,7 @@ a = Analysis(
         'requests',
         'bs4',
         'lxml',
+        'numpy',
         'urllib.parse',
         'urllib3',
         're',
@@ -56,6 +57,9 @@ a = Analysis(
         'threading',
         'time',
         'collections',
+        'concurrent.futures',
+        'multiprocessing',
+        'sqlite3',
     ],
     hookspath=[],
     hooksconfig={},
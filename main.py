@@ -12,6 +12,7 @@ Rok: 2024/2025
 
 import sys
 import os
+import multiprocessing
 import tkinter as tk
 from tkinter import messagebox
 
@@ -60,4 +61,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Wymagane przez pulę procesów analizy w wersji .exe
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
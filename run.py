@@ -15,7 +15,7 @@ from pathlib import Path
 
 def check_dependencies():
     """Check if required packages are installed."""
-    required = ['requests', 'bs4', 'lxml']
+    required = ['requests', 'bs4', 'lxml', 'numpy']
     missing = []
 
     for package in required:
@@ -35,7 +35,8 @@ def install_dependencies():
             sys.executable, "-m", "pip", "install",
             "requests>=2.28.0",
             "beautifulsoup4>=4.11.0",
-            "lxml>=4.9.0"
+            "lxml>=4.9.0",
+            "numpy>=1.21.0"
         ])
         return True
     except subprocess.CalledProcessError:
@@ -60,13 +61,13 @@ def main():
         if response == 'y':
             if not install_dependencies():
                 print("ERROR: Failed to install dependencies")
-                print("Please run manually: pip install requests beautifulsoup4 lxml")
+                print("Please run manually: pip install requests beautifulsoup4 lxml numpy")
                 return 1
             print("Dependencies installed successfully!")
             print()
         else:
             print("Cannot start without dependencies.")
-            print("Install with: pip install requests beautifulsoup4 lxml")
+            print("Install with: pip install requests beautifulsoup4 lxml numpy")
             return 1
 
     # Change to script directory
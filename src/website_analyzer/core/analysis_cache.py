@@ -0,0 +1,125 @@
+"""
+Trwała pamięć podręczna wyników analizy pojedynczych stron.
+
+Wyniki są zapisywane w bazie SQLite pod kluczem (skrót treści, wersja
+analizatora). Przy ponownej analizie parsowane są tylko strony nowe lub
+zmienione - pozostałe wyniki są odczytywane z pamięci podręcznej.
+"""
+
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, Iterator
+
+from .analysis_partial import AnalysisPartial
+
+
+def content_hash(content: str) -> str:
+    """Zwraca skrót SHA-256 treści strony (hex)."""
+    return hashlib.sha256(content.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def page_key(url: str, content: str) -> str:
+    """Zwraca klucz wyniku strony - adresy względne zależą od adresu strony, więc wchodzi on do skrótu."""
+    return content_hash(f"{url}\0{content}")
+
+
+class AnalysisCache:
+    """Pamięć podręczna wyników częściowych zapisana w pliku SQLite."""
+
+    # Maksymalna liczba parametrów w jednym zapytaniu IN (...)
+    QUERY_CHUNK = 500
+
+    def __init__(self, db_path: str):
+        """
+        Otwiera (lub tworzy) plik pamięci podręcznej.
+
+        Args:
+            db_path: Ścieżka do pliku bazy SQLite
+        """
+        self.db_path = db_path
+        folder = os.path.dirname(db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS page_results ("
+                " content_hash TEXT NOT NULL,"
+                " version TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " PRIMARY KEY (content_hash, version))"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Otwiera połączenie na czas jednej transakcji - analiza działa w osobnych wątkach."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, hashes: Iterable[str], version: str) -> Dict[str, AnalysisPartial]:
+        """
+        Odczytuje zapisane wyniki dla podanych skrótów treści.
+
+        Args:
+            hashes: Skróty treści stron
+            version: Wersja analizatora, dla której wyniki są ważne
+
+        Returns:
+            Słownik skrót -> wynik częściowy (tylko znalezione wpisy)
+        """
+        hashes = list(hashes)
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(hashes), self.QUERY_CHUNK):
+                chunk = hashes[i:i + self.QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT content_hash, data FROM page_results"
+                    f" WHERE version = ? AND content_hash IN ({placeholders})",
+                    [version] + chunk
+                )
+                for key, data in rows:
+                    found[key] = AnalysisPartial.from_dict(json.loads(data))
+        return found
+
+    def put_many(self, partials: Dict[str, AnalysisPartial], version: str):
+        """
+        Zapisuje wyniki częściowe w jednej transakcji.
+
+        Args:
+            partials: Słownik skrót treści -> wynik częściowy
+            version: Wersja analizatora
+        """
+        if not partials:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO page_results (content_hash, version, data) VALUES (?, ?, ?)",
+                ((key, version, json.dumps(partial.to_dict(), ensure_ascii=False))
+                 for key, partial in partials.items())
+            )
+
+    def prune(self, version: str) -> int:
+        """
+        Usuwa wpisy zapisane przez inne wersje analizatora.
+
+        Wpisy z wersją postaci '<version>-...' (ta sama wersja analizatora,
+        inne ustawienia ekstrakcji) są zachowywane.
+
+        Args:
+            version: Bieżąca wersja analizatora
+
+        Returns:
+            Liczba usuniętych wpisów
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM page_results WHERE version != ?1 AND substr(version, 1, length(?1) + 1) != ?1 || '-'",
+                (version,)
+            ).rowcount
@@ -0,0 +1,231 @@
+"""
+Częściowe wyniki analizy, które można scalać.
+
+Każda strona (lub fragment stron przetworzony w osobnym procesie) daje
+obiekt AnalysisPartial. Scalenie fragmentów w kolejności stron daje wynik
+identyczny z analizą sekwencyjną.
+"""
+
+from bs4 import BeautifulSoup
+from collections import Counter
+import numpy as np
+import re
+from typing import Collection, Dict, List, Optional, Set, Tuple, Union
+
+from .near_duplicates import minhash_signature
+from .url_resolver import default_resolver
+from .word_stats import HeavyHitters
+
+# Wersja logiki ekstrakcji - zmiana unieważnia zapisane w pamięci podręcznej wyniki
+ANALYZER_VERSION = 3
+
+# Kategorie adresów zbieranych ze stron
+URL_CATEGORIES = ('links', 'images', 'videos', 'audio', 'css', 'js', 'documents')
+# Dane wyciągane z treści stron - kategorie adresów i słowa (liczniki, sygnatury)
+CONTENT_FIELDS = URL_CATEGORIES + ('words',)
+
+VIDEO_EXTENSIONS = {'mp4', 'webm', 'avi', 'mov'}
+AUDIO_EXTENSIONS = {'mp3', 'wav', 'ogg', 'm4a'}
+DOCUMENT_EXTENSIONS = {'pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'zip', 'rar'}
+
+WORD_PATTERN = re.compile(r'\b[a-ząćęłńóśźż]+\b')
+
+
+class AnalysisPartial:
+    """
+    Częściowy wynik analizy - liczniki i zbiory adresów dla fragmentu stron.
+
+    Przechowuje tylko dane potrzebne do raportu: liczniki słów i kodów HTTP,
+    łączną liczbę adresów w każdej kategorii oraz zbiory unikalnych adresów.
+    """
+
+    def __init__(self, word_capacity: Optional[int] = None):
+        """
+        Tworzy pusty wynik częściowy.
+
+        Args:
+            word_capacity: Limit liczników słów (None = dokładne liczenie wszystkich słów)
+        """
+        self.total_pages = 0
+        self.total_size = 0
+        self.status_codes: Counter = Counter()
+        self.word_freq: Union[Counter, HeavyHitters] = Counter() if word_capacity is None else HeavyHitters(word_capacity)
+        self.url_totals: Dict[str, int] = {category: 0 for category in URL_CATEGORIES}
+        self.urls: Dict[str, Set[str]] = {category: set() for category in URL_CATEGORIES}
+        self.signature: Optional[np.ndarray] = None  # sygnatura MinHash pojedynczej strony (nie jest scalana)
+
+    def add_page_metadata(self, page_data: Dict):
+        """Dolicza metadane strony (rozmiar, kod HTTP) niezależne od treści."""
+        self.total_pages += 1
+        self.total_size += page_data['size']
+        self.status_codes[page_data['status_code']] += 1
+
+    def add_urls(self, category: str, urls: List[str]):
+        """Dodaje adresy do wskazanej kategorii."""
+        self.url_totals[category] += len(urls)
+        self.urls[category].update(urls)
+
+    def merge(self, other: 'AnalysisPartial') -> 'AnalysisPartial':
+        """
+        Dołącza inny wynik częściowy do bieżącego.
+
+        Args:
+            other: Wynik częściowy stron występujących po stronach bieżącego
+
+        Returns:
+            Bieżący obiekt (po scaleniu)
+        """
+        self.total_pages += other.total_pages
+        self.total_size += other.total_size
+        self.status_codes.update(other.status_codes)
+        self.word_freq.update(other.word_freq)
+        for category in URL_CATEGORIES:
+            self.url_totals[category] += other.url_totals[category]
+            self.urls[category].update(other.urls[category])
+        return self
+
+    def trim_words(self, limit: int):
+        """
+        Zostawia tylko limit najczęstszych słów strony.
+
+        Wywoływane po doliczeniu strony do wyniku zbiorczego - licznik strony
+        służy dalej tylko indeksowi słów kluczowych, więc jego rozmiar nie
+        zależy od długości ani słownictwa strony.
+        """
+        if len(self.word_freq) > limit:
+            self.word_freq = Counter(dict(self.word_freq.most_common(limit)))
+
+    def to_dict(self) -> Dict:
+        """Zamienia wynik częściowy na słownik gotowy do zapisu jako JSON."""
+        return {
+            'total_pages': self.total_pages,
+            'total_size': self.total_size,
+            'status_codes': [[code, count] for code, count in self.status_codes.items()],
+            'word_freq': dict(self.word_freq.items()),
+            'url_totals': dict(self.url_totals),
+            'urls': {category: sorted(urls) for category, urls in self.urls.items()},
+            'signature': self.signature.tolist() if self.signature is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'AnalysisPartial':
+        """Odtwarza wynik częściowy ze słownika utworzonego przez to_dict()."""
+        partial = cls()
+        partial.total_pages = data['total_pages']
+        partial.total_size = data['total_size']
+        partial.status_codes = Counter(dict((code, count) for code, count in data['status_codes']))
+        partial.word_freq = Counter(data['word_freq'])
+        partial.url_totals.update(data['url_totals'])
+        for category, urls in data['urls'].items():
+            partial.urls[category] = set(urls)
+        if data.get('signature') is not None:
+            partial.signature = np.array(data['signature'], dtype=np.uint32)
+        return partial
+
+
+def extract_content(content: str, min_word_length: int, page_url: str = '', num_perm: int = 0,
+                    fields: Optional[Collection[str]] = None) -> AnalysisPartial:
+    """
+    Wyciąga z treści HTML adresy i słowa.
+
+    Adresy są rozwiązywane względem page_url, a rodzaj pliku (video, audio,
+    dokument) jest rozpoznawany po rozszerzeniu ze ścieżki adresu. Dane
+    spoza fields nie są wyszukiwane w drzewie HTML - ich zbiory i liczniki
+    pozostają puste.
+
+    Args:
+        content: Kod HTML strony
+        min_word_length: Minimalna długość słowa uwzględnianego w statystykach
+        page_url: Adres strony (podstawa dla adresów względnych)
+        num_perm: Długość sygnatury MinHash tekstu (0 = bez sygnatury)
+        fields: Wyciągane dane z CONTENT_FIELDS (None = wszystkie)
+
+    Returns:
+        Wynik częściowy bez metadanych strony
+    """
+    partial = AnalysisPartial()
+    resolver = default_resolver
+    fields = CONTENT_FIELDS if fields is None else fields
+
+    # Parsuj HTML tylko raz na stronę
+    soup = BeautifulSoup(content, 'html.parser')
+
+    def attribute_values(tags, attribute: str) -> List[str]:
+        """Rozwiązane wartości atrybutu z podanych tagów (puste pomijane)."""
+        return [resolver.resolve(page_url, str(tag.get(attribute))) for tag in tags if tag.get(attribute)]
+
+    if 'links' in fields or 'documents' in fields:
+        anchors = attribute_values(soup.find_all('a', href=True), 'href')
+        if 'links' in fields:
+            partial.add_urls('links', anchors)
+        if 'documents' in fields:
+            partial.add_urls('documents', [href for href in anchors if resolver.extension(href) in DOCUMENT_EXTENSIONS])
+    if 'videos' in fields or 'audio' in fields:
+        sources = attribute_values(soup.find_all('source', src=True), 'src')
+        if 'videos' in fields:
+            videos = attribute_values(soup.find_all('video', src=True), 'src')
+            videos.extend(src for src in sources if resolver.extension(src) in VIDEO_EXTENSIONS)
+            partial.add_urls('videos', videos)
+        if 'audio' in fields:
+            audio = attribute_values(soup.find_all('audio', src=True), 'src')
+            audio.extend(src for src in sources if resolver.extension(src) in AUDIO_EXTENSIONS)
+            partial.add_urls('audio', audio)
+    if 'images' in fields:
+        partial.add_urls('images', attribute_values(soup.find_all('img', src=True), 'src'))
+    if 'css' in fields:
+        partial.add_urls('css', attribute_values(soup.find_all('link', rel='stylesheet'), 'href'))
+    if 'js' in fields:
+        partial.add_urls('js', attribute_values(soup.find_all('script', src=True), 'src'))
+
+    if 'words' in fields:
+        # Zliczaj słowa bezpośrednio bez przechowywania pełnego tekstu
+        text = soup.get_text(separator=' ', strip=True)
+        words = WORD_PATTERN.findall(text.lower())
+        partial.word_freq.update(word for word in words if len(word) >= min_word_length)
+        if num_perm:
+            partial.signature = minhash_signature(words, num_perm)
+
+    return partial
+
+
+def analyze_page(page_data: Dict, min_word_length: int) -> AnalysisPartial:
+    """
+    Analizuje pojedynczą stronę i zwraca jej wynik częściowy.
+
+    Args:
+        page_data: Dane strony (content, status_code, size)
+        min_word_length: Minimalna długość słowa uwzględnianego w statystykach
+
+    Returns:
+        Wynik częściowy dla jednej strony
+    """
+    partial = extract_content(page_data['content'], min_word_length, page_data.get('url', ''))
+    partial.add_page_metadata(page_data)
+    return partial
+
+
+def analyze_shard(pages: List[Tuple[str, str]], min_word_length: int, per_page: bool = False,
+                  word_capacity: Optional[int] = None, num_perm: int = 0,
+                  fields: Optional[Collection[str]] = None) -> List[AnalysisPartial]:
+    """
+    Analizuje fragment stron - funkcja uruchamiana w procesie roboczym.
+
+    Args:
+        pages: Pary (url, treść HTML) w kolejności z oryginalnego słownika
+        min_word_length: Minimalna długość słowa uwzględnianego w statystykach
+        per_page: Czy zwrócić osobny wynik dla każdej strony (np. do pamięci podręcznej)
+        word_capacity: Limit liczników słów w scalonym wyniku fragmentu
+        num_perm: Długość sygnatur MinHash stron (0 = bez sygnatur)
+        fields: Wyciągane dane z CONTENT_FIELDS (None = wszystkie)
+
+    Returns:
+        Lista wyników częściowych bez metadanych stron - po jednym na stronę
+        lub jeden scalony dla całego fragmentu
+    """
+    partials = [extract_content(content, min_word_length, url, num_perm, fields) for url, content in pages]
+    if per_page:
+        return partials
+    shard = AnalysisPartial(word_capacity)
+    for partial in partials:
+        shard.merge(partial)
+    return [shard]
@@ -0,0 +1,753 @@
+"""
+Strukturalny wynik analizy witryny.
+
+AnalysisResult przechowuje liczniki i zbiory adresów zamiast gotowego tekstu.
+Sekcje raportu tekstowego są generowane dopiero przy odczycie, a eksport do
+JSON, JSON Lines, CSV i HTML odbywa się strumieniowo - bez budowania dużych
+napisów w pamięci.
+"""
+
+import csv
+from html import escape
+import json
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, TextIO, Tuple, Union
+
+from .analysis_partial import AnalysisPartial, URL_CATEGORIES
+from .image_probe import ImageReport
+from .keywords import KeywordIndex
+from .link_graph import LinkGraph
+from .link_checker import LinkCheckReport
+from .near_duplicates import NearDuplicateClusters
+from .page_weight import PageWeightReport
+from .sampling import Estimate, SamplingReport
+from .url_resolver import default_resolver
+from .word_stats import HeavyHitters
+
+SEPARATOR = "=" * 50
+# Arkusz stylów wbudowany w raport HTML - plik nie zależy od zewnętrznych zasobów
+HTML_STYLE = """
+body { font-family: Segoe UI, Arial, sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }
+h1 { border-bottom: 2px solid #444; }
+nav a { margin-right: 1em; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border: 1px solid #ccc; padding: 2px 8px; text-align: left; }
+td.num { text-align: right; }
+tr.error td { background: #fde8e8; }
+pre { background: #f6f6f6; padding: 1em; overflow-x: auto; white-space: pre-wrap; }
+"""
+
+
+class AnalysisResult(Mapping):
+    """
+    Wynik analizy witryny z leniwym renderowaniem raportu.
+
+    Dla zgodności z wcześniejszym API obiekt zachowuje się jak słownik
+    sekcja -> tekst ('stats', 'links', ...), ale tekst sekcji jest
+    generowany dopiero przy odczycie.
+    """
+
+    SECTIONS = ('stats', 'links', 'images', 'media', 'resources', 'documents')
+    OPTIONAL_SECTIONS = ('sampling', 'keywords', 'link_graph', 'near_duplicates', 'link_check', 'page_weight', 'image_check')
+    CSV_TABLES = ('urls', 'status_codes', 'page_status', 'links', 'assets', 'words', 'keywords', 'pages',
+                  'broken_links', 'page_weights', 'images', 'near_duplicates')
+
+    def __init__(self, partial: AnalysisPartial, max_links_display: int = 50,
+                 max_images_per_type: int = 20, max_media_per_type: int = 15,
+                 top_words: int = 20, keywords: Optional[KeywordIndex] = None,
+                 keywords_per_page: int = 5, link_graph: Optional[LinkGraph] = None,
+                 site_url: str = ''):
+        """
+        Tworzy wynik na podstawie scalonego wyniku częściowego.
+
+        Args:
+            partial: Scalony wynik częściowy wszystkich stron
+            max_links_display: Maksymalna liczba linków w sekcji tekstowej
+            max_images_per_type: Maksymalna liczba obrazów jednego formatu w sekcji tekstowej
+            max_media_per_type: Maksymalna liczba plików jednego rodzaju w sekcji tekstowej
+            top_words: Liczba najczęstszych słów w statystykach
+            keywords: Indeks TF-IDF stron (None = bez sekcji słów kluczowych)
+            keywords_per_page: Liczba słów kluczowych pokazywanych dla strony
+            link_graph: Graf linków między stronami (None = bez sekcji grafu)
+            site_url: Adres strony startowej - jej host wyznacza linki wewnętrzne
+        """
+        self.total_pages = partial.total_pages
+        self.total_size = partial.total_size
+        self.status_codes: Counter = partial.status_codes
+        self.word_freq: Union[Counter, HeavyHitters] = partial.word_freq
+        self.url_totals: Dict[str, int] = partial.url_totals
+        self.urls: Dict[str, Set[str]] = partial.urls
+        self.max_links_display = max_links_display
+        self.max_images_per_type = max_images_per_type
+        self.max_media_per_type = max_media_per_type
+        self.top_words = top_words
+        self.keywords = keywords
+        self.keywords_per_page = keywords_per_page
+        self.link_graph = link_graph
+        self.site_url = site_url
+        self.sampling: Optional[SamplingReport] = None  # oszacowania dla całej witryny w trybie próby
+        self.near_duplicates: Optional[NearDuplicateClusters] = None  # grupy stron prawie identycznych
+        self.link_sources: Dict[str, List[str]] = {}  # link -> strony, na których występuje
+        self.link_check: Optional[LinkCheckReport] = None  # uzupełniane po sprawdzeniu linków
+        self.page_sizes: Dict[str, int] = {}  # strona -> rozmiar HTML
+        self.page_status: Dict[str, int] = {}  # strona -> kod HTTP
+        self.page_assets: Dict[str, List[str]] = {}  # strona -> adresy jej zasobów
+        self.page_weight: Optional[PageWeightReport] = None  # uzupełniane po profilowaniu wagi stron
+        self.image_check: Optional[ImageReport] = None  # uzupełniane po sprawdzeniu obrazów
+        self.stage_results: Dict[str, Any] = {}  # wyniki wszystkich etapów analizy (także własnych)
+        self.extra_sections: Dict[str, Callable[[], Iterable[str]]] = {}  # sekcje tekstowe własnych etapów
+        self.base_sections: Tuple[str, ...] = self.SECTIONS  # włączone sekcje podstawowe w kolejności etapów
+
+    # --- Zapytania o dane ---
+
+    @property
+    def average_page_size(self) -> float:
+        """Średni rozmiar strony w bajtach."""
+        return self.total_size / self.total_pages if self.total_pages else 0.0
+
+    @property
+    def word_error_bound(self) -> int:
+        """Maksymalne niedoszacowanie liczników słów (0 przy dokładnym liczeniu)."""
+        return self.word_freq.error_bound if isinstance(self.word_freq, HeavyHitters) else 0
+
+    def unique_count(self, category: str) -> int:
+        """Zwraca liczbę unikalnych adresów w kategorii."""
+        return len(self.urls[category])
+
+    def categorize_links(self) -> Dict[str, List[str]]:
+        """
+        Dzieli unikalne linki na kategorie.
+
+        Linki są już rozwiązane względem stron, więc wewnętrzne to adresy
+        HTTP(S) z tym samym hostem co strona startowa.
+
+        Returns:
+            Słownik 'internal'/'external'/'email'/'other' -> posortowana lista linków
+        """
+        categories: Dict[str, List[str]] = {'internal': [], 'external': [], 'email': [], 'other': []}
+        site_host = default_resolver.host(self.site_url)
+        for link in self.urls['links']:
+            categories[default_resolver.classify(link, site_host)].append(link)
+        for links in categories.values():
+            links.sort()
+        return categories
+
+    def group_by_extension(self, category: str) -> Dict[str, List[str]]:
+        """
+        Grupuje unikalne adresy kategorii według rozszerzenia pliku ze ścieżki adresu.
+
+        Returns:
+            Słownik rozszerzenie -> posortowana lista adresów (klucze posortowane)
+        """
+        groups: Dict[str, List[str]] = {}
+        for url in self.urls[category]:
+            groups.setdefault(default_resolver.extension(url), []).append(url)
+        return {ext: sorted(groups[ext]) for ext in sorted(groups)}
+
+    def page_keywords(self, url: str) -> List[Tuple[str, float]]:
+        """Zwraca słowa kluczowe strony (pusta lista gdy indeks nie został zbudowany)."""
+        return self.keywords.page_keywords(url, self.keywords_per_page) if self.keywords else []
+
+    def page_links(self) -> Dict[str, List[str]]:
+        """
+        Zwraca linki HTTP(S) każdej strony - odwrócenie link_sources.
+
+        Returns:
+            Słownik adres strony -> posortowana lista adresów linków
+        """
+        links: Dict[str, List[str]] = {}
+        for link, pages in self.link_sources.items():
+            for page in pages:
+                links.setdefault(page, []).append(link)
+        for page_links in links.values():
+            page_links.sort()
+        return links
+
+    # --- Zgodność ze słownikiem sekcji ---
+
+    @property
+    def sections(self) -> Tuple[str, ...]:
+        """
+        Dostępne sekcje raportu.
+
+        Najpierw włączone sekcje podstawowe (w kolejności etapów analizatora),
+        potem sekcje opcjonalne, które mają dane, na końcu sekcje własnych etapów.
+        """
+        optional = tuple(name for name in self.OPTIONAL_SECTIONS if getattr(self, name) is not None)
+        return self.base_sections + optional + tuple(self.extra_sections)
+
+    def __getitem__(self, section: str) -> str:
+        if section not in self.sections:
+            raise KeyError(section)
+        return ''.join(self.iter_text(section))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sections)
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    # --- Raport tekstowy ---
+
+    def iter_text(self, section: str) -> Iterator[str]:
+        """
+        Generuje tekst sekcji raportu fragment po fragmencie.
+
+        Args:
+            section: Nazwa sekcji z AnalysisResult.sections
+        """
+        if not self.total_pages:
+            if section == 'stats':
+                yield 'Brak danych do analizy.'
+            return
+        if section in self.extra_sections:
+            yield from self.extra_sections[section]()
+            return
+        yield from getattr(self, f'_text_{section}')()
+
+    def write_text(self, f: TextIO):
+        """Zapisuje wszystkie sekcje raportu tekstowego do otwartego pliku."""
+        for i, section in enumerate(self.sections):
+            if i:
+                f.write("\n\n")
+            f.writelines(self.iter_text(section))
+
+    def _text_stats(self) -> Iterator[str]:
+        """Sekcja podstawowych statystyk."""
+        total_pages = self.total_pages
+        total_size = self.total_size
+        yield f"""STATYSTYKI WITRYNY / WEBSITE STATISTICS
+{SEPARATOR}
+
+"""
+        if self.sampling is not None:
+            sample = self.sampling.sample
+            yield (f"UWAGA: analiza próby {len(sample.indices)} z {sample.population_size} stron "
+                   f"({sample.sampling_rate:.1%}) - oszacowania dla całej witryny w sekcji próbkowania.\n\n")
+        yield f"""Podstawowe informacje:
+- Liczba pobranych stron: {total_pages}
+- Całkowity rozmiar: {total_size:,} bajtów ({total_size/1024/1024:.2f} MB)
+- Średni rozmiar strony: {total_size/total_pages:,.0f} bajtów
+
+Kody odpowiedzi HTTP:
+{self.status_codes}
+
+Linki:
+- Całkowita liczba linków: {self.url_totals['links']}
+- Unikalne linki: {self.unique_count('links')}
+
+Obrazy:
+- Całkowita liczba obrazów: {self.url_totals['images']}
+- Unikalne obrazy: {self.unique_count('images')}
+
+Media:
+- Pliki video: {self.unique_count('videos')}
+- Pliki audio: {self.unique_count('audio')}
+- Pliki CSS: {self.unique_count('css')}
+- Pliki JavaScript: {self.unique_count('js')}
+- Dokumenty: {self.unique_count('documents')}
+
+Najczęstsze słowa:
+"""
+        if isinstance(self.word_freq, HeavyHitters):
+            yield (f"(przybliżenie: limit {self.word_freq.capacity} liczników, rzeczywiste wartości "
+                   f"mogą być większe o maks. {self.word_error_bound} z {self.word_freq.total} słów)\n")
+        common_words = self.word_freq.most_common(self.top_words)
+        if common_words:
+            for word, count in common_words:
+                yield f"- {word}: {count}\n"
+        else:
+            yield "Brak słów do analizy.\n"
+
+    def _text_links(self) -> Iterator[str]:
+        """Sekcja analizy linków."""
+        yield "ANALIZA LINKÓW / LINKS ANALYSIS\n" + SEPARATOR + "\n\n"
+        categories = self.categorize_links()
+
+        yield f"Linki wewnętrzne ({len(categories['internal'])}):\n"
+        for link in categories['internal'][:self.max_links_display]:
+            yield f"  {link}\n"
+
+        yield f"\nLinki zewnętrzne ({len(categories['external'])}):\n"
+        for link in categories['external'][:self.max_links_display]:
+            yield f"  {link}\n"
+
+        if categories['email']:
+            yield f"\nLinki email ({len(categories['email'])}):\n"
+            for link in categories['email']:
+                yield f"  {link}\n"
+
+    def _text_images(self) -> Iterator[str]:
+        """Sekcja analizy obrazów."""
+        yield "ANALIZA OBRAZÓW / IMAGES ANALYSIS\n" + SEPARATOR + "\n\n"
+        yield f"Całkowita liczba unikalnych obrazów: {self.unique_count('images')}\n\n"
+        for ext, images in self.group_by_extension('images').items():
+            yield f"{ext.upper()} ({len(images)}):\n"
+            for img in images[:self.max_images_per_type]:
+                yield f"  {img}\n"
+            yield "\n"
+
+    def _text_url_list(self, title: str, category: str) -> Iterator[str]:
+        """Lista unikalnych adresów kategorii z nagłówkiem (pomijana gdy pusta)."""
+        urls = self.urls[category]
+        if urls:
+            yield f"{title} ({len(urls)}):\n"
+            for url in sorted(urls)[:self.max_media_per_type]:
+                yield f"  {url}\n"
+            yield "\n"
+
+    def _text_media(self) -> Iterator[str]:
+        """Sekcja plików video i audio."""
+        yield "ANALIZA MEDIÓW / MEDIA ANALYSIS\n" + SEPARATOR + "\n\n"
+        yield from self._text_url_list("PLIKI VIDEO", 'videos')
+        yield from self._text_url_list("PLIKI AUDIO", 'audio')
+        if not self.urls['videos'] and not self.urls['audio']:
+            yield "Nie znaleziono plików video ani audio.\n"
+
+    def _text_resources(self) -> Iterator[str]:
+        """Sekcja plików CSS i JavaScript."""
+        yield "ANALIZA ZASOBÓW / RESOURCES ANALYSIS\n" + SEPARATOR + "\n\n"
+        yield from self._text_url_list("PLIKI CSS", 'css')
+        yield from self._text_url_list("PLIKI JAVASCRIPT", 'js')
+        if not self.urls['css'] and not self.urls['js']:
+            yield "Nie znaleziono plików CSS ani JavaScript.\n"
+
+    def _text_documents(self) -> Iterator[str]:
+        """Sekcja dokumentów do pobrania."""
+        yield "ANALIZA DOKUMENTÓW / DOCUMENTS ANALYSIS\n" + SEPARATOR + "\n\n"
+        if not self.urls['documents']:
+            yield "Nie znaleziono dokumentów do pobrania.\n"
+            return
+        yield f"Całkowita liczba dokumentów: {self.unique_count('documents')}\n\n"
+        for ext, docs in self.group_by_extension('documents').items():
+            yield f"{ext.upper()} ({len(docs)}):\n"
+            for doc in docs[:self.max_media_per_type]:
+                yield f"  {doc}\n"
+            yield "\n"
+
+    def _text_sampling(self) -> Iterator[str]:
+        """Sekcja oszacowań na podstawie próby."""
+        report = self.sampling
+        sample = report.sample
+        criterion = 'głębokość ścieżki' if sample.by == 'depth' else 'pierwszy segment ścieżki'
+        yield "PRÓBKOWANIE / SAMPLING\n" + SEPARATOR + "\n\n"
+        yield (f"Próba: {len(sample.indices)} z {sample.population_size} stron ({sample.sampling_rate:.1%}), "
+               f"{len(sample.population)} warstw ({criterion})\n")
+        yield "Oszacowania dla całej witryny (95% przedział ufności):\n\n"
+
+        def line(label: str, estimate: Estimate) -> str:
+            return f"- {label}: {estimate.value:,.0f} ± {estimate.margin:,.0f} ({estimate.low:,.0f} - {estimate.high:,.0f})\n"
+
+        labels = {'links': 'Linki', 'images': 'Obrazy', 'videos': 'Pliki video', 'audio': 'Pliki audio',
+                  'css': 'Pliki CSS', 'js': 'Pliki JavaScript', 'documents': 'Dokumenty'}
+        yield line("Całkowity rozmiar (bajty)", report.totals['size'])
+        for category, label in labels.items():
+            yield line(f"{label} - wszystkie", report.totals[category])
+            yield line(f"{label} - unikalne (szacunek)", report.unique[category])
+
+        yield "\nKody odpowiedzi HTTP (liczba stron):\n"
+        for code, estimate in report.status_codes.items():
+            yield line(str(code), estimate)
+
+        yield "\nWarstwy (próba / wszystkie strony):\n"
+        for key, population in sorted(sample.population.items(), key=lambda item: (-item[1], item[0])):
+            yield f"  {sample.sampled[key]:>6} / {population:<6} {key}\n"
+
+    def _text_keywords(self) -> Iterator[str]:
+        """Sekcja słów kluczowych TF-IDF."""
+        yield "SŁOWA KLUCZOWE / KEYWORDS (TF-IDF)\n" + SEPARATOR + "\n\n"
+        yield f"Słowa charakterystyczne dla witryny ({len(self.keywords.vocabulary)} różnych słów):\n"
+        for word, score in self.keywords.distinctive_terms(self.top_words):
+            yield f"- {word}: {score:.4f}\n"
+
+        yield "\nSłowa kluczowe stron:\n"
+        for url in self.keywords.urls[:self.max_links_display]:
+            words = ', '.join(word for word, _ in self.page_keywords(url))
+            yield f"  {url}\n    {words or '(brak słów)'}\n"
+        hidden = self.keywords.page_count - self.max_links_display
+        if hidden > 0:
+            yield f"  ... i {hidden} kolejnych stron (pełna lista w eksporcie CSV)\n"
+
+    def _text_link_graph(self) -> Iterator[str]:
+        """Sekcja grafu linków wewnętrznych."""
+        graph = self.link_graph
+        yield "GRAF LINKÓW / LINK GRAPH\n" + SEPARATOR + "\n\n"
+        yield f"Strony: {graph.node_count}, linki między stronami: {graph.edge_count}\n\n"
+
+        yield "Głębokość kliknięć od strony startowej:\n"
+        for level, count in graph.depth_distribution().items():
+            label = "nieosiągalne" if level < 0 else f"poziom {level}"
+            yield f"- {label}: {count}\n"
+
+        yield "\nNajważniejsze strony (PageRank):\n"
+        for url, rank in graph.top_pages(self.top_words):
+            yield f"  {rank:.5f}  {url}\n"
+
+        for title, urls in (("Strony osierocone (brak linków przychodzących)", graph.orphan_pages()),
+                            ("Strony bez linków wychodzących", graph.dead_end_pages())):
+            yield f"\n{title} ({len(urls)}):\n"
+            for url in urls[:self.max_links_display]:
+                yield f"  {url}\n"
+
+    def _text_near_duplicates(self) -> Iterator[str]:
+        """Sekcja grup stron prawie identycznych."""
+        duplicates = self.near_duplicates
+        yield "STRONY PRAWIE IDENTYCZNE / NEAR DUPLICATES\n" + SEPARATOR + "\n\n"
+        yield (f"Próg podobieństwa: {duplicates.threshold:.0%} (MinHash, {duplicates.bands} pasm x "
+               f"{duplicates.rows} wierszy)\n")
+        yield (f"Grupy: {len(duplicates.clusters)}, strony będące prawie kopiami: "
+               f"{duplicates.duplicate_count} z {duplicates.page_count}\n")
+        if not duplicates.clusters:
+            yield "\nNie znaleziono stron prawie identycznych.\n"
+            return
+        for i, cluster in enumerate(duplicates.clusters[:self.max_links_display], 1):
+            yield f"\nGrupa {i} ({len(cluster)} stron), reprezentant: {cluster[0]}\n"
+            for url in cluster[1:self.max_media_per_type + 1]:
+                yield f"  {duplicates.similarity[url]:.0%}  {url}\n"
+            hidden = len(cluster) - 1 - self.max_media_per_type
+            if hidden > 0:
+                yield f"  ... i {hidden} kolejnych stron\n"
+
+    def _text_link_check(self) -> Iterator[str]:
+        """Sekcja wyników sprawdzania linków."""
+        report = self.link_check
+        yield "SPRAWDZANIE LINKÓW / LINK CHECK\n" + SEPARATOR + "\n\n"
+        yield f"Sprawdzone unikalne linki: {len(report.results)} (z pamięci podręcznej: {report.from_cache})\n\n"
+        yield "Kody odpowiedzi:\n"
+        for status, count in sorted(report.status_counts().items(), key=lambda item: (item[0] is None, item[0] or 0)):
+            yield f"- {status if status is not None else 'błąd połączenia'}: {count}\n"
+
+        broken = report.broken_links()
+        yield f"\nNiedziałające linki ({len(broken)}):\n"
+        for url in broken[:self.max_links_display]:
+            result = report.results[url]
+            pages = report.sources.get(url, [])
+            label = result.status if result.status is not None else f"błąd: {result.error[:60]}"
+            yield f"  [{label}] {url}\n"
+            yield f"      na stronach ({len(pages)}): {', '.join(pages[:5])}{' ...' if len(pages) > 5 else ''}\n"
+
+    def _text_page_weight(self) -> Iterator[str]:
+        """Sekcja wagi stron i zasobów."""
+        report = self.page_weight
+        yield "WAGA STRON / PAGE WEIGHT\n" + SEPARATOR + "\n\n"
+        yield (f"Sprawdzone unikalne zasoby: {len(report.assets)} (z pamięci podręcznej: {report.from_cache}, "
+               f"nieznany rozmiar: {len(report.unknown_assets())})\n")
+        yield f"Łączny rozmiar witryny (HTML + zasoby): {report.site_bytes:,} bajtów ({report.site_bytes/1024/1024:.2f} MB)\n\n"
+
+        distribution = report.distribution()
+        if distribution:
+            yield "Rozkład wagi stron (bajty):\n"
+            for name in ('min', 'p50', 'mean', 'p90', 'p99', 'max'):
+                yield f"- {name}: {distribution[name]:,.0f}\n"
+
+        yield "\nRozmiar zasobów według typu:\n"
+        for content_type, size in report.type_totals().items():
+            yield f"- {content_type}: {size:,} bajtów\n"
+
+        yield "\nNajcięższe strony:\n"
+        for url, weight in report.heaviest_pages(self.top_words):
+            yield f"  {weight:>12,}  {url} (HTML: {report.html_sizes[url]:,}, zasoby: {len(report.page_assets.get(url, []))})\n"
+
+        page_counts = report.asset_page_counts()
+        yield "\nNajcięższe zasoby:\n"
+        for url, size in report.heaviest_assets(self.top_words):
+            yield f"  {size:>12,}  {url} (na {page_counts[url]} stronach)\n"
+
+    def _text_image_check(self) -> Iterator[str]:
+        """Sekcja formatów i wymiarów obrazów."""
+        report = self.image_check
+        yield "WYMIARY OBRAZÓW / IMAGE DIMENSIONS\n" + SEPARATOR + "\n\n"
+        yield f"Sprawdzone unikalne obrazy: {len(report.results)} (z pamięci podręcznej: {report.from_cache})\n\n"
+        yield "Rzeczywiste formaty:\n"
+        for image_format, count in sorted(report.format_counts().items()):
+            yield f"- {image_format.upper() or 'nierozpoznany'}: {count}\n"
+
+        oversized = report.oversized()
+        yield (f"\nZbyt duże obrazy ({len(oversized)}; powyżej {report.max_dimension} px "
+               f"lub {report.max_bytes // 1024} KB):\n")
+        for url in oversized[:self.max_links_display]:
+            info = report.results[url]
+            dimensions = f"{info.width}x{info.height}" if info.width else "?"
+            size = f"{info.size:,} B" if info.size is not None else "? B"
+            yield f"  {dimensions:>11}  {size:>14}  {url}\n"
+
+        mismatched = report.mismatched_extensions()
+        if mismatched:
+            yield f"\nRozszerzenie niezgodne z formatem ({len(mismatched)}):\n"
+            for url, image_format in mismatched[:self.max_links_display]:
+                yield f"  [{image_format.upper()}] {url}\n"
+
+        unreadable = report.unreadable()
+        if unreadable:
+            yield f"\nNie udało się odczytać ({len(unreadable)}):\n"
+            for url in unreadable[:self.max_links_display]:
+                yield f"  {url} ({report.results[url].error[:60]})\n"
+
+    # --- JSON ---
+
+    def iter_json(self) -> Iterator[str]:
+        """
+        Generuje dokument JSON z pełnymi danymi wyniku fragment po fragmencie.
+
+        Listy adresów są zapisywane element po elemencie, więc cały dokument
+        nigdy nie istnieje w pamięci jako jeden napis.
+        """
+        dump = lambda value: json.dumps(value, ensure_ascii=False)
+        yield '{"total_pages": %d, "total_size": %d' % (self.total_pages, self.total_size)
+        yield ', "status_codes": ' + dump({str(code): count for code, count in self.status_codes.items()})
+        yield ', "top_words": ' + dump(self.word_freq.most_common(self.top_words))
+        yield ', "word_error_bound": %d' % self.word_error_bound
+        yield ', "urls": {'
+        for i, category in enumerate(URL_CATEGORIES):
+            yield '%s%s: {"total": %d, "unique": [' % (', ' if i else '', dump(category), self.url_totals[category])
+            for j, url in enumerate(sorted(self.urls[category])):
+                yield (', ' if j else '') + dump(url)
+            yield ']}'
+        yield '}, "link_categories": {'
+        for i, (name, links) in enumerate(self.categorize_links().items()):
+            yield '%s%s: %d' % (', ' if i else '', dump(name), len(links))
+        yield '}'
+        if self.sampling is not None:
+            report = self.sampling
+            estimate = lambda value: {'value': value.value, 'margin': value.margin}
+            yield ', "sampling": ' + dump({
+                'sample_size': len(report.sample.indices),
+                'population': report.sample.population_size,
+                'sampling_rate': report.sample.sampling_rate,
+                'strata': {key: [report.sample.sampled[key], population] for key, population in report.sample.population.items()},
+                'totals': {name: estimate(value) for name, value in report.totals.items()},
+                'unique': {name: estimate(value) for name, value in report.unique.items()},
+                'status_codes': {str(code): estimate(value) for code, value in report.status_codes.items()},
+            })
+        if self.keywords is not None:
+            yield ', "distinctive_terms": ' + dump(self.keywords.distinctive_terms(self.top_words))
+        if self.link_graph is not None:
+            graph = self.link_graph
+            yield ', "link_graph": ' + dump({
+                'nodes': graph.node_count,
+                'edges': graph.edge_count,
+                'depth_distribution': {str(level): count for level, count in graph.depth_distribution().items()},
+                'top_pages': graph.top_pages(self.top_words),
+                'orphan_pages': graph.orphan_pages(),
+                'dead_end_pages': graph.dead_end_pages(),
+            })
+        if self.near_duplicates is not None:
+            duplicates = self.near_duplicates
+            yield ', "near_duplicates": ' + dump({
+                'threshold': duplicates.threshold,
+                'duplicate_count': duplicates.duplicate_count,
+                'clusters': [{'representative': cluster[0], 'pages': cluster} for cluster in duplicates.clusters],
+            })
+        if self.link_check is not None:
+            report = self.link_check
+            yield ', "link_check": ' + dump({
+                'checked': len(report.results),
+                'from_cache': report.from_cache,
+                'broken': [{'url': url, 'status': report.results[url].status, 'error': report.results[url].error,
+                            'source_pages': report.sources.get(url, [])} for url in report.broken_links()],
+            })
+        if self.page_weight is not None:
+            report = self.page_weight
+            yield ', "page_weight": ' + dump({
+                'assets': len(report.assets),
+                'from_cache': report.from_cache,
+                'site_bytes': report.site_bytes,
+                'distribution': report.distribution(),
+                'type_totals': report.type_totals(),
+                'heaviest_pages': report.heaviest_pages(self.top_words),
+                'heaviest_assets': report.heaviest_assets(self.top_words),
+                'unknown_assets': report.unknown_assets(),
+            })
+        if self.image_check is not None:
+            report = self.image_check
+            yield ', "image_check": ' + dump({
+                'checked': len(report.results),
+                'from_cache': report.from_cache,
+                'formats': dict(report.format_counts()),
+                'oversized': [{'url': url, 'format': report.results[url].format, 'width': report.results[url].width,
+                               'height': report.results[url].height, 'size': report.results[url].size}
+                              for url in report.oversized()],
+                'mismatched_extensions': report.mismatched_extensions(),
+                'unreadable': report.unreadable(),
+            })
+        yield '}\n'
+
+    def write_json(self, f: TextIO):
+        """Zapisuje wynik jako JSON do otwartego pliku."""
+        f.writelines(self.iter_json())
+
+    # --- JSON Lines ---
+
+    def iter_jsonl(self) -> Iterator[str]:
+        """
+        Generuje wiersze JSON Lines - jeden obiekt na stronę.
+
+        Każdy wiersz jest kompletnym dokumentem JSON (adres, kod HTTP, rozmiar,
+        linki i zasoby strony oraz - gdy zostały policzone - słowa kluczowe,
+        metryki grafu linków, waga strony i grupa stron prawie identycznych),
+        więc plik może być przetwarzany wiersz po wierszu.
+        """
+        links = self.page_links()
+        graph = self.link_graph
+        nodes = {url: node for node, url in enumerate(graph.urls)} if graph else {}
+        duplicates = self.near_duplicates
+        representatives = {url: cluster[0] for cluster in duplicates.clusters for url in cluster} if duplicates else {}
+        for url, size in self.page_sizes.items():
+            record: Dict[str, Any] = {
+                'url': url,
+                'status_code': self.page_status.get(url),
+                'size': size,
+                'links': links.get(url, []),
+                'assets': self.page_assets.get(url, []),
+            }
+            if self.keywords is not None:
+                record['keywords'] = [[word, round(score, 6)] for word, score in self.page_keywords(url)]
+            if url in nodes:
+                node = nodes[url]
+                record.update(pagerank=float(graph.pagerank[node]), in_degree=int(graph.in_degree[node]),
+                              out_degree=int(graph.out_degree[node]), depth=int(graph.depth[node]))
+            if self.page_weight is not None:
+                record['total_bytes'] = self.page_weight.page_weights.get(url)
+            if duplicates is not None:
+                record['near_duplicate_of'] = representatives.get(url)
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+    def write_jsonl(self, f: TextIO):
+        """Zapisuje wyniki stron jako JSON Lines do otwartego pliku."""
+        f.writelines(self.iter_jsonl())
+
+    # --- HTML ---
+
+    def iter_html(self, title: str = "Raport analizy witryny") -> Iterator[str]:
+        """
+        Generuje samodzielny raport HTML (styl wbudowany, bez skryptów) fragment po fragmencie.
+
+        Raport zawiera podsumowanie, tabelę kodów HTTP, wszystkie sekcje
+        raportu tekstowego i tabelę stron.
+
+        Args:
+            title: Tytuł raportu
+        """
+        yield ('<!DOCTYPE html>\n<html lang="pl">\n<head>\n<meta charset="utf-8">\n'
+               f'<title>{escape(title)}</title>\n<style>{HTML_STYLE}</style>\n</head>\n<body>\n')
+        yield f'<h1>{escape(title)}</h1>\n'
+        if self.site_url:
+            yield f'<p>Witryna: <a href="{escape(self.site_url)}">{escape(self.site_url)}</a></p>\n'
+        yield (f'<table>\n<tr><th>Liczba stron</th><td class="num">{self.total_pages}</td></tr>\n'
+               f'<tr><th>Całkowity rozmiar</th><td class="num">{self.total_size:,} B</td></tr>\n'
+               f'<tr><th>Średni rozmiar strony</th><td class="num">{self.average_page_size:,.0f} B</td></tr>\n'
+               '</table>\n')
+        yield '<nav>' + ''.join(f'<a href="#{name}">{escape(name)}</a>' for name in self.sections)
+        yield '<a href="#pages">pages</a></nav>\n'
+
+        yield '<h2>Kody odpowiedzi HTTP</h2>\n<table>\n<tr><th>Kod</th><th>Liczba stron</th></tr>\n'
+        for code, count in sorted(self.status_codes.items()):
+            yield f'<tr><td>{code}</td><td class="num">{count}</td></tr>\n'
+        yield '</table>\n'
+
+        for section in self.sections:
+            yield f'<section id="{escape(section)}">\n<pre>'
+            for chunk in self.iter_text(section):
+                yield escape(chunk, quote=False)
+            yield '</pre>\n</section>\n'
+
+        yield ('<section id="pages">\n<h2>Strony</h2>\n<table>\n<tr><th>Adres</th><th>Kod</th>'
+               '<th>Rozmiar</th><th>Zasoby</th></tr>\n')
+        for url, size in self.page_sizes.items():
+            status = self.page_status.get(url)
+            row_class = ' class="error"' if status is not None and status >= 400 else ''
+            yield (f'<tr{row_class}><td><a href="{escape(url)}">{escape(url)}</a></td>'
+                   f'<td>{status if status is not None else ""}</td><td class="num">{size}</td>'
+                   f'<td class="num">{len(self.page_assets.get(url, []))}</td></tr>\n')
+        yield '</table>\n</section>\n</body>\n</html>\n'
+
+    def write_html(self, f: TextIO, title: str = "Raport analizy witryny"):
+        """Zapisuje raport HTML do otwartego pliku."""
+        f.writelines(self.iter_html(title))
+
+    # --- CSV ---
+
+    def iter_csv_rows(self, table: str) -> Iterator[List]:
+        """
+        Generuje wiersze tabeli CSV (pierwszy wiersz to nagłówek).
+
+        Args:
+            table: 'urls' (kategoria, grupa, adres), 'status_codes', 'page_status' (kod HTTP strony),
+                'links' (link i strona, na której występuje), 'assets' (strona i jej zasób), 'words', 'keywords',
+                'pages' (metryki grafu linków), 'broken_links', 'page_weights', 'images' lub 'near_duplicates'
+        """
+        if table == 'urls':
+            yield ['category', 'group', 'url']
+            for group, links in self.categorize_links().items():
+                for link in links:
+                    yield ['links', group, link]
+            for category in URL_CATEGORIES[1:]:
+                for ext, urls in self.group_by_extension(category).items():
+                    for url in urls:
+                        yield [category, ext, url]
+        elif table == 'status_codes':
+            yield ['status_code', 'count']
+            for code, count in sorted(self.status_codes.items()):
+                yield [code, count]
+        elif table == 'page_status':
+            yield ['url', 'status_code', 'size']
+            for url, size in self.page_sizes.items():
+                status = self.page_status.get(url)
+                yield [url, status if status is not None else '', size]
+        elif table == 'links':
+            yield ['link', 'group', 'source_page']
+            site_host = default_resolver.host(self.site_url)
+            for link, pages in self.link_sources.items():
+                group = default_resolver.classify(link, site_host)
+                for page in pages:
+                    yield [link, group, page]
+        elif table == 'assets':
+            yield ['url', 'asset']
+            for url, assets in self.page_assets.items():
+                for asset in assets:
+                    yield [url, asset]
+        elif table == 'words':
+            yield ['word', 'count']
+            for word, count in self.word_freq.most_common():
+                yield [word, count]
+        elif table == 'keywords':
+            yield ['url', 'keyword', 'score']
+            for url in self.keywords.urls if self.keywords else []:
+                for word, score in self.page_keywords(url):
+                    yield [url, word, f"{score:.6f}"]
+        elif table == 'pages':
+            yield ['url', 'pagerank', 'in_degree', 'out_degree', 'depth']
+            graph = self.link_graph
+            for node, url in enumerate(graph.urls if graph else []):
+                yield [url, f"{graph.pagerank[node]:.8f}", int(graph.in_degree[node]),
+                       int(graph.out_degree[node]), int(graph.depth[node])]
+        elif table == 'broken_links':
+            yield ['url', 'status', 'error', 'source_page']
+            report = self.link_check
+            for url in report.broken_links() if report else []:
+                result = report.results[url]
+                for page in report.sources.get(url, []):
+                    yield [url, result.status if result.status is not None else '', result.error, page]
+        elif table == 'page_weights':
+            yield ['url', 'total_bytes', 'html_bytes', 'asset_bytes', 'asset_count']
+            report = self.page_weight
+            for url, weight in report.heaviest_pages(len(report.page_weights)) if report else []:
+                yield [url, weight, report.html_sizes[url], weight - report.html_sizes[url], len(report.page_assets.get(url, []))]
+        elif table == 'images':
+            yield ['url', 'format', 'width', 'height', 'size', 'oversized']
+            report = self.image_check
+            for url, info in sorted(report.results.items()) if report else []:
+                yield [url, info.format, info.width or '', info.height or '', info.size if info.size is not None else '',
+                       int(report.is_oversized(info))]
+        elif table == 'near_duplicates':
+            yield ['cluster', 'representative', 'url', 'similarity']
+            duplicates = self.near_duplicates
+            for i, cluster in enumerate(duplicates.clusters if duplicates else [], 1):
+                for url in cluster:
+                    yield [i, cluster[0], url, f"{duplicates.similarity[url]:.4f}"]
+        else:
+            raise ValueError(f"Nieznana tabela CSV: {table}")
+
+    def write_csv(self, f: TextIO, table: str = 'urls'):
+        """Zapisuje wybraną tabelę CSV do pliku otwartego z newline=''."""
+        csv.writer(f).writerows(self.iter_csv_rows(table))
@@ -2,325 +2,397 @@
 Moduł analizy stron internetowych.
 """
 
-from bs4 import BeautifulSoup
-from collections import Counter
-import re
-from typing import Dict, List, Tuple, Callable, Optional
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple, Callable, Optional
+
+from .analysis_partial import (ANALYZER_VERSION, CONTENT_FIELDS, URL_CATEGORIES, AnalysisPartial, extract_content,
+                               analyze_shard)
+from .analysis_cache import AnalysisCache, page_key
+from .analysis_result import AnalysisResult
+from .keywords import KeywordIndex
+from .link_graph import LinkGraph
+from .near_duplicates import NearDuplicateClusters
+from .link_checker import collect_link_sources
+from .page_source import PageSource
+from .page_weight import collect_page_assets
+from .sampling import SamplingReport, StratifiedSample
+from .stages import PAGE_INPUTS, AnalysisStage, StageRegistry
+
+# Wyniki etapów zapisywane we własnych atrybutach AnalysisResult
+RESULT_ATTRIBUTES = ('keywords', 'link_graph', 'near_duplicates', 'link_sources', 'page_sizes', 'page_status', 'page_assets')
+# Etapy sekcji podstawowych raportu -> nazwa sekcji (nazwy etapów nie mogą powtarzać nazw wejść, np. 'links')
+SECTION_STAGES = {f'{section}_section': section for section in AnalysisResult.SECTIONS}
+# Dane ekstrakcji potrzebne sekcjom podstawowym - wyłączona sekcja nie wymusza ich zbierania
+SECTION_FIELDS = {
+    'stats_section': CONTENT_FIELDS,  # statystyki podsumowują wszystkie kategorie i słowa
+    'links_section': ('links',),
+    'images_section': ('images',),
+    'media_section': ('videos', 'audio'),
+    'resources_section': ('css', 'js'),
+    'documents_section': ('documents',),
+}
+# Dane ekstrakcji potrzebne wejściom etapów liczonym ze stron
+INPUT_FIELDS = {
+    'word_counts': ('words',),
+    'signatures': ('words',),
+    'links': ('links',),
+    'page_urls': URL_CATEGORIES,
+}
 
 
 class WebsiteAnalyzer:
     """Analizuje pobrane dane stron internetowych."""
     
-    def __init__(self):
-        """Inicjalizuje analizator stron."""
+    def __init__(self, workers: int = 1, cache_path: Optional[str] = None):
+        """
+        Inicjalizuje analizator stron.
+        
+        Args:
+            workers: Liczba procesów do analizy równoległej (1 = analiza sekwencyjna)
+            cache_path: Ścieżka do pliku pamięci podręcznej wyników stron (None = bez pamięci)
+        """
         self.min_word_length = 3
         self.max_links_display = 50
         self.max_images_per_type = 20
         self.max_media_per_type = 15
+        self.workers = max(1, workers)
+        self.parallel_min_pages = 100  # poniżej tej liczby stron procesy się nie opłacają
+        self.shards_per_worker = 4     # mniejsze fragmenty = lepsze rozłożenie pracy
+        self.word_capacity: Optional[int] = None  # limit liczników słów witryny i każdej strony (None = dokładne liczenie)
+        self.duplicate_threshold = 0.8    # minimalne podobieństwo Jaccarda stron w grupie
+        self.signature_length = 128       # długość sygnatur MinHash
+        self.sample_size: Optional[int] = None  # analiza próby stron (None = wszystkie strony)
+        self.sample_strata = 'path'       # warstwy próby: 'path' (pierwszy segment ścieżki) lub 'depth'
+        self.sample_seed = 0              # ziarno losowania - powtarzalna próba
+        self.stream_batch_pages = 500     # strony z dysku (PageSource) analizowane porcjami tej wielkości
+        self.prefetch_pages = 32          # ile stron odczytywać z wyprzedzeniem
+        self.read_workers = 4             # wątki odczytujące pliki stron równolegle
+        self.cache = AnalysisCache(cache_path) if cache_path else None
+        if self.cache is not None:
+            self.cache.prune(str(ANALYZER_VERSION))  # wyniki poprzednich wersji analizatora nie będą już odczytane
+        self.stages = self._default_stages()  # etapy po ekstrakcji - można wyłączać i dodawać własne
         
-    def analyze_pages(self, downloaded_pages: Dict[str, Dict], progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, str]:
+    def analyze_pages(self, downloaded_pages: Mapping[str, Dict], progress_callback: Optional[Callable[[str], None]] = None) -> AnalysisResult:
         """
         Analizuje pobrane strony i generuje szczegółowy raport.
         
+        Przy workers > 1 i odpowiednio dużej liczbie stron analiza jest
+        dzielona na fragmenty przetwarzane w puli procesów. Wyniki częściowe
+        są scalane w kolejności stron, więc raport jest identyczny
+        z analizą sekwencyjną. Jeśli włączona jest pamięć podręczna,
+        parsowane są tylko strony o nowej lub zmienionej treści.
+        
+        Strony zapisane na dysku można przekazać jako leniwe źródło
+        (PageSource, np. FileManager.open_website_data) - są wtedy odczytywane
+        z wyprzedzeniem i analizowane porcjami po stream_batch_pages stron,
+        a po analizie porcji ich treść jest zwalniana. W pamięci pozostają
+        tylko metadane i wyniki częściowe stron.
+        
+        Przy ustawionym word_capacity liczniki słów witryny mają stały
+        rozmiar, a każda strona zachowuje dla indeksu słów kluczowych tylko
+        word_capacity swoich najczęstszych słów - pamięć rośnie z liczbą
+        stron, ale nie z ich długością ani słownictwem. Wyłączenie etapu
+        'keywords' usuwa liczniki słów stron całkowicie.
+        
+        Gdy ustawiono sample_size, analizowana jest tylko warstwowa próba
+        stron, a wynik zawiera oszacowania dla całej witryny z przedziałami
+        ufności (sekcja 'sampling').
+        
+        Po ekstrakcji wykonywane są etapy z rejestru self.stages (indeks
+        słów kluczowych, graf linków, ...) - niezależne etapy współbieżnie.
+        Wyłączenie etapu, np. self.stages.disable('keywords'), pomija jego
+        koszt, a dane stron potrzebne tylko jemu nie są nawet zbierane.
+        Sekcje podstawowe też są etapami ('stats_section', 'links_section', ...)
+        - można je wyłączać i przestawiać (self.stages.reorder), zmieniając raport.
+        Dane wyłączonych sekcji (np. obrazy, słowa) nie są wyszukiwane
+        w treści stron, chyba że potrzebuje ich inny włączony etap.
+        
         Args:
-            downloaded_pages: Słownik z danymi pobranych stron
+            downloaded_pages: Słownik lub leniwe źródło (PageSource) z danymi stron
             progress_callback: Opcjonalna funkcja callback do informowania o postępie
             
         Returns:
-            Słownik zawierający wyniki analizy dla różnych kategorii
+            Wynik analizy - dostępny także jako słownik sekcja -> tekst raportu
         """
            
         if not downloaded_pages:
-            return {'stats': 'Brak danych do analizy.', 'links': '', 'images': ''}
+            return self._build_report(self._new_partial())
         
-        # Podstawowe statystyki
-        total_pages = len(downloaded_pages)
-        total_size = sum(page['size'] for page in downloaded_pages.values())
-        all_links = []      # linki
-        all_images = []     # obrazy
-        all_videos = []     # filmy
-        all_audio = []      # pliki audio
-        all_css = []        # pliki CSS
-        all_js = []         # pliki JavaScript
-        all_documents = []  # dokumenty
-        all_words = []      # słowa
-        status_codes = []   # kody HTTP odpowiedzi
-        for i, (url, page_data) in enumerate(downloaded_pages.items()):
+        urls = list(downloaded_pages)
+        site_url = urls[0]  # strona startowa - także przy analizie próby
+        sample = None
+        if self.sample_size and len(urls) > self.sample_size:
+            # Strona startowa zawsze w próbie - od niej liczona jest głębokość w grafie linków
+            sample = StratifiedSample.draw(urls, self.sample_size, self.sample_strata, self.sample_seed,
+                                           keep_first=True)
             if progress_callback:
-                progress_callback(f"Analizuję stronę {i+1}/{total_pages}: {url[:50]}...")
-                
-            content = page_data['content']
-            status_codes.append(page_data['status_code'])
-            
-            # Parsuj HTML tylko raz na stronę
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Wyciągnij linki
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')
-                if href:
-                    all_links.append(str(href))                  # Wyciągnij obrazy
-            for img in soup.find_all('img', src=True):
-                src = img.get('src')
-                if src:
-                    all_images.append(str(src))
-            
-            # Wyciągnij filmy
-            for video in soup.find_all('video', src=True):
-                src = video.get('src')
-                if src:
-                    all_videos.append(str(src))
-            
-            # Wyciągnij źródła filmów
-            for source in soup.find_all('source', src=True):
-                src = source.get('src')
-                if src and any(ext in src.lower() for ext in ['.mp4', '.webm', '.avi', '.mov']):
-                    all_videos.append(str(src))
-            
-            # Wyciągnij pliki audio
-            for audio in soup.find_all('audio', src=True):
-                src = audio.get('src')
-                if src:
-                    all_audio.append(str(src))
+                progress_callback(f"Analizuję próbę {len(sample.indices)} z {len(urls)} stron "
+                                  f"({len(sample.population)} warstw)...")
+            urls = [urls[i] for i in sample.indices]
             
-            # Wyciągnij źródła plików audio
-            for source in soup.find_all('source', src=True):
-                src = source.get('src')
-                if src and any(ext in src.lower() for ext in ['.mp3', '.wav', '.ogg', '.m4a']):
-                    all_audio.append(str(src))
-            
-            # Wyciągnij pliki CSS
-            for link in soup.find_all('link', rel='stylesheet'):
-                href = link.get('href')
-                if href:
-                    all_css.append(str(href))
-            
-            # Wyciągnij pliki JavaScript
-            for script in soup.find_all('script', src=True):
-                src = script.get('src')
-                if src:
-                    all_js.append(str(src))
-            
-            # Wyciągnij linki do dokumentów z tagów <a>
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')
-                if href and any(ext in href.lower() for ext in ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx', '.zip', '.rar']):
-                    all_documents.append(str(href))
+        partial = self._new_partial()
+        page_partials: List[AnalysisPartial] = []
+        pages: List[Tuple[str, Dict]] = []  # metadane stron (bez treści)
+        collect_pages = self._needs_page_partials() or sample is not None
+        fields = self._extraction_fields(sampling=sample is not None)
+        for batch in self._page_batches(downloaded_pages, urls, progress_callback):
+            if collect_pages:
+                batch_partials = self._collect_pages(batch, fields, progress_callback)
+                # Porcja jest scalana od razu - licznik zbiorczy dostaje pełne liczniki stron
+                for page_partial in batch_partials:
+                    partial.merge(page_partial)
+                    if self.word_capacity is not None:
+                        page_partial.trim_words(self.word_capacity)
+                page_partials.extend(batch_partials)
+            else:
+                for content_partial in self._extract_contents(batch, fields, progress_callback, per_page=False):
+                    partial.merge(content_partial)
+            pages.extend((url, {key: value for key, value in page_data.items() if key != 'content'})
+                         for url, page_data in batch)
                 
-            # Wyciągnij słowa bezpośrednio bez przechowywania pełnego tekstu
-            text = soup.get_text(separator=' ', strip=True)
-            words = re.findall(r'\b[a-ząćęłńóśźż]+\b', text.lower())
-            all_words.extend(word for word in words if len(word) >= self.min_word_length)
+        # Metadane (rozmiar, kod HTTP) nie zależą od treści - zawsze liczone na bieżąco
+        for _, page_data in pages:
+            partial.add_page_metadata(page_data)
             
-        if progress_callback:
-            progress_callback("Generuję statystyki...")              # Wygeneruj statystyki
-        word_freq = Counter(all_words)
-        stats = self._generate_statistics(
-            total_pages, total_size, status_codes, all_links, all_images, 
-            all_videos, all_audio, all_css, all_js, all_documents, word_freq        )
-        
-        if progress_callback:
-            progress_callback("Analizuję linki...")
-        links_analysis = self._analyze_links(all_links)
+        result = self._build_report(partial, progress_callback, site_url=site_url)
+        if sample is not None:
+            result.sampling = SamplingReport.build(
+                sample, [page_data for _, page_data in pages], [p.url_totals for p in page_partials],
+                [p.urls for p in page_partials], URL_CATEGORIES
+            )
+        self._run_stages(result, pages, page_partials, progress_callback)
+        return result
+    
+    def page_partials(self, downloaded_pages: Mapping[str, Dict], urls: List[str],
+                      progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, AnalysisPartial]:
+        """
+        Zwraca wyniki częściowe (adresy i słowa) wskazanych stron.
         
-        if progress_callback:
-            progress_callback("Analizuję obrazy...")
-        images_analysis = self._analyze_images(all_images)
+        Gdy źródło przechowuje klucze wyników stron (migawka magazynu treści)
+        i włączona jest pamięć podręczna, wyniki stron już analizowanych są
+        odczytywane bez odczytu ich treści - parsowane są tylko pozostałe.
         
-        if progress_callback:
-            progress_callback("Analizuję media...")
-        media_analysis = self._analyze_media_only(all_videos, all_audio)
-        
-        if progress_callback:
-            progress_callback("Analizuję zasoby...")
-        resources_analysis = self._analyze_resources(all_css, all_js)
+        Args:
+            downloaded_pages: Słownik lub leniwe źródło z danymi stron
+            urls: Adresy stron
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+            
+        Returns:
+            Słownik adres -> wynik częściowy strony (bez metadanych)
+        """
+        found: Dict[str, AnalysisPartial] = {}
+        keys = downloaded_pages.page_keys() if isinstance(downloaded_pages, PageSource) else {}
+        if self.cache is not None and keys:
+            known = self.cache.get_many({keys[url] for url in urls if url in keys}, self._cache_version(CONTENT_FIELDS))
+            found = {url: known[keys[url]] for url in urls if keys.get(url) in known}
+        missing = [url for url in urls if url not in found]
+        if progress_callback and found:
+            progress_callback(f"Pamięć podręczna: {len(found)} stron bez odczytu treści, {len(missing)} do odczytu")
+        for batch in self._page_batches(downloaded_pages, missing, progress_callback):
+            found.update(zip((url for url, _ in batch), self._collect_pages(batch, CONTENT_FIELDS, progress_callback)))
+        return found
+    
+    def _page_batches(self, downloaded_pages: Mapping[str, Dict], urls: List[str],
+                      progress_callback: Optional[Callable[[str], None]]) -> Iterator[List[Tuple[str, Dict]]]:
+        """
+        Zwraca strony do analizy porcjami.
         
-        if progress_callback:
-            progress_callback("Analizuję dokumenty...")
-        documents_analysis = self._analyze_documents(all_documents)
+        Strony w pamięci tworzą jedną porcję. Strony z leniwego źródła są
+        odczytywane z wyprzedzeniem (prefetch_pages) w puli wątków - kolejne
+        pliki są czytane w trakcie analizy bieżącej porcji.
+        """
+        if not isinstance(downloaded_pages, PageSource):
+            yield [(url, downloaded_pages[url]) for url in urls]
+            return
+        stream = downloaded_pages.iter_pages(urls, self.prefetch_pages, self.read_workers)
+        batch_size = max(1, self.stream_batch_pages)
+        for start in range(0, len(urls), batch_size):
+            batch = list(islice(stream, batch_size))
+            if progress_callback:
+                progress_callback(f"Odczytano z dysku strony {start + 1}-{start + len(batch)} z {len(urls)}")
+            yield batch
+    
+    def _default_stages(self) -> StageRegistry:
+        """
+        Tworzy rejestr wbudowanych etapów analizy.
         
-        return {
-            'stats': stats,
-            'links': links_analysis,
-            'images': images_analysis,
-            'media': media_analysis,
-            'resources': resources_analysis,
-            'documents': documents_analysis
-        }
+        Dane sekcji podstawowych raportu (statystyki, linki, obrazy, ...) są
+        zbierane podczas ekstrakcji - ich etapy decydują, które dane są
+        wyszukiwane w treści stron (SECTION_FIELDS) oraz czy i w jakiej
+        kolejności sekcje trafiają do raportu.
+        """
+        return StageRegistry([
+            *(AnalysisStage(name, lambda inputs: None) for name in SECTION_STAGES),
+            AnalysisStage('keywords', lambda inputs: KeywordIndex.build(inputs['urls'], inputs['word_counts']),
+                          requires=('urls', 'word_counts'), message="Buduję indeks słów kluczowych..."),
+            AnalysisStage('link_graph', lambda inputs: LinkGraph.build(inputs['urls'], inputs['links']),
+                          requires=('urls', 'links'), message="Buduję graf linków..."),
+            AnalysisStage('near_duplicates',
+                          lambda inputs: NearDuplicateClusters.build(inputs['urls'], inputs['signatures'],
+                                                                     self.duplicate_threshold),
+                          requires=('urls', 'signatures'), message="Szukam stron prawie identycznych..."),
+            AnalysisStage('link_sources', lambda inputs: collect_link_sources(inputs['urls'], inputs['links']),
+                          requires=('urls', 'links')),
+            AnalysisStage('page_sizes', lambda inputs: {url: page['size'] for url, page in zip(inputs['urls'], inputs['pages'])},
+                          requires=('urls', 'pages')),
+            AnalysisStage('page_status', lambda inputs: {url: page['status_code'] for url, page in zip(inputs['urls'], inputs['pages'])},
+                          requires=('urls', 'pages')),
+            AnalysisStage('page_assets', lambda inputs: collect_page_assets(inputs['urls'], inputs['page_urls']),
+                          requires=('urls', 'page_urls')),
+        ])
     
-    def _generate_statistics(self, total_pages: int, total_size: int, 
-                           status_codes: List[int], all_links: List[str], 
-                           all_images: List[str], all_videos: List[str], 
-                           all_audio: List[str], all_css: List[str], 
-                           all_js: List[str], all_documents: List[str], word_freq: Counter) -> str:
-        """Generuje podstawowy raport statystyk."""
-        stats = f"""STATYSTYKI WITRYNY / WEBSITE STATISTICS
-{'='*50}
-
-Podstawowe informacje:
-- Liczba pobranych stron: {total_pages}
-- Całkowity rozmiar: {total_size:,} bajtów ({total_size/1024/1024:.2f} MB)
-- Średni rozmiar strony: {total_size/total_pages:,.0f} bajtów
-
-Kody odpowiedzi HTTP:
-{Counter(status_codes)}
-
-Linki:
-- Całkowita liczba linków: {len(all_links)}
-- Unikalne linki: {len(set(all_links))}
-
-Obrazy:
-- Całkowita liczba obrazów: {len(all_images)}
-- Unikalne obrazy: {len(set(all_images))}
-
-Media:
-- Pliki video: {len(set(all_videos))}
-- Pliki audio: {len(set(all_audio))}
-- Pliki CSS: {len(set(all_css))}
-- Pliki JavaScript: {len(set(all_js))}
-- Dokumenty: {len(set(all_documents))}
+    def _run_stages(self, result: AnalysisResult, items: List[Tuple[str, Dict]], page_partials: List[AnalysisPartial],
+                    progress_callback: Optional[Callable[[str], None]]):
+        """Wykonuje etapy z rejestru i zapisuje ich wyniki w obiekcie wyniku."""
+        inputs = {'urls': [url for url, _ in items], 'pages': [page_data for _, page_data in items]}
+        for name in self.stages.required_inputs() & set(PAGE_INPUTS):
+            inputs[name] = [PAGE_INPUTS[name](p) for p in page_partials]
+        outputs = self.stages.run(inputs, max_workers=4, progress_callback=progress_callback)
+        result.base_sections = tuple(SECTION_STAGES[name] for name in self.stages.names
+                                     if name in SECTION_STAGES and name in outputs)
+        for name in self.stages.names:
+            if name not in outputs:
+                continue
+            output = outputs[name]
+            result.stage_results[name] = output
+            if name in RESULT_ATTRIBUTES:
+                setattr(result, name, output)
+            stage = self.stages.get(name)
+            if stage.render is not None:
+                result.extra_sections[name] = lambda stage=stage, output=output: stage.render(output)
+    
+    def _needs_page_partials(self) -> bool:
+        """Czy któryś z etapów potrzebuje wyników każdej strony osobno."""
+        return self.cache is not None or bool(self.stages.required_inputs() & set(PAGE_INPUTS))
+    
+    def _extraction_fields(self, sampling: bool = False) -> Tuple[str, ...]:
+        """
+        Zwraca dane wyciągane z treści stron - tylko potrzebne zaplanowanym etapom.
 
-Najczęstsze słowa:
-"""
-        
-        # Wyświetl najczęstsze słowa
-        common_words = word_freq.most_common(20)
-        
-        if common_words:
-            for word, count in common_words:
-                stats += f"- {word}: {count}\n"
-        else:
-            stats += "Brak słów do analizy.\n"
-                
-        return stats
-        
-    def _analyze_links(self, all_links: List[str]) -> str:
-        """Analizuje linki znalezione na stronie internetowej."""
-        links_analysis = "ANALIZA LINKÓW / LINKS ANALYSIS\n" + "="*50 + "\n\n"
-        unique_links = set(all_links)
-          # Skategoryzuj linki
-        internal_links = []
-        external_links = []
-        email_links = []
-        other_links = []
+        Args:
+            sampling: Czy analizowana jest próba (oszacowania obejmują wszystkie kategorie adresów)
+        """
+        planned = {stage.name for level in self.stages.plan() for stage in level}
+        needed = set(URL_CATEGORIES) if sampling else set()
+        for name in planned & SECTION_FIELDS.keys():
+            needed.update(SECTION_FIELDS[name])
+        for name in self.stages.required_inputs() & INPUT_FIELDS.keys():
+            needed.update(INPUT_FIELDS[name])
+        return tuple(field for field in CONTENT_FIELDS if field in needed)
+    
+    def _new_partial(self) -> AnalysisPartial:
+        """Tworzy pusty wynik zbiorczy - z przybliżonym licznikiem słów jeśli ustawiono limit."""
+        return AnalysisPartial(self.word_capacity)
+    
+    def _cache_version(self, fields: Sequence[str]) -> str:
+        """Zwraca wersję wyników w pamięci podręcznej - zależy od ustawień ekstrakcji i wyciąganych danych."""
+        version = f"{ANALYZER_VERSION}-{self.min_word_length}-{self._num_perm(per_page=True)}"
+        if tuple(fields) != CONTENT_FIELDS:
+            version += '-' + '+'.join(fields)
+        return version
+    
+    def _num_perm(self, per_page: bool) -> int:
+        """Długość sygnatur MinHash liczonych podczas ekstrakcji (0 = bez sygnatur)."""
+        return self.signature_length if per_page and 'signatures' in self.stages.required_inputs() else 0
+    
+    def _collect_pages(self, items: List[Tuple[str, Dict]], fields: Sequence[str],
+                       progress_callback: Optional[Callable[[str], None]] = None) -> List[AnalysisPartial]:
+        """Zwraca wyniki częściowe (bez metadanych) dla każdej strony, w kolejności stron."""
+        if self.cache is not None:
+            return self._collect_cached(items, fields, progress_callback)
+        return self._extract_contents(items, fields, progress_callback, per_page=True)
+    
+    def _collect_cached(self, items: List[Tuple[str, Dict]], fields: Sequence[str],
+                        progress_callback: Optional[Callable[[str], None]] = None) -> List[AnalysisPartial]:
+        """Odczytuje wyniki z pamięci podręcznej i analizuje tylko nowe lub zmienione strony."""
+        version = self._cache_version(fields)
+        hashes = [page_key(url, page_data['content']) for url, page_data in items]
+        known = self.cache.get_many(set(hashes), version)
         
-        for link in unique_links:
-            if link.startswith('mailto:'):
-                email_links.append(link)
-            elif link.startswith(('http://', 'https://')):
-                external_links.append(link)
-            elif link.startswith('/') or not link.startswith(('javascript:', '#')):
-                internal_links.append(link)
-            else:
-                other_links.append(link)
-                
-        links_analysis += f"Linki wewnętrzne ({len(internal_links)}):\n"
-        for link in sorted(internal_links)[:self.max_links_display]:
-            links_analysis += f"  {link}\n"
-            
-        links_analysis += f"\nLinki zewnętrzne ({len(external_links)}):\n"
-        for link in sorted(external_links)[:self.max_links_display]:
-            links_analysis += f"  {link}\n"
-            
-        if email_links:
-            links_analysis += f"\nLinki email ({len(email_links)}):\n"
-            for link in sorted(email_links):
-                links_analysis += f"  {link}\n"
+        # Każdą unikalną nową treść analizuj tylko raz
+        missing: Dict[str, Tuple[str, Dict]] = {}
+        for (url, page_data), key in zip(items, hashes):
+            if key not in known and key not in missing:
+                missing[key] = (url, page_data)
                 
-        return links_analysis
-        
-    def _analyze_images(self, all_images: List[str]) -> str:
-        """Analizuje obrazy znalezione na stronie internetowej."""
-        images_analysis = "ANALIZA OBRAZÓW / IMAGES ANALYSIS\n" + "="*50 + "\n\n"
-        unique_images = set(all_images)
-        
-        # Skategoryzuj według rozszerzenia
-        extensions = {}
-        for img in unique_images:
-            ext = img.split('.')[-1].lower() if '.' in img else 'unknown'
-            if ext not in extensions:
-                extensions[ext] = []
-            extensions[ext].append(img)
+        if progress_callback:
+            cached_pages = sum(1 for key in hashes if key in known)
+            progress_callback(f"Pamięć podręczna: {cached_pages} stron bez zmian, {len(missing)} do analizy")
             
-        images_analysis += f"Całkowita liczba unikalnych obrazów: {len(unique_images)}\n\n"
+        computed = self._extract_contents(list(missing.values()), fields, progress_callback, per_page=True)
+        new_results = dict(zip(missing.keys(), computed))
+        self.cache.put_many(new_results, version)
+        known.update(new_results)
         
-        for ext, imgs in sorted(extensions.items()):
-            images_analysis += f"{ext.upper()} ({len(imgs)}):\n"
-            for img in sorted(imgs)[:self.max_images_per_type]:
-                images_analysis += f"  {img}\n"
-            images_analysis += "\n"            
-        return images_analysis
+        return [known[key] for key in hashes]
     
-    def _analyze_media_only(self, all_videos: List[str], all_audio: List[str]) -> str:
-        """Analizuje pliki video i audio."""
-        media_analysis = "ANALIZA MEDIÓW / MEDIA ANALYSIS\n" + "="*50 + "\n\n"
-        
-        # Analiza video
-        unique_videos = set(all_videos)
-        if unique_videos:
-            media_analysis += f"PLIKI VIDEO ({len(unique_videos)}):\n"
-            for video in sorted(unique_videos)[:self.max_media_per_type]:
-                media_analysis += f"  {video}\n"
-            media_analysis += "\n"
-        
-        # Analiza audio
-        unique_audio = set(all_audio)
-        if unique_audio:
-            media_analysis += f"PLIKI AUDIO ({len(unique_audio)}):\n"
-            for audio in sorted(unique_audio)[:self.max_media_per_type]:
-                media_analysis += f"  {audio}\n"
-            media_analysis += "\n"
+    def _extract_contents(self, items: List[Tuple[str, Dict]], fields: Sequence[str],
+                          progress_callback: Optional[Callable[[str], None]], per_page: bool) -> List[AnalysisPartial]:
+        """
+        Wyciąga adresy i słowa (tylko fields) z treści stron - sekwencyjnie lub w puli procesów.
         
-        if not unique_videos and not unique_audio:
-            media_analysis += "Nie znaleziono plików video ani audio.\n"
-            
-        return media_analysis
+        Returns:
+            Wyniki częściowe w kolejności stron - po jednym na stronę (per_page=True)
+            lub dowolna liczba wyników do scalenia
+        """
+        if not items:
+            return []
+        if self.workers > 1 and len(items) >= self.parallel_min_pages:
+            return self._extract_parallel(items, fields, progress_callback, per_page)
+        return self._extract_serial(items, fields, progress_callback, per_page)
     
-    def _analyze_resources(self, all_css: List[str], all_js: List[str]) -> str:
-        """Analizuje zasoby CSS i JavaScript."""
-        resources_analysis = "ANALIZA ZASOBÓW / RESOURCES ANALYSIS\n" + "="*50 + "\n\n"
-        
-        # Analiza CSS
-        unique_css = set(all_css)
-        if unique_css:
-            resources_analysis += f"PLIKI CSS ({len(unique_css)}):\n"
-            for css in sorted(unique_css)[:self.max_media_per_type]:
-                resources_analysis += f"  {css}\n"
-            resources_analysis += "\n"
-          # Analiza JavaScript
-        unique_js = set(all_js)
-        if unique_js:
-            resources_analysis += f"PLIKI JAVASCRIPT ({len(unique_js)}):\n"
-            for js in sorted(unique_js)[:self.max_media_per_type]:
-                resources_analysis += f"  {js}\n"
-            resources_analysis += "\n"
-        
-        if not unique_css and not unique_js:
-            resources_analysis += "Nie znaleziono plików CSS ani JavaScript.\n"
-            
-        return resources_analysis
+    def _extract_serial(self, items: List[Tuple[str, Dict]], fields: Sequence[str],
+                        progress_callback: Optional[Callable[[str], None]], per_page: bool) -> List[AnalysisPartial]:
+        """Analizuje strony po kolei w bieżącym wątku."""
+        total_pages = len(items)
+        results = []
+        merged = self._new_partial()
+        for i, (url, page_data) in enumerate(items):
+            if progress_callback:
+                progress_callback(f"Analizuję stronę {i+1}/{total_pages}: {url[:50]}...")
+            partial = extract_content(page_data['content'], self.min_word_length, url, self._num_perm(per_page), fields)
+            if per_page:
+                results.append(partial)
+            else:
+                merged.merge(partial)
+        return results if per_page else [merged]
     
-    def _analyze_documents(self, all_documents: List[str]) -> str:
-        """Analizuje dokumenty do pobrania."""
-        documents_analysis = "ANALIZA DOKUMENTÓW / DOCUMENTS ANALYSIS\n" + "="*50 + "\n\n"
-        
-        unique_docs = set(all_documents)
-        if unique_docs:            # Skategoryzuj według rozszerzenia
-            extensions = {}
-            for doc in unique_docs:
-                ext = doc.split('.')[-1].lower() if '.' in doc else 'unknown'
-                if ext not in extensions:
-                    extensions[ext] = []
-                extensions[ext].append(doc)
-            
-            documents_analysis += f"Całkowita liczba dokumentów: {len(unique_docs)}\n\n"
-            
-            for ext, docs in sorted(extensions.items()):
-                documents_analysis += f"{ext.upper()} ({len(docs)}):\n"
-                for doc in sorted(docs)[:self.max_media_per_type]:
-                    documents_analysis += f"  {doc}\n"
-                documents_analysis += "\n"
-        else:
-            documents_analysis += "Nie znaleziono dokumentów do pobrania.\n"
+    def _extract_parallel(self, items: List[Tuple[str, Dict]], fields: Sequence[str],
+                          progress_callback: Optional[Callable[[str], None]], per_page: bool) -> List[AnalysisPartial]:
+        """Dzieli strony na ciągłe fragmenty i analizuje je w puli procesów."""
+        shards = self._split_into_shards([(url, page_data['content']) for url, page_data in items])
+        workers = min(self.workers, len(shards))
+        if progress_callback:
+            progress_callback(f"Analizuję {len(items)} stron w {workers} procesach...")
             
-        return documents_analysis
\ No newline at end of file
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() zwraca wyniki w kolejności fragmentów - scalanie zachowuje kolejność stron
+            shard_results = executor.map(analyze_shard, shards, repeat(self.min_word_length),
+                                         repeat(per_page), repeat(self.word_capacity), repeat(self._num_perm(per_page)),
+                                         repeat(fields))
+            for i, partials in enumerate(shard_results):
+                results.extend(partials)
+                if progress_callback:
+                    progress_callback(f"Przeanalizowano fragment {i+1}/{len(shards)}")
+        return results
+    
+    def _split_into_shards(self, pages: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+        """Dzieli listę par (url, treść) na ciągłe fragmenty o zbliżonej wielkości."""
+        shard_count = max(1, min(len(pages), self.workers * self.shards_per_worker))
+        shard_size = -(-len(pages) // shard_count)
+        return [pages[i:i + shard_size] for i in range(0, len(pages), shard_size)]
+    
+    def _build_report(self, partial: AnalysisPartial, progress_callback: Optional[Callable[[str], None]] = None,
+                      site_url: str = '') -> AnalysisResult:
+        """Tworzy strukturalny wynik ze scalonego wyniku częściowego - tekst sekcji powstaje przy odczycie."""
+        if progress_callback:
+            progress_callback("Przygotowuję wyniki analizy...")
+        return AnalysisResult(
+            partial,
+            site_url=site_url,
+            max_links_display=self.max_links_display,
+            max_images_per_type=self.max_images_per_type,
+            max_media_per_type=self.max_media_per_type
+        )
@@ -0,0 +1,444 @@
+"""
+Magazyn migawek witryny z deduplikacją treści (adresowanie treścią).
+
+Treść każdej strony jest zapisywana raz - jako skompresowany plik o nazwie
+równej skrótowi SHA-256 treści (objects/ab/abcdef...). Migawka (np. kolejne
+nocne pobranie witryny) przechowuje tylko metadane stron i skróty ich treści,
+więc zapis prawie niezmienionej witryny kosztuje miejsce tylko dla zmienionych
+stron. Baza SQLite liczy odwołania do każdej treści; usunięcie migawki
+zmniejsza liczniki, a collect_garbage usuwa treści, do których nic się nie
+odwołuje.
+
+Migawka może być zapisana jako delta względem wcześniejszej (bazowej) -
+przechowuje wtedy tylko strony dodane, zmienione i znaczniki usuniętych,
+a pełna lista stron jest składana z łańcucha migawek przy otwarciu.
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+import time
+from typing import Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+import zlib
+
+from .analysis_cache import content_hash, page_key
+from .page_source import PageSource
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    " hash TEXT PRIMARY KEY,"
+    " size INTEGER NOT NULL,"
+    " stored_size INTEGER NOT NULL,"
+    " refcount INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS blobs_unreferenced ON blobs (refcount) WHERE refcount <= 0",
+    "CREATE TABLE IF NOT EXISTS snapshots ("
+    " name TEXT PRIMARY KEY,"
+    " created_at REAL NOT NULL,"
+    " base TEXT REFERENCES snapshots (name))",
+    "CREATE TABLE IF NOT EXISTS snapshot_pages ("
+    " snapshot TEXT NOT NULL REFERENCES snapshots (name),"
+    " position INTEGER NOT NULL,"
+    " url TEXT NOT NULL,"
+    " hash TEXT NOT NULL,"
+    " status_code INTEGER NOT NULL,"
+    " size INTEGER NOT NULL,"
+    " depth INTEGER,"
+    " headers TEXT NOT NULL,"
+    " page_key TEXT,"
+    " removed INTEGER NOT NULL DEFAULT 0,"
+    " PRIMARY KEY (snapshot, position))",
+    "CREATE INDEX IF NOT EXISTS snapshot_pages_url ON snapshot_pages (snapshot, url)",
+    "CREATE INDEX IF NOT EXISTS snapshots_base ON snapshots (base)",
+)
+# Kolumny dodane po pierwszej wersji magazynu: (tabela, kolumna, definicja)
+ADDED_COLUMNS = (
+    ('snapshots', 'base', 'TEXT'),
+    ('snapshot_pages', 'page_key', 'TEXT'),
+    ('snapshot_pages', 'removed', 'INTEGER NOT NULL DEFAULT 0'),
+)
+# Nagłówki zmieniające się przy każdym pobraniu - nie decydują o zmianie strony w delcie
+VOLATILE_HEADERS = frozenset({'date', 'age', 'expires', 'set-cookie', 'x-request-id', 'x-cache', 'cf-ray'})
+# Maksymalna długość łańcucha delt - dłuższy łańcuch spowalniałby otwieranie migawki
+MAX_DELTA_CHAIN = 16
+
+# Wiersz strony migawki: (skrót treści, kod HTTP, rozmiar, głębokość, nagłówki JSON, klucz wyniku analizy)
+PageRow = Tuple[str, int, int, Optional[int], str, str]
+
+
+STORE_DATABASE = 'refs.sqlite'
+
+
+def is_content_store(path: str) -> bool:
+    """Czy katalog jest magazynem treści."""
+    return os.path.isfile(os.path.join(path, STORE_DATABASE))
+
+
+class SnapshotStats(NamedTuple):
+    """Wynik zapisu migawki."""
+    pages: int          # liczba stron w migawce
+    new_blobs: int      # liczba nowych (dotąd niezapisanych) treści
+    new_bytes: int      # rozmiar nowych treści na dysku (po kompresji)
+    reused_pages: int   # strony, których treść już była w magazynie
+    stored_rows: int    # zapisane wiersze stron (w delcie tylko zmiany)
+    base: Optional[str]  # migawka bazowa delty (None = migawka pełna)
+
+
+class SnapshotInfo(NamedTuple):
+    """Opis migawki w magazynie."""
+    name: str
+    created_at: float
+    base: Optional[str]  # migawka bazowa delty (None = migawka pełna)
+    stored_rows: int     # liczba zapisanych wierszy stron
+
+
+class ContentStore:
+    """Katalog z treściami stron adresowanymi skrótem i migawkami witryn."""
+
+    def __init__(self, root_path: str):
+        """
+        Otwiera (lub tworzy) magazyn.
+
+        Args:
+            root_path: Katalog magazynu (baza refs.sqlite i katalog objects)
+        """
+        self.root_path = root_path
+        self.objects_path = os.path.join(root_path, 'objects')
+        self.db_path = os.path.join(root_path, STORE_DATABASE)
+        os.makedirs(self.objects_path, exist_ok=True)
+        with self._connect() as conn:
+            self._migrate(conn)
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Dodaje kolumny brakujące w magazynach utworzonych przez wcześniejszą wersję."""
+        for table, column, definition in ADDED_COLUMNS:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if columns and column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Otwiera połączenie na czas jednej transakcji."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _object_path(self, key: str) -> str:
+        """Ścieżka pliku treści - dwa pierwsze znaki skrótu tworzą podkatalog."""
+        return os.path.join(self.objects_path, key[:2], key[2:])
+
+    def _write_object(self, key: str, content: str) -> int:
+        """
+        Zapisuje treść, jeśli jej jeszcze nie ma.
+
+        Returns:
+            Rozmiar zapisanego pliku (0 gdy treść już istniała)
+        """
+        path = self._object_path(key)
+        if os.path.exists(path):
+            return 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = zlib.compress(content.encode('utf-8', 'surrogatepass'))
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return len(data)
+
+    def read_object(self, key: str) -> str:
+        """Odczytuje treść o podanym skrócie."""
+        with open(self._object_path(key), 'rb') as f:
+            return zlib.decompress(f.read()).decode('utf-8', 'surrogatepass')
+
+    def save_snapshot(self, name: str, downloaded_pages: Mapping[str, Dict], base: Optional[str] = None,
+                      progress_callback: Optional[Callable[[str], None]] = None) -> SnapshotStats:
+        """
+        Zapisuje migawkę witryny - treść tylko tych stron, których jeszcze nie ma w magazynie.
+
+        Migawka o tej samej nazwie jest zastępowana. Pliki treści są
+        zapisywane przed zatwierdzeniem odwołań, więc przerwany zapis nie
+        zostawia odwołań do brakujących treści (najwyżej nieużywane pliki,
+        które usuwa collect_garbage).
+
+        Args:
+            name: Nazwa migawki (np. data pobrania)
+            downloaded_pages: Słownik lub leniwe źródło z danymi stron
+            base: Migawka bazowa - zapisywane są tylko różnice względem niej
+                (None = migawka pełna; przy zbyt długim łańcuchu delt także pełna).
+                Strona różniąca się tylko nagłówkami z VOLATILE_HEADERS (Date,
+                Set-Cookie, ...) nie jest uznawana za zmienioną.
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+        Returns:
+            Statystyki zapisu (liczba nowych treści i ich rozmiar)
+
+        Raises:
+            KeyError: Gdy migawka bazowa nie istnieje
+        """
+        if base == name:
+            raise ValueError(f"Migawka nie może być deltą względem samej siebie: {name}")
+        base_rows: Dict[str, PageRow] = {}
+        if base is not None:
+            with self._connect() as conn:
+                if len(self._chain(conn, base)) >= MAX_DELTA_CHAIN:
+                    base = None
+                else:
+                    base_rows = self._resolve(conn, base)
+
+        if isinstance(downloaded_pages, PageSource):
+            pages = downloaded_pages.iter_pages()
+        else:
+            pages = iter(downloaded_pages.items())
+        total = len(downloaded_pages)
+
+        rows = []
+        seen = set()
+        sizes: Dict[str, Tuple[int, int]] = {}  # skrót -> (rozmiar treści, rozmiar pliku) nowych treści
+        references: Dict[str, int] = {}
+        reused = 0
+        for i, (url, page_data) in enumerate(pages, 1):
+            seen.add(url)
+            key = content_hash(page_data['content'])
+            row = (key, page_data['status_code'], page_data['size'], page_data.get('depth'),
+                   json.dumps(page_data['headers'], ensure_ascii=False), page_key(url, page_data['content']))
+            base_row = base_rows.get(url)
+            if base_row is not None and self._delta_key(base_row) == self._delta_key(row):
+                reused += 1  # strona bez zmian - w delcie nie jest zapisywana (zostają nagłówki z bazy)
+            else:
+                stored = self._write_object(key, page_data['content'])
+                if stored:
+                    sizes[key] = (len(page_data['content']), stored)
+                else:
+                    reused += 1
+                references[key] = references.get(key, 0) + 1
+                rows.append((name, len(rows), url) + row + (0,))
+            if progress_callback and (i % 500 == 0 or i == total):
+                progress_callback(f"Zapisano migawkę {i}/{total} stron ({len(sizes)} nowych treści)")
+        for url in base_rows:
+            if url not in seen:
+                rows.append((name, len(rows), url, '', 0, 0, None, '{}', None, 1))
+
+        with self._connect() as conn:
+            self._detach_dependents(conn, name)
+            self._release_snapshot(conn, name)
+            conn.execute("INSERT INTO snapshots (name, created_at, base) VALUES (?, ?, ?)", (name, time.time(), base))
+            self._insert_rows(conn, rows)
+            for key, count in references.items():
+                updated = conn.execute("UPDATE blobs SET refcount = refcount + ? WHERE hash = ?", (count, key)).rowcount
+                if not updated:
+                    size, stored_size = sizes.get(key) or self._sizes_on_disk(key)
+                    conn.execute("INSERT INTO blobs (hash, size, stored_size, refcount) VALUES (?, ?, ?, ?)",
+                                 (key, size, stored_size, count))
+        return SnapshotStats(len(seen), len(sizes), sum(stored for _, stored in sizes.values()), reused,
+                             len(rows), base)
+
+    @staticmethod
+    def _delta_key(row: PageRow) -> Tuple:
+        """Część wiersza strony porównywana przy zapisie delty - bez nagłówków z VOLATILE_HEADERS."""
+        headers = {name: value for name, value in json.loads(row[4]).items() if name.lower() not in VOLATILE_HEADERS}
+        return row[:4] + (headers,) + row[5:]
+
+    @staticmethod
+    def _insert_rows(conn: sqlite3.Connection, rows: List[Tuple]):
+        """Zapisuje wiersze stron migawki."""
+        conn.executemany(
+            "INSERT INTO snapshot_pages (snapshot, position, url, hash, status_code, size, depth, headers,"
+            " page_key, removed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+
+    @staticmethod
+    def _chain(conn: sqlite3.Connection, name: str) -> List[str]:
+        """
+        Łańcuch migawek od podanej do pełnej migawki, na której się opiera.
+
+        Raises:
+            KeyError: Gdy migawka (lub jej baza) nie istnieje
+        """
+        chain = []
+        current: Optional[str] = name
+        while current is not None:
+            row = conn.execute("SELECT base FROM snapshots WHERE name = ?", (current,)).fetchone()
+            if row is None:
+                raise KeyError(f"Brak migawki: {current}")
+            chain.append(current)
+            current = row[0]
+        return chain
+
+    def _resolve(self, conn: sqlite3.Connection, name: str) -> Dict[str, PageRow]:
+        """
+        Składa pełną listę stron migawki z łańcucha delt.
+
+        Kolejność stron jest kolejnością z migawki pełnej - zmienione strony
+        zostają na swoim miejscu, dodane trafiają na koniec.
+        """
+        rows: Dict[str, PageRow] = {}
+        for snapshot in reversed(self._chain(conn, name)):
+            for url, removed, *values in conn.execute(
+                    "SELECT url, removed, hash, status_code, size, depth, headers, page_key FROM snapshot_pages"
+                    " WHERE snapshot = ? ORDER BY position", (snapshot,)):
+                if removed:
+                    rows.pop(url, None)
+                else:
+                    rows[url] = tuple(values)  # type: ignore
+        return rows
+
+    def _detach_dependents(self, conn: sqlite3.Connection, name: str):
+        """Zamienia delty opierające się na migawce w migawki pełne (przed jej usunięciem lub zastąpieniem)."""
+        for child, in conn.execute("SELECT name FROM snapshots WHERE base = ?", (name,)).fetchall():
+            resolved = self._resolve(conn, child)
+            self._release_rows(conn, child)
+            self._insert_rows(conn, [(child, position, url) + row + (0,)
+                                     for position, (url, row) in enumerate(resolved.items())])
+            counts: Dict[str, int] = {}
+            for row in resolved.values():
+                counts[row[0]] = counts.get(row[0], 0) + 1
+            conn.executemany("UPDATE blobs SET refcount = refcount + ? WHERE hash = ?",
+                             ((count, key) for key, count in counts.items()))
+            conn.execute("UPDATE snapshots SET base = NULL WHERE name = ?", (child,))
+
+    def _release_rows(self, conn: sqlite3.Connection, name: str):
+        """Usuwa wiersze stron migawki i zmniejsza liczniki odwołań ich treści."""
+        counts = conn.execute("SELECT hash, COUNT(*) FROM snapshot_pages WHERE snapshot = ? AND removed = 0"
+                              " GROUP BY hash", (name,)).fetchall()
+        conn.executemany("UPDATE blobs SET refcount = refcount - ? WHERE hash = ?",
+                         ((count, key) for key, count in counts))
+        conn.execute("DELETE FROM snapshot_pages WHERE snapshot = ?", (name,))
+
+    def _sizes_on_disk(self, key: str) -> Tuple[int, int]:
+        """Rozmiary treści, której plik istnieje, ale nie ma jej w bazie (np. po przerwanym zapisie)."""
+        return len(self.read_object(key)), os.path.getsize(self._object_path(key))
+
+    def _release_snapshot(self, conn: sqlite3.Connection, name: str) -> bool:
+        """Usuwa migawkę i zmniejsza liczniki odwołań jej treści."""
+        self._release_rows(conn, name)
+        return conn.execute("DELETE FROM snapshots WHERE name = ?", (name,)).rowcount > 0
+
+    def delete_snapshot(self, name: str) -> bool:
+        """
+        Usuwa migawkę - treści zostają na dysku do wywołania collect_garbage.
+
+        Delty opierające się na usuwanej migawce są wcześniej zamieniane
+        w migawki pełne.
+
+        Returns:
+            True jeśli migawka istniała
+        """
+        with self._connect() as conn:
+            self._detach_dependents(conn, name)
+            return self._release_snapshot(conn, name)
+
+    def collect_garbage(self) -> Tuple[int, int]:
+        """
+        Usuwa treści, do których nie odwołuje się żadna migawka, oraz pliki bez wpisu w bazie.
+
+        Nie może działać równolegle z save_snapshot.
+
+        Returns:
+            Para (liczba usuniętych treści, zwolnione bajty)
+        """
+        with self._connect() as conn:
+            unreferenced = [key for key, in conn.execute("SELECT hash FROM blobs WHERE refcount <= 0")]
+            known = {key for key, in conn.execute("SELECT hash FROM blobs WHERE refcount > 0")}
+        removed, freed = 0, 0
+        for folder in os.listdir(self.objects_path):
+            folder_path = os.path.join(self.objects_path, folder)
+            for filename in os.listdir(folder_path):
+                if folder + filename in known:
+                    continue
+                path = os.path.join(folder_path, filename)
+                freed += os.path.getsize(path)
+                os.remove(path)
+                removed += 1
+            if not os.listdir(folder_path):
+                os.rmdir(folder_path)
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM blobs WHERE hash = ? AND refcount <= 0", ((key,) for key in unreferenced))
+        return removed, freed
+
+    def snapshots(self) -> List[SnapshotInfo]:
+        """Lista migawek od najstarszej."""
+        with self._connect() as conn:
+            return [SnapshotInfo(*row) for row in conn.execute(
+                "SELECT name, created_at, base, (SELECT COUNT(*) FROM snapshot_pages WHERE snapshot = name)"
+                " FROM snapshots ORDER BY created_at"
+            )]
+
+    def latest_snapshot(self) -> Optional[str]:
+        """Nazwa najnowszej migawki lub None, gdy magazyn jest pusty."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT name FROM snapshots ORDER BY created_at DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def usage(self) -> Dict[str, int]:
+        """Zajętość magazynu: liczba treści, ich łączny rozmiar, rozmiar na dysku i rozmiar treści we wpisach migawek."""
+        with self._connect() as conn:
+            blobs, size, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs WHERE refcount > 0"
+            ).fetchone()
+            referenced = conn.execute("SELECT COALESCE(SUM(size), 0) FROM snapshot_pages WHERE removed = 0").fetchone()[0]
+        return {'blobs': blobs, 'content_bytes': size, 'stored_bytes': stored, 'referenced_bytes': referenced}
+
+    def open_snapshot(self, name: str) -> 'ContentSnapshot':
+        """Otwiera migawkę jako leniwe źródło stron."""
+        return ContentSnapshot(self, name)
+
+
+class ContentSnapshot(PageSource):
+    """Migawka z magazynu treści - treść strony odczytywana przy dostępie."""
+
+    def __init__(self, store: ContentStore, name: str):
+        """
+        Args:
+            store: Magazyn treści
+            name: Nazwa migawki
+
+        Raises:
+            KeyError: Gdy migawka nie istnieje
+        """
+        self.store = store
+        self.name = name
+        with store._connect() as conn:
+            chain = store._chain(conn, name)
+            self.base: Optional[str] = chain[1] if len(chain) > 1 else None  # migawka bazowa delty
+            rows = store._resolve(conn, name)
+        self._hashes: Dict[str, str] = {}
+        self._keys: Dict[str, str] = {}
+        self._info: Dict[str, Dict] = {}
+        for url, (key, status_code, size, depth, headers, result_key) in rows.items():
+            self._hashes[url] = key
+            self._keys[url] = result_key
+            self._info[url] = {'status_code': status_code, 'headers': json.loads(headers), 'url': url, 'size': size}
+            if depth is not None:
+                self._info[url]['depth'] = depth
+
+    def urls(self) -> List[str]:
+        return list(self._hashes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._hashes)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._hashes
+
+    def page_info(self, url: str) -> Dict:
+        return self._info[url]
+
+    def read_content(self, url: str) -> str:
+        return self.store.read_object(self._hashes[url])
+
+    def content_hashes(self) -> Dict[str, str]:
+        """Słownik adres -> skrót treści (porównanie migawek bez odczytu treści)."""
+        return dict(self._hashes)
+
+    def page_keys(self) -> Dict[str, str]:
+        """Słownik adres -> klucz wyniku analizy strony zapisany razem z migawką."""
+        return {url: key for url, key in self._keys.items() if key}
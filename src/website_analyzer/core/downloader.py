@@ -2,13 +2,22 @@
 Moduł pobierania stron internetowych.
 """
 
+from collections import OrderedDict
+from contextlib import contextmanager
+import os
 import requests
+from requests.adapters import BaseAdapter
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import time
-from typing import Dict, List, Tuple, Set, Callable, Optional, Union
+from typing import Dict, Iterator, List, Mapping, MutableMapping, Tuple, Set, Callable, Optional, Union
 
 from .error_handler import handle_network_error, log_error
+from .http_cassette import CassetteRecorder, CassetteReplayer, HttpCassette
+from .page_store import PageStore
+from .page_writer import CrawlPages
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 
 
 class WebsiteDownloader:
@@ -38,12 +47,17 @@ class WebsiteDownloader:
         self.max_depth = max_depth
         self.timeout = timeout
         self.base_path = ""  # Ścieżka bazowa do ograniczenia crawlowania
+        self.page_store: Optional[PageStore] = None  # zapis stron w tle do bazy (None = tylko w pamięci)
+        self.memory_budget = 64 * 1024 * 1024       # limit treści stron w pamięci przy zapisie w tle
+        self.durable_writes = True                  # fsync każdej zapisanej porcji stron
+        self.request_delay = 0.5                    # przerwa po każdym zapytaniu (ograniczenie obciążenia serwera)
+        self._saved_adapters: Optional[OrderedDict] = None  # adaptery sesji sprzed podłączenia kasety
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': DEFAULT_USER_AGENT
         })
         
-    def download_website(self, start_url: str, progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Dict]:
+    def download_website(self, start_url: str, progress_callback: Optional[Callable[[str], None]] = None) -> Mapping[str, Dict]:
         """
         Główna metoda pobierająca witrynę internetową.
         
@@ -58,8 +72,13 @@ class WebsiteDownloader:
             start_url: adres strony od której zaczynamy pobieranie
             progress_callback: funkcja do wyświetlania postępu (opcjonalna)
             
+        Gdy ustawiono page_store, każda pobrana strona jest od razu zapisywana
+        w tle do bazy, a treść zapisanych stron jest zwalniana z pamięci po
+        przekroczeniu memory_budget.
+        
         Zwraca:
             Słownik gdzie klucz=URL, wartość=dane strony (zawartość, nagłówki, itp.)
+            - przy zapisie w tle obiekt CrawlPages działający jak słownik
         """
         if not self._is_valid_url(start_url):
             raise ValueError(f"Nieprawidłowy URL: {start_url}")
@@ -67,10 +86,26 @@ class WebsiteDownloader:
         if progress_callback:
             progress_callback(f"Rozpoczynam pobieranie: {start_url}")
             
+        downloaded_pages: Union[Dict[str, Dict], CrawlPages] = {}  # wyniki
+        if self.page_store is not None:
+            downloaded_pages = CrawlPages(self.page_store, self.memory_budget,
+                                          durable=self.durable_writes, progress_callback=progress_callback)
+            # Strony oczekujące w kolejce są zapisywane, a wątek zapisu kończony - także po błędzie
+            with downloaded_pages:
+                self._crawl(start_url, downloaded_pages, progress_callback)
+        else:
+            self._crawl(start_url, downloaded_pages, progress_callback)
+            
+        if progress_callback:
+            progress_callback(f"Pobieranie zakończone. Pobrano {len(downloaded_pages)} stron.")
+            
+        return downloaded_pages
+    
+    def _crawl(self, start_url: str, downloaded_pages: MutableMapping[str, Dict],
+               progress_callback: Optional[Callable[[str], None]]):
+        """Przeszukuje witrynę wszerz, dodając pobrane strony do downloaded_pages."""
         visited_urls: Set[str] = set()
         to_visit: List[Tuple[str, int]] = [(start_url, 0)]  # kolejka: (url, głębokość)
-        downloaded_pages: Dict[str, Dict] = {}  # wyniki
-        
         parsed_start = urlparse(start_url)
         base_domain = parsed_start.netloc
         self.base_path = parsed_start.path.rstrip('/')
@@ -95,6 +130,7 @@ class WebsiteDownloader:
                 
             success, result = self._download_single_page(current_url)
             if success:
+                result['depth'] = depth  # type: ignore
                 downloaded_pages[current_url] = result  # type: ignore
                 
                 # Znajdź nowe linki jeśli to HTML
@@ -113,18 +149,103 @@ class WebsiteDownloader:
             else:
                 if progress_callback:
                     progress_callback(result) # type: ignore
-                    
-        if progress_callback:
-            progress_callback(f"Pobieranie zakończone. Pobrano {len(downloaded_pages)} stron.")
+    
+    def record_cassette(self, cassette_path: str) -> HttpCassette:
+        """
+        Włącza nagrywanie ruchu HTTP sesji do kasety (poprzednia zawartość kasety jest usuwana).
+        
+        Nagrywanie trwa do wywołania stop_cassette.
+        
+        Argumenty:
+            cassette_path: ścieżka do pliku kasety
             
-        return downloaded_pages
+        Zwraca:
+            Kasetę, do której trafiają nagrania
+        """
+        cassette = HttpCassette(cassette_path)
+        cassette.clear()
+        self._mount(CassetteRecorder(cassette))
+        return cassette
+        
+    def replay_cassette(self, cassette_path: str, reproduce_latency: bool = False,
+                        latency_scale: float = 1.0) -> CassetteReplayer:
+        """
+        Przełącza sesję na odtwarzanie kasety - pobieranie nie korzysta z sieci
+        do wywołania stop_cassette.
+        
+        Przy odtwarzaniu przerwa między zapytaniami (request_delay) zwykle
+        powinna wynosić 0, by mierzyć sam crawler.
+        
+        Argumenty:
+            cassette_path: ścieżka do pliku kasety
+            reproduce_latency: True = odpowiedzi przychodzą po nagranym czasie odpowiedzi
+            latency_scale: mnożnik nagranych czasów odpowiedzi
+            
+        Zwraca:
+            Adapter odtwarzający (licznik misses - zapytania spoza kasety)
+        """
+        if not os.path.exists(cassette_path):
+            raise FileNotFoundError(f"Brak pliku kasety: {cassette_path}")
+        replayer = CassetteReplayer(HttpCassette(cassette_path), reproduce_latency, latency_scale)
+        self._mount(replayer)
+        return replayer
+        
+    def stop_cassette(self):
+        """
+        Kończy nagrywanie lub odtwarzanie kasety - sesja wraca do adapterów sprzed jego włączenia.
+        
+        Bez podłączonej kasety nic nie robi.
+        """
+        if self._saved_adapters is None:
+            return
+        self.session.adapters['https://'].close()
+        self.session.adapters = self._saved_adapters
+        self._saved_adapters = None
+        
+    @contextmanager
+    def cassette(self, cassette_path: str, record: bool = False, reproduce_latency: bool = False,
+                 latency_scale: float = 1.0) -> Iterator[Union[HttpCassette, CassetteReplayer]]:
+        """
+        Nagrywa lub odtwarza kasetę w obrębie bloku with - po nim sesja wraca do zwykłych adapterów.
+        
+        Argumenty:
+            cassette_path: ścieżka do pliku kasety
+            record: True = nagrywanie (jak record_cassette), False = odtwarzanie (jak replay_cassette)
+            reproduce_latency: przy odtwarzaniu - True = odpowiedzi po nagranym czasie odpowiedzi
+            latency_scale: przy odtwarzaniu - mnożnik nagranych czasów odpowiedzi
+            
+        Zwraca:
+            Kasetę (nagrywanie) albo adapter odtwarzający (odtwarzanie)
+        """
+        if record:
+            target: Union[HttpCassette, CassetteReplayer] = self.record_cassette(cassette_path)
+        else:
+            target = self.replay_cassette(cassette_path, reproduce_latency, latency_scale)
+        try:
+            yield target
+        finally:
+            self.stop_cassette()
+        
+    def _mount(self, adapter: BaseAdapter):
+        """
+        Podłącza adapter transportu do sesji dla adresów HTTP i HTTPS.
+        
+        Adaptery sprzed pierwszej kasety są zachowywane do stop_cassette;
+        adapter poprzedniej kasety jest zamykany.
+        """
+        if self._saved_adapters is None:
+            self._saved_adapters = OrderedDict(self.session.adapters)
+        else:
+            self.session.adapters['https://'].close()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def _download_single_page(self, url: str) -> Tuple[bool, Union[Dict, str]]:
         """Pobiera pojedynczą stronę."""
         try:
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
-            time.sleep(0.5)  # Rate limiting
+            time.sleep(self.request_delay)  # Rate limiting
             
             return True, {
                 'content': response.text,
@@ -192,4 +313,5 @@ class WebsiteDownloader:
                     clean_url += f"?{parsed.query}"
                 links.append(clean_url)
                 
-        return list(set(links))  # Usuń duplikaty
\ No newline at end of file
+        # Usuń duplikaty z zachowaniem kolejności w dokumencie - kolejka nie zależy od PYTHONHASHSEED
+        return list(dict.fromkeys(links))
\ No newline at end of file
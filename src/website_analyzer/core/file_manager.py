@@ -2,11 +2,30 @@
 Narzędzia do zarządzania plikami - zapisywanie i wczytywanie danych stron internetowych.
 """
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import glob
 import os
 import json
-from typing import Dict, Optional
+import re
+import shutil
+from typing import Callable, Deque, Dict, List, Mapping, Optional, Tuple
 
 from .error_handler import handle_file_error, safe_execute
+from .analysis_result import AnalysisResult
+from .content_store import ContentStore, SnapshotInfo, SnapshotStats, is_content_store
+from .page_source import FolderSnapshot, PageSource
+from .page_store import PageStore, is_page_store
+from .snapshot_diff import SnapshotDiff
+from .snapshot_archive import SnapshotArchive, is_snapshot_archive, write_snapshot_archive
+from .warc_archive import WarcArchive, is_warc_file, write_warc
+
+# Plik metadanych zapisanej witryny - zapisywany jako ostatni (manifest)
+METADATA_FILENAME = "metadata.json"
+# Przyrostek katalogu, w którym powstaje nowy zapis przed przemianowaniem
+TEMP_FOLDER_SUFFIX = ".tmp-"
+# Pliki stron zapisywane przez save_website_data (page_NNN.html lub page_NNN_G.html, G = numer zapisu)
+PAGE_FILE_PATTERN = re.compile(r'page_\d+(_\d+)?\.html(\.tmp)?')
 
 
 class FileManager:
@@ -15,77 +34,367 @@ class FileManager:
     def __init__(self):
         """Inicjalizuje menedżer plików."""
         self.default_encoding = 'utf-8'
+        self.write_workers = 8      # wątki zapisujące pliki stron równolegle
+        self.durable_writes = True  # True = pliki są utrwalane na dysku (fsync) przed zapisem metadanych
         
-    def save_website_data(self, downloaded_pages: Dict[str, Dict], folder_path: str) -> bool:
+    def save_website_data(self, downloaded_pages: Mapping[str, Dict], folder_path: str,
+                          progress_callback: Optional[Callable[[str], None]] = None) -> bool:
         """
-        Zapisuje pobrane dane strony internetowej na dysk.
+        Zapisuje pobrane dane strony internetowej na dysk (katalog page_NNN.html + metadata.json).
+        
+        Pliki stron są zapisywane równolegle w puli wątków. Przerwany zapis
+        nigdy nie zostawia katalogu wyglądającego na kompletny: nowy katalog
+        powstaje pod tymczasową nazwą i jest przemianowywany po zapisaniu
+        całości. W istniejącym katalogu strony trafiają do plików o nowych
+        nazwach, a zapis kończy atomowa podmiana metadanych (manifestu) - do
+        tego czasu katalog wczytuje się jako poprzedni zapis.
         
         Args:
-            downloaded_pages: Słownik z danymi stron do zapisania
+            downloaded_pages: Słownik lub leniwe źródło z danymi stron do zapisania
             folder_path: Ścieżka do katalogu zapisu plików
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
             
         Returns:
             True jeśli operacja się powiodła, False w przeciwnym razie
         """
-        success, _ = safe_execute(self._do_save_website_data, downloaded_pages, folder_path)
+        success, _ = safe_execute(self._do_save_website_data, downloaded_pages, folder_path, progress_callback)
         return success
     
-    def _do_save_website_data(self, downloaded_pages: Dict[str, Dict], folder_path: str):
+    def _do_save_website_data(self, downloaded_pages: Mapping[str, Dict], folder_path: str,
+                              progress_callback: Optional[Callable[[str], None]] = None):
         """Wykonuje faktyczne zapisywanie danych."""
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
-            
-        # Zapisz poszczególne strony
-        for i, (url, page_data) in enumerate(downloaded_pages.items()):
-            filename = f"page_{i+1:03d}.html"
-            filepath = os.path.join(folder_path, filename)
-            
-            with open(filepath, 'w', encoding=self.default_encoding) as f:
-                f.write(f"<!-- URL: {url} -->\n")
-                f.write(f"<!-- Status: {page_data['status_code']} -->\n")
-                f.write(f"<!-- Size: {page_data['size']} bytes -->\n")
-                f.write(page_data['content'])
+        folder_path = os.path.normpath(folder_path)
+        # Pozostałości przerwanych wcześniej zapisów do tego katalogu
+        for leftover in glob.glob(glob.escape(folder_path) + TEMP_FOLDER_SUFFIX + '*'):
+            shutil.rmtree(leftover, ignore_errors=True)
+            
+        fresh = not os.path.exists(folder_path) or not os.listdir(folder_path)
+        if fresh:
+            # Cały katalog powstaje obok i jest przemianowywany na końcu
+            target = f"{folder_path}{TEMP_FOLDER_SUFFIX}{os.getpid()}"
+            os.makedirs(target)
+            generation = 0
+        else:
+            # Katalog może zawierać inne pliki użytkownika - zapis na miejscu, pod nazwami
+            # nieużywanymi przez obecny manifest, który pozostaje ważny do końca zapisu
+            target = folder_path
+            generation = self._saved_generation(target) + 1
                 
-        # Zapisz plik indeksu i metadane
-        self._save_index_file(downloaded_pages, folder_path)
-        self._save_metadata(downloaded_pages, folder_path)
+        try:
+            pages = self._write_pages(downloaded_pages, target, generation, progress_callback)
+            self._save_metadata(pages, target, generation)
+            self._save_index_file(pages, target)
+            if fresh:
+                if os.path.exists(folder_path):
+                    os.rmdir(folder_path)  # pusty katalog wskazany przez użytkownika
+                os.rename(target, folder_path)
+                self._sync_directory(os.path.dirname(os.path.abspath(folder_path)))
+            else:
+                self._sync_directory(target)
+        except BaseException:
+            if fresh:
+                shutil.rmtree(target, ignore_errors=True)
+            else:
+                self._remove_unused_pages(target)
+            raise
+        if not fresh:
+            # Strony poprzedniego zapisu - dopiero gdy nowy manifest jest trwały
+            self._remove_unused_pages(target)
+        if progress_callback:
+            progress_callback(f"Zapisano {len(pages)} stron w katalogu {folder_path}")
+            
+    def _read_manifest(self, folder_path: str) -> Optional[Dict]:
+        """Wczytuje metadane zapisu (None gdy ich brak lub są uszkodzone)."""
+        try:
+            with open(os.path.join(folder_path, METADATA_FILENAME), 'r', encoding=self.default_encoding) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+            
+    def _saved_generation(self, folder_path: str) -> int:
+        """Numer zapisu obecnego w katalogu (0 dla zapisów bez numeru lub bez manifestu)."""
+        manifest = self._read_manifest(folder_path)
+        return manifest.get('generation', 0) if manifest else 0
+        
+    def _remove_unused_pages(self, folder_path: str):
+        """Usuwa pliki stron, do których nie odwołuje się manifest katalogu (pozostałe pliki nie są ruszane)."""
+        manifest = self._read_manifest(folder_path)
+        used = set(manifest['pages']) if manifest else set()
+        for filename in os.listdir(folder_path):
+            if PAGE_FILE_PATTERN.fullmatch(filename) and filename not in used:
+                try:
+                    os.remove(os.path.join(folder_path, filename))
+                except OSError:
+                    pass
+            
+    def _write_pages(self, downloaded_pages: Mapping[str, Dict], folder_path: str, generation: int,
+                     progress_callback: Optional[Callable[[str], None]]) -> List[Tuple[str, str, Dict]]:
+        """
+        Zapisuje pliki stron w puli wątków.
+        
+        W toku jest najwyżej kilka zapisów na wątek, więc strony z leniwego
+        źródła nie są wczytywane do pamięci naraz.
+        
+        Args:
+            generation: Numer zapisu - kolejne zapisy w tym samym katalogu używają innych nazw plików
+            
+        Returns:
+            Lista (nazwa pliku, adres, metadane strony) w kolejności stron
+        """
+        if isinstance(downloaded_pages, PageSource):
+            items = downloaded_pages.iter_pages()
+        else:
+            items = iter(downloaded_pages.items())
+        total = len(downloaded_pages)
+        workers = max(1, self.write_workers)
+        suffix = f"_{generation}" if generation else ""
+        pages: List[Tuple[str, str, Dict]] = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: Deque[Future] = deque()
+            for i, (url, page_data) in enumerate(items, 1):
+                filename = f"page_{i:03d}{suffix}.html"
+                pages.append((filename, url, {key: page_data[key] for key in ('status_code', 'size', 'headers')}))
+                pending.append(executor.submit(self._write_page_file, os.path.join(folder_path, filename),
+                                               url, page_data))
+                if len(pending) >= workers * 4:
+                    pending.popleft().result()
+                if progress_callback and i % 500 == 0:
+                    progress_callback(f"Zapisano {i}/{total} stron")
+            for future in pending:
+                future.result()
+        return pages
+        
+    def _write_page_file(self, filepath: str, url: str, page_data: Dict):
+        """Zapisuje plik strony jednym wywołaniem write."""
+        data = (f"<!-- URL: {url} -->\n"
+                f"<!-- Status: {page_data['status_code']} -->\n"
+                f"<!-- Size: {page_data['size']} bytes -->\n"
+                f"{page_data['content']}").encode(self.default_encoding)
+        with open(filepath, 'wb') as f:
+            f.write(data)
+            if self.durable_writes:
+                f.flush()
+                os.fsync(f.fileno())
+            
+    def _sync_directory(self, folder_path: str):
+        """Utrwala wpisy katalogu (przemianowanie) - tylko w systemach, które na to pozwalają."""
+        if not self.durable_writes or not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd = os.open(folder_path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
             
-    def _save_index_file(self, downloaded_pages: Dict[str, Dict], folder_path: str):
+    def _save_index_file(self, pages: List[Tuple[str, str, Dict]], folder_path: str):
         """Zapisuje plik indeksu mapujący nazwy plików na URL."""
+        lines = ["INDEKS POBRANYCH STRON / DOWNLOADED PAGES INDEX\n", "="*60 + "\n\n"]
+        lines.extend(f"{filename} - {url} - {info['status_code']} - {info['size']} bytes\n"
+                     for filename, url, info in pages)
         index_path = os.path.join(folder_path, "index.txt")
-        with open(index_path, 'w', encoding=self.default_encoding) as f:
-            f.write("INDEKS POBRANYCH STRON / DOWNLOADED PAGES INDEX\n")
-            f.write("="*60 + "\n\n")
-            for i, (url, page_data) in enumerate(downloaded_pages.items(), 1):
-                f.write(f"page_{i:03d}.html - {url} - {page_data['status_code']} - {page_data['size']} bytes\n")
+        with open(index_path + '.tmp', 'w', encoding=self.default_encoding) as f:
+            f.writelines(lines)
+        os.replace(index_path + '.tmp', index_path)
                 
-    def _save_metadata(self, downloaded_pages: Dict[str, Dict], folder_path: str):
-        """Zapisuje metadane jako JSON do programowego dostępu."""
+    def _save_metadata(self, pages: List[Tuple[str, str, Dict]], folder_path: str, generation: int):
+        """
+        Zapisuje metadane jako JSON do programowego dostępu.
+        
+        Plik metadanych jest manifestem zapisu - powstaje po zapisaniu stron
+        i jest podmieniany atomowo, więc zawsze opisuje kompletny zapis.
+        """
         metadata = {
-            'total_pages': len(downloaded_pages),
-            'total_size': sum(page['size'] for page in downloaded_pages.values()),
+            'generation': generation,
+            'total_pages': len(pages),
+            'total_size': sum(info['size'] for _, _, info in pages),
             'pages': {}
         }
         
-        for i, (url, page_data) in enumerate(downloaded_pages.items(), 1):
-            filename = f"page_{i:03d}.html"
+        for filename, url, info in pages:
             metadata['pages'][filename] = {
                 'url': url,
-                'status_code': page_data['status_code'],
-                'size': page_data['size'],
-                'headers': page_data['headers']
+                'status_code': info['status_code'],
+                'size': info['size'],
+                'headers': info['headers']
             }
             
-        metadata_path = os.path.join(folder_path, "metadata.json")
-        with open(metadata_path, 'w', encoding=self.default_encoding) as f:
+        metadata_path = os.path.join(folder_path, METADATA_FILENAME)
+        temp_path = metadata_path + '.tmp'
+        with open(temp_path, 'w', encoding=self.default_encoding) as f:
             json.dump(metadata, f, indent=2, ensure_ascii=False)
+            if self.durable_writes:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, metadata_path)
+            
+    def save_website_archive(self, downloaded_pages: Mapping[str, Dict], archive_path: str,
+                             progress_callback: Optional[Callable[[str], None]] = None) -> bool:
+        """
+        Zapisuje pobrane dane strony internetowej do jednego pliku archiwum.
+        
+        Źródłem może być także witryna otwarta z katalogu - tak zapisany
+        wcześniej katalog jest importowany do archiwum.
+        
+        Args:
+            downloaded_pages: Słownik lub leniwe źródło z danymi stron
+            archive_path: Ścieżka pliku archiwum (.wsa)
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+            
+        Returns:
+            True jeśli operacja się powiodła, False w przeciwnym razie
+        """
+        success, _ = safe_execute(write_snapshot_archive, downloaded_pages, archive_path,
+                                  progress_callback=progress_callback)
+        return success
+        
+    def save_website_warc(self, downloaded_pages: Mapping[str, Dict], warc_path: str,
+                          progress_callback: Optional[Callable[[str], None]] = None) -> bool:
+        """
+        Eksportuje pobrane dane strony do pliku WARC (.warc.gz) z indeksem CDX.
+        
+        Strony są zapisywane kolejno, rekord po rekordzie - eksport dużej
+        witryny otwartej z dysku nie wczytuje jej do pamięci.
+        
+        Args:
+            downloaded_pages: Słownik lub leniwe źródło z danymi stron
+            warc_path: Ścieżka pliku WARC; indeks trafia obok (plik .cdx)
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+            
+        Returns:
+            True jeśli operacja się powiodła, False w przeciwnym razie
+        """
+        success, _ = safe_execute(write_warc, downloaded_pages, warc_path, progress_callback=progress_callback)
+        return success
+        
+    def save_website_store(self, downloaded_pages: Mapping[str, Dict], db_path: str,
+                           progress_callback: Optional[Callable[[str], None]] = None) -> bool:
+        """
+        Zapisuje pobrane dane strony internetowej do bazy SQLite (PageStore).
+        
+        Strony już zapisane w bazie pod tym samym adresem są zastępowane.
+        
+        Args:
+            downloaded_pages: Słownik lub leniwe źródło z danymi stron
+            db_path: Ścieżka pliku bazy
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
             
-    def save_analysis_report(self, analysis_data: Dict[str, str], filepath: str) -> bool:
+        Returns:
+            True jeśli operacja się powiodła, False w przeciwnym razie
+        """
+        success, _ = safe_execute(self._do_save_website_store, downloaded_pages, db_path, progress_callback)
+        return success
+    
+    def _do_save_website_store(self, downloaded_pages: Mapping[str, Dict], db_path: str,
+                               progress_callback: Optional[Callable[[str], None]]):
+        """Wykonuje faktyczny zapis do bazy."""
+        PageStore(db_path).add_pages(downloaded_pages, progress_callback=progress_callback)
+        
+    def save_website_snapshot(self, downloaded_pages: Mapping[str, Dict], store_path: str, name: str,
+                              base: Optional[str] = None,
+                              progress_callback: Optional[Callable[[str], None]] = None) -> Optional[SnapshotStats]:
         """
-        Zapisuje raport analizy do pliku tekstowego.
+        Zapisuje pobrane dane strony jako migawkę w magazynie treści z deduplikacją.
+        
+        Treść identyczna z już zapisaną (w tej lub wcześniejszej migawce) nie
+        jest zapisywana ponownie - migawka przechowuje tylko odwołanie do niej.
+        Migawka zapisana względem bazowej przechowuje tylko zmienione strony.
         
         Args:
-            analysis_data: Słownik zawierający wyniki analizy
+            downloaded_pages: Słownik lub leniwe źródło z danymi stron
+            store_path: Katalog magazynu treści
+            name: Nazwa migawki (istniejąca migawka o tej nazwie jest zastępowana)
+            base: Migawka, względem której zapisać deltę (None = migawka pełna)
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+            
+        Returns:
+            Statystyki zapisu lub None jeśli operacja się nie powiodła
+        """
+        success, result = safe_execute(self._do_save_website_snapshot, downloaded_pages, store_path, name,
+                                       base, progress_callback)
+        return result if success else None
+    
+    def _do_save_website_snapshot(self, downloaded_pages: Mapping[str, Dict], store_path: str, name: str,
+                                  base: Optional[str],
+                                  progress_callback: Optional[Callable[[str], None]]) -> SnapshotStats:
+        """Wykonuje faktyczny zapis migawki."""
+        return ContentStore(store_path).save_snapshot(name, downloaded_pages, base, progress_callback)
+    
+    def list_website_snapshots(self, store_path: str) -> List[SnapshotInfo]:
+        """
+        Zwraca migawki zapisane w magazynie treści.
+        
+        Returns:
+            Opisy migawek od najstarszej; pusta lista, gdy magazynu nie ma
+        """
+        if not is_content_store(store_path):
+            return []
+        success, result = safe_execute(self._do_list_website_snapshots, store_path)
+        return result if success else []
+    
+    def _do_list_website_snapshots(self, store_path: str) -> List[SnapshotInfo]:
+        """Odczytuje listę migawek magazynu."""
+        return ContentStore(store_path).snapshots()
+    
+    def open_website_snapshot(self, store_path: str, name: Optional[str] = None) -> Optional[PageSource]:
+        """
+        Otwiera migawkę z magazynu treści bez wczytywania treści stron.
+        
+        Args:
+            store_path: Katalog magazynu treści
+            name: Nazwa migawki (None = najnowsza)
+            
+        Returns:
+            Leniwe źródło stron lub None jeśli operacja się nie powiodła
+        """
+        success, result = safe_execute(self._do_open_website_snapshot, store_path, name)
+        return result if success else None
+    
+    def _do_open_website_snapshot(self, store_path: str, name: Optional[str]) -> PageSource:
+        """Otwiera wskazaną (lub najnowszą) migawkę."""
+        store = ContentStore(store_path)
+        if name is None:
+            name = store.latest_snapshot()
+            if name is None:
+                raise FileNotFoundError(f"Magazyn nie zawiera migawek: {store_path}")
+        return store.open_snapshot(name)
+    
+    def delete_website_snapshot(self, store_path: str, name: str,
+                                collect_garbage: bool = True) -> Optional[Tuple[int, int]]:
+        """
+        Usuwa migawkę z magazynu treści.
+        
+        Args:
+            store_path: Katalog magazynu treści
+            name: Nazwa migawki
+            collect_garbage: True = od razu usuń treści, do których nie odwołuje się już żadna migawka
+            
+        Returns:
+            Para (liczba usuniętych treści, zwolnione bajty) lub None jeśli operacja się nie powiodła
+        """
+        success, result = safe_execute(self._do_delete_website_snapshot, store_path, name, collect_garbage)
+        return result if success else None
+    
+    def _do_delete_website_snapshot(self, store_path: str, name: str, collect_garbage: bool) -> Tuple[int, int]:
+        """Wykonuje faktyczne usunięcie migawki."""
+        store = ContentStore(store_path)
+        if not store.delete_snapshot(name):
+            raise FileNotFoundError(f"Brak migawki: {name}")
+        return store.collect_garbage() if collect_garbage else (0, 0)
+    
+    def save_analysis_report(self, analysis_data: AnalysisResult, filepath: str) -> bool:
+        """
+        Zapisuje raport analizy do pliku - format wynika z rozszerzenia.
+        
+        Obsługiwane formaty: .txt (raport tekstowy), .json (pełne dane),
+        .jsonl (jeden wiersz JSON na stronę), .html (samodzielny raport)
+        i .csv - wtedy każda tabela AnalysisResult.CSV_TABLES trafia do
+        osobnego pliku <nazwa>_<tabela>.csv. Każdy format jest zapisywany
+        strumieniowo, fragment po fragmencie.
+        
+        Args:
+            analysis_data: Wynik analizy
             filepath: Ścieżka do zapisania raportu
             
         Returns:
@@ -94,56 +403,106 @@ class FileManager:
         success, _ = safe_execute(self._write_report, analysis_data, filepath)
         return success
     
-    def _write_report(self, analysis_data: Dict[str, str], filepath: str):
-        """Zapisuje raport do pliku."""
-        with open(filepath, 'w', encoding=self.default_encoding) as f:
-            f.write("RAPORT ANALIZY WITRYNY / WEBSITE ANALYSIS REPORT\n")
-            f.write("="*60 + "\n\n")
+    def save_diff_report(self, diff: SnapshotDiff, filepath: str) -> bool:
+        """
+        Zapisuje raport porównania pobrań do pliku tekstowego.
+        
+        Args:
+            diff: Wynik porównania pobrań
+            filepath: Ścieżka do zapisania raportu
             
-            for section in ['stats', 'links', 'images', 'media', 'resources', 'documents']:
-                if section in analysis_data:
-                    if section != 'stats':
-                        f.write("\n\n")
-                    f.write(analysis_data[section])
+        Returns:
+            True jeśli operacja się powiodła, False w przeciwnym razie
+        """
+        success, _ = safe_execute(self._write_diff_report, diff, filepath)
+        return success
+    
+    def _write_diff_report(self, diff: SnapshotDiff, filepath: str):
+        """Zapisuje raport porównania - tworzy brakujący katalog."""
+        folder = os.path.dirname(filepath)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(filepath, 'w', encoding=self.default_encoding) as f:
+            diff.write_text(f)
+    
+    def _write_report(self, analysis_data: AnalysisResult, filepath: str):
+        """Zapisuje raport do pliku w formacie wynikającym z rozszerzenia."""
+        extension = os.path.splitext(filepath)[1].lower()
+        if extension == '.csv':
+            self._write_csv_tables(analysis_data, filepath)
+            return
+        with open(filepath, 'w', encoding=self.default_encoding) as f:
+            if extension == '.json':
+                analysis_data.write_json(f)
+            elif extension == '.jsonl':
+                analysis_data.write_jsonl(f)
+            elif extension in ('.html', '.htm'):
+                analysis_data.write_html(f)
+            else:
+                f.write("RAPORT ANALIZY WITRYNY / WEBSITE ANALYSIS REPORT\n")
+                f.write("="*60 + "\n\n")
+                analysis_data.write_text(f)
+                
+    def _write_csv_tables(self, analysis_data: AnalysisResult, filepath: str):
+        """Zapisuje każdą tabelę CSV wyniku do osobnego pliku <nazwa>_<tabela>.csv."""
+        base = os.path.splitext(filepath)[0]
+        for table in AnalysisResult.CSV_TABLES:
+            with open(f"{base}_{table}.csv", 'w', encoding=self.default_encoding, newline='') as f:
+                analysis_data.write_csv(f, table)
             
-    def load_website_data(self, folder_path: str) -> Optional[Dict[str, Dict]]:
+    def load_website_data(self, folder_path: str, lazy: bool = False) -> Optional[Mapping[str, Dict]]:
         """
         Wczytuje wcześniej zapisane dane strony internetowej.
         
+        W trybie leniwym wczytywane są tylko metadane, a treść strony jest
+        odczytywana i dekodowana przy dostępie do niej - wczytanie dużej
+        witryny jest natychmiastowe, a pamięć zależy od liczby oglądanych stron.
+        
         Args:
-            folder_path: Katalog zawierający zapisane dane strony
+            folder_path: Katalog zawierający zapisane dane strony lub plik archiwum (.wsa, .sqlite, .warc.gz)
+            lazy: True = zwróć leniwe źródło stron zamiast słownika
             
         Returns:
-            Słownik z wczytanymi danymi stron lub None jeśli operacja się nie powiodła
+            Słownik (lub leniwe źródło) z danymi stron albo None jeśli operacja się nie powiodła
         """
+        if lazy:
+            return self.open_website_data(folder_path)
         success, result = safe_execute(self._do_load_website_data, folder_path)
         return result if success else None
     
     def _do_load_website_data(self, folder_path: str) -> Dict[str, Dict]:
-        """Wykonuje faktyczne wczytywanie danych."""
-        metadata_path = os.path.join(folder_path, "metadata.json")
-        if not os.path.exists(metadata_path):
-            raise FileNotFoundError(f"Brak pliku metadanych: {metadata_path}")
-            
-        with open(metadata_path, 'r', encoding=self.default_encoding) as f:
-            metadata = json.load(f)
-            
-        downloaded_pages = {}
-        
-        for filename, page_info in metadata['pages'].items():
-            filepath = os.path.join(folder_path, filename)
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding=self.default_encoding) as f:
-                    content = f.read()
-                    lines = content.split('\n')
-                    content = '\n'.join(lines[3:])
-                    
-                downloaded_pages[page_info['url']] = {
-                    'content': content,
-                    'status_code': page_info['status_code'],
-                    'headers': page_info['headers'],
-                    'url': page_info['url'],
-                    'size': page_info['size']
-                }
-                
-        return downloaded_pages
\ No newline at end of file
+        """Wykonuje faktyczne wczytywanie danych - źródło jest zamykane po odczytaniu stron."""
+        source = self._open_snapshot(folder_path)
+        try:
+            return dict(source.iter_pages())
+        finally:
+            source.close()
+    
+    def open_website_data(self, folder_path: str) -> Optional[PageSource]:
+        """
+        Otwiera zapisaną witrynę bez wczytywania treści stron.
+        
+        Zwrócony obiekt działa jak słownik z danymi stron, ale treść każdej
+        strony jest odczytywana z dysku dopiero przy dostępie - analizator
+        przetwarza go strumieniowo.
+        
+        Args:
+            folder_path: Katalog zawierający zapisane dane strony lub plik archiwum (.wsa, .sqlite, .warc.gz)
+            
+        Returns:
+            Leniwe źródło stron lub None jeśli operacja się nie powiodła
+        """
+        success, result = safe_execute(self._open_snapshot, folder_path)
+        return result if success else None
+    
+    def _open_snapshot(self, path: str) -> PageSource:
+        """Otwiera archiwum, plik WARC, bazę stron, najnowszą migawkę magazynu treści albo zapisany katalog stron."""
+        if is_content_store(path):
+            return self._do_open_website_snapshot(path, None)
+        if is_snapshot_archive(path):
+            return SnapshotArchive(path)
+        if is_warc_file(path):
+            return WarcArchive(path)
+        if is_page_store(path):
+            return PageStore(path)
+        return FolderSnapshot(path, self.default_encoding)
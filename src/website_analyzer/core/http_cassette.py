@@ -0,0 +1,254 @@
+"""
+Nagrywanie i odtwarzanie ruchu HTTP (kaseta) dla powtarzalnych pomiarów pobierania.
+
+W trybie nagrywania każde zapytanie sesji requests i odpowiedź na nie (kod,
+nagłówki, treść, czas odpowiedzi) są zapisywane w kasecie - pliku SQLite
+z indeksem po metodzie i adresie, z treścią skompresowaną zlib. W trybie
+odtwarzania te same zapytania są obsługiwane z kasety, bez sieci - opcjonalnie
+z zachowaniem nagranych czasów odpowiedzi.
+
+Kaseta działa na poziomie adaptera transportu requests, więc przekierowania
+są nagrywane i odtwarzane krok po kroku, tak jak wykonała je sesja.
+"""
+
+from contextlib import contextmanager
+from datetime import timedelta
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+import zlib
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS interactions ("
+    " interaction_id INTEGER PRIMARY KEY,"
+    " method TEXT NOT NULL,"
+    " url TEXT NOT NULL,"
+    " request_headers TEXT NOT NULL,"
+    " status_code INTEGER,"
+    " reason TEXT,"
+    " headers TEXT,"
+    " size INTEGER,"
+    " body BLOB,"
+    " error TEXT,"
+    " started REAL NOT NULL,"
+    " elapsed REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS interactions_request ON interactions (method, url, interaction_id)",
+)
+
+
+class CassetteStats(NamedTuple):
+    """Podsumowanie zawartości kasety."""
+    interactions: int   # liczba nagranych zapytań
+    errors: int         # zapytania zakończone błędem sieci
+    body_bytes: int     # łączny rozmiar treści odpowiedzi
+    stored_bytes: int   # rozmiar treści po kompresji
+    duration: float     # czas od początku pierwszego do końca ostatniego zapytania (s)
+
+
+class HttpCassette:
+    """Plik kasety z nagranymi zapytaniami HTTP."""
+
+    def __init__(self, cassette_path: str):
+        """
+        Otwiera (lub tworzy) kasetę.
+
+        Args:
+            cassette_path: Ścieżka do pliku kasety
+        """
+        self.cassette_path = cassette_path
+        folder = os.path.dirname(cassette_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Otwiera połączenie na czas jednej transakcji - adaptery są używane z wielu wątków."""
+        conn = sqlite3.connect(self.cassette_path)
+        # Kaseta to dane pomiarowe - utrwalanie zostaje systemowi, by zapis nie spowalniał nagrania
+        conn.execute("PRAGMA synchronous = OFF")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def clear(self):
+        """Usuwa wszystkie nagrane zapytania."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM interactions")
+
+    def add(self, request: requests.PreparedRequest, started: float, elapsed: float,
+            response: Optional[requests.Response] = None, error: Optional[Exception] = None):
+        """
+        Zapisuje zapytanie wraz z odpowiedzią albo błędem.
+
+        Args:
+            request: Wysłane zapytanie
+            started: Początek zapytania w sekundach od początku nagrania
+            elapsed: Czas odpowiedzi w sekundach
+            response: Odpowiedź (None gdy zapytanie zakończyło się błędem)
+            error: Błąd zapytania
+        """
+        values: Tuple = (request.method, request.url, json.dumps(list(request.headers.items()), ensure_ascii=False))
+        if response is not None:
+            values += (response.status_code, response.reason or '',
+                       json.dumps(list(response.headers.items()), ensure_ascii=False),
+                       len(response.content), zlib.compress(response.content), None)
+        else:
+            values += (None, None, None, None, None, f"{type(error).__name__}: {error}")
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO interactions (method, url, request_headers, status_code, reason, headers, size, body,"
+                " error, started, elapsed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values + (started, elapsed)
+            )
+
+    def find(self, method: str, url: str, occurrence: int = 0) -> Optional[Dict]:
+        """
+        Wyszukuje nagranie zapytania.
+
+        Args:
+            method: Metoda HTTP
+            url: Pełny adres zapytania
+            occurrence: Numer powtórzenia zapytania (0 = pierwsze); gdy nagrano mniej
+                powtórzeń, zwracane jest ostatnie
+
+        Returns:
+            Słownik z polami nagrania lub None gdy zapytania nie nagrano
+        """
+        with self._connect() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM interactions WHERE method = ? AND url = ?",
+                                 (method, url)).fetchone()[0]
+            if not count:
+                return None
+            row = conn.execute(
+                "SELECT status_code, reason, headers, body, error, elapsed FROM interactions"
+                " WHERE method = ? AND url = ? ORDER BY interaction_id LIMIT 1 OFFSET ?",
+                (method, url, min(occurrence, count - 1))
+            ).fetchone()
+        status_code, reason, headers, body, error, elapsed = row
+        return {
+            'status_code': status_code,
+            'reason': reason,
+            'headers': json.loads(headers) if headers is not None else [],
+            'content': zlib.decompress(body) if body is not None else b'',
+            'error': error,
+            'elapsed': elapsed,
+        }
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+
+    def stats(self) -> CassetteStats:
+        """Zwraca podsumowanie zawartości kasety."""
+        with self._connect() as conn:
+            interactions, errors, body_bytes, stored_bytes, start, end = conn.execute(
+                "SELECT COUNT(*), COUNT(error), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0),"
+                " MIN(started), MAX(started + elapsed) FROM interactions"
+            ).fetchone()
+        return CassetteStats(interactions, errors, body_bytes, stored_bytes, (end - start) if interactions else 0.0)
+
+
+class CassetteRecorder(HTTPAdapter):
+    """
+    Adapter transportu requests wykonujący zapytania przez sieć i nagrywający je do kasety.
+
+    Treść odpowiedzi jest odczytywana w całości przed zapisem, więc adapter
+    nie nadaje się do zapytań strumieniowych dużych plików.
+    """
+
+    def __init__(self, cassette: HttpCassette, **kwargs):
+        """
+        Args:
+            cassette: Kaseta, do której trafiają nagrania
+            **kwargs: Parametry HTTPAdapter (np. pool_connections)
+        """
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self._origin = time.perf_counter()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+            response.content  # treść musi być pobrana, by czas odpowiedzi obejmował transfer
+        except requests.RequestException as e:
+            self.cassette.add(request, started - self._origin, time.perf_counter() - started, error=e)
+            raise
+        self.cassette.add(request, started - self._origin, time.perf_counter() - started, response=response)
+        return response
+
+
+class CassetteReplayer(BaseAdapter):
+    """
+    Adapter transportu requests obsługujący zapytania z kasety - bez dostępu do sieci.
+
+    Powtórzenia tego samego zapytania są obsługiwane kolejnymi nagraniami.
+    Zapytanie, którego nie nagrano, kończy się błędem połączenia.
+    """
+
+    def __init__(self, cassette: HttpCassette, reproduce_latency: bool = False, latency_scale: float = 1.0):
+        """
+        Args:
+            cassette: Kaseta z nagraniami
+            reproduce_latency: True = odpowiedź jest zwracana po nagranym czasie odpowiedzi
+            latency_scale: Mnożnik nagranych czasów odpowiedzi (np. 0.5 = dwa razy szybciej)
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.reproduce_latency = reproduce_latency
+        self.latency_scale = latency_scale
+        self.misses = 0  # zapytania, których nie było w kasecie
+        self._occurrences: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = (request.method or 'GET', request.url or '')
+        with self._lock:
+            occurrence = self._occurrences.get(key, 0)
+            self._occurrences[key] = occurrence + 1
+        recorded = self.cassette.find(key[0], key[1], occurrence)
+        if recorded is None:
+            with self._lock:
+                self.misses += 1
+            raise requests.ConnectionError(f"Brak nagrania w kasecie: {key[0]} {key[1]}", request=request)
+        if self.reproduce_latency:
+            time.sleep(recorded['elapsed'] * self.latency_scale)
+        if recorded['error'] is not None:
+            raise self._recorded_error(recorded['error'], request)
+
+        response = requests.Response()
+        response.status_code = recorded['status_code']
+        response.reason = recorded['reason']
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = recorded['content']
+        response._content_consumed = True
+        response.url = key[1]
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=recorded['elapsed'])
+        return response
+
+    def _recorded_error(self, error: str, request: requests.PreparedRequest) -> requests.RequestException:
+        """Odtwarza nagrany błąd - jako ten sam typ wyjątku requests, jeśli to możliwe."""
+        name, _, message = error.partition(': ')
+        error_type = getattr(requests.exceptions, name, None)
+        if not (isinstance(error_type, type) and issubclass(error_type, requests.RequestException)):
+            error_type = requests.ConnectionError
+        return error_type(message, request=request)
+
+    def close(self):
+        pass
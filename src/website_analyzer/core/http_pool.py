@@ -0,0 +1,112 @@
+"""
+Wspólna pula zapytań HTTP dla etapów sprawdzających wiele adresów.
+
+Zapytania są wykonywane współbieżnie w puli wątków, z osobną sesją HTTP dla
+każdego wątku i limitem równoczesnych połączeń do jednego hosta. Adresy są
+układane naprzemiennie według hostów, aby limity hostów nie blokowały puli.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from typing import Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+import requests
+
+from .downloader import DEFAULT_USER_AGENT
+
+T = TypeVar('T')
+
+
+def total_size(response: requests.Response) -> Optional[int]:
+    """
+    Pełny rozmiar zasobu z odpowiedzi na zapytanie z zakresem (Range: bytes=0-...).
+
+    Odpowiedź 206 podaje rozmiar w Content-Range, a serwer bez obsługi
+    zakresów (200) - w Content-Length. Odpowiedź z błędem nie ma rozmiaru.
+
+    Returns:
+        Rozmiar w bajtach lub None, gdy jest nieznany
+    """
+    if response.status_code == 206:
+        # Content-Range: bytes 0-0/12345 ('*' = rozmiar nieznany)
+        total = response.headers.get('Content-Range', '').rpartition('/')[2]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get('Content-Length', '')
+    if response.status_code < 400 and length.isdigit():
+        return int(length)
+    return None
+
+
+class HostLimitedPool:
+    """Współbieżne wykonywanie zapytań z limitem połączeń na host."""
+
+    def __init__(self, max_workers: int = 16, per_host_limit: int = 4, timeout: int = 10):
+        """
+        Args:
+            max_workers: Maksymalna liczba równoczesnych zapytań
+            per_host_limit: Maksymalna liczba równoczesnych zapytań do jednego hosta
+            timeout: Czas oczekiwania na odpowiedź w sekundach
+        """
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self._local = threading.local()
+        self._host_limits: Dict[str, threading.Semaphore] = {}
+        self._host_limits_lock = threading.Lock()
+
+    def run(self, urls: List[str], fetch: Callable[[str], T],
+            progress_callback: Optional[Callable[[str], None]] = None, label: str = "adresów") -> Dict[str, T]:
+        """
+        Wywołuje fetch dla każdego adresu w puli wątków.
+
+        Args:
+            urls: Unikalne adresy do sprawdzenia
+            fetch: Funkcja wywoływana dla adresu (z zajętym limitem jego hosta)
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+            label: Nazwa sprawdzanych elementów w komunikatach postępu
+
+        Returns:
+            Słownik adres -> wynik fetch
+        """
+        results: Dict[str, T] = {}
+        pending = self._interleave_hosts(urls)
+        if not pending:
+            return results
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._fetch_limited, fetch, url): url for url in pending}
+            for i, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if progress_callback and (i % 50 == 0 or i == len(pending)):
+                    progress_callback(f"Sprawdzono {i}/{len(pending)} {label}")
+        return results
+
+    def _fetch_limited(self, fetch: Callable[[str], T], url: str) -> T:
+        """Wywołuje fetch z zajętym semaforem hosta."""
+        with self._host_limit(urlparse(url).netloc):
+            return fetch(url)
+
+    def _interleave_hosts(self, urls: List[str]) -> List[str]:
+        """Układa adresy naprzemiennie według hostów, aby limity hostów nie blokowały puli."""
+        by_host: Dict[str, List[str]] = {}
+        for url in urls:
+            by_host.setdefault(urlparse(url).netloc, []).append(url)
+        queues = list(by_host.values())
+        ordered = []
+        for i in range(max((len(queue) for queue in queues), default=0)):
+            ordered.extend(queue[i] for queue in queues if i < len(queue))
+        return ordered
+
+    def _host_limit(self, host: str) -> threading.Semaphore:
+        """Zwraca semafor ograniczający liczbę połączeń do hosta."""
+        with self._host_limits_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.Semaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def _session(self) -> requests.Session:
+        """Sesja HTTP osobna dla każdego wątku."""
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+            self._local.session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+        return self._local.session
@@ -0,0 +1,236 @@
+"""
+Rozpoznawanie formatu i wymiarów obrazów na podstawie nagłówków plików.
+
+Z każdego unikalnego obrazu pobierany jest tylko początek pliku (zapytanie
+GET z nagłówkiem Range, odczyt przerywany po rozpoznaniu nagłówka). Obsługiwane
+formaty: PNG, JPEG, GIF i WebP (VP8, VP8L, VP8X). Pełny rozmiar pliku jest
+odczytywany z Content-Range, więc można tanio wskazać zbyt duże obrazy.
+"""
+
+from collections import Counter
+import struct
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from .http_pool import HostLimitedPool, total_size
+from .url_cache import UrlResultCache
+from .url_resolver import default_resolver
+
+# Znaczniki JPEG początku ramki (SOF) - zawierają wymiary obrazu
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Rozszerzenia w adresach, które oznaczają ten sam format
+EXTENSION_FORMATS = {'jpg': 'jpeg', 'jpe': 'jpeg', 'jpeg': 'jpeg', 'png': 'png', 'gif': 'gif', 'webp': 'webp', 'svg': 'svg'}
+
+
+class ImageInfo(NamedTuple):
+    """Format, wymiary i rozmiar jednego obrazu."""
+    format: str  # 'png', 'jpeg', 'gif', 'webp', 'svg' lub '' (nierozpoznany)
+    width: Optional[int] = None
+    height: Optional[int] = None
+    size: Optional[int] = None  # pełny rozmiar pliku w bajtach
+    error: str = ''
+
+    @property
+    def pixels(self) -> int:
+        """Liczba pikseli (0 gdy wymiary nieznane)."""
+        return (self.width or 0) * (self.height or 0)
+
+
+def _jpeg_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """Szuka znacznika SOF w segmentach JPEG; None gdy dane są za krótkie."""
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # bajty wypełnienia
+            offset += 1
+            continue
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:  # znaczniki bez długości
+            offset += 2
+            continue
+        length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+        if marker in JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return width, height
+        offset += 2 + length
+    return None
+
+
+def _webp_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """Odczytuje wymiary z pierwszego fragmentu pliku WebP."""
+    chunk = data[12:16]
+    if chunk == b'VP8X' and len(data) >= 30:
+        width = int.from_bytes(data[24:27], 'little') + 1
+        height = int.from_bytes(data[27:30], 'little') + 1
+        return width, height
+    if chunk == b'VP8L' and len(data) >= 25 and data[20] == 0x2F:
+        bits = int.from_bytes(data[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8 ' and len(data) >= 30 and data[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    return None
+
+
+def parse_image_header(data: bytes) -> Optional[Tuple[str, Optional[int], Optional[int]]]:
+    """
+    Rozpoznaje format i wymiary obrazu na podstawie początku pliku.
+
+    Args:
+        data: Pierwsze bajty pliku
+
+    Returns:
+        Krotka (format, szerokość, wysokość) albo None, gdy format jest
+        nieznany lub danych jest za mało do odczytania wymiarów
+    """
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        if len(data) < 24:
+            return None
+        width, height = struct.unpack('>II', data[16:24])
+        return 'png', width, height
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        if len(data) < 10:
+            return None
+        width, height = struct.unpack('<HH', data[6:10])
+        return 'gif', width, height
+    if data.startswith(b'\xff\xd8'):
+        dimensions = _jpeg_dimensions(data)
+        return ('jpeg',) + dimensions if dimensions else None
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        dimensions = _webp_dimensions(data)
+        return ('webp',) + dimensions if dimensions else None
+    head = data[:1024].lstrip().lower()
+    if head.startswith(b'<') and b'<svg' in head:
+        return 'svg', None, None
+    return None
+
+
+class ImageReport:
+    """Wyniki sprawdzenia obrazów witryny."""
+
+    def __init__(self, results: Dict[str, ImageInfo], from_cache: int,
+                 max_dimension: int = 2000, max_bytes: int = 500 * 1024):
+        """
+        Args:
+            results: Słownik adres obrazu -> wynik sprawdzenia
+            from_cache: Liczba wyników odczytanych z pamięci podręcznej
+            max_dimension: Większa szerokość lub wysokość oznacza zbyt duży obraz
+            max_bytes: Większy rozmiar pliku oznacza zbyt duży obraz
+        """
+        self.results = results
+        self.from_cache = from_cache
+        self.max_dimension = max_dimension
+        self.max_bytes = max_bytes
+
+    def format_counts(self) -> Counter:
+        """Liczba obrazów według rzeczywistego formatu ('' = nierozpoznany)."""
+        return Counter(info.format for info in self.results.values())
+
+    def is_oversized(self, info: ImageInfo) -> bool:
+        """Czy obraz przekracza limit wymiarów lub rozmiaru pliku."""
+        return (max(info.width or 0, info.height or 0) > self.max_dimension
+                or (info.size or 0) > self.max_bytes)
+
+    def oversized(self) -> List[str]:
+        """Zbyt duże obrazy - od największej liczby pikseli."""
+        found = [url for url, info in self.results.items() if self.is_oversized(info)]
+        return sorted(found, key=lambda url: (-self.results[url].pixels, -(self.results[url].size or 0), url))
+
+    def mismatched_extensions(self) -> List[Tuple[str, str]]:
+        """Obrazy, których rozszerzenie w adresie nie zgadza się z formatem - pary (adres, format)."""
+        mismatched = []
+        for url, info in sorted(self.results.items()):
+            expected = EXTENSION_FORMATS.get(default_resolver.extension(url))
+            if info.format and expected and expected != info.format:
+                mismatched.append((url, info.format))
+        return mismatched
+
+    def unreadable(self) -> List[str]:
+        """Obrazy, których formatu nie udało się rozpoznać."""
+        return sorted(url for url, info in self.results.items() if not info.format)
+
+
+class ImageProber(HostLimitedPool):
+    """Współbieżne odczytywanie nagłówków obrazów z trwałą pamięcią podręczną."""
+
+    CHUNK_SIZE = 4096
+
+    def __init__(self, cache_path: Optional[str] = None, max_workers: int = 16, per_host_limit: int = 4,
+                 timeout: int = 10, cache_ttl: int = 7 * 24 * 3600, max_header_bytes: int = 64 * 1024):
+        """
+        Args:
+            cache_path: Ścieżka do pliku SQLite z wynikami (None = bez pamięci podręcznej)
+            max_workers: Maksymalna liczba równoczesnych zapytań
+            per_host_limit: Maksymalna liczba równoczesnych zapytań do jednego hosta
+            timeout: Czas oczekiwania na odpowiedź w sekundach
+            cache_ttl: Czas ważności wyniku w pamięci podręcznej w sekundach
+            max_header_bytes: Maksymalna liczba bajtów czytanych z początku pliku
+        """
+        super().__init__(max_workers, per_host_limit, timeout)
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.max_header_bytes = max_header_bytes
+        self._cache = UrlResultCache(cache_path, 'image_info', [
+            ('format', 'TEXT NOT NULL'), ('width', 'INTEGER'), ('height', 'INTEGER'), ('size', 'INTEGER')
+        ]) if cache_path else None
+
+    def inspect(self, urls: Iterable[str], progress_callback: Optional[Callable[[str], None]] = None) -> ImageReport:
+        """
+        Sprawdza format i wymiary obrazów - każdy adres dokładnie raz.
+
+        Args:
+            urls: Adresy obrazów (adresy inne niż HTTP(S) są pomijane)
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+        Returns:
+            Raport z wynikami sprawdzenia
+        """
+        urls = [url for url in dict.fromkeys(urls) if default_resolver.split(url).scheme in ('http', 'https')]
+        results = self._load_cached(urls)
+        from_cache = len(results)
+        pending = [url for url in urls if url not in results]
+        if progress_callback:
+            progress_callback(f"Sprawdzam {len(pending)} obrazów ({from_cache} z pamięci podręcznej)...")
+
+        probed = self.run(pending, self._probe_image, progress_callback, "obrazów")
+        self._store_cached(probed)
+        results.update(probed)
+        return ImageReport(results, from_cache)
+
+    def _probe_image(self, url: str) -> ImageInfo:
+        """Czyta początek pliku, aż nagłówek zostanie rozpoznany lub osiągnięty zostanie limit."""
+        headers = {'Range': f'bytes=0-{self.max_header_bytes - 1}'}
+        try:
+            with self._session().get(url, timeout=self.timeout, allow_redirects=True,
+                                     stream=True, headers=headers) as response:
+                if response.status_code >= 400:
+                    return ImageInfo('', error=f"HTTP {response.status_code}")
+                size = total_size(response)
+                data = b''
+                parsed = None
+                # Serwer bez obsługi Range wysyła cały plik - czytanie i tak kończy się po limicie
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    data += chunk
+                    parsed = parse_image_header(data)
+                    if parsed or len(data) >= self.max_header_bytes:
+                        break
+        except requests.RequestException as e:
+            return ImageInfo('', error=str(e))
+        if parsed is None:
+            return ImageInfo('', size=size, error="nierozpoznany format")
+        return ImageInfo(parsed[0], parsed[1], parsed[2], size)
+
+    def _load_cached(self, urls: List[str]) -> Dict[str, ImageInfo]:
+        """Odczytuje aktualne (nieprzeterminowane) wyniki z pamięci podręcznej."""
+        if self._cache is None:
+            return {}
+        return {url: ImageInfo(*values) for url, values in self._cache.load(urls, self.cache_ttl).items()}
+
+    def _store_cached(self, results: Dict[str, ImageInfo]):
+        """Zapisuje rozpoznane obrazy - błędy są sprawdzane ponownie przy kolejnym uruchomieniu."""
+        if self._cache is not None:
+            self._cache.store((url, info[:4]) for url, info in results.items() if info.format)
@@ -0,0 +1,120 @@
+"""
+Indeks słów kluczowych TF-IDF dla pobranych stron.
+
+Macierz dokument-termin jest przechowywana w formacie CSR (tablice NumPy
+indptr / indices / data), a wagi TF-IDF są liczone wektorowo dla całej
+macierzy naraz - bez pętli po słowach w Pythonie.
+"""
+
+import numpy as np
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+
+class KeywordIndex:
+    """
+    Rzadka macierz TF-IDF: wiersze = strony, kolumny = słowa ze słownika.
+
+    Wagi każdego wiersza są znormalizowane (norma L2 = 1), więc nadają się
+    bezpośrednio do porównywania stron i wyboru słów kluczowych.
+    """
+
+    def __init__(self, urls: List[str], vocabulary: List[str], indptr: np.ndarray,
+                 indices: np.ndarray, counts: np.ndarray):
+        """
+        Args:
+            urls: Adresy stron (kolejność wierszy)
+            vocabulary: Słowa (kolejność kolumn)
+            indptr: Początki wierszy w tablicach indices/counts (długość = liczba stron + 1)
+            indices: Numery kolumn (słów) kolejnych niezerowych elementów
+            counts: Liczby wystąpień słów na stronach
+        """
+        self.urls = urls
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.indices = indices
+        self.counts = counts
+        self._url_rows = {url: row for row, url in enumerate(urls)}
+
+        page_count = len(urls)
+        row_ids = np.repeat(np.arange(page_count), np.diff(indptr))
+
+        # Wygładzone IDF: log((1 + N) / (1 + df)) + 1
+        self.document_frequency = np.bincount(indices, minlength=len(vocabulary))
+        self.idf = np.log((1 + page_count) / (1 + self.document_frequency)) + 1
+
+        page_lengths = np.bincount(row_ids, weights=counts, minlength=page_count)
+        weights = counts / np.maximum(page_lengths, 1)[row_ids] * self.idf[indices]
+        norms = np.sqrt(np.bincount(row_ids, weights=weights * weights, minlength=page_count))
+        self.weights = weights / np.maximum(norms, 1e-12)[row_ids]
+
+    @classmethod
+    def build(cls, urls: Sequence[str], page_counts: Sequence[Mapping[str, int]]) -> 'KeywordIndex':
+        """
+        Buduje indeks z liczników słów poszczególnych stron.
+
+        Args:
+            urls: Adresy stron
+            page_counts: Liczniki słów stron (w tej samej kolejności co urls)
+
+        Returns:
+            Gotowy indeks TF-IDF
+        """
+        vocabulary: Dict[str, int] = {}
+        indptr = np.zeros(len(page_counts) + 1, dtype=np.int64)
+        indices_parts = []
+        counts_parts = []
+        for row, counts in enumerate(page_counts):
+            indices_parts.append(np.fromiter((vocabulary.setdefault(word, len(vocabulary)) for word in counts),
+                                             dtype=np.int32, count=len(counts)))
+            counts_parts.append(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+            indptr[row + 1] = indptr[row] + len(counts)
+
+        indices = np.concatenate(indices_parts) if indices_parts else np.zeros(0, dtype=np.int32)
+        counts_array = np.concatenate(counts_parts) if counts_parts else np.zeros(0)
+        return cls(list(urls), list(vocabulary), indptr, indices, counts_array)
+
+    @property
+    def page_count(self) -> int:
+        """Liczba stron w indeksie."""
+        return len(self.urls)
+
+    def page_keywords(self, url: str, n: int = 10) -> List[Tuple[str, float]]:
+        """
+        Zwraca słowa kluczowe strony posortowane malejąco według wagi TF-IDF.
+
+        Args:
+            url: Adres strony
+            n: Liczba słów do zwrócenia
+
+        Returns:
+            Lista par (słowo, waga); pusta dla nieznanej strony
+        """
+        row = self._url_rows.get(url)
+        if row is None:
+            return []
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self._top_terms(self.indices[start:end], self.weights[start:end], n)
+
+    def distinctive_terms(self, n: int = 20) -> List[Tuple[str, float]]:
+        """
+        Zwraca słowa najbardziej charakterystyczne dla witryny.
+
+        Waga słowa to średnia jego wag TF-IDF ze wszystkich stron - wysoka
+        dla słów często i mocno wyróżniających strony, niska dla słów
+        obecnych wszędzie w podobnym stopniu.
+        """
+        if not self.page_count:
+            return []
+        mean_weights = np.bincount(self.indices, weights=self.weights, minlength=len(self.vocabulary)) / self.page_count
+        return self._top_terms(np.arange(len(self.vocabulary)), mean_weights, n)
+
+    def _top_terms(self, term_ids: np.ndarray, weights: np.ndarray, n: int) -> List[Tuple[str, float]]:
+        """Wybiera n słów o największych wagach (argpartition zamiast pełnego sortowania)."""
+        if n <= 0 or not len(weights):
+            return []
+        if len(weights) > n:
+            top = np.argpartition(-weights, n - 1)[:n]
+        else:
+            top = np.arange(len(weights))
+        top = top[np.lexsort((term_ids[top], -weights[top]))]
+        return [(self.vocabulary[term_ids[i]], float(weights[i])) for i in top]
@@ -0,0 +1,138 @@
+"""
+Sprawdzanie działania linków znalezionych na stronach.
+
+Każdy unikalny adres jest sprawdzany tylko raz na uruchomienie, niezależnie
+od liczby stron, które do niego linkują. Zapytania są wykonywane
+współbieżnie (HEAD, a gdy serwer go nie obsługuje - GET) z limitem
+równoczesnych połączeń do jednego hosta. Wyniki trafiają do trwałej
+pamięci podręcznej z czasem ważności.
+"""
+
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import requests
+
+from .http_pool import HostLimitedPool
+from .link_graph import resolve_link
+from .url_cache import UrlResultCache
+
+
+class LinkStatus(NamedTuple):
+    """Wynik sprawdzenia jednego adresu."""
+    status: Optional[int]  # kod HTTP (None = błąd połączenia)
+    error: str = ''
+
+    @property
+    def is_broken(self) -> bool:
+        """Czy link nie działa (błąd połączenia lub kod >= 400)."""
+        return self.status is None or self.status >= 400
+
+
+def collect_link_sources(urls: Sequence[str], page_links: Sequence[Iterable[str]]) -> Dict[str, List[str]]:
+    """
+    Zbiera unikalne adresy HTTP(S) linków wraz ze stronami, na których występują.
+
+    Args:
+        urls: Adresy stron
+        page_links: Wartości href z każdej strony (w kolejności urls)
+
+    Returns:
+        Słownik adres linku -> lista stron zawierających ten link
+    """
+    sources: Dict[str, List[str]] = {}
+    for url, links in zip(urls, page_links):
+        for target in {resolve_link(url, href) for href in links}:
+            if target is not None:
+                sources.setdefault(target, []).append(url)
+    return sources
+
+
+class LinkCheckReport:
+    """Wyniki sprawdzenia linków witryny."""
+
+    def __init__(self, results: Dict[str, LinkStatus], sources: Dict[str, List[str]], from_cache: int):
+        """
+        Args:
+            results: Słownik adres -> wynik sprawdzenia
+            sources: Słownik adres -> strony zawierające link
+            from_cache: Liczba wyników odczytanych z pamięci podręcznej
+        """
+        self.results = results
+        self.sources = sources
+        self.from_cache = from_cache
+
+    def status_counts(self) -> Counter:
+        """Liczba adresów według kodu odpowiedzi (None = błąd połączenia)."""
+        return Counter(result.status for result in self.results.values())
+
+    def broken_links(self) -> List[str]:
+        """Posortowana lista niedziałających adresów."""
+        return sorted(url for url, result in self.results.items() if result.is_broken)
+
+
+class LinkChecker(HostLimitedPool):
+    """Współbieżny sprawdzacz linków z trwałą pamięcią podręczną wyników."""
+
+    def __init__(self, cache_path: Optional[str] = None, max_workers: int = 16,
+                 per_host_limit: int = 4, timeout: int = 10, cache_ttl: int = 24 * 3600):
+        """
+        Args:
+            cache_path: Ścieżka do pliku SQLite z wynikami (None = bez pamięci podręcznej)
+            max_workers: Maksymalna liczba równoczesnych zapytań
+            per_host_limit: Maksymalna liczba równoczesnych zapytań do jednego hosta
+            timeout: Czas oczekiwania na odpowiedź w sekundach
+            cache_ttl: Czas ważności wyniku w pamięci podręcznej w sekundach
+        """
+        super().__init__(max_workers, per_host_limit, timeout)
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self._cache = UrlResultCache(cache_path, 'link_status', [('status', 'INTEGER NOT NULL')]) if cache_path else None
+
+    def check(self, sources: Dict[str, List[str]], progress_callback: Optional[Callable[[str], None]] = None) -> LinkCheckReport:
+        """
+        Sprawdza wszystkie adresy - każdy dokładnie raz.
+
+        Args:
+            sources: Słownik adres linku -> strony zawierające link (np. z collect_link_sources)
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+        Returns:
+            Raport z wynikami sprawdzenia
+        """
+        results = self._load_cached(list(sources))
+        from_cache = len(results)
+        pending = [url for url in sources if url not in results]
+        if progress_callback:
+            progress_callback(f"Sprawdzam {len(pending)} linków ({from_cache} z pamięci podręcznej)...")
+
+        checked = self.run(pending, self._check_url, progress_callback, "linków")
+        self._store_cached(checked)
+        results.update(checked)
+        return LinkCheckReport(results, sources, from_cache)
+
+    def _check_url(self, url: str) -> LinkStatus:
+        """Sprawdza jeden adres: HEAD, a w razie odmowy lub błędu - GET bez pobierania treści."""
+        session = self._session()
+        try:
+            response = session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code not in (403, 405, 501):
+                return LinkStatus(response.status_code)
+        except requests.RequestException:
+            pass
+        try:
+            with session.get(url, timeout=self.timeout, allow_redirects=True, stream=True) as response:
+                return LinkStatus(response.status_code)
+        except requests.RequestException as e:
+            return LinkStatus(None, str(e))
+
+    def _load_cached(self, urls: List[str]) -> Dict[str, LinkStatus]:
+        """Odczytuje aktualne (nieprzeterminowane) wyniki z pamięci podręcznej."""
+        if self._cache is None:
+            return {}
+        return {url: LinkStatus(*values) for url, values in self._cache.load(urls, self.cache_ttl).items()}
+
+    def _store_cached(self, results: Dict[str, LinkStatus]):
+        """Zapisuje wyniki z kodem HTTP - błędy połączenia są sprawdzane ponownie przy kolejnym uruchomieniu."""
+        if self._cache is not None:
+            self._cache.store((url, (result.status,)) for url, result in results.items() if result.status is not None)
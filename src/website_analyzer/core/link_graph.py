@@ -0,0 +1,145 @@
+"""
+Graf linków wewnętrznych witryny.
+
+Węzłami są pobrane strony, krawędziami - linki między nimi (po rozwiązaniu
+adresów względnych). Graf jest przechowywany w formacie CSR (tablice NumPy
+indptr / indices), a PageRank, stopnie wierzchołków i głębokość kliknięć
+są liczone operacjami wektorowymi.
+"""
+
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .url_resolver import default_resolver
+
+
+def normalize_url(url: str) -> str:
+    """Sprowadza adres do postaci używanej przez crawler (bez fragmentu, pusta ścieżka = '/')."""
+    return default_resolver.normalize(url)
+
+
+def resolve_link(page_url: str, href: str) -> Optional[str]:
+    """Rozwiązuje link względem adresu strony; None dla linków niebędących stronami."""
+    return default_resolver.resolve_link(page_url, href)
+
+
+class LinkGraph:
+    """Skierowany graf linków między pobranymi stronami w formacie CSR."""
+
+    DAMPING = 0.85
+    MAX_ITERATIONS = 100
+    TOLERANCE = 1e-10
+
+    def __init__(self, urls: List[str], indptr: np.ndarray, indices: np.ndarray):
+        """
+        Args:
+            urls: Adresy stron (numer węzła = pozycja na liście, węzeł 0 = strona startowa)
+            indptr: Początki list sąsiedztwa węzłów (długość = liczba stron + 1)
+            indices: Numery węzłów docelowych kolejnych krawędzi
+        """
+        self.urls = urls
+        self.indptr = indptr
+        self.indices = indices
+        self.out_degree = np.diff(indptr)
+        self.in_degree = np.bincount(indices, minlength=len(urls))
+        self.pagerank = self._compute_pagerank()
+        self.depth = self._compute_depth(0)
+
+    @classmethod
+    def build(cls, urls: Sequence[str], page_links: Sequence[Iterable[str]]) -> 'LinkGraph':
+        """
+        Buduje graf z linków znalezionych na stronach.
+
+        Args:
+            urls: Adresy pobranych stron (pierwszy = strona startowa)
+            page_links: Wartości href z każdej strony (w kolejności urls)
+
+        Returns:
+            Graf zawierający tylko krawędzie między pobranymi stronami
+        """
+        node_ids: Dict[str, int] = {}
+        for node, url in enumerate(urls):
+            node_ids.setdefault(normalize_url(url), node)
+
+        indptr = np.zeros(len(urls) + 1, dtype=np.int64)
+        targets_parts = []
+        for node, (url, links) in enumerate(zip(urls, page_links)):
+            targets = set()
+            for href in links:
+                target = node_ids.get(resolve_link(url, href))
+                if target is not None and target != node:
+                    targets.add(target)
+            targets_parts.append(np.array(sorted(targets), dtype=np.int32))
+            indptr[node + 1] = indptr[node] + len(targets)
+
+        indices = np.concatenate(targets_parts) if targets_parts else np.zeros(0, dtype=np.int32)
+        return cls(list(urls), indptr, indices)
+
+    @property
+    def node_count(self) -> int:
+        """Liczba stron w grafie."""
+        return len(self.urls)
+
+    @property
+    def edge_count(self) -> int:
+        """Liczba linków między stronami."""
+        return len(self.indices)
+
+    def _compute_pagerank(self) -> np.ndarray:
+        """PageRank metodą potęgową; masa stron bez linków jest rozdzielana równo."""
+        node_count = self.node_count
+        if not node_count:
+            return np.zeros(0)
+        sources = np.repeat(np.arange(node_count), self.out_degree)
+        dangling = self.out_degree == 0
+        out_degree = np.maximum(self.out_degree, 1)
+
+        rank = np.full(node_count, 1.0 / node_count)
+        for _ in range(self.MAX_ITERATIONS):
+            spread = np.bincount(self.indices, weights=(rank / out_degree)[sources], minlength=node_count)
+            new_rank = (1 - self.DAMPING) / node_count + self.DAMPING * (spread + rank[dangling].sum() / node_count)
+            converged = np.abs(new_rank - rank).sum() < self.TOLERANCE
+            rank = new_rank
+            if converged:
+                break
+        return rank
+
+    def _compute_depth(self, start: int) -> np.ndarray:
+        """Liczba kliknięć od strony startowej (BFS po całych poziomach; -1 = nieosiągalna)."""
+        depth = np.full(self.node_count, -1, dtype=np.int64)
+        if not self.node_count:
+            return depth
+        depth[start] = 0
+        frontier = np.array([start])
+        level = 0
+        while len(frontier):
+            level += 1
+            # Zbierz sąsiadów wszystkich węzłów poziomu naraz
+            starts = self.indptr[frontier]
+            lengths = self.indptr[frontier + 1] - starts
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            neighbours = np.unique(self.indices[np.repeat(starts, lengths) + offsets])
+            frontier = neighbours[depth[neighbours] < 0]
+            depth[frontier] = level
+        return depth
+
+    def top_pages(self, n: int = 20) -> List[Tuple[str, float]]:
+        """Zwraca n stron o najwyższym PageRank."""
+        order = np.lexsort((np.arange(self.node_count), -self.pagerank))[:n]
+        return [(self.urls[node], float(self.pagerank[node])) for node in order]
+
+    def orphan_pages(self) -> List[str]:
+        """Strony, do których nie prowadzi żaden link z innych stron (poza stroną startową)."""
+        return [self.urls[node] for node in np.flatnonzero(self.in_degree == 0) if node != 0]
+
+    def dead_end_pages(self) -> List[str]:
+        """Strony bez linków do innych pobranych stron."""
+        return [self.urls[node] for node in np.flatnonzero(self.out_degree == 0)]
+
+    def unreachable_pages(self) -> List[str]:
+        """Strony nieosiągalne ze strony startowej przez linki między pobranymi stronami."""
+        return [self.urls[node] for node in np.flatnonzero(self.depth < 0)]
+
+    def depth_distribution(self) -> Dict[int, int]:
+        """Liczba stron na każdym poziomie głębokości (-1 = nieosiągalne)."""
+        levels, counts = np.unique(self.depth, return_counts=True)
+        return {int(level): int(count) for level, count in zip(levels, counts)}
@@ -0,0 +1,158 @@
+"""
+Wykrywanie stron prawie identycznych (MinHash + LSH).
+
+Tekst każdej strony jest dzielony na nakładające się n-gramy słów
+(shingle), a z ich skrótów powstaje sygnatura MinHash - stała liczba
+minimów, której zgodność przybliża podobieństwo Jaccarda stron. Sygnatury
+są dzielone na pasma (LSH): strony o identycznym paśmie trafiają do jednego
+kubełka i tylko takie pary są porównywane, więc czas działania rośnie
+w przybliżeniu liniowo z liczbą stron zamiast kwadratowo.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+import zlib
+
+import numpy as np
+
+# Liczba pierwsza większa od 2^32 - iloczyny a * x mieszczą się w uint64
+HASH_PRIME = 4294967311
+MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+@lru_cache(maxsize=8)
+def _permutations(num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Współczynniki funkcji (a * x + b) mod p - stałe, aby sygnatury były porównywalne między uruchomieniami."""
+    generator = np.random.RandomState(1)
+    a = generator.randint(1, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+    b = generator.randint(0, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(tokens: Sequence[str], num_perm: int = 128, shingle_size: int = 5) -> Optional[np.ndarray]:
+    """
+    Liczy sygnaturę MinHash tekstu strony.
+
+    Args:
+        tokens: Słowa strony w kolejności występowania
+        num_perm: Długość sygnatury (liczba funkcji skrótu)
+        shingle_size: Liczba kolejnych słów w jednym n-gramie
+
+    Returns:
+        Tablica uint32 długości num_perm albo None dla strony bez tekstu
+    """
+    if not tokens:
+        return None
+    count = max(1, len(tokens) - shingle_size + 1)
+    # crc32 zamiast hash() - wynik nie zależy od procesu (PYTHONHASHSEED)
+    shingles = {zlib.crc32(' '.join(tokens[i:i + shingle_size]).encode('utf-8')) for i in range(count)}
+    hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+    a, b = _permutations(num_perm)
+    permuted = (np.outer(hashes, a) + b) % np.uint64(HASH_PRIME) & MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def lsh_parameters(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Dobiera liczbę pasm i wierszy w paśmie dla progu podobieństwa.
+
+    Wybierana jest para (pasma b, wiersze r) o największym progu krzywej LSH
+    (1/b)^(1/r) nieprzekraczającym zadanego progu - pary tuż powyżej progu
+    są wtedy wykrywane z dużym prawdopodobieństwem, a fałszywe kandydatki
+    odrzuca porównanie sygnatur.
+    """
+    candidates = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    curve = lambda bands_rows: (1 / bands_rows[0]) ** (1 / bands_rows[1])
+    below = [candidate for candidate in candidates if curve(candidate) <= threshold]
+    return max(below, key=curve) if below else min(candidates, key=curve)
+
+
+class NearDuplicateClusters:
+    """Grupy stron prawie identycznych."""
+
+    def __init__(self, clusters: List[List[str]], similarity: Dict[str, float], threshold: float,
+                 bands: int, rows: int, page_count: int):
+        """
+        Args:
+            clusters: Grupy adresów (pierwszy adres grupy = strona reprezentatywna)
+            similarity: Przybliżone podobieństwo Jaccarda strony do reprezentanta grupy
+            threshold: Minimalne podobieństwo stron w grupie
+            bands: Liczba pasm LSH
+            rows: Liczba wierszy sygnatury w paśmie
+            page_count: Liczba porównywanych stron
+        """
+        self.clusters = clusters
+        self.similarity = similarity
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.page_count = page_count
+
+    @classmethod
+    def build(cls, urls: Sequence[str], signatures: Sequence[Optional[np.ndarray]],
+              threshold: float = 0.8) -> 'NearDuplicateClusters':
+        """
+        Grupuje strony o podobieństwie sygnatur co najmniej threshold.
+
+        Args:
+            urls: Adresy stron (kolejność pobrania - wcześniejsza strona zostaje reprezentantem)
+            signatures: Sygnatury MinHash stron (None = strona bez tekstu, pomijana)
+            threshold: Minimalne przybliżone podobieństwo Jaccarda
+
+        Returns:
+            Grupy zawierające co najmniej dwie strony
+        """
+        nodes = [node for node, signature in enumerate(signatures) if signature is not None]
+        num_perm = len(signatures[nodes[0]]) if nodes else 1
+        bands, rows = lsh_parameters(num_perm, threshold)
+        if len(nodes) < 2:
+            return cls([], {}, threshold, bands, rows, len(nodes))
+        matrix = np.vstack([signatures[node] for node in nodes])
+
+        parent = list(range(len(nodes)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def similarity(i: int, j: int) -> float:
+            return float(np.count_nonzero(matrix[i] == matrix[j])) / num_perm
+
+        for band in range(bands):
+            # Pasmo jako jedna wartość bajtowa - grupowanie kubełków sortowaniem zamiast słownika
+            keys = np.ascontiguousarray(matrix[:, band * rows:(band + 1) * rows]).view(f'V{4 * rows}').ravel()
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            ends = np.r_[starts[1:], len(order)]
+            for start, end in zip(starts, ends):
+                if end - start < 2:
+                    continue
+                # Porównanie z pierwszym elementem kubełka - liniowo, nie każdej pary
+                first = order[start]
+                for member in order[start + 1:end]:
+                    root_first, root_member = find(first), find(member)
+                    if root_first != root_member and similarity(first, member) >= threshold:
+                        parent[max(root_first, root_member)] = min(root_first, root_member)
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(nodes)):
+            groups.setdefault(find(i), []).append(i)
+        clusters = []
+        similarities = {}
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            representative = members[0]
+            clusters.append([urls[nodes[i]] for i in members])
+            for i in members:
+                similarities[urls[nodes[i]]] = similarity(representative, i)
+        clusters.sort(key=lambda cluster: (-len(cluster), cluster[0]))
+        return cls(clusters, similarities, threshold, bands, rows, len(nodes))
+
+    @property
+    def duplicate_count(self) -> int:
+        """Liczba stron, które są prawie kopiami reprezentanta swojej grupy."""
+        return sum(len(cluster) - 1 for cluster in self.clusters)
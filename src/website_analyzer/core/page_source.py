@@ -0,0 +1,295 @@
+"""
+Leniwe źródła stron - dostęp do zapisanej witryny bez wczytywania jej w całości.
+
+Źródło zachowuje się jak słownik adres -> dane strony, ale treść strony jest
+odczytywana z dysku dopiero przy dostępie. Metoda iter_pages odczytuje strony
+w kolejności z ograniczonym wyprzedzeniem w puli wątków, więc w pamięci jest
+jednocześnie najwyżej kilkadziesiąt stron niezależnie od rozmiaru witryny.
+
+Strony można filtrować po metadanych (kod HTTP, rozmiar, typ treści,
+głębokość) bez odczytu ich treści - select_pages działa dla słowników
+i leniwych źródeł, a źródła z własnym indeksem (PageStore) wykonują
+filtr zapytaniem do bazy.
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import threading
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .analysis_cache import content_hash
+from .url_resolver import default_resolver
+
+# Liczba wierszy komentarzy (URL, Status, Size) na początku zapisanego pliku strony
+PAGE_HEADER_LINES = 3
+
+
+def page_content_type(page_info: Dict) -> str:
+    """Typ MIME strony z nagłówka Content-Type, bez parametrów (np. 'text/html')."""
+    for name, value in page_info.get('headers', {}).items():
+        if name.lower() == 'content-type':
+            return value.split(';')[0].strip().lower()
+    return ''
+
+
+def page_depth(page_info: Dict) -> int:
+    """Głębokość strony - z pobierania, a gdy jej brak, liczba segmentów ścieżki adresu."""
+    if page_info.get('depth') is not None:
+        return page_info['depth']
+    return len([segment for segment in default_resolver.split(page_info['url']).path.split('/') if segment])
+
+
+def page_matches(page_info: Dict, status_code: Optional[int] = None, min_status: Optional[int] = None,
+                 min_size: Optional[int] = None, max_size: Optional[int] = None,
+                 content_type: Optional[str] = None, depth: Optional[int] = None) -> bool:
+    """Czy metadane strony spełniają wszystkie podane warunki (None = bez warunku)."""
+    return ((status_code is None or page_info['status_code'] == status_code)
+            and (min_status is None or page_info['status_code'] >= min_status)
+            and (min_size is None or page_info['size'] >= min_size)
+            and (max_size is None or page_info['size'] <= max_size)
+            and (content_type is None or page_content_type(page_info).startswith(content_type.lower()))
+            and (depth is None or page_depth(page_info) == depth))
+
+
+def select_pages(downloaded_pages: Mapping[str, Dict], **filters) -> List[str]:
+    """
+    Zwraca adresy stron spełniających warunki, bez odczytu treści stron.
+
+    Args:
+        downloaded_pages: Słownik lub leniwe źródło z danymi stron
+        **filters: Warunki jak w page_matches (status_code, min_status, min_size,
+            max_size, content_type, depth)
+
+    Returns:
+        Adresy w kolejności stron
+    """
+    if isinstance(downloaded_pages, PageSource):
+        return downloaded_pages.select(**filters)
+    return [url for url, page_data in downloaded_pages.items() if page_matches(page_data, **filters)]
+
+
+def content_hashes(downloaded_pages: Mapping[str, Dict]) -> Dict[str, str]:
+    """
+    Zwraca skróty treści stron.
+
+    Źródła przechowujące skróty (migawki magazynu treści) zwracają je bez
+    odczytu treści; dla słownika skróty są liczone z treści stron.
+
+    Returns:
+        Słownik adres -> skrót treści w kolejności stron
+    """
+    if isinstance(downloaded_pages, PageSource):
+        return downloaded_pages.content_hashes()
+    return {url: content_hash(page_data['content']) for url, page_data in downloaded_pages.items()}
+
+
+class SharedFile:
+    """
+    Plik odczytywany fragmentami z wielu wątków przez jeden uchwyt.
+
+    Ustawienie położenia i odczyt są wykonywane pod blokadą, więc wątki nie
+    dzielą pozycji pliku, a liczba otwartych uchwytów nie rośnie z liczbą
+    wątków i kolejnych przebiegów odczytu. Rozpakowywanie odbywa się poza
+    blokadą, równolegle.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Odczytuje length bajtów od położenia offset (plik otwierany przy pierwszym odczycie)."""
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'rb')
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def close(self):
+        """Zamyka uchwyt pliku - kolejny odczyt otworzy go ponownie."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class PageSource(Mapping):
+    """
+    Bazowe leniwe źródło stron.
+
+    Podklasy dostarczają listę adresów, metadane strony (bez treści) oraz
+    odczyt treści pojedynczej strony.
+    """
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.urls())
+
+    def __len__(self) -> int:
+        return len(self.urls())
+
+    def __getitem__(self, url: str) -> Dict:
+        page = dict(self.page_info(url))
+        page['content'] = self.read_content(url)
+        return page
+
+    def urls(self) -> List[str]:
+        """Adresy stron w kolejności zapisu."""
+        raise NotImplementedError
+
+    def page_info(self, url: str) -> Dict:
+        """Metadane strony (url, status_code, size, headers) bez treści."""
+        raise NotImplementedError
+
+    def read_content(self, url: str) -> str:
+        """Odczytuje treść strony."""
+        raise NotImplementedError
+
+    def close(self):
+        """Zwalnia zasoby źródła (otwarte pliki)."""
+
+    def content_hashes(self) -> Dict[str, str]:
+        """
+        Słownik adres -> skrót treści strony.
+
+        Źródła, które przechowują skróty (migawki magazynu treści), zwracają je
+        bez odczytu treści; domyślnie skróty są liczone z odczytanych stron.
+        """
+        return {url: content_hash(page['content']) for url, page in self.iter_pages()}
+
+    def page_keys(self) -> Dict[str, str]:
+        """Zapisane klucze wyników analizy stron (adres -> page_key) - puste, gdy źródło ich nie przechowuje."""
+        return {}
+
+    def select(self, **filters) -> List[str]:
+        """Adresy stron spełniających warunki (jak w page_matches) - sprawdzane są tylko metadane."""
+        return [url for url in self.urls() if page_matches(self.page_info(url), **filters)]
+
+    def subset(self, urls: Iterable[str]) -> 'PageSubset':
+        """Leniwe źródło ograniczone do wskazanych stron (np. wyniku select) - do analizy części witryny."""
+        return PageSubset(self, urls)
+
+    def iter_pages(self, urls: Optional[Iterable[str]] = None, prefetch: int = 32,
+                   read_workers: int = 4) -> Iterator[Tuple[str, Dict]]:
+        """
+        Zwraca kolejno pary (adres, dane strony) odczytywane z wyprzedzeniem.
+
+        Args:
+            urls: Adresy do odczytu (None = wszystkie strony w kolejności zapisu)
+            prefetch: Maksymalna liczba stron odczytanych, a jeszcze nie zwróconych
+            read_workers: Liczba wątków odczytujących pliki równolegle
+
+        Yields:
+            Pary (adres, dane strony) w kolejności urls
+        """
+        pending = iter(self.urls() if urls is None else urls)
+        with ThreadPoolExecutor(max_workers=max(1, read_workers)) as executor:
+            window: Deque = deque()
+            for url in pending:
+                window.append((url, executor.submit(self.__getitem__, url)))
+                if len(window) >= max(1, prefetch):
+                    break
+            while window:
+                url, future = window.popleft()
+                page = future.result()
+                next_url = next(pending, None)
+                if next_url is not None:
+                    window.append((next_url, executor.submit(self.__getitem__, next_url)))
+                yield url, page
+
+
+class PageSubset(PageSource):
+    """Wybrane strony innego źródła - treść odczytywana z niego przy dostępie."""
+
+    def __init__(self, source: PageSource, urls: Iterable[str]):
+        """
+        Args:
+            source: Źródło wszystkich stron
+            urls: Adresy stron należących do podzbioru
+        """
+        self.source = source
+        self._urls = [url for url in urls if url in source]
+        self._members = set(self._urls)
+
+    def urls(self) -> List[str]:
+        return list(self._urls)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._members
+
+    def page_info(self, url: str) -> Dict:
+        if url not in self._members:
+            raise KeyError(url)
+        return self.source.page_info(url)
+
+    def read_content(self, url: str) -> str:
+        return self.source.read_content(url)
+
+
+class FolderSnapshot(PageSource):
+    """Witryna zapisana w katalogu (page_NNN.html + metadata.json) odczytywana leniwie."""
+
+    def __init__(self, folder_path: str, encoding: str = 'utf-8'):
+        """
+        Wczytuje metadane zapisanej witryny - treść stron pozostaje na dysku.
+
+        Args:
+            folder_path: Katalog zawierający zapisane dane strony
+            encoding: Kodowanie plików stron
+
+        Raises:
+            FileNotFoundError: Gdy w katalogu brakuje pliku metadanych
+        """
+        self.folder_path = folder_path
+        self.encoding = encoding
+        metadata_path = os.path.join(folder_path, "metadata.json")
+        if not os.path.exists(metadata_path):
+            raise FileNotFoundError(f"Brak pliku metadanych: {metadata_path}")
+
+        with open(metadata_path, 'r', encoding=encoding) as f:
+            metadata = json.load(f)
+
+        # Jedno listowanie katalogu zamiast sprawdzania istnienia każdego pliku
+        existing = set(os.listdir(folder_path))
+        self._files: Dict[str, str] = {}
+        self._info: Dict[str, Dict] = {}
+        for filename, page_info in metadata['pages'].items():
+            if filename in existing:
+                url = page_info['url']
+                self._files[url] = filename
+                self._info[url] = {
+                    'status_code': page_info['status_code'],
+                    'headers': page_info['headers'],
+                    'url': url,
+                    'size': page_info['size']
+                }
+
+    def urls(self) -> List[str]:
+        return list(self._files)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._files
+
+    def page_info(self, url: str) -> Dict:
+        return self._info[url]
+
+    def read_content(self, url: str) -> str:
+        filepath = os.path.join(self.folder_path, self._files[url])
+        # Wiersze nagłówka są pomijane przed dekodowaniem - treść jest kopiowana tylko raz
+        with open(filepath, 'rb') as f:
+            for _ in range(PAGE_HEADER_LINES):
+                f.readline()
+            content = f.read().decode(self.encoding)
+        if '\r' in content:
+            # Jak przy odczycie w trybie tekstowym (pliki zapisane w systemie Windows)
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
@@ -0,0 +1,300 @@
+"""
+Magazyn stron w bazie SQLite z indeksowanymi zapytaniami.
+
+Strony, ich nagłówki, linki i zasoby trafiają do osobnych tabel
+z indeksami, a treść strony jest zapisywana jako skompresowany blob.
+Zapytania o metadane (np. wszystkie strony 404, strony powyżej 1 MB, strony
+linkujące do adresu) są wykonywane przez bazę - bez wczytywania witryny,
+a treść strony jest rozpakowywana dopiero przy dostępie.
+"""
+
+from contextlib import contextmanager
+import os
+import pathlib
+import sqlite3
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+import zlib
+
+from .analysis_partial import extract_content
+from .page_source import PageSource, page_content_type, page_depth
+
+# Kategorie adresów zapisywane jako zasoby strony (linki mają osobną tabelę)
+ASSET_TABLE_CATEGORIES = ('images', 'videos', 'audio', 'css', 'js', 'documents')
+STORE_EXTENSION = '.sqlite'
+SQLITE_MAGIC = b'SQLite format 3\x00'
+# Kolumny, po których rozpoznawany jest magazyn stron
+STORE_COLUMNS = {
+    'pages': {'page_id', 'url', 'status_code', 'size', 'content_type', 'depth', 'body'},
+    'headers': {'page_id', 'position', 'name', 'value'},
+    'links': {'page_id', 'target'},
+    'assets': {'page_id', 'category', 'url'},
+}
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS pages ("
+    " page_id INTEGER PRIMARY KEY,"
+    " url TEXT NOT NULL UNIQUE,"
+    " status_code INTEGER NOT NULL,"
+    " size INTEGER NOT NULL,"
+    " content_type TEXT NOT NULL,"
+    " depth INTEGER NOT NULL,"
+    " body BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS pages_status ON pages (status_code)",
+    "CREATE INDEX IF NOT EXISTS pages_size ON pages (size)",
+    "CREATE INDEX IF NOT EXISTS pages_content_type ON pages (content_type)",
+    "CREATE INDEX IF NOT EXISTS pages_depth ON pages (depth)",
+    "CREATE TABLE IF NOT EXISTS headers ("
+    " page_id INTEGER NOT NULL REFERENCES pages (page_id) ON DELETE CASCADE,"
+    " position INTEGER NOT NULL,"
+    " name TEXT NOT NULL,"
+    " value TEXT NOT NULL,"
+    " PRIMARY KEY (page_id, position))",
+    "CREATE TABLE IF NOT EXISTS links ("
+    " page_id INTEGER NOT NULL REFERENCES pages (page_id) ON DELETE CASCADE,"
+    " target TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS links_page ON links (page_id)",
+    "CREATE INDEX IF NOT EXISTS links_target ON links (target)",
+    "CREATE TABLE IF NOT EXISTS assets ("
+    " page_id INTEGER NOT NULL REFERENCES pages (page_id) ON DELETE CASCADE,"
+    " category TEXT NOT NULL,"
+    " url TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS assets_page ON assets (page_id)",
+    "CREATE INDEX IF NOT EXISTS assets_url ON assets (url)",
+)
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> Set[str]:
+    """Nazwy kolumn tabeli (pusty zbiór, gdy tabeli nie ma)."""
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def is_page_store(path: str) -> bool:
+    """
+    Czy plik jest magazynem stron - bazą SQLite z tabelami stron.
+
+    Baza jest otwierana tylko do odczytu, więc sprawdzenie innego pliku
+    SQLite (np. pamięci podręcznej analizy lub kasety HTTP) go nie zmienia.
+    """
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        if f.read(len(SQLITE_MAGIC)) != SQLITE_MAGIC:
+            return False
+    try:
+        conn = sqlite3.connect(f"{pathlib.Path(os.path.abspath(path)).as_uri()}?mode=ro", uri=True)
+        try:
+            return all(columns <= _table_columns(conn, table) for table, columns in STORE_COLUMNS.items())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+
+
+class PageStore(PageSource):
+    """Strony witryny w bazie SQLite - leniwe źródło stron z zapytaniami po metadanych."""
+
+    def __init__(self, db_path: str, min_word_length: int = 3):
+        """
+        Otwiera (lub tworzy) magazyn stron.
+
+        Args:
+            db_path: Ścieżka do pliku bazy SQLite
+            min_word_length: Minimalna długość słowa przy ekstrakcji adresów ze stron
+
+        Raises:
+            ValueError: Gdy plik istnieje, ale nie jest magazynem stron (np. inna baza SQLite)
+        """
+        self.db_path = db_path
+        self.min_word_length = min_word_length
+        self.synchronous = 'FULL'  # 'FULL' = fsync przy każdej transakcji, 'OFF' = utrwalanie przez system
+        if os.path.exists(db_path) and os.path.getsize(db_path) > 0:
+            # Istniejący plik - schemat nie jest tworzony, aby nie zmienić innej bazy
+            if not is_page_store(db_path):
+                raise ValueError(f"Plik nie jest magazynem stron: {db_path}")
+            return
+        folder = os.path.dirname(db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with self._connect() as conn:
+            # Dziennik WAL - odczyt stron nie czeka na trwający zapis w tle
+            conn.execute("PRAGMA journal_mode = WAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Otwiera połączenie na czas jednej transakcji - odczyty stron działają w osobnych wątkach."""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add_pages(self, downloaded_pages: Mapping[str, Dict], batch_size: int = 200,
+                  progress_callback: Optional[Callable[[str], None]] = None) -> int:
+        """
+        Zapisuje strony - każda porcja w jednej transakcji.
+
+        Strona o istniejącym adresie jest zastępowana (zachowuje swoje miejsce
+        w kolejności stron).
+
+        Args:
+            downloaded_pages: Słownik lub leniwe źródło z danymi stron
+            batch_size: Liczba stron zapisywanych w jednej transakcji
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+        Returns:
+            Liczba zapisanych stron
+        """
+        if isinstance(downloaded_pages, PageSource):
+            pages = downloaded_pages.iter_pages()
+        else:
+            pages = iter(downloaded_pages.items())
+        total = len(downloaded_pages)
+        saved = 0
+        batch: List[Tuple[str, Dict]] = []
+        for url, page_data in pages:
+            batch.append((url, page_data))
+            if len(batch) >= batch_size:
+                saved += self._write_batch(batch)
+                batch = []
+                if progress_callback:
+                    progress_callback(f"Zapisano w bazie {saved}/{total} stron")
+        if batch:
+            saved += self._write_batch(batch)
+            if progress_callback:
+                progress_callback(f"Zapisano w bazie {saved}/{total} stron")
+        return saved
+
+    def _write_batch(self, batch: List[Tuple[str, Dict]]) -> int:
+        """Zapisuje porcję stron w jednej transakcji."""
+        rows = []
+        for url, page_data in batch:
+            found = extract_content(page_data['content'], self.min_word_length, url).urls
+            rows.append((url, page_data, zlib.compress(page_data['content'].encode('utf-8')), found))
+
+        with self._connect() as conn:
+            for url, page_data, body, found in rows:
+                values = (page_data['status_code'], page_data['size'], page_content_type(page_data),
+                          page_depth(page_data), body)
+                existing = conn.execute("SELECT page_id FROM pages WHERE url = ?", (url,)).fetchone()
+                if existing:
+                    page_id = existing[0]
+                    conn.execute(
+                        "UPDATE pages SET status_code = ?, size = ?, content_type = ?, depth = ?, body = ?"
+                        " WHERE page_id = ?", values + (page_id,)
+                    )
+                    for table in ('headers', 'links', 'assets'):
+                        conn.execute(f"DELETE FROM {table} WHERE page_id = ?", (page_id,))
+                else:
+                    page_id = conn.execute(
+                        "INSERT INTO pages (url, status_code, size, content_type, depth, body)"
+                        " VALUES (?, ?, ?, ?, ?, ?)", (url,) + values
+                    ).lastrowid
+                conn.executemany(
+                    "INSERT INTO headers (page_id, position, name, value) VALUES (?, ?, ?, ?)",
+                    ((page_id, i, name, str(value)) for i, (name, value) in enumerate(page_data['headers'].items()))
+                )
+                conn.executemany("INSERT INTO links (page_id, target) VALUES (?, ?)",
+                                 ((page_id, target) for target in sorted(found['links'])))
+                conn.executemany(
+                    "INSERT INTO assets (page_id, category, url) VALUES (?, ?, ?)",
+                    ((page_id, category, asset) for category in ASSET_TABLE_CATEGORIES
+                     for asset in sorted(found[category]))
+                )
+        return len(rows)
+
+    def remove_pages(self, urls: List[str]) -> int:
+        """
+        Usuwa strony wraz z ich nagłówkami, linkami i zasobami.
+
+        Returns:
+            Liczba usuniętych stron
+        """
+        with self._connect() as conn:
+            return sum(conn.execute("DELETE FROM pages WHERE url = ?", (url,)).rowcount for url in urls)
+
+    def urls(self) -> List[str]:
+        with self._connect() as conn:
+            return [url for url, in conn.execute("SELECT url FROM pages ORDER BY page_id")]
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def __contains__(self, url: object) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM pages WHERE url = ?", (url,)).fetchone() is not None
+
+    def __getitem__(self, url: str) -> Dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT page_id, status_code, size, depth, body FROM pages WHERE url = ?",
+                               (url,)).fetchone()
+            if row is None:
+                raise KeyError(url)
+            page = self._page_info(conn, url, row)
+        page['content'] = zlib.decompress(row[4]).decode('utf-8')
+        return page
+
+    def page_info(self, url: str) -> Dict:
+        with self._connect() as conn:
+            row = conn.execute("SELECT page_id, status_code, size, depth FROM pages WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                raise KeyError(url)
+            return self._page_info(conn, url, row)
+
+    def _page_info(self, conn: sqlite3.Connection, url: str, row: Tuple) -> Dict:
+        """Składa metadane strony z wiersza tabeli pages i jej nagłówków."""
+        page_id, status_code, size, depth = row[:4]
+        headers = dict(conn.execute("SELECT name, value FROM headers WHERE page_id = ? ORDER BY position", (page_id,)))
+        return {'status_code': status_code, 'headers': headers, 'url': url, 'size': size, 'depth': depth}
+
+    def read_content(self, url: str) -> str:
+        with self._connect() as conn:
+            row = conn.execute("SELECT body FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            raise KeyError(url)
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def select(self, status_code: Optional[int] = None, min_status: Optional[int] = None,
+               min_size: Optional[int] = None, max_size: Optional[int] = None,
+               content_type: Optional[str] = None, depth: Optional[int] = None) -> List[str]:
+        """Adresy stron spełniających warunki - zapytanie korzysta z indeksów tabeli pages."""
+        conditions = []
+        params: List = []
+        for condition, value in (("status_code = ?", status_code), ("status_code >= ?", min_status),
+                                 ("size >= ?", min_size), ("size <= ?", max_size), ("depth = ?", depth)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        if content_type is not None:
+            # Zakres zamiast LIKE - dopasowanie prefiksu korzysta z indeksu
+            conditions.append("content_type >= ? AND content_type < ?")
+            params.extend([content_type.lower(), content_type.lower() + '\uffff'])
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        with self._connect() as conn:
+            return [url for url, in conn.execute(f"SELECT url FROM pages{where} ORDER BY page_id", params)]
+
+    def links_to(self, target: str) -> List[str]:
+        """Adresy stron zawierających link do podanego adresu."""
+        with self._connect() as conn:
+            return [url for url, in conn.execute(
+                "SELECT DISTINCT pages.url FROM links JOIN pages USING (page_id)"
+                " WHERE links.target = ? ORDER BY pages.page_id", (target,)
+            )]
+
+    def pages_using_asset(self, asset_url: str) -> List[str]:
+        """Adresy stron odwołujących się do zasobu (obrazu, skryptu, arkusza stylów, ...)."""
+        with self._connect() as conn:
+            return [url for url, in conn.execute(
+                "SELECT DISTINCT pages.url FROM assets JOIN pages USING (page_id)"
+                " WHERE assets.url = ? ORDER BY pages.page_id", (asset_url,)
+            )]
+
+    def status_counts(self) -> Dict[int, int]:
+        """Liczba stron z każdym kodem HTTP."""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status_code, COUNT(*) FROM pages GROUP BY status_code ORDER BY status_code"))
@@ -0,0 +1,204 @@
+"""
+Profil wagi stron: HTML oraz wszystkie zasoby, do których strona się odwołuje.
+
+Każdy unikalny zasób (obraz, CSS, JS, video, audio) jest sprawdzany tylko raz
+- zapytaniem HEAD, a gdy serwer nie podaje rozmiaru, zapytaniem GET z
+nagłówkiem 'Range: bytes=0-0' (rozmiar z Content-Range). Treść zasobów nie
+jest pobierana. Wyniki trafiają do trwałej pamięci podręcznej z czasem
+ważności.
+"""
+
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import requests
+
+from .http_pool import HostLimitedPool, total_size
+from .url_cache import UrlResultCache
+from .url_resolver import default_resolver
+
+# Kategorie adresów pobieranych razem ze stroną
+ASSET_CATEGORIES = ('images', 'css', 'js', 'videos', 'audio')
+
+
+class AssetInfo(NamedTuple):
+    """Rozmiar i typ jednego zasobu."""
+    size: Optional[int]  # bajty (None = serwer nie podał rozmiaru lub błąd)
+    content_type: str = ''
+
+
+def collect_page_assets(urls: Sequence[str], page_urls: Sequence[Mapping[str, Set[str]]]) -> Dict[str, List[str]]:
+    """
+    Zbiera adresy HTTP(S) zasobów każdej strony.
+
+    Args:
+        urls: Adresy stron
+        page_urls: Adresy znalezione na stronach według kategorii (w kolejności urls)
+
+    Returns:
+        Słownik adres strony -> posortowana lista adresów jej zasobów
+    """
+    assets: Dict[str, List[str]] = {}
+    for url, categories in zip(urls, page_urls):
+        found = set()
+        for category in ASSET_CATEGORIES:
+            for asset in categories[category]:
+                if default_resolver.split(asset).scheme in ('http', 'https'):
+                    found.add(asset)
+        assets[url] = sorted(found)
+    return assets
+
+
+class PageWeightReport:
+    """Waga stron i zasobów witryny."""
+
+    def __init__(self, html_sizes: Dict[str, int], page_assets: Dict[str, List[str]],
+                 assets: Dict[str, AssetInfo], from_cache: int):
+        """
+        Args:
+            html_sizes: Słownik adres strony -> rozmiar HTML w bajtach
+            page_assets: Słownik adres strony -> adresy jej zasobów
+            assets: Słownik adres zasobu -> rozmiar i typ
+            from_cache: Liczba zasobów odczytanych z pamięci podręcznej
+        """
+        self.html_sizes = html_sizes
+        self.page_assets = page_assets
+        self.assets = assets
+        self.from_cache = from_cache
+        self.page_weights = {url: size + self.asset_bytes(url) for url, size in html_sizes.items()}
+
+    def asset_bytes(self, url: str) -> int:
+        """Łączny znany rozmiar zasobów strony (każdy zasób liczony raz)."""
+        return sum(self.assets[asset].size or 0 for asset in self.page_assets.get(url, []) if asset in self.assets)
+
+    @property
+    def site_bytes(self) -> int:
+        """Rozmiar całej witryny: HTML wszystkich stron i każdy unikalny zasób raz."""
+        return sum(self.html_sizes.values()) + sum(info.size or 0 for info in self.assets.values())
+
+    def unknown_assets(self) -> List[str]:
+        """Zasoby, których rozmiaru nie udało się ustalić."""
+        return sorted(url for url, info in self.assets.items() if info.size is None)
+
+    def heaviest_pages(self, n: int = 20) -> List[Tuple[str, int]]:
+        """Zwraca n stron o największej łącznej wadze."""
+        return sorted(self.page_weights.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def heaviest_assets(self, n: int = 20) -> List[Tuple[str, int]]:
+        """Zwraca n największych zasobów."""
+        sized = ((url, info.size) for url, info in self.assets.items() if info.size is not None)
+        return sorted(sized, key=lambda item: (-item[1], item[0]))[:n]
+
+    def asset_page_counts(self) -> Counter:
+        """Liczba stron odwołujących się do każdego zasobu."""
+        return Counter(asset for assets in self.page_assets.values() for asset in assets)
+
+    def type_totals(self) -> Dict[str, int]:
+        """Łączny rozmiar unikalnych zasobów według typu MIME (malejąco)."""
+        totals: Counter = Counter()
+        for info in self.assets.values():
+            totals[info.content_type or 'nieznany'] += info.size or 0
+        return dict(totals.most_common())
+
+    def distribution(self) -> Dict[str, float]:
+        """Rozkład wagi stron: minimum, średnia, percentyle i maksimum."""
+        if not self.page_weights:
+            return {}
+        weights = np.fromiter(self.page_weights.values(), dtype=np.float64, count=len(self.page_weights))
+        p50, p90, p99 = np.percentile(weights, [50, 90, 99])
+        return {'min': float(weights.min()), 'mean': float(weights.mean()), 'p50': float(p50),
+                'p90': float(p90), 'p99': float(p99), 'max': float(weights.max())}
+
+
+class AssetProber(HostLimitedPool):
+    """Współbieżne ustalanie rozmiarów zasobów z trwałą pamięcią podręczną."""
+
+    def __init__(self, cache_path: Optional[str] = None, max_workers: int = 16,
+                 per_host_limit: int = 4, timeout: int = 10, cache_ttl: int = 24 * 3600):
+        """
+        Args:
+            cache_path: Ścieżka do pliku SQLite z wynikami (None = bez pamięci podręcznej)
+            max_workers: Maksymalna liczba równoczesnych zapytań
+            per_host_limit: Maksymalna liczba równoczesnych zapytań do jednego hosta
+            timeout: Czas oczekiwania na odpowiedź w sekundach
+            cache_ttl: Czas ważności wyniku w pamięci podręcznej w sekundach
+        """
+        super().__init__(max_workers, per_host_limit, timeout)
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self._cache = UrlResultCache(
+            cache_path, 'asset_info', [('size', 'INTEGER NOT NULL'), ('content_type', 'TEXT NOT NULL')]
+        ) if cache_path else None
+
+    def profile(self, html_sizes: Dict[str, int], page_assets: Dict[str, List[str]],
+                progress_callback: Optional[Callable[[str], None]] = None) -> PageWeightReport:
+        """
+        Ustala rozmiary zasobów i liczy wagę stron.
+
+        Args:
+            html_sizes: Słownik adres strony -> rozmiar HTML w bajtach
+            page_assets: Słownik adres strony -> adresy jej zasobów (np. z collect_page_assets)
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+        Returns:
+            Raport wagi stron
+        """
+        unique = list(dict.fromkeys(asset for assets in page_assets.values() for asset in assets))
+        assets, from_cache = self.probe(unique, progress_callback)
+        return PageWeightReport(html_sizes, page_assets, assets, from_cache)
+
+    def probe(self, urls: Iterable[str], progress_callback: Optional[Callable[[str], None]] = None) -> Tuple[Dict[str, AssetInfo], int]:
+        """
+        Ustala rozmiar i typ każdego zasobu - każdy adres dokładnie raz.
+
+        Returns:
+            Para (słownik adres -> AssetInfo, liczba wyników z pamięci podręcznej)
+        """
+        urls = list(dict.fromkeys(urls))
+        results = self._load_cached(urls)
+        from_cache = len(results)
+        pending = [url for url in urls if url not in results]
+        if progress_callback:
+            progress_callback(f"Sprawdzam rozmiar {len(pending)} zasobów ({from_cache} z pamięci podręcznej)...")
+
+        probed = self.run(pending, self._probe_url, progress_callback, "zasobów")
+        self._store_cached(probed)
+        results.update(probed)
+        return results, from_cache
+
+    def _probe_url(self, url: str) -> AssetInfo:
+        """Odczytuje rozmiar z HEAD, a gdy go brak - z odpowiedzi na GET z zakresem jednego bajtu."""
+        session = self._session()
+        content_type = ''
+        try:
+            response = session.head(url, timeout=self.timeout, allow_redirects=True)
+            content_type = self._content_type(response)
+            length = response.headers.get('Content-Length')
+            if response.status_code < 400 and length and length.isdigit():
+                return AssetInfo(int(length), content_type)
+        except requests.RequestException:
+            pass
+        try:
+            with session.get(url, timeout=self.timeout, allow_redirects=True, stream=True,
+                             headers={'Range': 'bytes=0-0'}) as response:
+                content_type = self._content_type(response) or content_type
+                return AssetInfo(total_size(response), content_type)
+        except requests.RequestException:
+            return AssetInfo(None, content_type)
+
+    @staticmethod
+    def _content_type(response: requests.Response) -> str:
+        """Typ MIME bez parametrów (np. 'image/png')."""
+        return response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+
+    def _load_cached(self, urls: List[str]) -> Dict[str, AssetInfo]:
+        """Odczytuje aktualne (nieprzeterminowane) wyniki z pamięci podręcznej."""
+        if self._cache is None:
+            return {}
+        return {url: AssetInfo(*values) for url, values in self._cache.load(urls, self.cache_ttl).items()}
+
+    def _store_cached(self, results: Dict[str, AssetInfo]):
+        """Zapisuje wyniki ze znanym rozmiarem - pozostałe są sprawdzane ponownie przy kolejnym uruchomieniu."""
+        if self._cache is not None:
+            self._cache.store((url, info) for url, info in results.items() if info.size is not None)
@@ -0,0 +1,206 @@
+"""
+Zapis stron w tle w trakcie pobierania (write-behind) z limitem pamięci.
+
+Pobrane strony trafiają do kolejki, z której osobny wątek zapisuje je
+porcjami do bazy stron (PageStore). Treść stron już zapisanych jest
+zwalniana z pamięci, gdy łączny rozmiar treści w pamięci przekracza limit -
+w pamięci zostają wtedy tylko metadane, a treść jest odczytywana z bazy przy
+dostępie. Gdy zapis nie nadąża, dodawanie kolejnych stron czeka, aż
+niezapisana treść zmieści się w limicie.
+"""
+
+from collections import OrderedDict
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .page_source import PageSource
+from .page_store import PageStore
+
+# Znaczniki sterujące wątkiem zapisu
+_FLUSH = object()
+_STOP = object()
+
+
+class CrawlPages(PageSource):
+    """
+    Strony pobieranej witryny z zapisem w tle do bazy stron.
+
+    Obiekt działa jak słownik adres -> dane strony: strony dodaje się
+    przypisaniem (pages[url] = page_data), a odczyt zwraca treść z pamięci
+    lub - po jej zwolnieniu - z bazy.
+    """
+
+    def __init__(self, store: PageStore, memory_budget: int = 64 * 1024 * 1024, batch_size: int = 50,
+                 flush_interval: float = 2.0, durable: bool = True,
+                 progress_callback: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            store: Baza, do której zapisywane są strony
+            memory_budget: Limit łącznego rozmiaru treści stron w pamięci (znaki)
+            batch_size: Liczba stron zapisywanych w jednej transakcji
+            flush_interval: Maksymalny czas (s) oczekiwania niepełnej porcji na zapis
+            durable: True = każda zapisana porcja jest utrwalana na dysku (fsync),
+                False = szybszy zapis, utrwalanie pozostawione systemowi
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+        """
+        self.store = store
+        self.memory_budget = memory_budget
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.progress_callback = progress_callback
+        store.synchronous = 'FULL' if durable else 'OFF'
+
+        self._info: Dict[str, Dict] = {}
+        self._contents: 'OrderedDict[str, str]' = OrderedDict()  # treść w pamięci, od najstarszej
+        self._persisted: Set[str] = set()
+        self._memory = 0      # rozmiar treści w pamięci
+        self._unsaved = 0     # rozmiar treści jeszcze niezapisanej
+        self._saved_count = 0
+        self.error: Optional[Exception] = None
+        self._condition = threading.Condition()
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def __setitem__(self, url: str, page_data: Dict):
+        """Dodaje stronę i przekazuje ją do zapisu w tle."""
+        content = page_data['content']
+        with self._condition:
+            # Ograniczenie pamięci: czekaj, aż zapis nadgoni (pojedyncza strona zawsze przechodzi)
+            flush_requested = False
+            while self._unsaved and self._unsaved + len(content) > self.memory_budget and self.error is None:
+                if not flush_requested:
+                    # Niepełna porcja nie czeka flush_interval, gdy wstrzymuje pobieranie
+                    self._queue.put(_FLUSH)
+                    flush_requested = True
+                self._condition.wait()
+            self._raise_error()
+            if url in self._contents:
+                previous = self._contents.pop(url)
+                self._memory -= len(previous)
+                if url not in self._persisted:
+                    self._unsaved -= len(previous)
+            self._persisted.discard(url)
+            self._info[url] = {key: value for key, value in page_data.items() if key != 'content'}
+            self._contents[url] = content
+            self._memory += len(content)
+            self._unsaved += len(content)
+        self._queue.put((url, page_data))
+
+    def urls(self) -> List[str]:
+        return list(self._info)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._info))
+
+    def __len__(self) -> int:
+        return len(self._info)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._info
+
+    def page_info(self, url: str) -> Dict:
+        return self._info[url]
+
+    def read_content(self, url: str) -> str:
+        with self._condition:
+            if url in self._contents:
+                return self._contents[url]
+        return self.store.read_content(url)
+
+    @property
+    def memory_used(self) -> int:
+        """Łączny rozmiar treści stron w pamięci."""
+        return self._memory
+
+    @property
+    def saved_count(self) -> int:
+        """Liczba stron zapisanych w bazie."""
+        return self._saved_count
+
+    def flush(self):
+        """Czeka na zapisanie wszystkich dodanych stron."""
+        self._queue.put(_FLUSH)
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Zapisuje pozostałe strony i kończy wątek zapisu."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._raise_error()
+
+    def __enter__(self) -> 'CrawlPages':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Zamyka zapis; błąd zapisu nie zastępuje błędu, który przerwał pobieranie."""
+        try:
+            self.close()
+        except RuntimeError:
+            if exc_type is None:
+                raise
+
+    def _raise_error(self):
+        """Przekazuje błąd wątku zapisu do wątku pobierania."""
+        if self.error is not None:
+            raise RuntimeError(f"Błąd zapisu stron do bazy: {self.error}") from self.error
+
+    def _write_loop(self):
+        """Wątek zapisu: zbiera strony w porcje i zapisuje je w jednej transakcji."""
+        batch: List[Tuple[str, Dict]] = []
+        started = 0.0
+        while True:
+            timeout = max(0.0, started + self.flush_interval - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+                received = True
+            except queue.Empty:
+                item, received = _FLUSH, False
+            if item is not _FLUSH and item is not _STOP:
+                if not batch:
+                    started = time.monotonic()
+                batch.append(item)
+            if batch and (item is _FLUSH or item is _STOP or len(batch) >= self.batch_size):
+                self._save_batch(batch)
+                batch = []
+            if received:
+                # Po zapisie - flush() (queue.join) wraca dopiero, gdy strony są w bazie
+                self._queue.task_done()
+            if item is _STOP:
+                return
+
+    def _save_batch(self, batch: List[Tuple[str, Dict]]):
+        """Zapisuje porcję stron, a następnie zwalnia treść ponad limit pamięci."""
+        try:
+            self.store.add_pages(dict(batch))
+        except Exception as e:
+            # Treść zostaje w pamięci - nic nie zostanie utracone
+            with self._condition:
+                self.error = e
+                self._condition.notify_all()
+            return
+        with self._condition:
+            for url, page_data in batch:
+                if self._contents.get(url) is page_data['content']:
+                    self._persisted.add(url)
+                    self._unsaved -= len(page_data['content'])
+            self._saved_count += len(batch)
+            self._evict()
+            self._condition.notify_all()
+        if self.progress_callback:
+            self.progress_callback(f"Zapisano w tle {self._saved_count} stron "
+                                   f"({self._memory / (1024 * 1024):.1f} MB treści w pamięci)")
+
+    def _evict(self):
+        """Zwalnia najstarszą zapisaną treść, dopóki pamięć przekracza limit."""
+        if self._memory <= self.memory_budget:
+            return
+        for url in list(self._contents):
+            if self._memory <= self.memory_budget:
+                break
+            if url in self._persisted:
+                self._memory -= len(self._contents.pop(url))
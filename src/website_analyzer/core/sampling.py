@@ -0,0 +1,231 @@
+"""
+Analiza przybliżona na podstawie warstwowej próby losowej stron.
+
+Strony są dzielone na warstwy (pierwszy segment ścieżki adresu lub
+głębokość ścieżki), a z każdej warstwy losowana jest liczba stron
+proporcjonalna do jej wielkości. Sumy dla całej witryny (rozmiar, liczba
+linków, obrazów, kody HTTP) są szacowane estymatorem warstwowym
+z 95% przedziałem ufności, a liczby unikalnych adresów - estymatorem Chao2
+ekstrapolowanym do liczby stron witryny.
+"""
+
+import math
+import random
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set
+
+import numpy as np
+
+from .url_resolver import default_resolver
+
+# Kwantyl rozkładu normalnego dla 95% przedziału ufności
+Z_95 = 1.96
+
+
+class Estimate(NamedTuple):
+    """Oszacowanie z marginesem błędu (95% przedział ufności: value ± margin)."""
+    value: float
+    margin: float
+
+    @property
+    def low(self) -> float:
+        """Dolna granica przedziału ufności (nie mniejsza niż 0)."""
+        return max(0.0, self.value - self.margin)
+
+    @property
+    def high(self) -> float:
+        """Górna granica przedziału ufności."""
+        return self.value + self.margin
+
+
+def stratum_key(url: str, by: str = 'path') -> str:
+    """
+    Zwraca warstwę strony.
+
+    Args:
+        url: Adres strony
+        by: 'path' - pierwszy segment ścieżki, 'depth' - liczba segmentów ścieżki
+    """
+    segments = [segment for segment in default_resolver.split(url).path.split('/') if segment]
+    if by == 'depth':
+        return str(len(segments))
+    return '/' + segments[0] if len(segments) > 1 else '/'
+
+
+class StratifiedSample:
+    """Warstwowa próba losowa stron z przydziałem proporcjonalnym."""
+
+    def __init__(self, indices: List[int], labels: List[str], population: Dict[str, int], by: str):
+        """
+        Args:
+            indices: Numery wylosowanych stron (rosnąco - kolejność pobrania)
+            labels: Warstwa każdej wylosowanej strony
+            population: Liczba wszystkich stron w każdej warstwie
+            by: Sposób podziału na warstwy ('path' lub 'depth')
+        """
+        self.indices = indices
+        self.labels = labels
+        self.population = population
+        self.by = by
+        self.sampled = Counter(labels)
+
+    @classmethod
+    def draw(cls, urls: Sequence[str], sample_size: int, by: str = 'path', seed: int = 0,
+             keep_first: bool = False) -> 'StratifiedSample':
+        """
+        Losuje próbę warstwową.
+
+        Każda warstwa dostaje co najmniej jedną stronę (o ile wielkość próby
+        na to pozwala), a pozostałe miejsca są rozdzielane proporcjonalnie
+        metodą największych reszt.
+
+        Args:
+            urls: Adresy wszystkich stron
+            sample_size: Docelowa liczba stron w próbie
+            by: Sposób podziału na warstwy ('path' lub 'depth')
+            seed: Ziarno generatora - ta sama próba przy kolejnych uruchomieniach
+            keep_first: True = pierwsza strona (strona startowa) zawsze trafia do próby,
+                zajmując jedno z miejsc swojej warstwy
+        """
+        strata: Dict[str, List[int]] = {}
+        for index, url in enumerate(urls):
+            strata.setdefault(stratum_key(url, by), []).append(index)
+        sample_size = min(sample_size, len(urls))
+
+        allocation = {key: 0 for key in strata}
+        if sample_size >= len(strata):
+            allocation = {key: 1 for key in strata}
+        remaining = sample_size - sum(allocation.values())
+        quotas = {key: remaining * len(members) / len(urls) for key, members in strata.items()}
+        for key in strata:
+            allocation[key] += min(int(quotas[key]), len(strata[key]) - allocation[key])
+        leftover = sample_size - sum(allocation.values())
+        by_remainder = sorted(strata, key=lambda key: (-(quotas[key] - int(quotas[key])), -len(strata[key]), key))
+        while leftover > 0:
+            for key in by_remainder:
+                if leftover and allocation[key] < len(strata[key]):
+                    allocation[key] += 1
+                    leftover -= 1
+
+        generator = random.Random(seed)
+        chosen = {}
+        for key, members in strata.items():
+            count = allocation[key]
+            if keep_first and count and members[0] == 0:
+                chosen[0] = key
+                members, count = members[1:], count - 1
+            for index in generator.sample(members, count):
+                chosen[index] = key
+        indices = sorted(chosen)
+        return cls(indices, [chosen[index] for index in indices],
+                   {key: len(members) for key, members in strata.items()}, by)
+
+    @property
+    def population_size(self) -> int:
+        """Liczba wszystkich stron."""
+        return sum(self.population.values())
+
+    @property
+    def sampling_rate(self) -> float:
+        """Udział stron w próbie."""
+        return len(self.indices) / self.population_size if self.population_size else 0.0
+
+    def estimate_total(self, values: Iterable[float]) -> Estimate:
+        """
+        Szacuje sumę wartości dla wszystkich stron estymatorem warstwowym.
+
+        Args:
+            values: Wartość dla każdej wylosowanej strony (w kolejności indices)
+
+        Returns:
+            Oszacowanie sumy z marginesem 95% (z poprawką na skończoną populację)
+        """
+        values = np.fromiter(values, dtype=np.float64, count=len(self.indices))
+        total = variance = 0.0
+        labels = np.array(self.labels)
+        for key, population in self.population.items():
+            stratum_values = values[labels == key]
+            count = len(stratum_values)
+            if not count:
+                continue
+            total += population * stratum_values.mean()
+            if count > 1:
+                variance += population ** 2 * (1 - count / population) * stratum_values.var(ddof=1) / count
+        return Estimate(total, Z_95 * math.sqrt(variance))
+
+
+def estimate_unique(url_sets: Sequence[Set[str]], population_size: int) -> Estimate:
+    """
+    Szacuje liczbę unikalnych adresów na wszystkich stronach witryny.
+
+    Używany jest estymator Chao2 dla danych o występowaniu (strona = jednostka
+    próby) ekstrapolowany do skończonej liczby stron witryny: adresy widziane
+    w próbie tylko na jednej (q1) lub dwóch (q2) stronach wskazują, ile
+    adresów pozostało niezauważonych. Margines jest przybliżony - wariancja
+    Chao2 przeskalowana do części ekstrapolowanej.
+
+    Args:
+        url_sets: Zbiory adresów z każdej wylosowanej strony
+        population_size: Liczba wszystkich stron witryny
+    """
+    sample_size = len(url_sets)
+    frequency = Counter(url for urls in url_sets for url in urls)
+    observed = len(frequency)
+    counts = Counter(frequency.values())
+    q1, q2 = counts[1], counts[2]
+    extra = population_size - sample_size
+    if not q1 or sample_size < 2 or extra <= 0:
+        return Estimate(float(observed), 0.0)
+
+    correction = (sample_size - 1) / sample_size
+    if q2:
+        unseen = correction * q1 * q1 / (2 * q2)
+        ratio = q1 / q2
+        variance = q2 * (correction * ratio ** 2 / 2 + correction ** 2 * ratio ** 3 + correction ** 2 * ratio ** 4 / 4)
+    else:
+        unseen = correction * q1 * (q1 - 1) / 2
+        variance = correction * q1 * (q1 - 1) / 2 + correction ** 2 * q1 * (2 * q1 - 1) ** 2 / 4
+    # Część niezauważonych adresów, które pojawiłyby się na pozostałych stronach
+    found = 1 - (1 - q1 / (sample_size * unseen + q1)) ** extra
+    return Estimate(observed + unseen * found, Z_95 * math.sqrt(variance) * found)
+
+
+class SamplingReport:
+    """Oszacowania dla całej witryny na podstawie próby."""
+
+    def __init__(self, sample: StratifiedSample, totals: Dict[str, Estimate],
+                 unique: Dict[str, Estimate], status_codes: Dict[int, Estimate]):
+        """
+        Args:
+            sample: Wylosowana próba
+            totals: Oszacowania sum ('size', 'links', 'images', ...)
+            unique: Oszacowania liczby unikalnych adresów według kategorii
+            status_codes: Oszacowana liczba stron z każdym kodem HTTP
+        """
+        self.sample = sample
+        self.totals = totals
+        self.unique = unique
+        self.status_codes = status_codes
+
+    @classmethod
+    def build(cls, sample: StratifiedSample, page_data: Sequence[Dict], url_totals: Sequence[Dict[str, int]],
+              url_sets: Sequence[Dict[str, Set[str]]], categories: Sequence[str]) -> 'SamplingReport':
+        """
+        Liczy oszacowania z danych wylosowanych stron.
+
+        Args:
+            sample: Wylosowana próba
+            page_data: Dane wylosowanych stron (size, status_code) w kolejności sample.indices
+            url_totals: Liczba adresów każdej kategorii na stronie
+            url_sets: Zbiory adresów każdej kategorii na stronie
+            categories: Kategorie adresów do oszacowania
+        """
+        totals = {'size': sample.estimate_total(page['size'] for page in page_data)}
+        for category in categories:
+            totals[category] = sample.estimate_total(counts[category] for counts in url_totals)
+        unique = {category: estimate_unique([urls[category] for urls in url_sets], sample.population_size)
+                  for category in categories}
+        codes = sorted({page['status_code'] for page in page_data})
+        status_codes = {code: sample.estimate_total(float(page['status_code'] == code) for page in page_data)
+                        for code in codes}
+        return cls(sample, totals, unique, status_codes)
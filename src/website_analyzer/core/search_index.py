@@ -0,0 +1,261 @@
+"""
+Pełnotekstowy indeks odwrócony pobranych stron.
+
+Indeks jest zapisany na dysku (SQLite). Dla każdej pary (słowo, strona)
+przechowywana jest liczba wystąpień oraz pozycje słowa zakodowane jako
+różnice kolejnych pozycji w formacie varint. Wyszukiwanie zwraca strony
+uszeregowane według BM25 i obsługuje frazy w cudzysłowie.
+"""
+
+from bs4 import BeautifulSoup
+from contextlib import contextmanager
+import math
+import os
+import re
+import sqlite3
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .analysis_partial import WORD_PATTERN
+from .page_source import content_hashes
+
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    """Koduje nieujemne liczby całkowite w formacie varint (7 bitów na bajt)."""
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data: bytes) -> List[int]:
+    """Dekoduje liczby zapisane przez encode_varints."""
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def encode_positions(positions: List[int]) -> bytes:
+    """Koduje rosnącą listę pozycji jako różnice kolejnych wartości."""
+    previous = 0
+    deltas = []
+    for position in positions:
+        deltas.append(position - previous)
+        previous = position
+    return encode_varints(deltas)
+
+
+def decode_positions(data: bytes) -> List[int]:
+    """Odtwarza listę pozycji zakodowaną przez encode_positions."""
+    positions = []
+    current = 0
+    for delta in decode_varints(data):
+        current += delta
+        positions.append(current)
+    return positions
+
+
+def tokenize(text: str) -> List[str]:
+    """Dzieli tekst na słowa (małe litery) - tak samo jak przy analizie stron."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    """Indeks odwrócony z pozycjami słów, zapisany w pliku SQLite."""
+
+    # Parametry BM25
+    K1 = 1.2
+    B = 0.75
+    BATCH_SIZE = 200
+
+    def __init__(self, db_path: str):
+        """
+        Otwiera (lub tworzy) plik indeksu.
+
+        Args:
+            db_path: Ścieżka do pliku bazy SQLite
+        """
+        self.db_path = db_path
+        folder = os.path.dirname(db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self._docs: Optional[Dict[int, Tuple[str, int]]] = None
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                " doc_id INTEGER PRIMARY KEY,"
+                " url TEXT UNIQUE NOT NULL,"
+                " content_hash TEXT NOT NULL,"
+                " length INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings ("
+                " term TEXT NOT NULL,"
+                " doc_id INTEGER NOT NULL,"
+                " tf INTEGER NOT NULL,"
+                " positions BLOB NOT NULL,"
+                " PRIMARY KEY (term, doc_id)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Otwiera połączenie na czas jednej transakcji - indeks jest używany z wielu wątków."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def update(self, downloaded_pages: Mapping[str, Dict], progress_callback: Optional[Callable[[str], None]] = None) -> int:
+        """
+        Synchronizuje indeks z podanymi stronami.
+
+        Indeksowane są tylko strony nowe lub o zmienionej treści; strony,
+        których nie ma w słowniku, są usuwane z indeksu.
+
+        Args:
+            downloaded_pages: Słownik lub leniwe źródło z danymi stron
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+        Returns:
+            Liczba (ponownie) zaindeksowanych stron
+        """
+        with self._connect() as conn:
+            indexed = {url: (doc_id, key) for doc_id, url, key in conn.execute("SELECT doc_id, url, content_hash FROM docs")}
+
+            removed = [doc_id for url, (doc_id, _) in indexed.items() if url not in downloaded_pages]
+            for doc_id in removed:
+                self._delete_doc(conn, doc_id)
+
+        # Migawka magazynu treści zna skróty stron - treść jest odczytywana tylko dla stron zmienionych
+        changed = [(url, key) for url, key in content_hashes(downloaded_pages).items()
+                   if url not in indexed or indexed[url][1] != key]
+
+        for start in range(0, len(changed), self.BATCH_SIZE):
+            batch = changed[start:start + self.BATCH_SIZE]
+            if progress_callback:
+                progress_callback(f"Indeksuję strony {start + 1}-{start + len(batch)}/{len(changed)}...")
+            with self._connect() as conn:
+                for url, key in batch:
+                    # Treść odczytywana ponownie - leniwe źródło nie trzyma wszystkich stron w pamięci
+                    content = downloaded_pages[url]['content']
+                    self._index_page(conn, url, key, content, indexed.get(url, (None, None))[0])
+
+        self._docs = None
+        return len(changed)
+
+    def _delete_doc(self, conn: sqlite3.Connection, doc_id: int):
+        """Usuwa stronę i jej wpisy z indeksu."""
+        conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+
+    def _index_page(self, conn: sqlite3.Connection, url: str, key: str, content: str, doc_id: Optional[int]):
+        """Zapisuje wpisy jednej strony (zastępując poprzednią wersję)."""
+        text = BeautifulSoup(content, 'html.parser').get_text(separator=' ', strip=True)
+        tokens = tokenize(text)
+
+        positions: Dict[str, List[int]] = {}
+        for position, token in enumerate(tokens):
+            positions.setdefault(token, []).append(position)
+
+        if doc_id is None:
+            doc_id = conn.execute("INSERT INTO docs (url, content_hash, length) VALUES (?, ?, ?)",
+                                  (url, key, len(tokens))).lastrowid
+        else:
+            conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+            conn.execute("UPDATE docs SET content_hash = ?, length = ? WHERE doc_id = ?", (key, len(tokens), doc_id))
+
+        conn.executemany(
+            "INSERT INTO postings (term, doc_id, tf, positions) VALUES (?, ?, ?, ?)",
+            ((term, doc_id, len(term_positions), encode_positions(term_positions))
+             for term, term_positions in positions.items())
+        )
+
+    def _load_docs(self) -> Dict[int, Tuple[str, int]]:
+        """Wczytuje (i zapamiętuje) adresy oraz długości stron."""
+        if self._docs is None:
+            with self._connect() as conn:
+                self._docs = {doc_id: (url, length) for doc_id, url, length in conn.execute("SELECT doc_id, url, length FROM docs")}
+        return self._docs
+
+    @property
+    def page_count(self) -> int:
+        """Liczba stron w indeksie."""
+        return len(self._load_docs())
+
+    def search(self, query: str, limit: int = 50) -> List[Tuple[str, float]]:
+        """
+        Wyszukuje strony pasujące do zapytania.
+
+        Słowa są punktowane według BM25 (strona musi zawierać co najmniej
+        jedno z nich). Frazy w cudzysłowie, np. "analiza witryny", muszą
+        wystąpić na stronie dokładnie w tej kolejności.
+
+        Args:
+            query: Zapytanie, np. 'python "analiza witryny"'
+            limit: Maksymalna liczba wyników
+
+        Returns:
+            Lista par (url, wynik) posortowana malejąco według wyniku
+        """
+        phrases = [tokenize(phrase) for phrase in PHRASE_PATTERN.findall(query)]
+        phrases = [phrase for phrase in phrases if phrase]
+        terms = tokenize(PHRASE_PATTERN.sub(' ', query))
+        phrase_terms = {term for phrase in phrases for term in phrase}
+        all_terms = list(dict.fromkeys(terms + [term for phrase in phrases for term in phrase]))
+        if not all_terms:
+            return []
+
+        docs = self._load_docs()
+        if not docs:
+            return []
+        page_count = len(docs)
+        average_length = sum(length for _, length in docs.values()) / page_count or 1
+
+        scores: Dict[int, float] = {}
+        term_positions: Dict[str, Dict[int, bytes]] = {}
+        with self._connect() as conn:
+            for term in all_terms:
+                if term in phrase_terms:
+                    rows = conn.execute("SELECT doc_id, tf, positions FROM postings WHERE term = ?", (term,)).fetchall()
+                    term_positions[term] = {doc_id: blob for doc_id, _, blob in rows}
+                else:
+                    rows = conn.execute("SELECT doc_id, tf, NULL FROM postings WHERE term = ?", (term,)).fetchall()
+                idf = math.log(1 + (page_count - len(rows) + 0.5) / (len(rows) + 0.5))
+                for doc_id, tf, _ in rows:
+                    if doc_id not in docs:
+                        continue
+                    length_norm = 1 - self.B + self.B * docs[doc_id][1] / average_length
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + self.K1 * length_norm)
+
+        for phrase in phrases:
+            scores = {doc_id: score for doc_id, score in scores.items()
+                      if self._contains_phrase(doc_id, phrase, term_positions)}
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], docs[item[0]][0]))[:limit]
+        return [(docs[doc_id][0], score) for doc_id, score in ranked]
+
+    def _contains_phrase(self, doc_id: int, phrase: List[str], term_positions: Dict[str, Dict[int, bytes]]) -> bool:
+        """Sprawdza czy słowa frazy występują na stronie kolejno po sobie."""
+        blobs = [term_positions[term].get(doc_id) for term in phrase]
+        if any(blob is None for blob in blobs):
+            return False
+        candidates = set(decode_positions(blobs[0]))
+        for offset, blob in enumerate(blobs[1:], 1):
+            candidates &= {position - offset for position in decode_positions(blob)}
+            if not candidates:
+                return False
+        return True
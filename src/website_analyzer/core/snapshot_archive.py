@@ -0,0 +1,182 @@
+"""
+Archiwum witryny w jednym pliku z dostępem swobodnym do stron.
+
+Układ pliku:
+
+    MAGIC | rekordy stron | słownik kompresji | tabela metadanych | stopka
+
+Treść każdej strony jest kompresowana osobno (zlib z presetowym słownikiem
+zbudowanym z fragmentów powtarzających się na wielu stronach - nawigacja,
+nagłówki, stopki), więc odczyt jednej strony nie wymaga rozpakowania
+pozostałych. Tabela metadanych (adres, kod HTTP, rozmiar, nagłówki, położenie
+rekordu) jest skompresowanym JSON-em w formie kolumn wierszy, a stopka
+o stałej długości wskazuje położenie słownika i tabeli.
+"""
+
+from collections import Counter
+import json
+import os
+import struct
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+import zlib
+
+from .page_source import PageSource, SharedFile
+
+MAGIC = b'WSARCH01'
+# Stopka: położenie i długość słownika, położenie i długość tabeli metadanych, MAGIC
+FOOTER = struct.Struct('<QIQQ8s')
+# zlib korzysta najwyżej z 32 KB słownika
+MAX_DICTIONARY_SIZE = 32 * 1024
+ARCHIVE_EXTENSION = '.wsa'
+
+
+def train_dictionary(samples: Iterable[str], size: int = MAX_DICTIONARY_SIZE) -> bytes:
+    """
+    Buduje słownik kompresji z przykładowych stron.
+
+    Wiersze występujące na co najmniej dwóch stronach są oceniane iloczynem
+    liczby stron i długości; najlepsze trafiają na koniec słownika, gdzie
+    zlib koduje odwołania najkrócej.
+
+    Args:
+        samples: Treść przykładowych stron
+        size: Maksymalny rozmiar słownika w bajtach
+    """
+    document_frequency: Counter = Counter()
+    for content in samples:
+        document_frequency.update({line.strip().encode('utf-8') for line in content.split('\n')})
+    scored = sorted(((count * len(line), line) for line, count in document_frequency.items()
+                     if count >= 2 and len(line) >= 8), reverse=True)
+    chosen: List[bytes] = []
+    total = 0
+    for _, line in scored:
+        if total + len(line) + 1 > size:
+            continue
+        chosen.append(line)
+        total += len(line) + 1
+    return b'\n'.join(reversed(chosen))
+
+
+def write_snapshot_archive(downloaded_pages: Mapping[str, Dict], archive_path: str, sample_pages: int = 200,
+                           progress_callback: Optional[Callable[[str], None]] = None) -> int:
+    """
+    Zapisuje strony do archiwum.
+
+    Plik powstaje pod tymczasową nazwą i jest podmieniany dopiero po
+    zapisaniu całości, więc przerwany zapis nie psuje istniejącego archiwum,
+    a plik tymczasowy jest wtedy usuwany.
+
+    Args:
+        downloaded_pages: Słownik lub leniwe źródło z danymi stron
+        archive_path: Ścieżka pliku archiwum
+        sample_pages: Liczba stron użytych do budowy słownika kompresji
+        progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+    Returns:
+        Liczba zapisanych stron
+    """
+    urls = list(downloaded_pages)
+    step = max(1, len(urls) // max(1, sample_pages))
+    dictionary = train_dictionary(downloaded_pages[url]['content'] for url in urls[::step][:sample_pages])
+
+    if isinstance(downloaded_pages, PageSource):
+        pages = downloaded_pages.iter_pages()
+    else:
+        pages = iter(downloaded_pages.items())
+
+    rows = []
+    temp_path = archive_path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(MAGIC)
+            for i, (url, page_data) in enumerate(pages, 1):
+                compressor = zlib.compressobj(6, zdict=dictionary) if dictionary else zlib.compressobj(6)
+                record = compressor.compress(page_data['content'].encode('utf-8')) + compressor.flush()
+                rows.append([url, page_data['status_code'], page_data['size'], page_data['headers'],
+                             f.tell(), len(record)])
+                f.write(record)
+                if progress_callback and (i % 500 == 0 or i == len(urls)):
+                    progress_callback(f"Zapisano w archiwum {i}/{len(urls)} stron")
+
+            dictionary_offset = f.tell()
+            f.write(dictionary)
+            table = zlib.compress(json.dumps({
+                'columns': ['url', 'status_code', 'size', 'headers', 'offset', 'length'],
+                'rows': rows
+            }, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+            table_offset = f.tell()
+            f.write(table)
+            f.write(FOOTER.pack(dictionary_offset, len(dictionary), table_offset, len(table), MAGIC))
+        os.replace(temp_path, archive_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)  # niedokończony plik nie może zostać obok archiwum
+        raise
+    return len(rows)
+
+
+def is_snapshot_archive(path: str) -> bool:
+    """Czy plik jest archiwum witryny."""
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class SnapshotArchive(PageSource):
+    """Archiwum witryny odczytywane leniwie - treść strony rozpakowywana przy dostępie."""
+
+    def __init__(self, archive_path: str):
+        """
+        Wczytuje słownik kompresji i tabelę metadanych archiwum.
+
+        Args:
+            archive_path: Ścieżka pliku archiwum
+
+        Raises:
+            ValueError: Gdy plik nie jest archiwum witryny lub jest uszkodzony
+        """
+        self.archive_path = archive_path
+        with open(archive_path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Plik nie jest archiwum witryny: {archive_path}")
+            f.seek(-FOOTER.size, os.SEEK_END)
+            dictionary_offset, dictionary_length, table_offset, table_length, magic = FOOTER.unpack(f.read(FOOTER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Uszkodzone archiwum witryny: {archive_path}")
+            f.seek(dictionary_offset)
+            self._dictionary = f.read(dictionary_length)
+            f.seek(table_offset)
+            table = json.loads(zlib.decompress(f.read(table_length)).decode('utf-8'))
+
+        self._info: Dict[str, Dict] = {}
+        self._records: Dict[str, Tuple[int, int]] = {}  # adres -> (położenie, długość rekordu)
+        for url, status_code, size, headers, offset, length in table['rows']:
+            self._info[url] = {'status_code': status_code, 'headers': headers, 'url': url, 'size': size}
+            self._records[url] = (offset, length)
+        self._file = SharedFile(archive_path)
+
+    def urls(self) -> List[str]:
+        return list(self._records)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._records
+
+    def page_info(self, url: str) -> Dict:
+        return self._info[url]
+
+    def read_content(self, url: str) -> str:
+        offset, length = self._records[url]
+        record = self._file.read(offset, length)
+        decompressor = zlib.decompressobj(zdict=self._dictionary) if self._dictionary else zlib.decompressobj()
+        return (decompressor.decompress(record) + decompressor.flush()).decode('utf-8')
+
+    def close(self):
+        """Zamyka otwarte uchwyty pliku archiwum."""
+        self._file.close()
@@ -0,0 +1,214 @@
+"""
+Porównanie dwóch pobrań witryny (migawek).
+
+Strony dodane, usunięte i zmienione są wyznaczane ze skrótów treści - dla
+migawek magazynu treści zapisanych razem z migawką, więc porównanie nie
+odczytuje treści stron. Zmiany kodów HTTP wynikają z metadanych.
+
+Do wykrycia nowych niedziałających linków i zmian zasobów potrzebne są
+adresy znalezione na stronach - wyznaczane tylko dla stron zmienionych
+i dodanych (oraz stron bez zmian, gdy któryś cel linku zaczął lub przestał
+działać). Wyniki stron bez zmian pochodzą z pamięci podręcznej analizatora.
+"""
+
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Set, TextIO, Tuple
+
+from .analysis_partial import URL_CATEGORIES, AnalysisPartial
+from .analyzer import WebsiteAnalyzer
+from .link_graph import normalize_url
+from .page_source import PageSource, content_hashes
+
+SEPARATOR = "=" * 50
+# Kategorie adresów traktowane jako zasoby strony
+ASSET_CATEGORIES = tuple(category for category in URL_CATEGORIES if category != 'links')
+
+
+class SnapshotDiff:
+    """Różnice między dwoma pobraniami witryny."""
+
+    def __init__(self, old_label: str, new_label: str, old_count: int, new_count: int, max_display: int = 50):
+        """
+        Args:
+            old_label: Nazwa starszego pobrania
+            new_label: Nazwa nowszego pobrania
+            old_count: Liczba stron starszego pobrania
+            new_count: Liczba stron nowszego pobrania
+            max_display: Maksymalna liczba pozycji listy w raporcie tekstowym
+        """
+        self.old_label = old_label
+        self.new_label = new_label
+        self.old_count = old_count
+        self.new_count = new_count
+        self.max_display = max_display
+        self.added: List[str] = []
+        self.removed: List[str] = []
+        self.changed: List[str] = []
+        self.unchanged_count = 0
+        self.status_changes: List[Tuple[str, int, int]] = []  # (adres, stary kod, nowy kod)
+        self.new_broken_links: List[Tuple[str, str, int]] = []  # (strona, link, kod HTTP celu)
+        self.fixed_broken_links: List[Tuple[str, str]] = []  # (strona, link) - link już działa lub zniknął
+        self.asset_changes: Dict[str, Tuple[List[str], List[str]]] = {}  # strona -> (dodane, usunięte zasoby)
+        self.analyzed_pages = 0  # strony, dla których potrzebne były wyniki analizy
+
+    @property
+    def has_changes(self) -> bool:
+        """Czy pobrania różnią się czymkolwiek."""
+        return bool(self.added or self.removed or self.changed or self.status_changes)
+
+    def iter_text(self) -> Iterator[str]:
+        """Generuje raport tekstowy fragment po fragmencie."""
+        yield "PORÓWNANIE POBRAŃ / CRAWL DIFF\n" + SEPARATOR + "\n\n"
+        yield f"Starsze pobranie: {self.old_label} ({self.old_count} stron)\n"
+        yield f"Nowsze pobranie: {self.new_label} ({self.new_count} stron)\n\n"
+        yield (f"Dodane strony: {len(self.added)}, usunięte: {len(self.removed)}, "
+               f"zmienione: {len(self.changed)}, bez zmian: {self.unchanged_count}\n")
+        yield (f"Zmiany kodów HTTP: {len(self.status_changes)}, nowe niedziałające linki: "
+               f"{len(self.new_broken_links)}, naprawione: {len(self.fixed_broken_links)}\n")
+
+        yield from self._url_list("Dodane strony", self.added)
+        yield from self._url_list("Usunięte strony", self.removed)
+        yield from self._url_list("Zmienione strony", self.changed)
+
+        yield f"\nZmiany kodów HTTP ({len(self.status_changes)}):\n"
+        for url, old_status, new_status in self.status_changes[:self.max_display]:
+            yield f"  {old_status} -> {new_status}  {url}\n"
+        yield from self._hidden(len(self.status_changes))
+
+        yield f"\nNowe niedziałające linki ({len(self.new_broken_links)}):\n"
+        for page, link, status in self.new_broken_links[:self.max_display]:
+            yield f"  [{status}] {link}\n      na stronie: {page}\n"
+        yield from self._hidden(len(self.new_broken_links))
+
+        yield f"\nNaprawione niedziałające linki ({len(self.fixed_broken_links)}):\n"
+        for page, link in self.fixed_broken_links[:self.max_display]:
+            yield f"  {link}\n      na stronie: {page}\n"
+        yield from self._hidden(len(self.fixed_broken_links))
+
+        yield f"\nZmiany zasobów na zmienionych stronach ({len(self.asset_changes)}):\n"
+        for page, (added, removed) in list(self.asset_changes.items())[:self.max_display]:
+            yield f"  {page}\n"
+            for asset in added:
+                yield f"      + {asset}\n"
+            for asset in removed:
+                yield f"      - {asset}\n"
+        yield from self._hidden(len(self.asset_changes))
+
+    def _url_list(self, title: str, urls: List[str]) -> Iterator[str]:
+        """Lista adresów z limitem długości."""
+        yield f"\n{title} ({len(urls)}):\n"
+        for url in urls[:self.max_display]:
+            yield f"  {url}\n"
+        yield from self._hidden(len(urls))
+
+    def _hidden(self, total: int) -> Iterator[str]:
+        """Informacja o pominiętych pozycjach listy."""
+        if total > self.max_display:
+            yield f"  ... i {total - self.max_display} kolejnych\n"
+
+    def write_text(self, f: TextIO):
+        """Zapisuje raport tekstowy do otwartego pliku."""
+        for chunk in self.iter_text():
+            f.write(chunk)
+
+
+def _page_info(downloaded_pages: Mapping[str, Dict], url: str) -> Dict:
+    """Metadane strony bez odczytu jej treści."""
+    if isinstance(downloaded_pages, PageSource):
+        return downloaded_pages.page_info(url)
+    return downloaded_pages[url]
+
+
+def _broken_targets(downloaded_pages: Mapping[str, Dict]) -> Dict[str, int]:
+    """Pobrane strony z kodem błędu: adres (postać kanoniczna) -> kod HTTP."""
+    broken = {}
+    for url in downloaded_pages:
+        status = _page_info(downloaded_pages, url)['status_code']
+        if status >= 400:
+            broken[normalize_url(url)] = status
+    return broken
+
+
+def _page_links(partial: AnalysisPartial) -> Set[str]:
+    """Linki HTTP(S) strony w postaci kanonicznej."""
+    return {normalize_url(link) for link in partial.urls['links'] if link.startswith(('http://', 'https://'))}
+
+
+def _broken_pairs(partials: Dict[str, AnalysisPartial], broken: Dict[str, int]) -> Set[Tuple[str, str]]:
+    """Pary (strona, cel linku) wskazujące na niedziałające strony."""
+    return {(page, target) for page, partial in partials.items() for target in _page_links(partial) if target in broken}
+
+
+def _assets(partial: AnalysisPartial) -> Set[str]:
+    """Wszystkie zasoby strony (obrazy, skrypty, arkusze stylów, media, dokumenty)."""
+    return set().union(*(partial.urls[category] for category in ASSET_CATEGORIES))
+
+
+def diff_snapshots(old_pages: Mapping[str, Dict], new_pages: Mapping[str, Dict], analyzer: WebsiteAnalyzer,
+                   old_label: str = '', new_label: str = '',
+                   progress_callback: Optional[Callable[[str], None]] = None) -> SnapshotDiff:
+    """
+    Porównuje dwa pobrania witryny.
+
+    Args:
+        old_pages: Starsze pobranie (słownik lub leniwe źródło, np. migawka magazynu treści)
+        new_pages: Nowsze pobranie
+        analyzer: Analizator - jego pamięć podręczna dostarcza wyniki stron bez zmian
+        old_label: Nazwa starszego pobrania w raporcie
+        new_label: Nazwa nowszego pobrania w raporcie
+        progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+    Returns:
+        Różnice między pobraniami
+    """
+    diff = SnapshotDiff(old_label, new_label, len(old_pages), len(new_pages))
+    old_hashes = content_hashes(old_pages)
+    new_hashes = content_hashes(new_pages)
+    unchanged: List[str] = []
+    for url, key in new_hashes.items():
+        if url not in old_hashes:
+            diff.added.append(url)
+        elif old_hashes[url] != key:
+            diff.changed.append(url)
+        else:
+            unchanged.append(url)
+    diff.removed = [url for url in old_hashes if url not in new_hashes]
+    diff.unchanged_count = len(unchanged)
+
+    for url in new_hashes:
+        if url in old_hashes:
+            old_status = _page_info(old_pages, url)['status_code']
+            new_status = _page_info(new_pages, url)['status_code']
+            if old_status != new_status:
+                diff.status_changes.append((url, old_status, new_status))
+    if progress_callback:
+        progress_callback(f"Porównanie: {len(diff.added)} dodanych, {len(diff.removed)} usuniętych, "
+                          f"{len(diff.changed)} zmienionych stron")
+
+    old_broken = _broken_targets(old_pages)
+    new_broken = _broken_targets(new_pages)
+    # Strony bez zmian mają te same linki w obu pobraniach - liczą się tylko, gdy zmienił się stan celu
+    targets_changed = any(target not in old_broken for target in new_broken) or \
+        any(target not in new_broken for target in old_broken)
+    shared = unchanged if targets_changed else []
+
+    new_partials = analyzer.page_partials(new_pages, diff.changed + diff.added + shared, progress_callback)
+    old_partials = analyzer.page_partials(old_pages, diff.changed, progress_callback)
+    for url in shared:
+        old_partials[url] = new_partials[url]  # ta sama treść i adres - ten sam wynik
+    diff.analyzed_pages = len(new_partials) + len(diff.changed)
+
+    new_pairs = _broken_pairs(new_partials, new_broken)
+    old_pairs = _broken_pairs(old_partials, old_broken)
+    diff.new_broken_links = sorted((page, target, new_broken[target]) for page, target in new_pairs - old_pairs)
+    # Link jest naprawiony, gdy zniknął ze strony albo cel działa - nie gdy cel po prostu nie został pobrany
+    crawled = {normalize_url(url) for url in new_hashes}
+    diff.fixed_broken_links = sorted(
+        (page, target) for page, target in old_pairs - new_pairs
+        if target in crawled or target not in _page_links(new_partials[page])
+    )
+
+    for url in diff.changed:
+        old_assets, new_assets = _assets(old_partials[url]), _assets(new_partials[url])
+        if old_assets != new_assets:
+            diff.asset_changes[url] = (sorted(new_assets - old_assets), sorted(old_assets - new_assets))
+    return diff
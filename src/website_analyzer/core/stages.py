@@ -0,0 +1,181 @@
+"""
+Rejestr etapów analizy wykonywanych po ekstrakcji treści stron.
+
+Każdy etap deklaruje nazwę (pod nią zapisywany jest jego wynik) oraz
+wejścia: dane stron ('urls', 'pages' - metadane bez treści, 'word_counts',
+'links', 'page_urls', 'signatures') lub wyniki innych etapów. Etapy niezależne od siebie są
+wykonywane współbieżnie, poziom po poziomie grafu zależności. Etapy można
+włączać, wyłączać i przestawiać, a własne etapy rejestrować bez zmian
+w analizatorze. Kolejność etapów w rejestrze wyznacza kolejność sekcji raportu.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+# Wejścia liczone z wyników częściowych poszczególnych stron
+PAGE_INPUTS: Dict[str, Callable[[Any], Any]] = {
+    'word_counts': lambda partial: partial.word_freq,
+    'links': lambda partial: partial.urls['links'],
+    'page_urls': lambda partial: partial.urls,
+    'signatures': lambda partial: partial.signature,
+}
+# Wszystkie wejścia dostarczane przez analizator
+BASE_INPUTS = ('urls', 'pages') + tuple(PAGE_INPUTS)
+
+
+class AnalysisStage:
+    """Pojedynczy etap analizy."""
+
+    def __init__(self, name: str, run: Callable[[Dict[str, Any]], Any], requires: Sequence[str] = (),
+                 message: str = '', render: Optional[Callable[[Any], Iterable[str]]] = None):
+        """
+        Args:
+            name: Nazwa etapu i jego wyniku
+            run: Funkcja otrzymująca słownik wejść (tylko zadeklarowanych) i zwracająca wynik
+            requires: Nazwy wejść - danych stron z BASE_INPUTS lub wyników innych etapów
+            message: Komunikat postępu wyświetlany przed uruchomieniem etapu
+            render: Opcjonalna funkcja tworząca z wyniku sekcję raportu tekstowego
+        """
+        self.name = name
+        self.run = run
+        self.requires = tuple(requires)
+        self.message = message
+        self.render = render
+
+
+class StageRegistry:
+    """Zbiór etapów analizy z obsługą zależności."""
+
+    def __init__(self, stages: Iterable[AnalysisStage] = ()):
+        """
+        Args:
+            stages: Początkowe etapy (wszystkie włączone)
+        """
+        self._stages: Dict[str, AnalysisStage] = {}
+        self._disabled: Set[str] = set()
+        for stage in stages:
+            self.register(stage)
+
+    def register(self, stage: AnalysisStage, enabled: bool = True):
+        """Dodaje etap; nazwa musi być unikalna i różna od nazw wejść analizatora."""
+        if stage.name in self._stages or stage.name in BASE_INPUTS:
+            raise ValueError(f"Etap o nazwie '{stage.name}' już istnieje")
+        self._stages[stage.name] = stage
+        if not enabled:
+            self._disabled.add(stage.name)
+
+    def unregister(self, name: str):
+        """Usuwa etap z rejestru."""
+        del self._stages[name]
+        self._disabled.discard(name)
+
+    def enable(self, *names: str):
+        """Włącza wskazane etapy."""
+        for name in names:
+            self._check_known(name)
+            self._disabled.discard(name)
+
+    def disable(self, *names: str):
+        """Wyłącza wskazane etapy (nadal uruchamiane, jeśli wymaga ich włączony etap)."""
+        for name in names:
+            self._check_known(name)
+            self._disabled.add(name)
+
+    def only(self, *names: str):
+        """Włącza tylko wskazane etapy - pozostałe są wyłączane."""
+        for name in names:
+            self._check_known(name)
+        self._disabled = set(self._stages) - set(names)
+
+    def reorder(self, *names: str):
+        """Przestawia wskazane etapy na początek kolejności, w podanym porządku - pozostałe zachowują kolejność."""
+        for name in names:
+            self._check_known(name)
+        order = list(dict.fromkeys(names)) + [name for name in self._stages if name not in names]
+        self._stages = {name: self._stages[name] for name in order}
+
+    def is_enabled(self, name: str) -> bool:
+        """Czy etap zostanie uruchomiony (jest włączony lub wymaga go włączony etap)."""
+        return any(stage.name == name for level in self.plan() for stage in level)
+
+    @property
+    def names(self) -> List[str]:
+        """Nazwy zarejestrowanych etapów w bieżącej kolejności (rejestracji lub ustalonej przez reorder)."""
+        return list(self._stages)
+
+    def get(self, name: str) -> AnalysisStage:
+        """Zwraca etap o podanej nazwie."""
+        self._check_known(name)
+        return self._stages[name]
+
+    def _check_known(self, name: str):
+        if name not in self._stages:
+            raise KeyError(f"Nieznany etap: {name}")
+
+    def plan(self) -> List[List[AnalysisStage]]:
+        """
+        Układa włączone etapy (wraz z wymaganymi przez nie etapami) w poziomy.
+
+        Etapy jednego poziomu zależą tylko od poziomów wcześniejszych, więc
+        mogą być wykonywane współbieżnie.
+
+        Raises:
+            ValueError: Gdy etap wymaga nieznanego wejścia lub zależności są cykliczne
+        """
+        needed: Set[str] = set()
+        pending = [name for name in self._stages if name not in self._disabled]
+        while pending:
+            name = pending.pop()
+            if name in needed:
+                continue
+            needed.add(name)
+            for requirement in self._stages[name].requires:
+                if requirement in self._stages:
+                    pending.append(requirement)
+                elif requirement not in BASE_INPUTS:
+                    raise ValueError(f"Etap '{name}' wymaga nieznanego wejścia '{requirement}'")
+
+        levels = []
+        done: Set[str] = set()
+        while len(done) < len(needed):
+            level = [self._stages[name] for name in self._stages if name in needed and name not in done
+                     and all(req in done or req in BASE_INPUTS for req in self._stages[name].requires)]
+            if not level:
+                raise ValueError("Cykliczne zależności między etapami: " + ', '.join(sorted(needed - done)))
+            levels.append(level)
+            done.update(stage.name for stage in level)
+        return levels
+
+    def required_inputs(self) -> Set[str]:
+        """Wejścia analizatora potrzebne do wykonania zaplanowanych etapów."""
+        return {req for level in self.plan() for stage in level for req in stage.requires if req in BASE_INPUTS}
+
+    def run(self, inputs: Dict[str, Any], max_workers: int = 4,
+            progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Wykonuje zaplanowane etapy.
+
+        Args:
+            inputs: Wartości wejść analizatora (co najmniej required_inputs())
+            max_workers: Maksymalna liczba etapów wykonywanych jednocześnie
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+        Returns:
+            Słownik nazwa etapu -> wynik
+        """
+        values = dict(inputs)
+        outputs: Dict[str, Any] = {}
+        for level in self.plan():
+            if progress_callback:
+                for stage in level:
+                    if stage.message:
+                        progress_callback(stage.message)
+            arguments = [{req: values[req] for req in stage.requires} for stage in level]
+            if len(level) == 1 or max_workers <= 1:
+                results = [stage.run(args) for stage, args in zip(level, arguments)]
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(level))) as executor:
+                    results = list(executor.map(lambda pair: pair[0].run(pair[1]), zip(level, arguments)))
+            for stage, result in zip(level, results):
+                values[stage.name] = outputs[stage.name] = result
+        return outputs
@@ -0,0 +1,96 @@
+"""
+Wspólna trwała pamięć podręczna wyników sprawdzania adresów.
+
+Wyniki (jeden wiersz na adres) są zapisywane w tabeli SQLite razem z czasem
+sprawdzenia i odczytywane tylko przed upływem czasu ważności. Z pamięci
+korzystają etapy sprawdzające wiele adresów przez sieć (linki, rozmiary
+zasobów, nagłówki obrazów) - każdy we własnej tabeli.
+"""
+
+from contextlib import contextmanager
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+
+class UrlResultCache:
+    """Tabela SQLite adres -> wynik sprawdzenia z czasem ważności."""
+
+    # Maksymalna liczba parametrów w jednym zapytaniu IN (...)
+    QUERY_CHUNK = 500
+
+    def __init__(self, db_path: str, table: str, columns: Sequence[Tuple[str, str]]):
+        """
+        Otwiera (lub tworzy) plik pamięci podręcznej z tabelą wyników.
+
+        Args:
+            db_path: Ścieżka do pliku bazy SQLite
+            table: Nazwa tabeli wyników
+            columns: Kolumny wyniku jako pary (nazwa, definicja SQL), np. ('status', 'INTEGER NOT NULL')
+        """
+        self.db_path = db_path
+        self.table = table
+        self.columns = [name for name, _ in columns]
+        folder = os.path.dirname(db_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        definitions = ''.join(f" {name} {definition}," for name, definition in columns)
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                f" url TEXT PRIMARY KEY,{definitions}"
+                f" checked_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Otwiera połączenie na czas jednej transakcji - sprawdzanie działa w osobnych wątkach."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, urls: List[str], ttl: float) -> Dict[str, Tuple]:
+        """
+        Odczytuje aktualne (nieprzeterminowane) wyniki.
+
+        Args:
+            urls: Adresy do odczytu
+            ttl: Czas ważności wyniku w sekundach
+
+        Returns:
+            Słownik adres -> krotka wartości kolumn (tylko znalezione adresy)
+        """
+        found = {}
+        oldest = time.time() - ttl
+        selected = ', '.join(['url'] + self.columns)
+        with self._connect() as conn:
+            for i in range(0, len(urls), self.QUERY_CHUNK):
+                chunk = urls[i:i + self.QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT {selected} FROM {self.table} WHERE checked_at >= ? AND url IN ({placeholders})",
+                    [oldest] + chunk
+                )
+                for url, *values in rows:
+                    found[url] = tuple(values)
+        return found
+
+    def store(self, results: Iterable[Tuple[str, Sequence]]):
+        """
+        Zapisuje wyniki w jednej transakcji, z bieżącym czasem sprawdzenia.
+
+        Args:
+            results: Pary (adres, wartości kolumn w kolejności columns)
+        """
+        now = time.time()
+        names = ', '.join(['url'] + self.columns + ['checked_at'])
+        placeholders = ', '.join('?' * (len(self.columns) + 2))
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} ({names}) VALUES ({placeholders})",
+                ((url,) + tuple(values) + (now,) for url, values in results)
+            )
@@ -0,0 +1,124 @@
+"""
+Wspólna usługa rozwiązywania i klasyfikacji adresów URL.
+
+Wartości href/src są rozwiązywane względem adresu strony, a wyniki
+urljoin/urlsplit są zapamiętywane w ograniczonej pamięci LRU. Linki
+bezwzględne i zaczynające się od '/' nie zależą od ścieżki strony, więc są
+zapamiętywane raz dla całej witryny - typowa nawigacja powtarzana na
+każdej stronie jest rozwiązywana tylko raz.
+"""
+
+from functools import lru_cache
+import posixpath
+from typing import Optional
+from urllib.parse import SplitResult, urljoin, urlsplit
+
+# Wartości, które nie wskazują zasobów HTTP - pozostawiane bez zmian
+SPECIAL_PREFIXES = ('#', 'javascript:', 'mailto:', 'tel:', 'data:')
+HTTP_SCHEMES = ('http', 'https')
+# Części adresu, którego nie da się przetworzyć
+INVALID_URL = SplitResult('', '', '', '', '')
+
+
+class UrlResolver:
+    """Rozwiązuje, normalizuje i klasyfikuje adresy z pamięcią podręczną LRU."""
+
+    def __init__(self, cache_size: int = 65536):
+        """
+        Args:
+            cache_size: Maksymalna liczba zapamiętanych wyników każdej operacji
+        """
+        self._split_cached = lru_cache(maxsize=cache_size)(urlsplit)
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def split(self, url: str) -> SplitResult:
+        """
+        Dzieli adres na części (wynik zapamiętywany).
+
+        Adres, którego nie da się podzielić (np. 'http://[::1'), daje puste
+        części - jest traktowany jak adres inny niż HTTP(S). Błąd nie jest
+        zapamiętywany.
+        """
+        try:
+            return self._split_cached(url)
+        except ValueError:
+            return INVALID_URL
+
+    def _resolve(self, base: str, href: str) -> str:
+        """Faktyczne rozwiązanie adresu względem bazy (wynik zapamiętywany)."""
+        parts = self._split_cached(urljoin(base, href) if base else href)
+        if parts.scheme not in HTTP_SCHEMES:
+            return href
+        return self._join(parts)
+
+    @staticmethod
+    def _join(parts: SplitResult) -> str:
+        """Składa adres w postaci używanej przez crawler (bez fragmentu, pusta ścieżka = '/')."""
+        url = f"{parts.scheme}://{parts.netloc}{parts.path or '/'}"
+        if parts.query:
+            url += f"?{parts.query}"
+        return url
+
+    def resolve(self, page_url: str, href: str) -> str:
+        """
+        Rozwiązuje href względem adresu strony.
+
+        Args:
+            page_url: Adres strony, na której znaleziono link
+            href: Surowa wartość atrybutu
+
+        Returns:
+            Bezwzględny adres HTTP(S) bez fragmentu albo niezmieniona wartość
+            dla linków specjalnych (mailto:, javascript:, '#...' itp.) i niepoprawnych
+        """
+        href = href.strip()
+        if not href or href.startswith(SPECIAL_PREFIXES):
+            return href
+        if href.startswith(('http://', 'https://')):
+            base = ''
+        elif href.startswith('/'):
+            # Adresy od korzenia (i '//host') zależą tylko od schematu i hosta strony
+            page = self.split(page_url)
+            base = f"{page.scheme}://{page.netloc}"
+        else:
+            base = page_url
+        try:
+            return self._resolve_cached(base, href)
+        except ValueError:
+            # Niepoprawny adres (np. niedomknięty nawias IPv6) - surowa wartość, bez zapamiętywania
+            return href
+
+    def resolve_link(self, page_url: str, href: str) -> Optional[str]:
+        """Jak resolve(), ale zwraca None dla adresów innych niż HTTP(S)."""
+        url = self.resolve(page_url, href)
+        return url if self.split(url).scheme in HTTP_SCHEMES else None
+
+    def normalize(self, url: str) -> str:
+        """Sprowadza bezwzględny adres do postaci używanej przez crawler."""
+        return self._join(self.split(url))
+
+    def host(self, url: str) -> str:
+        """Zwraca nazwę hosta (małe litery, bez portu) lub pusty napis."""
+        return self.split(url).hostname or ''
+
+    def extension(self, url: str) -> str:
+        """Zwraca rozszerzenie pliku ze ścieżki adresu (bez zapytania) lub 'unknown'."""
+        ext = posixpath.splitext(self.split(url).path)[1]
+        return ext[1:].lower() if len(ext) > 1 else 'unknown'
+
+    def classify(self, url: str, site_host: str) -> str:
+        """
+        Klasyfikuje rozwiązany adres linku.
+
+        Returns:
+            'email', 'internal' (ten sam host co witryna), 'external' lub 'other'
+        """
+        if url.startswith('mailto:'):
+            return 'email'
+        if self.split(url).scheme in HTTP_SCHEMES:
+            return 'internal' if self.host(url) == site_host else 'external'
+        return 'other'
+
+
+# Wspólna instancja dla całego procesu
+default_resolver = UrlResolver()
@@ -0,0 +1,533 @@
+"""
+Import i eksport witryny w formacie WARC z indeksem CDX.
+
+Plik WARC (.warc.gz) jest ciągiem rekordów, z których każdy jest osobnym
+członem gzip - rekord można więc odczytać bez rozpakowywania pozostałych.
+Zapis i odczyt przetwarzają rekordy kolejno, bez wczytywania całego pobrania
+do pamięci.
+
+Obok pliku WARC zapisywany jest indeks CDX (plik .cdx): jeden wiersz na
+stronę z kanonicznym kluczem adresu (SURT), położeniem i długością rekordu.
+Wiersze są posortowane po kluczu, więc położenie rekordu dowolnego adresu
+znajduje wyszukiwanie binarne w pliku indeksu (cdx_lookup).
+"""
+
+import base64
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import hashlib
+from http import HTTPStatus
+import os
+from typing import BinaryIO, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import uuid
+import zlib
+
+from .page_source import PageSource, SharedFile
+
+WARC_EXTENSION = '.warc.gz'
+CDX_EXTENSION = '.cdx'
+CDX_HEADER = ' CDX N b a m s k r M S V g\n'
+GZIP_MAGIC = b'\x1f\x8b'
+# Nagłówki opisujące transport odpowiedzi - treść w pliku jest już rozpakowana
+# i zdekodowana, więc zapisywane są z prefiksem (jak w innych narzędziach archiwizujących)
+TRANSPORT_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+ORIGINAL_HEADER_PREFIX = 'X-Archive-Orig-'
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class CdxEntry(NamedTuple):
+    """Wiersz indeksu CDX."""
+    url_key: str
+    timestamp: str
+    url: str
+    mime_type: str
+    status: str
+    digest: str
+    length: int
+    offset: int
+    filename: str
+
+
+def cdx_url_key(url: str) -> str:
+    """
+    Kanoniczny klucz adresu w formacie SURT (np. 'com,example)/katalog?a=1&b=2').
+
+    Pomijane są schemat, przedrostek www, port domyślny i fragment, a parametry
+    zapytania są sortowane - różne zapisy tego samego adresu mają ten sam klucz.
+    """
+    parts = urlsplit(url.strip().lower())
+    host = parts.hostname or ''
+    if host.startswith('www.'):
+        host = host[4:]
+    key = ','.join(reversed(host.split('.')))
+    if parts.port and parts.port not in (80, 443):
+        key += f':{parts.port}'
+    key += ')' + (parts.path or '/')
+    if parts.query:
+        key += '?' + urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return key
+
+
+def payload_digest(payload: bytes) -> str:
+    """Skrót treści odpowiedzi w formacie WARC (SHA-1 w base32)."""
+    return 'sha1:' + base64.b32encode(hashlib.sha1(payload).digest()).decode('ascii')
+
+
+def _gzip_member(data: bytes) -> bytes:
+    """Kompresuje rekord jako samodzielny człon gzip."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _warc_record(warc_headers: List[Tuple[str, str]], block: bytes) -> bytes:
+    """Składa rekord WARC z nagłówków i bloku danych."""
+    lines = ['WARC/1.0'] + [f"{name}: {value}" for name, value in warc_headers]
+    lines.append(f"Content-Length: {len(block)}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + block + b'\r\n\r\n'
+
+
+def _page_charset(headers: Mapping[str, str]) -> str:
+    """Kodowanie znaków z nagłówka Content-Type (domyślnie UTF-8)."""
+    for name, value in headers.items():
+        if name.lower() == 'content-type':
+            for parameter in value.split(';')[1:]:
+                key, _, charset = parameter.partition('=')
+                if key.strip().lower() == 'charset' and charset.strip():
+                    return charset.strip().strip('"\'')
+    return 'utf-8'
+
+
+def _encode_payload(page_data: Dict) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Koduje treść strony w kodowaniu z nagłówka Content-Type.
+
+    Gdy treści nie da się zapisać w zadeklarowanym kodowaniu, zapisywana jest
+    w UTF-8, a nagłówek Content-Type jest odpowiednio poprawiany.
+    """
+    headers = dict(page_data['headers'])
+    charset = _page_charset(headers)
+    try:
+        return page_data['content'].encode(charset), headers
+    except (LookupError, UnicodeEncodeError):
+        for name, value in headers.items():
+            if name.lower() == 'content-type':
+                headers[name] = value.split(';')[0].strip() + '; charset=utf-8'
+        return page_data['content'].encode('utf-8'), headers
+
+
+def _http_response(page_data: Dict) -> Tuple[bytes, bytes, str]:
+    """
+    Składa odpowiedź HTTP zapisywaną w rekordzie typu response.
+
+    Returns:
+        Krotka (blok rekordu, treść odpowiedzi, typ MIME)
+    """
+    payload, headers = _encode_payload(page_data)
+    status = page_data['status_code']
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ''
+    lines = [f"HTTP/1.1 {status} {reason}".rstrip()]
+    mime_type = '-'
+    for name, value in headers.items():
+        if name.lower() in TRANSPORT_HEADERS:
+            name = ORIGINAL_HEADER_PREFIX + name
+        elif name.lower() == 'content-type':
+            mime_type = value.split(';')[0].strip().lower() or '-'
+        lines.append(f"{name}: {value}")
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', 'replace')
+    return head + payload, payload, mime_type
+
+
+def _record_date(page_data: Dict, default: datetime) -> datetime:
+    """Czas pobrania strony z nagłówka Date odpowiedzi (gdy go brak - czas eksportu)."""
+    for name, value in page_data['headers'].items():
+        if name.lower() == 'date':
+            try:
+                return parsedate_to_datetime(value).astimezone(timezone.utc)
+            except (TypeError, ValueError):
+                break
+    return default
+
+
+def write_warc(downloaded_pages: Mapping[str, Dict], warc_path: str,
+               progress_callback: Optional[Callable[[str], None]] = None) -> int:
+    """
+    Zapisuje strony do pliku WARC (rekord warcinfo i rekord response na stronę) oraz jego indeks CDX.
+
+    Strony są zapisywane kolejno - w pamięci jest tylko bieżący rekord
+    i wiersze indeksu. Plik powstaje pod tymczasową nazwą i jest podmieniany
+    dopiero po zapisaniu całości.
+
+    Args:
+        downloaded_pages: Słownik lub leniwe źródło z danymi stron
+        warc_path: Ścieżka pliku WARC (.warc.gz); indeks trafia do pliku z dodanym rozszerzeniem .cdx
+        progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+    Returns:
+        Liczba zapisanych stron
+    """
+    if isinstance(downloaded_pages, PageSource):
+        pages = downloaded_pages.iter_pages()
+    else:
+        pages = iter(downloaded_pages.items())
+    total = len(downloaded_pages)
+    filename = os.path.basename(warc_path)
+    exported_at = datetime.now(timezone.utc)
+    warcinfo_id = f"<urn:uuid:{uuid.uuid4()}>"
+
+    entries: List[str] = []
+    temp_path = warc_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        info = b'software: Analizator Stron Internetowych\r\nformat: WARC File Format 1.0\r\n'
+        f.write(_gzip_member(_warc_record([
+            ('WARC-Type', 'warcinfo'),
+            ('WARC-Date', exported_at.strftime('%Y-%m-%dT%H:%M:%SZ')),
+            ('WARC-Filename', filename),
+            ('WARC-Record-ID', warcinfo_id),
+            ('Content-Type', 'application/warc-fields'),
+        ], info)))
+
+        for i, (url, page_data) in enumerate(pages, 1):
+            block, payload, mime_type = _http_response(page_data)
+            date = _record_date(page_data, exported_at)
+            digest = payload_digest(payload)
+            record = _gzip_member(_warc_record([
+                ('WARC-Type', 'response'),
+                ('WARC-Target-URI', url),
+                ('WARC-Date', date.strftime('%Y-%m-%dT%H:%M:%SZ')),
+                ('WARC-Record-ID', f"<urn:uuid:{uuid.uuid4()}>"),
+                ('WARC-Warcinfo-ID', warcinfo_id),
+                ('WARC-Payload-Digest', digest),
+                ('Content-Type', 'application/http; msgtype=response'),
+            ], block))
+            entries.append(' '.join([
+                cdx_url_key(url), date.strftime('%Y%m%d%H%M%S'), url.replace(' ', '%20'), mime_type,
+                str(page_data['status_code']), digest.split(':', 1)[1], '-', '-',
+                str(len(record)), str(f.tell()), filename
+            ]))
+            f.write(record)
+            if progress_callback and (i % 500 == 0 or i == total):
+                progress_callback(f"Zapisano w pliku WARC {i}/{total} stron")
+    os.replace(temp_path, warc_path)
+    _write_cdx(entries, warc_path + CDX_EXTENSION)
+    return len(entries)
+
+
+def _write_cdx(entries: List[str], cdx_path: str):
+    """Zapisuje posortowany indeks CDX (kolejność bajtowa - jak 'LC_ALL=C sort')."""
+    entries.sort()
+    temp_path = cdx_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(CDX_HEADER)
+        for entry in entries:
+            f.write(entry + '\n')
+    os.replace(temp_path, cdx_path)
+
+
+def _iter_members(f: BinaryIO) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Odczytuje kolejne człony gzip pliku bez wczytywania całego pliku.
+
+    Yields:
+        Krotki (położenie członu, długość skompresowana, dane po rozpakowaniu)
+    """
+    offset = 0
+    pending = b''
+    while True:
+        if not pending:
+            pending = f.read(READ_CHUNK_SIZE)
+            if not pending:
+                return
+        decompressor = zlib.decompressobj(31)
+        parts = []
+        consumed = 0
+        data = pending
+        while True:
+            parts.append(decompressor.decompress(data))
+            if decompressor.eof:
+                consumed += len(data) - len(decompressor.unused_data)
+                pending = decompressor.unused_data
+                break
+            consumed += len(data)
+            data = f.read(READ_CHUNK_SIZE)
+            if not data:
+                raise ValueError("Niepełny rekord na końcu pliku WARC")
+        yield offset, consumed, b''.join(parts)
+        offset += consumed
+
+
+def _parse_record(data: bytes) -> Tuple[Dict[str, str], bytes]:
+    """
+    Rozdziela rekord WARC na nagłówki (nazwy małymi literami) i blok danych.
+
+    Raises:
+        ValueError: Gdy dane nie są pojedynczym rekordem WARC
+    """
+    head, _, rest = data.partition(b'\r\n\r\n')
+    lines = head.decode('utf-8', 'replace').split('\r\n')
+    if not lines[0].startswith('WARC/'):
+        raise ValueError("Nieprawidłowy rekord WARC")
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', len(rest)))
+    if rest[length:].strip():
+        raise ValueError("Człon gzip zawiera więcej niż jeden rekord WARC - wymagana kompresja per rekord")
+    return headers, rest[:length]
+
+
+def _is_http_response(warc_headers: Dict[str, str]) -> bool:
+    """Czy rekord zawiera odpowiedź HTTP z treścią strony."""
+    return (warc_headers.get('warc-type') == 'response'
+            and warc_headers.get('content-type', '').startswith('application/http'))
+
+
+def _dechunk(body: bytes) -> bytes:
+    """Składa treść przesłaną w kodowaniu chunked."""
+    parts = []
+    position = 0
+    while position < len(body):
+        line_end = body.find(b'\r\n', position)
+        if line_end < 0:
+            break
+        size = int(body[position:line_end].split(b';')[0] or b'0', 16)
+        if size == 0:
+            break
+        parts.append(body[line_end + 2:line_end + 2 + size])
+        position = line_end + 2 + size + 2
+    return b''.join(parts)
+
+
+def _parse_http_response(block: bytes) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Rozdziela odpowiedź HTTP na kod, nagłówki i treść.
+
+    Nagłówki zapisane z prefiksem X-Archive-Orig- wracają pod pierwotną
+    nazwą; treść zapisana przez inne narzędzia w postaci surowej (chunked,
+    gzip, deflate) jest składana i rozpakowywana.
+    """
+    head, _, body = block.partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status_code = int(lines[0].split()[1])
+    headers: Dict[str, str] = {}
+    lowered: Dict[str, str] = {}
+    restored = False
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        name, value = name.strip(), value.strip()
+        if name.lower().startswith(ORIGINAL_HEADER_PREFIX.lower()):
+            name = name[len(ORIGINAL_HEADER_PREFIX):]
+            restored = True
+        if name.lower() in lowered:
+            # Powtórzony nagłówek - łączony jak w bibliotece requests
+            name = lowered[name.lower()]
+            headers[name] += ', ' + value
+        else:
+            lowered[name.lower()] = name
+            headers[name] = value
+    if not restored:
+        encoding = headers.get(lowered.get('transfer-encoding', ''), '').lower()
+        if 'chunked' in encoding:
+            body = _dechunk(body)
+        content_encoding = headers.get(lowered.get('content-encoding', ''), '').lower()
+        if content_encoding in ('gzip', 'x-gzip', 'deflate'):
+            try:
+                body = zlib.decompress(body, 47 if 'gzip' in content_encoding else zlib.MAX_WBITS)
+            except zlib.error:
+                pass  # treść nie była skompresowana mimo nagłówka
+    return status_code, headers, body
+
+
+def is_warc_file(path: str) -> bool:
+    """Czy plik jest plikiem WARC kompresowanym gzip."""
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        head = f.read(64 * 1024)
+    if not head.startswith(GZIP_MAGIC):
+        return False
+    try:
+        return zlib.decompressobj(31).decompress(head, 16).startswith(b'WARC/')
+    except zlib.error:
+        return False
+
+
+def build_cdx(warc_path: str, cdx_path: Optional[str] = None,
+              progress_callback: Optional[Callable[[str], None]] = None) -> int:
+    """
+    Buduje indeks CDX dla pliku WARC (np. zapisanego przez inne narzędzie).
+
+    Args:
+        warc_path: Ścieżka pliku WARC
+        cdx_path: Ścieżka indeksu (domyślnie plik WARC z dodanym rozszerzeniem .cdx)
+        progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+    Returns:
+        Liczba zaindeksowanych stron
+    """
+    filename = os.path.basename(warc_path)
+    entries = []
+    for entry in _scan_warc(warc_path, progress_callback):
+        entries.append(' '.join([entry.url_key, entry.timestamp, entry.url.replace(' ', '%20'), entry.mime_type,
+                                 entry.status, entry.digest, '-', '-', str(entry.length), str(entry.offset),
+                                 filename]))
+    _write_cdx(entries, cdx_path or warc_path + CDX_EXTENSION)
+    return len(entries)
+
+
+def _scan_warc(warc_path: str, progress_callback: Optional[Callable[[str], None]] = None) -> Iterator[CdxEntry]:
+    """Odczytuje kolejno rekordy odpowiedzi pliku WARC i zwraca ich wiersze indeksu."""
+    filename = os.path.basename(warc_path)
+    count = 0
+    with open(warc_path, 'rb') as f:
+        for offset, length, data in _iter_members(f):
+            warc_headers, block = _parse_record(data)
+            if not _is_http_response(warc_headers):
+                continue
+            url = warc_headers.get('warc-target-uri', '').strip('<>')
+            status_code, headers, payload = _parse_http_response(block)
+            content_type = next((value for name, value in headers.items() if name.lower() == 'content-type'), '')
+            timestamp = ''.join(ch for ch in warc_headers.get('warc-date', '') if ch.isdigit())[:14] or '-'
+            digest = warc_headers.get('warc-payload-digest') or payload_digest(payload)
+            count += 1
+            if progress_callback and count % 500 == 0:
+                progress_callback(f"Zaindeksowano {count} rekordów WARC")
+            yield CdxEntry(cdx_url_key(url), timestamp, url, content_type.split(';')[0].strip().lower() or '-',
+                           str(status_code), digest.split(':', 1)[-1], length, offset, filename)
+
+
+def _parse_cdx_line(line: str) -> CdxEntry:
+    """Odczytuje wiersz indeksu w formacie 'N b a m s k r M S V g'."""
+    fields = line.rstrip('\n').split(' ')
+    return CdxEntry(fields[0], fields[1], fields[2], fields[3], fields[4], fields[5],
+                    int(fields[8]), int(fields[9]), fields[10])
+
+
+def cdx_lookup(cdx_path: str, url: str) -> List[CdxEntry]:
+    """
+    Znajduje rekordy adresu w posortowanym indeksie CDX wyszukiwaniem binarnym w pliku.
+
+    Odczytywanych jest tylko kilkadziesiąt wierszy niezależnie od rozmiaru indeksu.
+
+    Args:
+        cdx_path: Ścieżka pliku indeksu
+        url: Szukany adres (dowolny zapis - porównywany jest klucz SURT)
+
+    Returns:
+        Wiersze indeksu dla adresu (pusta lista, gdy adresu nie ma w archiwum)
+    """
+    key = cdx_url_key(url).encode('utf-8')
+    prefix = key + b' '
+    with open(cdx_path, 'rb') as f:
+
+        def line_from(position: int) -> bytes:
+            """Pierwszy wiersz zaczynający się nie wcześniej niż w podanym miejscu."""
+            f.seek(max(0, position - 1))
+            if position:
+                f.readline()
+            return f.readline()
+
+        # Najmniejsze położenie, od którego pierwszy wiersz ma klucz nie mniejszy od szukanego
+        low, high = 0, os.fstat(f.fileno()).st_size
+        while low < high:
+            middle = (low + high) // 2
+            line = line_from(middle)
+            if line and line.split(b' ', 1)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        results = []
+        line = line_from(low)
+        while line.startswith(prefix):
+            results.append(_parse_cdx_line(line.decode('utf-8')))
+            line = f.readline()
+    return results
+
+
+class WarcArchive(PageSource):
+    """Plik WARC odczytywany leniwie - położenie rekordów pochodzi z indeksu CDX."""
+
+    def __init__(self, warc_path: str, progress_callback: Optional[Callable[[str], None]] = None):
+        """
+        Wczytuje indeks CDX pliku WARC - gdy go brak lub jest starszy od pliku, buduje go.
+
+        Args:
+            warc_path: Ścieżka pliku WARC
+            progress_callback: Opcjonalna funkcja callback do informowania o postępie
+
+        Raises:
+            ValueError: Gdy plik nie jest plikiem WARC kompresowanym per rekord
+        """
+        self.warc_path = warc_path
+        self.cdx_path = warc_path + CDX_EXTENSION
+        filename = os.path.basename(warc_path)
+        if (not os.path.exists(self.cdx_path)
+                or os.path.getmtime(self.cdx_path) < os.path.getmtime(warc_path)):
+            try:
+                build_cdx(warc_path, self.cdx_path, progress_callback)
+                entries = self._read_cdx(filename)
+            except OSError:
+                # Katalog tylko do odczytu - indeks pozostaje w pamięci
+                entries = list(_scan_warc(warc_path, progress_callback))
+        else:
+            entries = self._read_cdx(filename)
+
+        # Kolejność stron jak w pliku; przy powtórzonym adresie obowiązuje ostatni rekord
+        self._records: Dict[str, Tuple[int, int]] = {}
+        for entry in sorted(entries, key=lambda entry: entry.offset):
+            self._records.pop(entry.url, None)
+            self._records[entry.url] = (entry.offset, entry.length)
+        self._info: Dict[str, Dict] = {}
+        self._file = SharedFile(warc_path)
+
+    def _read_cdx(self, filename: str) -> List[CdxEntry]:
+        """Wczytuje wiersze indeksu dotyczące tego pliku WARC."""
+        with open(self.cdx_path, 'r', encoding='utf-8') as f:
+            return [entry for entry in (_parse_cdx_line(line) for line in f if not line.startswith(' CDX'))
+                    if entry.filename == filename]
+
+    def urls(self) -> List[str]:
+        return list(self._records)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._records
+
+    def __getitem__(self, url: str) -> Dict:
+        page = self._read_page(url)
+        self._info.setdefault(url, {key: value for key, value in page.items() if key != 'content'})
+        return page
+
+    def page_info(self, url: str) -> Dict:
+        # Nagłówki i rozmiar wymagają odczytu rekordu - metadane są zapamiętywane
+        if url not in self._info:
+            self[url]
+        return self._info[url]
+
+    def read_content(self, url: str) -> str:
+        return self._read_page(url)['content']
+
+    def _read_page(self, url: str) -> Dict:
+        """Odczytuje i rozpakowuje rekord strony."""
+        offset, length = self._records[url]
+        _, block = _parse_record(zlib.decompress(self._file.read(offset, length), 31))
+        status_code, headers, payload = _parse_http_response(block)
+        try:
+            content = payload.decode(_page_charset(headers), 'replace')
+        except LookupError:
+            content = payload.decode('utf-8', 'replace')
+        return {'status_code': status_code, 'headers': headers, 'url': url, 'size': len(content),
+                'content': content}
+
+    def close(self):
+        """Zamyka otwarte uchwyty pliku WARC."""
+        self._file.close()
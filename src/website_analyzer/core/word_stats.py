@@ -0,0 +1,75 @@
+"""
+Statystyki słów o ograniczonym zużyciu pamięci.
+
+HeavyHitters to podsumowanie Misra-Gries (odpowiednik algorytmu Space-Saving):
+przechowuje najwyżej około 2 * capacity liczników niezależnie od liczby
+różnych słów w witrynie, a błąd każdej zwróconej wartości jest ograniczony.
+"""
+
+import heapq
+from typing import Iterable, List, Mapping, Optional, Tuple, Union
+
+
+class HeavyHitters:
+    """
+    Przybliżony licznik najczęstszych słów o stałym limicie pamięci.
+
+    Zwracane wartości są niedoszacowane: rzeczywista liczba wystąpień słowa
+    mieści się w przedziale [count, count + error_bound], przy czym
+    error_bound <= total / (capacity + 1). Podsumowania można scalać,
+    więc nadają się do analizy równoległej.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Liczba słów, dla których gwarantowana jest dokładność
+        """
+        if capacity < 1:
+            raise ValueError("Pojemność licznika musi być dodatnia")
+        self.capacity = capacity
+        self.counts = {}
+        self.total = 0        # łączna liczba zliczonych wystąpień
+        self.error_bound = 0  # suma odjętych wartości = maksymalny błąd pojedynczego licznika
+
+    def update(self, other: Union[Mapping[str, int], 'HeavyHitters']):
+        """
+        Dolicza dokładny licznik strony (np. Counter) lub scala inne podsumowanie.
+
+        Args:
+            other: Słownik słowo -> liczba wystąpień albo inny obiekt HeavyHitters
+        """
+        if isinstance(other, HeavyHitters):
+            self.error_bound += other.error_bound
+            other_counts = other.counts
+            self.total += other.total
+        else:
+            other_counts = other
+            self.total += sum(other_counts.values())
+
+        counts = self.counts
+        for word, count in other_counts.items():
+            counts[word] = counts.get(word, 0) + count
+
+        # Redukcja odkładana do przekroczenia 2x limitu - koszt zamortyzowany
+        if len(counts) > 2 * self.capacity:
+            self._reduce()
+
+    def _reduce(self):
+        """Odejmuje (capacity+1)-tą największą wartość od wszystkich liczników."""
+        threshold = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        self.counts = {word: count - threshold for word, count in self.counts.items() if count > threshold}
+        self.error_bound += threshold
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Zwraca n słów o największych oszacowanych licznikach."""
+        if n is None:
+            return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+    def items(self) -> Iterable[Tuple[str, int]]:
+        """Pary (słowo, oszacowany licznik)."""
+        return self.counts.items()
+
+    def __len__(self) -> int:
+        return len(self.counts)
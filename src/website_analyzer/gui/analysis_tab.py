@@ -4,7 +4,7 @@ Komponent GUI zakładki analizy.
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
-from typing import Dict, TYPE_CHECKING
+from typing import Mapping, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .main_window import MainWindow
@@ -38,6 +38,24 @@ class AnalysisTab:
         ttk.Button(control_frame, text="📊 Eksportuj Raport", 
                   command=self.export_report).pack(side='left', padx=5)
         
+        self.check_links_btn = ttk.Button(control_frame, text="🔗 Sprawdź Linki", 
+                                          command=self.check_links)
+        self.check_links_btn.pack(side='left', padx=5)
+        
+        self.page_weight_btn = ttk.Button(control_frame, text="⚖️ Waga Stron", 
+                                          command=self.profile_page_weight)
+        self.page_weight_btn.pack(side='left', padx=5)
+        
+        self.check_images_btn = ttk.Button(control_frame, text="🖼️ Sprawdź Obrazy", 
+                                           command=self.check_images)
+        self.check_images_btn.pack(side='left', padx=5)
+        
+        # Tryb próby dla bardzo dużych witryn (0 = analiza wszystkich stron)
+        ttk.Label(control_frame, text="Próba stron (0 = wszystkie):").pack(side='left', padx=(15, 5))
+        self.sample_size_var = tk.IntVar(value=0)
+        ttk.Spinbox(control_frame, from_=0, to=1000000, increment=100, width=8,
+                    textvariable=self.sample_size_var).pack(side='left')
+        
         # Pasek postępu dla analizy
         self.analysis_progress = ttk.Progressbar(control_frame, mode='indeterminate', length=200)
         self.analysis_progress.pack(side='right')
@@ -113,16 +131,84 @@ class AnalysisTab:
         self.documents_text = scrolledtext.ScrolledText(documents_container, wrap=tk.WORD, font=('Courier', 9))
         self.documents_text.pack(fill='both', expand=True)
         
+        # Zakładka słów kluczowych
+        keywords_frame = ttk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(keywords_frame, text="🔑 Słowa kluczowe")
+        keywords_container = ttk.Frame(keywords_frame)
+        keywords_container.pack(fill='both', expand=True, padx=10, pady=10)
+        self.keywords_text = scrolledtext.ScrolledText(keywords_container, wrap=tk.WORD, font=('Courier', 9))
+        self.keywords_text.pack(fill='both', expand=True)
+        
+        # Zakładka grafu linków
+        graph_frame = ttk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(graph_frame, text="🕸️ Graf linków")
+        graph_container = ttk.Frame(graph_frame)
+        graph_container.pack(fill='both', expand=True, padx=10, pady=10)
+        self.graph_text = scrolledtext.ScrolledText(graph_container, wrap=tk.WORD, font=('Courier', 9))
+        self.graph_text.pack(fill='both', expand=True)
+        
+        # Zakładka stron prawie identycznych
+        duplicates_frame = ttk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(duplicates_frame, text="👯 Podobne strony")
+        duplicates_container = ttk.Frame(duplicates_frame)
+        duplicates_container.pack(fill='both', expand=True, padx=10, pady=10)
+        self.duplicates_text = scrolledtext.ScrolledText(duplicates_container, wrap=tk.WORD, font=('Courier', 9))
+        self.duplicates_text.pack(fill='both', expand=True)
+        
+        # Zakładka sprawdzania linków
+        check_frame = ttk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(check_frame, text="✅ Sprawdzanie linków")
+        check_container = ttk.Frame(check_frame)
+        check_container.pack(fill='both', expand=True, padx=10, pady=10)
+        self.check_text = scrolledtext.ScrolledText(check_container, wrap=tk.WORD, font=('Courier', 9))
+        self.check_text.pack(fill='both', expand=True)
+        
+        # Zakładka wagi stron
+        weight_frame = ttk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(weight_frame, text="⚖️ Waga stron")
+        weight_container = ttk.Frame(weight_frame)
+        weight_container.pack(fill='both', expand=True, padx=10, pady=10)
+        self.weight_text = scrolledtext.ScrolledText(weight_container, wrap=tk.WORD, font=('Courier', 9))
+        self.weight_text.pack(fill='both', expand=True)
+        
+        # Zakładka wymiarów obrazów
+        image_check_frame = ttk.Frame(self.analysis_notebook)
+        self.analysis_notebook.add(image_check_frame, text="📐 Wymiary obrazów")
+        image_check_container = ttk.Frame(image_check_frame)
+        image_check_container.pack(fill='both', expand=True, padx=10, pady=10)
+        self.image_check_text = scrolledtext.ScrolledText(image_check_container, wrap=tk.WORD, font=('Courier', 9))
+        self.image_check_text.pack(fill='both', expand=True)
+        
     def analyze_website(self):
         """Uruchamia analizę strony internetowej."""
         self.main_window.analyze_website()
         
-    def display_analysis(self, analysis_data: Dict[str, str]):
+    def get_sample_size(self) -> Optional[int]:
+        """Zwraca wielkość próby stron (None = analiza wszystkich stron)."""
+        try:
+            sample_size = self.sample_size_var.get()
+        except tk.TclError:
+            return None
+        return sample_size if sample_size > 0 else None
+        
+    def check_links(self):
+        """Uruchamia sprawdzanie linków znalezionych podczas analizy."""
+        self.main_window.check_links()
+        
+    def profile_page_weight(self):
+        """Uruchamia profilowanie wagi stron i ich zasobów."""
+        self.main_window.profile_page_weight()
+        
+    def check_images(self):
+        """Uruchamia sprawdzanie formatu i wymiarów obrazów."""
+        self.main_window.check_images()
+        
+    def display_analysis(self, analysis_data: Mapping[str, str]):
         """
         Wyświetla wyniki analizy w zakładkach.
         
         Args:
-            analysis_data: Słownik zawierający wyniki analizy
+            analysis_data: Wynik analizy (sekcja -> tekst generowany przy odczycie)
         """        
         # Wyczyść istniejącą zawartość
         self.stats_text.delete(1.0, tk.END)
@@ -131,11 +217,20 @@ class AnalysisTab:
         self.media_text.delete(1.0, tk.END)
         self.resources_text.delete(1.0, tk.END)
         self.documents_text.delete(1.0, tk.END)
+        self.keywords_text.delete(1.0, tk.END)
+        self.graph_text.delete(1.0, tk.END)
+        self.duplicates_text.delete(1.0, tk.END)
+        self.check_text.delete(1.0, tk.END)
+        self.weight_text.delete(1.0, tk.END)
+        self.image_check_text.delete(1.0, tk.END)
         
         # Wyświetl nową zawartość
         if 'stats' in analysis_data:
             self.stats_text.insert(1.0, analysis_data['stats'])
             
+        if 'sampling' in analysis_data:
+            self.stats_text.insert(tk.END, "\n\n" + analysis_data['sampling'])
+            
         if 'links' in analysis_data:
             self.links_text.insert(1.0, analysis_data['links'])
             
@@ -151,6 +246,24 @@ class AnalysisTab:
         if 'documents' in analysis_data:
             self.documents_text.insert(1.0, analysis_data['documents'])
             
+        if 'keywords' in analysis_data:
+            self.keywords_text.insert(1.0, analysis_data['keywords'])
+            
+        if 'link_graph' in analysis_data:
+            self.graph_text.insert(1.0, analysis_data['link_graph'])
+            
+        if 'near_duplicates' in analysis_data:
+            self.duplicates_text.insert(1.0, analysis_data['near_duplicates'])
+            
+        if 'link_check' in analysis_data:
+            self.check_text.insert(1.0, analysis_data['link_check'])
+            
+        if 'page_weight' in analysis_data:
+            self.weight_text.insert(1.0, analysis_data['page_weight'])
+            
+        if 'image_check' in analysis_data:
+            self.image_check_text.insert(1.0, analysis_data['image_check'])
+            
     def set_analyzing(self, is_analyzing: bool):
         """
         Aktualizuje stan UI na podstawie statusu analizowania.
@@ -160,16 +273,23 @@ class AnalysisTab:
         """
         if is_analyzing:
             self.analyze_btn.config(state='disabled')
+            self.check_links_btn.config(state='disabled')
+            self.page_weight_btn.config(state='disabled')
+            self.check_images_btn.config(state='disabled')
             self.analysis_progress.start()
         else:
             self.analyze_btn.config(state='normal')
+            self.check_links_btn.config(state='normal')
+            self.page_weight_btn.config(state='normal')
+            self.check_images_btn.config(state='normal')
             self.analysis_progress.stop()            
     def export_report(self):
         """Eksportuje raport analizy do pliku."""
         filename = filedialog.asksaveasfilename(
             title="Zapisz raport",
             defaultextension=".txt",
-            filetypes=[("Pliki tekstowe", "*.txt"), ("Wszystkie pliki", "*.*")]        )
+            filetypes=[("Pliki tekstowe", "*.txt"), ("Raport HTML", "*.html"), ("JSON", "*.json"),
+                       ("JSON Lines (strony)", "*.jsonl"), ("Tabele CSV", "*.csv"), ("Wszystkie pliki", "*.*")]        )
         
         if filename:
             if self.main_window.save_analysis_report(filename):
@@ -264,6 +384,18 @@ class AnalysisTab:
             text_widget = self.resources_text
         elif "Dokumenty" in tab_text:
             text_widget = self.documents_text
+        elif "Słowa kluczowe" in tab_text:
+            text_widget = self.keywords_text
+        elif "Graf linków" in tab_text:
+            text_widget = self.graph_text
+        elif "Podobne strony" in tab_text:
+            text_widget = self.duplicates_text
+        elif "Sprawdzanie linków" in tab_text:
+            text_widget = self.check_text
+        elif "Waga stron" in tab_text:
+            text_widget = self.weight_text
+        elif "Wymiary obrazów" in tab_text:
+            text_widget = self.image_check_text
         else:
             messagebox.showinfo("Info", "Brak dostępnych wyników analizy")
             return
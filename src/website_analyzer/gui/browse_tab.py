@@ -4,11 +4,21 @@ Komponent GUI dla zakładki przeglądania.
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext
+import time
 from typing import List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .main_window import MainWindow
 
+# Filtry listy stron - warunki dla MainWindow.filter_pages
+PAGE_FILTERS = {
+    "Wszystkie strony": {},
+    "Błędy (kod ≥ 400)": {'min_status': 400},
+    "Nie znaleziono (404)": {'status_code': 404},
+    "Większe niż 1 MB": {'min_size': 1024 * 1024},
+    "Tylko HTML": {'content_type': 'text/html'},
+}
+
 
 class BrowseTab:
     """Zakładka GUI do przeglądania pobranych stron."""
@@ -30,6 +40,35 @@ class BrowseTab:
         self.page_combo.pack(side='left', fill='x', expand=True, padx=5)
         self.page_combo.bind('<<ComboboxSelected>>', self.show_page)
         
+        ttk.Label(selector_frame, text="Filtr:").pack(side='left', padx=(10, 0))
+        self.filter_combo = ttk.Combobox(selector_frame, state='readonly', width=22, values=list(PAGE_FILTERS))
+        self.filter_combo.current(0)
+        self.filter_combo.pack(side='left', padx=5)
+        self.filter_combo.bind('<<ComboboxSelected>>', self.apply_filter)
+        
+        # Wyszukiwanie pełnotekstowe
+        search_frame = ttk.Frame(self.frame)
+        search_frame.pack(fill='x', pady=5)
+        
+        ttk.Label(search_frame, text="Szukaj:").pack(side='left')
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.pack(side='left', fill='x', expand=True, padx=5)
+        search_entry.bind('<Return>', self.search)
+        ttk.Button(search_frame, text="🔍 Szukaj", command=self.search).pack(side='left')
+        self.index_status_label = ttk.Label(search_frame, text="", foreground='gray')
+        self.index_status_label.pack(side='left', padx=(10, 0))
+        
+        results_frame = ttk.Frame(self.frame)
+        results_frame.pack(fill='x')
+        self.search_results = tk.Listbox(results_frame, height=5)
+        results_scrollbar = ttk.Scrollbar(results_frame, orient='vertical', command=self.search_results.yview)
+        self.search_results.config(yscrollcommand=results_scrollbar.set)
+        self.search_results.pack(side='left', fill='x', expand=True)
+        results_scrollbar.pack(side='right', fill='y')
+        self.search_results.bind('<<ListboxSelect>>', self.open_search_result)
+        self.search_result_urls: List[str] = []
+        
         # Opcje widoku
         options_frame = ttk.Frame(self.frame)
         options_frame.pack(fill='x', pady=5)
@@ -67,6 +106,7 @@ class BrowseTab:
         Args:
             urls: Lista URL-ów do wyświetlenia
         """
+        self.filter_combo.current(0)
         self.page_combo['values'] = urls
         if urls:
             self.page_combo.current(0)
@@ -76,6 +116,48 @@ class BrowseTab:
             self.page_combo.set('')
             self.page_viewer.delete(1.0, tk.END)
             self.status_label.config(text="Brak załadowanych stron")            
+    def apply_filter(self, event=None):
+        """Ogranicza listę stron do stron spełniających wybrany filtr."""
+        filters = PAGE_FILTERS[self.filter_combo.get()]
+        urls = self.main_window.filter_pages(**filters)
+        self.page_combo['values'] = urls
+        if urls:
+            self.page_combo.current(0)
+            self.show_page()
+        else:
+            self.page_combo.set('')
+            self.page_viewer.delete(1.0, tk.END)
+        self.status_label.config(text=f"Filtr: {len(urls)} stron")
+        
+    def set_index_status(self, status: str):
+        """Wyświetla stan indeksu wyszukiwania."""
+        self.index_status_label.config(text=status)
+        
+    def search(self, event=None):
+        """Wyszukuje strony pasujące do wpisanego zapytania."""
+        query = self.search_var.get().strip()
+        self.search_results.delete(0, tk.END)
+        self.search_result_urls = []
+        if not query:
+            return
+            
+        start = time.perf_counter()
+        results = self.main_window.search_pages(query)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        for url, score in results:
+            self.search_results.insert(tk.END, f"{score:6.2f}  {url}")
+            self.search_result_urls.append(url)
+        self.status_label.config(text=f"Znaleziono {len(results)} stron ({elapsed_ms:.0f} ms)")
+        
+    def open_search_result(self, event=None):
+        """Wyświetla stronę wybraną z wyników wyszukiwania."""
+        selection = self.search_results.curselection()
+        if not selection:
+            return
+        self.page_combo.set(self.search_result_urls[selection[0]])
+        self.show_page()
+        
     def show_page(self, event=None):
         """Wyświetla wybraną stronę."""
         selected_url = self.page_combo.get()
@@ -7,6 +7,18 @@ from tkinter import ttk, scrolledtext, filedialog, messagebox
 import time
 from typing import TYPE_CHECKING
 
+from ..core.page_store import STORE_EXTENSION
+from ..core.snapshot_archive import ARCHIVE_EXTENSION
+from ..core.warc_archive import WARC_EXTENSION
+
+# Formaty zapisu witryny w jednym pliku
+WEBSITE_FILETYPES = [
+    ("Archiwum witryny", f"*{ARCHIVE_EXTENSION}"),
+    ("Baza stron SQLite", f"*{STORE_EXTENSION}"),
+    ("Plik WARC", f"*{WARC_EXTENSION}"),
+    ("Wszystkie pliki", "*.*")
+]
+
 if TYPE_CHECKING:
     from .main_window import MainWindow
 
@@ -64,6 +76,10 @@ class DownloadTab:
         pages_frame.pack(fill='x', pady=(5, 0))
         ttk.Spinbox(pages_frame, from_=1, to=500, width=10, textvariable=self.max_pages).pack(side='left')
         ttk.Label(pages_frame, text="stron", foreground='gray').pack(side='left', padx=(5, 0))
+        
+        self.stream_to_disk = tk.BooleanVar(value=False)
+        ttk.Checkbutton(options_section, text="Zapisuj strony na dysk w trakcie pobierania (duże witryny)",
+                        variable=self.stream_to_disk).pack(anchor='w', pady=(10, 0))
         # Sekcja przycisków akcji
         actions_section = ttk.LabelFrame(main_container, text="Akcje", padding=15)
         actions_section.pack(fill='x', pady=(0, 15))
@@ -79,6 +95,15 @@ class DownloadTab:
         self.load_btn = ttk.Button(button_frame, text="📁 Wczytaj z Dysku", command=self.load_website)
         self.load_btn.pack(side='left', padx=5)
         
+        self.import_btn = ttk.Button(button_frame, text="📂 Importuj Folder", command=self.import_folder)
+        self.import_btn.pack(side='left', padx=5)
+        
+        self.export_btn = ttk.Button(button_frame, text="📤 Eksportuj Folder", command=self.export_folder)
+        self.export_btn.pack(side='left', padx=5)
+        
+        self.snapshot_btn = ttk.Button(button_frame, text="📚 Zapisz Migawkę", command=self.save_snapshot)
+        self.snapshot_btn.pack(side='left', padx=5)
+        
         # Pasek postępu
         self.progress = ttk.Progressbar(button_frame, mode='indeterminate', length=200)
         self.progress.pack(side='right')
@@ -96,7 +121,7 @@ class DownloadTab:
         depth = self.download_depth.get()
         max_pages = self.max_pages.get()
         
-        self.main_window.start_download(url, depth, max_pages)
+        self.main_window.start_download(url, depth, max_pages, self.stream_to_disk.get())
         
     def set_downloading(self, is_downloading: bool):
         """
@@ -125,18 +150,66 @@ class DownloadTab:
         self.status_text.update_idletasks()
         
     def save_website(self):
-        """Zapisuje pobraną stronę na dysk."""
-        folder = filedialog.askdirectory(title="Wybierz folder do zapisania")
-        if not folder:
+        """Zapisuje pobraną stronę na dysk w jednym pliku - archiwum lub bazie stron."""
+        filepath = filedialog.asksaveasfilename(
+            title="Zapisz witrynę",
+            defaultextension=ARCHIVE_EXTENSION,
+            filetypes=WEBSITE_FILETYPES
+        )
+        if not filepath:
             return
             
-        if self.main_window.save_website(folder):
-            messagebox.showinfo("Sukces", f"Witryna zapisana w folderze: {folder}")
+        if self.main_window.save_website_file(filepath):
+            messagebox.showinfo("Sukces", f"Witryna zapisana w pliku: {filepath}")
         else:
             messagebox.showerror("Błąd", "Błąd podczas zapisywania witryny")
             
     def load_website(self):
-        """Wczytuje wcześniej zapisaną stronę z dysku."""
+        """Wczytuje wcześniej zapisaną stronę z archiwum lub bazy stron."""
+        filepath = filedialog.askopenfilename(
+            title="Wybierz zapisaną witrynę",
+            filetypes=WEBSITE_FILETYPES
+        )
+        if not filepath:
+            return
+            
+        if self.main_window.load_website(filepath):
+            messagebox.showinfo("Sukces", "Witryna została wczytana z dysku")
+        else:
+            messagebox.showerror("Błąd", "Nie można wczytać wybranego pliku")
+            
+    def export_folder(self):
+        """Zapisuje pobraną stronę w formacie katalogu (page_NNN.html + metadata.json)."""
+        folder = filedialog.askdirectory(title="Wybierz folder do zapisania")
+        if not folder:
+            return
+            
+        def on_done(success: bool):
+            self.export_btn.config(state='normal')
+            if success:
+                messagebox.showinfo("Sukces", f"Witryna zapisana w folderze: {folder}")
+            else:
+                messagebox.showerror("Błąd", "Błąd podczas zapisywania witryny")
+                
+        # Zapis trwa w tle - przycisk jest zablokowany do jego zakończenia
+        if self.main_window.save_website(folder, on_done):
+            self.export_btn.config(state='disabled')
+            
+    def save_snapshot(self):
+        """Zapisuje pobraną stronę jako kolejną migawkę (tylko zmieniona treść zajmuje miejsce)."""
+        def on_done(success: bool):
+            self.snapshot_btn.config(state='normal')
+            if success:
+                messagebox.showinfo("Sukces", "Migawka witryny została zapisana")
+            else:
+                messagebox.showerror("Błąd", "Błąd podczas zapisywania migawki")
+                
+        # Zapis trwa w tle - przycisk jest zablokowany do jego zakończenia
+        if self.main_window.save_website_snapshot(on_done):
+            self.snapshot_btn.config(state='disabled')
+            
+    def import_folder(self):
+        """Wczytuje stronę zapisaną w formacie katalogu lub najnowszą migawkę z katalogu magazynu migawek."""
         folder = filedialog.askdirectory(title="Wybierz folder z zapisaną witryną")
         if not folder:
             return
@@ -5,11 +5,23 @@ Główne okno aplikacji.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
-from typing import Dict, Optional
+import os
+import time
+from urllib.parse import urlparse
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
 
 from ..core.downloader import WebsiteDownloader
 from ..core.analyzer import WebsiteAnalyzer
+from ..core.analysis_result import AnalysisResult
 from ..core.file_manager import FileManager
+from ..core.page_source import PageSource, select_pages
+from ..core.page_store import STORE_EXTENSION, PageStore
+from ..core.warc_archive import WARC_EXTENSION
+from ..core.search_index import SearchIndex
+from ..core.snapshot_diff import diff_snapshots
+from ..core.link_checker import LinkChecker
+from ..core.page_weight import AssetProber
+from ..core.image_probe import ImageProber
 from ..core.error_handler import set_global_logger, handle_error
 from .download_tab import DownloadTab
 from .analysis_tab import AnalysisTab
@@ -31,12 +43,20 @@ class MainWindow:
         
         # Główne komponenty
         self.downloader = WebsiteDownloader()
-        self.analyzer = WebsiteAnalyzer()
+        self.data_dir = os.path.join(os.path.expanduser('~'), '.website_analyzer')
+        self.analyzer = WebsiteAnalyzer(
+            workers=os.cpu_count() or 1,
+            cache_path=os.path.join(self.data_dir, 'analysis_cache.sqlite')
+        )
         self.file_manager = FileManager()
+        self.search_index = SearchIndex(os.path.join(self.data_dir, 'search_index.sqlite'))
+        self.link_checker = LinkChecker(cache_path=os.path.join(self.data_dir, 'link_cache.sqlite'))
+        self.asset_prober = AssetProber(cache_path=os.path.join(self.data_dir, 'asset_cache.sqlite'))
+        self.image_prober = ImageProber(cache_path=os.path.join(self.data_dir, 'image_cache.sqlite'))
         
         # Przechowywanie danych
-        self.downloaded_pages: Dict[str, Dict] = {}
-        self.current_analysis: Dict[str, str] = {}
+        self.downloaded_pages: Mapping[str, Dict] = {}  # słownik lub leniwe źródło stron z dysku
+        self.current_analysis: Optional[AnalysisResult] = None
         
         self.setup_ui()
         
@@ -74,7 +94,7 @@ class MainWindow:
         self.notebook.add(self.analysis_tab.frame, text="📊 Analiza")
         self.notebook.add(self.browse_tab.frame, text="📖 Przeglądanie")
         
-    def start_download(self, url: str, max_depth: int, max_pages: int):
+    def start_download(self, url: str, max_depth: int, max_pages: int, stream_to_disk: bool = False):
         """
         Rozpoczyna pobieranie strony internetowej w osobnym wątku.
         
@@ -82,6 +102,7 @@ class MainWindow:
             url: URL do rozpoczęcia pobierania
             max_depth: Maksymalna głębokość przeszukiwania
             max_pages: Maksymalna liczba stron do pobrania
+            stream_to_disk: True = zapisuj strony w tle do bazy w katalogu danych aplikacji
         """
         if not url:
             messagebox.showerror("Błąd", "Proszę podać URL witryny")
@@ -92,6 +113,12 @@ class MainWindow:
             
         self.downloader.max_pages = max_pages
         self.downloader.max_depth = max_depth
+        self.downloader.page_store = None
+        if stream_to_disk:
+            store_name = f"{urlparse(url).netloc.replace(':', '_')}-{time.strftime('%Y%m%d-%H%M%S')}{STORE_EXTENSION}"
+            store_path = os.path.join(self.data_dir, 'crawls', store_name)
+            self.downloader.page_store = PageStore(store_path)
+            self.download_tab.log_message(f"Strony będą zapisywane w tle do: {store_path}")
         
         # Rozpocznij pobieranie w osobnym wątku
         thread = threading.Thread(
@@ -118,6 +145,7 @@ class MainWindow:
         """Wywoływana gdy pobieranie zostało zakończone."""
         self.download_tab.set_downloading(False)
         self.browse_tab.update_page_list(list(self.downloaded_pages.keys()))
+        self.start_indexing()
         
     def analyze_website(self):
         """Analizuje pobrane dane strony internetowej."""
@@ -125,6 +153,8 @@ class MainWindow:
             messagebox.showwarning("Brak danych", "Najpierw pobierz witrynę")
             return
             
+        self.analyzer.sample_size = self.analysis_tab.get_sample_size()
+        
         # Rozpocznij analizę w osobnym wątku
         thread = threading.Thread(target=self._analysis_worker)
         thread.daemon = True
@@ -150,12 +180,124 @@ class MainWindow:
         self.analysis_tab.display_analysis(self.current_analysis)
         self.download_tab.log_message("Analiza zakończona!")
             
-    def save_website(self, folder_path: str) -> bool:
+    def check_links(self):
+        """Sprawdza działanie linków z ostatniej analizy w osobnym wątku."""
+        if not self.current_analysis or not self.current_analysis.link_sources:
+            messagebox.showwarning("Brak analizy", "Najpierw wykonaj analizę witryny")
+            return
+            
+        thread = threading.Thread(target=self._link_check_worker, args=(self.current_analysis,))
+        thread.daemon = True
+        thread.start()
+        
+    def _link_check_worker(self, analysis: AnalysisResult):
+        """Metoda robocza do sprawdzania linków w osobnym wątku."""
+        self.root.after(0, lambda: self.analysis_tab.set_analyzing(True))
+        try:
+            analysis.link_check = self.link_checker.check(analysis.link_sources, self._log_message)
+            self.root.after(0, self._link_check_completed)
+        except Exception as e:
+            handle_error("sprawdzania linków", e, show_gui=True)
+            self.root.after(0, lambda: self.analysis_tab.set_analyzing(False))
+            
+    def _link_check_completed(self):
+        """Wywoływana gdy sprawdzanie linków zostało zakończone."""
+        self.analysis_tab.set_analyzing(False)
+        self.analysis_tab.display_analysis(self.current_analysis)
+        self.download_tab.log_message("Sprawdzanie linków zakończone!")
+        
+    def profile_page_weight(self):
+        """Ustala wagę stron (HTML + zasoby) z ostatniej analizy w osobnym wątku."""
+        if not self.current_analysis or not self.current_analysis.page_sizes:
+            messagebox.showwarning("Brak analizy", "Najpierw wykonaj analizę witryny")
+            return
+            
+        thread = threading.Thread(target=self._page_weight_worker, args=(self.current_analysis,))
+        thread.daemon = True
+        thread.start()
+        
+    def _page_weight_worker(self, analysis: AnalysisResult):
+        """Metoda robocza do profilowania wagi stron w osobnym wątku."""
+        self.root.after(0, lambda: self.analysis_tab.set_analyzing(True))
+        try:
+            analysis.page_weight = self.asset_prober.profile(analysis.page_sizes, analysis.page_assets, self._log_message)
+            self.root.after(0, self._page_weight_completed)
+        except Exception as e:
+            handle_error("profilowania wagi stron", e, show_gui=True)
+            self.root.after(0, lambda: self.analysis_tab.set_analyzing(False))
+            
+    def _page_weight_completed(self):
+        """Wywoływana gdy profilowanie wagi stron zostało zakończone."""
+        self.analysis_tab.set_analyzing(False)
+        self.analysis_tab.display_analysis(self.current_analysis)
+        self.download_tab.log_message("Profil wagi stron gotowy!")
+        
+    def check_images(self):
+        """Sprawdza format i wymiary obrazów z ostatniej analizy w osobnym wątku."""
+        if not self.current_analysis or not self.current_analysis.urls['images']:
+            messagebox.showwarning("Brak obrazów", "Najpierw wykonaj analizę witryny zawierającej obrazy")
+            return
+            
+        thread = threading.Thread(target=self._image_check_worker, args=(self.current_analysis,))
+        thread.daemon = True
+        thread.start()
+        
+    def _image_check_worker(self, analysis: AnalysisResult):
+        """Metoda robocza do sprawdzania obrazów w osobnym wątku."""
+        self.root.after(0, lambda: self.analysis_tab.set_analyzing(True))
+        try:
+            analysis.image_check = self.image_prober.inspect(sorted(analysis.urls['images']), self._log_message)
+            self.root.after(0, self._image_check_completed)
+        except Exception as e:
+            handle_error("sprawdzania obrazów", e, show_gui=True)
+            self.root.after(0, lambda: self.analysis_tab.set_analyzing(False))
+            
+    def _image_check_completed(self):
+        """Wywoływana gdy sprawdzanie obrazów zostało zakończone."""
+        self.analysis_tab.set_analyzing(False)
+        self.analysis_tab.display_analysis(self.current_analysis)
+        self.download_tab.log_message("Sprawdzanie obrazów zakończone!")
+        
+    def save_website(self, folder_path: str, on_done: Optional[Callable[[bool], None]] = None) -> bool:
         """
-        Zapisuje pobrane dane strony internetowej na dysk.
+        Zapisuje pobrane dane strony internetowej na dysk w tle.
         
         Args:
             folder_path: Katalog do zapisania danych
+            on_done: Funkcja wywoływana w wątku GUI z wynikiem zapisu
+            
+        Returns:
+            True jeśli zapis został rozpoczęty, False gdy brak danych
+        """
+        if not self.downloaded_pages:
+            messagebox.showwarning("Brak danych", "Najpierw pobierz witrynę")
+            return False
+            
+        pages = self.downloaded_pages
+        if not isinstance(pages, PageSource):
+            pages = dict(pages)  # pobieranie w tle nie zmieni zapisywanego słownika
+        thread = threading.Thread(target=self._save_website_worker, args=(pages, folder_path, on_done))
+        thread.daemon = True
+        thread.start()
+        return True
+        
+    def _save_website_worker(self, pages: Mapping[str, Dict], folder_path: str,
+                             on_done: Optional[Callable[[bool], None]]):
+        """Zapisuje witrynę w katalogu - uruchamiana w osobnym wątku."""
+        success = self.file_manager.save_website_data(pages, folder_path, self._log_message)
+        if on_done:
+            self.root.after(0, lambda: on_done(success))
+        
+    def save_website_file(self, filepath: str) -> bool:
+        """
+        Zapisuje pobrane dane strony internetowej do jednego pliku.
+        
+        Plik z rozszerzeniem bazy stron (.sqlite) jest zapisywany jako
+        PageStore, plik .warc.gz jako WARC z indeksem CDX, każdy inny jako
+        archiwum witryny.
+        
+        Args:
+            filepath: Ścieżka pliku
             
         Returns:
             True jeśli operacja się powiodła, False w przeciwnym razie
@@ -164,7 +306,84 @@ class MainWindow:
             messagebox.showwarning("Brak danych", "Najpierw pobierz witrynę")
             return False
             
-        return self.file_manager.save_website_data(self.downloaded_pages, folder_path)
+        if filepath.lower().endswith(STORE_EXTENSION):
+            return self.file_manager.save_website_store(self.downloaded_pages, filepath, self._log_message)
+        if filepath.lower().endswith(WARC_EXTENSION):
+            return self.file_manager.save_website_warc(self.downloaded_pages, filepath, self._log_message)
+        if not self.file_manager.save_website_archive(self.downloaded_pages, filepath, self._log_message):
+            return False
+        if isinstance(self.downloaded_pages, PageSource):
+            # Zapis mógł podmienić plik, z którego czyta bieżące źródło
+            reopened = self.file_manager.open_website_data(filepath)
+            if reopened is not None:
+                self.downloaded_pages.close()
+                self.downloaded_pages = reopened
+        return True
+        
+    def save_website_snapshot(self, on_done: Optional[Callable[[bool], None]] = None) -> bool:
+        """
+        Zapisuje pobrane dane w tle jako kolejną migawkę witryny w magazynie treści z deduplikacją.
+        
+        Migawki każdej witryny trafiają do katalogu danych aplikacji
+        (snapshots/<host>); na dysk zapisywana jest tylko treść zmieniona od
+        poprzednich migawek, a migawka jest deltą względem poprzedniej.
+        Raport porównania z poprzednią migawką trafia do snapshots/<host>/reports.
+        
+        Args:
+            on_done: Funkcja wywoływana w wątku GUI z wynikiem zapisu
+            
+        Returns:
+            True jeśli zapis został rozpoczęty, False gdy brak danych
+        """
+        if not self.downloaded_pages:
+            messagebox.showwarning("Brak danych", "Najpierw pobierz witrynę")
+            return False
+            
+        pages = self.downloaded_pages
+        if not isinstance(pages, PageSource):
+            pages = dict(pages)  # pobieranie w tle nie zmieni zapisywanego słownika
+        thread = threading.Thread(target=self._snapshot_worker, args=(pages, on_done))
+        thread.daemon = True
+        thread.start()
+        return True
+        
+    def _snapshot_worker(self, pages: Mapping[str, Dict], on_done: Optional[Callable[[bool], None]]):
+        """Zapisuje migawkę (skróty i kompresja każdej strony) - uruchamiana w osobnym wątku."""
+        first_url = next(iter(pages))
+        store_path = os.path.join(self.data_dir, 'snapshots', urlparse(first_url).netloc.replace(':', '_'))
+        name = time.strftime('%Y%m%d-%H%M%S')
+        previous = self.file_manager.list_website_snapshots(store_path)
+        base = previous[-1].name if previous else None
+        stats = self.file_manager.save_website_snapshot(pages, store_path, name, base=base,
+                                                        progress_callback=self._log_message)
+        if stats is not None:
+            self._log_message(
+                f"Migawka {name}: {stats.pages} stron, nowych treści {stats.new_blobs} "
+                f"({stats.new_bytes / 1024:.1f} KB), zapisane wiersze {stats.stored_rows} - {store_path}"
+            )
+        if on_done:
+            self.root.after(0, lambda: on_done(stats is not None))
+        if stats is not None and base is not None:
+            # Porównanie analizuje zmienione strony - nadal w tym wątku, poza wątkiem GUI
+            self._compare_snapshots(store_path, base, name)
+        
+    def _compare_snapshots(self, store_path: str, old_name: str, new_name: str):
+        """Porównuje dwie migawki witryny i zapisuje raport różnic - wywoływana w wątku roboczym."""
+        old_pages = self.file_manager.open_website_snapshot(store_path, old_name)
+        new_pages = self.file_manager.open_website_snapshot(store_path, new_name)
+        if old_pages is None or new_pages is None:
+            return
+        try:
+            diff = diff_snapshots(old_pages, new_pages, self.analyzer, old_name, new_name, self._log_message)
+        except Exception as e:
+            self._log_message(handle_error("porównywania migawek", e))
+            return
+        report_path = os.path.join(store_path, 'reports', f"{old_name}_{new_name}.txt")
+        if self.file_manager.save_diff_report(diff, report_path):
+            self._log_message(
+                f"Porównanie z {old_name}: dodane {len(diff.added)}, usunięte {len(diff.removed)}, "
+                f"zmienione {len(diff.changed)}, nowe niedziałające linki {len(diff.new_broken_links)} - {report_path}"
+            )
         
     def save_analysis_report(self, filepath: str) -> bool:
         """
@@ -184,7 +403,9 @@ class MainWindow:
         
     def load_website(self, folder_path: str) -> bool:
         """
-        Wczytuje wcześniej zapisane dane strony internetowej.
+        Otwiera wcześniej zapisane dane strony internetowej.
+        
+        Treść stron pozostaje na dysku i jest odczytywana przy dostępie.
         
         Args:
             folder_path: Katalog zawierający zapisane dane
@@ -192,14 +413,55 @@ class MainWindow:
         Returns:
             True jeśli operacja się powiodła, False w przeciwnym razie
         """
-        loaded_data = self.file_manager.load_website_data(folder_path)
+        loaded_data = self.file_manager.open_website_data(folder_path)
         if loaded_data:
             self.downloaded_pages = loaded_data
             self.browse_tab.update_page_list(list(self.downloaded_pages.keys()))
             self.download_tab.log_message(f"Załadowano {len(loaded_data)} stron z dysku")
+            self.start_indexing()
             return True
         return False
         
+    def start_indexing(self):
+        """Aktualizuje indeks wyszukiwania w osobnym wątku (tylko nowe i zmienione strony)."""
+        self.browse_tab.set_index_status("Indeksowanie...")
+        pages = self.downloaded_pages
+        if not isinstance(pages, PageSource):
+            pages = dict(pages)  # kopia - pobieranie może zmienić słownik w trakcie
+        thread = threading.Thread(target=self._indexing_worker, args=(pages,))
+        thread.daemon = True
+        thread.start()
+        
+    def _indexing_worker(self, pages: Mapping[str, Dict]):
+        """Metoda robocza do indeksowania w osobnym wątku."""
+        try:
+            indexed = self.search_index.update(pages, self._log_message)
+            status = f"Indeks: {self.search_index.page_count} stron (zaktualizowano {indexed})"
+        except Exception as e:
+            status = handle_error("indeksowania", e)
+        self.root.after(0, lambda: self.browse_tab.set_index_status(status))
+        
+    def search_pages(self, query: str) -> List[Tuple[str, float]]:
+        """
+        Wyszukuje pobrane strony zawierające podane słowa lub frazy.
+        
+        Args:
+            query: Zapytanie - słowa oraz frazy w cudzysłowie
+            
+        Returns:
+            Lista par (url, wynik) od najlepiej pasującej strony
+        """
+        return self.search_index.search(query)
+        
+    def filter_pages(self, **filters) -> List[str]:
+        """
+        Zwraca adresy stron spełniających warunki (kod HTTP, rozmiar, typ treści, głębokość).
+        
+        Dla bazy stron filtr jest zapytaniem SQL, dla pozostałych źródeł
+        sprawdzane są tylko metadane - treść stron nie jest wczytywana.
+        """
+        return select_pages(self.downloaded_pages, **filters)
+        
     def get_page_content(self, url: str) -> Optional[str]:
         """
         Pobiera zawartość konkretnej strony.
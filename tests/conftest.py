@@ -0,0 +1,110 @@
+"""
+Wspólne dane testowe - małe witryny budowane w pamięci i lokalny serwer HTTP.
+"""
+
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import re
+import threading
+
+import pytest
+
+
+def make_page(url: str, body: str, status_code: int = 200) -> dict:
+    """Tworzy dane strony w formacie zwracanym przez WebsiteDownloader."""
+    return {
+        'content': body,
+        'status_code': status_code,
+        'headers': {'Content-Type': 'text/html; charset=utf-8'},
+        'url': url,
+        'size': len(body),
+        'is_html': True,
+    }
+
+
+def make_site(count: int = 30) -> dict:
+    """Witryna z powtarzalną treścią, linkami wewnętrznymi, zasobami i stronami błędów."""
+    pages = {}
+    for i in range(count):
+        url = f"https://example.com/sec{i % 3}/page{i}.html"
+        links = ''.join(f"<a href='/sec{(i + k) % 3}/page{(i * 7 + k) % count}.html'>link</a>" for k in range(1, 4))
+        body = (f"<html><head><title>Strona {i}</title><link rel='stylesheet' href='/style{i % 2}.css'>"
+                f"<script src='/app.js'></script></head><body>{links}"
+                f"<a href='https://other.org/x'>zewnętrzny</a><a href='mailto:a@example.com'>poczta</a>"
+                f"<img src='/img/p{i % 5}.png'><a href='/files/doc{i % 4}.pdf'>pdf</a>"
+                f"<p>analiza witryny strona {'kot ' * (i % 4)}pies dom drzewo numer{i}</p></body></html>")
+        pages[url] = make_page(url, body, 404 if i % 10 == 9 else 200)
+    return pages
+
+
+@pytest.fixture
+def site() -> dict:
+    return make_site()
+
+
+class LocalServer:
+    """Lokalny serwer HTTP z ustalonymi odpowiedziami - liczy zapytania do każdej ścieżki."""
+
+    def __init__(self, routes: dict):
+        """
+        Args:
+            routes: Ścieżka -> (kod HTTP, typ treści, treść w bajtach[, kod HTTP odpowiedzi na HEAD]);
+                inne ścieżki zwracają 404
+        """
+        self.routes = routes
+        self.requests = Counter()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_HEAD(self):
+                self._respond(send_body=False)
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+            def _respond(self, send_body):
+                server.requests[(self.command, self.path)] += 1
+                status, content_type, body, *head_status = server.routes.get(self.path, (404, 'text/plain', b'brak'))
+                if head_status and not send_body:
+                    status = head_status[0]
+                total = len(body)
+                match = re.fullmatch(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+                if match and status == 200 and send_body:
+                    start, end = int(match.group(1)), min(int(match.group(2)), total - 1)
+                    body = body[start:end + 1]
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{total}')
+                else:
+                    self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def local_server():
+    """Fabryka lokalnych serwerów HTTP - zamykanych po teście."""
+    servers = []
+
+    def start(routes: dict) -> LocalServer:
+        servers.append(LocalServer(routes))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
@@ -0,0 +1,37 @@
+from conftest import make_page, make_site
+
+from website_analyzer.core.analysis_cache import AnalysisCache
+from website_analyzer.core.analysis_partial import ANALYZER_VERSION, AnalysisPartial
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+
+
+def test_second_analysis_reads_unchanged_pages_from_cache(tmp_path):
+    cache_path = str(tmp_path / 'cache.sqlite')
+    pages = make_site(30)
+    first = WebsiteAnalyzer(cache_path=cache_path).analyze_pages(pages)
+
+    url = next(iter(pages))
+    pages[url] = make_page(url, pages[url]['content'] + '<a href="/nowy.html">nowy</a>')
+    messages = []
+    second = WebsiteAnalyzer(cache_path=cache_path).analyze_pages(pages, messages.append)
+
+    assert 'Pamięć podręczna: 29 stron bez zmian, 1 do analizy' in messages
+    assert second.unique_count('links') == first.unique_count('links') + 1
+    assert dict(WebsiteAnalyzer().analyze_pages(pages)) == dict(second)
+
+
+def test_opening_cache_prunes_results_of_other_analyzer_versions(tmp_path):
+    cache_path = str(tmp_path / 'cache.sqlite')
+    cache = AnalysisCache(cache_path)
+    current = f"{ANALYZER_VERSION}-3-128"
+    cache.put_many({'a': AnalysisPartial()}, current)
+    cache.put_many({'b': AnalysisPartial()}, f"{ANALYZER_VERSION}-4-0")
+    cache.put_many({'c': AnalysisPartial()}, f"{ANALYZER_VERSION - 1}-3-128")
+    cache.put_many({'d': AnalysisPartial()}, f"{ANALYZER_VERSION}0-3-128")
+
+    WebsiteAnalyzer(cache_path=cache_path)
+
+    assert set(cache.get_many('abcd', current)) == {'a'}
+    assert set(cache.get_many('abcd', f"{ANALYZER_VERSION}-4-0")) == {'b'}
+    assert cache.get_many('c', f"{ANALYZER_VERSION - 1}-3-128") == {}
+    assert cache.get_many('d', f"{ANALYZER_VERSION}0-3-128") == {}
@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+
+import pytest
+
+from website_analyzer.core.analysis_result import AnalysisResult
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+
+
+@pytest.fixture
+def result(site):
+    return WebsiteAnalyzer().analyze_pages(site)
+
+
+def test_result_behaves_like_section_dict(result):
+    assert list(result)[:6] == list(AnalysisResult.SECTIONS)
+    assert 'Liczba pobranych stron: 30' in result['stats']
+    assert 'Linki zewnętrzne (1):\n  https://other.org/x' in result['links']
+    assert 'PDF (4):' in result['documents']
+    with pytest.raises(KeyError):
+        result['link_check']  # sekcja bez danych
+    text = io.StringIO()
+    result.write_text(text)
+    assert text.getvalue() == '\n\n'.join(result[section] for section in result)
+
+
+def test_empty_analysis_reports_no_data():
+    result = WebsiteAnalyzer().analyze_pages({})
+    assert result['stats'] == 'Brak danych do analizy.'
+    assert result['links'] == ''
+
+
+def test_json_export_holds_full_data(result):
+    data = json.loads(''.join(result.iter_json()))
+
+    assert (data['total_pages'], data['status_codes']) == (30, {'200': 27, '404': 3})
+    assert data['urls']['links']['total'] == 180
+    assert data['urls']['links']['unique'] == sorted(result.urls['links'])
+    assert data['link_categories'] == {'internal': 34, 'external': 1, 'email': 1, 'other': 0}
+    assert data['word_error_bound'] == 0
+    assert data['top_words'][0] == ['link', 90]
+    assert data['link_graph']['nodes'] == 30
+
+
+def test_csv_tables(result):
+    def rows(table):
+        out = io.StringIO(newline='')
+        result.write_csv(out, table)
+        return list(csv.reader(io.StringIO(out.getvalue())))
+
+    urls = rows('urls')
+    assert urls[0] == ['category', 'group', 'url']
+    assert ['links', 'email', 'mailto:a@example.com'] in urls
+    assert ['documents', 'pdf', 'https://example.com/files/doc0.pdf'] in urls
+    assert len(urls) - 1 == sum(len(result.urls[category]) for category in result.urls)
+    assert rows('status_codes') == [['status_code', 'count'], ['200', '27'], ['404', '3']]
+    with pytest.raises(ValueError):
+        rows('missing')
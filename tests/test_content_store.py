@@ -0,0 +1,74 @@
+from conftest import make_page, make_site
+
+from website_analyzer.core.content_store import ContentStore
+
+
+def changed_site():
+    pages = make_site(30)
+    first = next(iter(pages))
+    pages[first] = dict(pages[first], content=pages[first]['content'] + '<p>zmiana</p>')
+    del pages[list(pages)[-1]]
+    pages['https://example.com/sec0/new.html'] = make_page('https://example.com/sec0/new.html', '<p>nowa</p>')
+    return pages
+
+
+def as_dict(snapshot):
+    return {url: (page['content'], page['status_code']) for url, page in snapshot.items()}
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = ContentStore(str(tmp_path))
+    first = store.save_snapshot('a', make_site(30))
+    second = store.save_snapshot('b', make_site(30))
+
+    assert first.new_blobs == 30
+    assert second.new_blobs == 0
+    assert second.reused_pages == 30
+    assert store.usage()['blobs'] == 30
+
+
+def test_delta_snapshot_stores_only_changes_and_reads_back(tmp_path):
+    store = ContentStore(str(tmp_path))
+    store.save_snapshot('a', make_site(30))
+    pages = changed_site()
+    stats = store.save_snapshot('b', pages, base='a')
+
+    # zmieniona, dodana i usunięta strona
+    assert stats.base == 'a'
+    assert stats.stored_rows == 3
+    assert as_dict(store.open_snapshot('b')) == as_dict(pages)
+    assert as_dict(store.open_snapshot('a')) == as_dict(make_site(30))
+
+
+def test_deleting_base_detaches_delta_and_garbage_collects(tmp_path):
+    store = ContentStore(str(tmp_path))
+    store.save_snapshot('a', make_site(30))
+    pages = changed_site()
+    store.save_snapshot('b', pages, base='a')
+
+    assert store.delete_snapshot('a')
+    removed, freed = store.collect_garbage()
+
+    # usunięte zostały tylko treści, do których odwoływała się wyłącznie migawka 'a'
+    assert removed == 2 and freed > 0
+    assert [info.base for info in store.snapshots()] == [None]
+    assert as_dict(store.open_snapshot('b')) == as_dict(pages)
+
+
+def test_delta_ignores_volatile_headers(tmp_path):
+    def fetched(date: str, content_type: str = 'text/html; charset=utf-8') -> dict:
+        pages = make_site(30)
+        for page in pages.values():
+            page['headers'] = {'Content-Type': content_type, 'Date': date, 'Set-Cookie': f'sesja={date}'}
+        return pages
+
+    store = ContentStore(str(tmp_path))
+    store.save_snapshot('a', fetched('Mon, 19 Oct 2026 02:00:00 GMT'))
+    stats = store.save_snapshot('b', fetched('Tue, 20 Oct 2026 02:00:00 GMT'), base='a')
+
+    assert stats.stored_rows == 0 and stats.reused_pages == 30
+    assert as_dict(store.open_snapshot('b')) == as_dict(make_site(30))
+    # zmiana istotnego nagłówka nadal trafia do delty
+    changed = store.save_snapshot('c', fetched('Wed, 21 Oct 2026 02:00:00 GMT', 'text/html; charset=iso-8859-2'),
+                                  base='a')
+    assert changed.stored_rows == 30
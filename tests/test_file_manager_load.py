@@ -0,0 +1,55 @@
+import json
+import os
+
+from conftest import make_page, make_site
+
+from website_analyzer.core.file_manager import FileManager
+from website_analyzer.core.page_source import PageSource
+
+BODY = "<html>\n<p>zażółć gęślą jaźń</p>\n\n<p>druga linia</p>\n</html>"
+
+
+def saved_site(tmp_path):
+    pages = make_site(10)
+    pages['https://example.com/pl.html'] = make_page('https://example.com/pl.html', BODY)
+    folder = str(tmp_path / 'site')
+    assert FileManager().save_website_data(pages, folder)
+    return pages, folder
+
+
+def test_eager_and_lazy_loads_return_the_same_pages(tmp_path):
+    pages, folder = saved_site(tmp_path)
+    manager = FileManager()
+
+    eager = manager.load_website_data(folder)
+    lazy = manager.load_website_data(folder, lazy=True)
+
+    assert isinstance(eager, dict) and isinstance(lazy, PageSource)
+    assert list(eager) == list(lazy) == list(pages)
+    for url, page in pages.items():
+        assert eager[url]['content'] == lazy[url]['content'] == page['content']
+        assert lazy.page_info(url)['status_code'] == page['status_code']
+
+
+def test_lazy_load_reads_content_on_access(tmp_path):
+    pages, folder = saved_site(tmp_path)
+    lazy = FileManager().load_website_data(folder, lazy=True)
+    url = 'https://example.com/pl.html'
+    with open(os.path.join(folder, 'metadata.json'), encoding='utf-8') as f:
+        filename = next(name for name, info in json.load(f)['pages'].items() if info['url'] == url)
+    path = os.path.join(folder, filename)
+
+    # plik zapisany w systemie Windows - treść jest odczytywana dopiero teraz
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data.replace(b'\n', b'\r\n'))
+
+    assert lazy.read_content(url) == BODY
+    assert lazy.page_info(url)['size'] == pages[url]['size']
+
+
+def test_missing_folder(tmp_path):
+    manager = FileManager()
+    assert manager.load_website_data(str(tmp_path / 'brak')) is None
+    assert manager.load_website_data(str(tmp_path / 'brak'), lazy=True) is None
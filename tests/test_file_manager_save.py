@@ -0,0 +1,110 @@
+import os
+
+import pytest
+from conftest import make_site
+
+from website_analyzer.core.file_manager import TEMP_FOLDER_SUFFIX, FileManager
+
+
+class CrashingPages(dict):
+    """Strony, których odczyt przerywa błąd po podanej liczbie stron."""
+
+    def __init__(self, pages: dict, fail_after: int):
+        super().__init__(pages)
+        self.fail_after = fail_after
+
+    def items(self):
+        for i, item in enumerate(super().items()):
+            if i == self.fail_after:
+                raise OSError("brak miejsca na dysku")
+            yield item
+
+
+@pytest.fixture
+def manager():
+    manager = FileManager()
+    manager.durable_writes = False
+    manager.write_workers = 3
+    return manager
+
+
+def test_save_writes_complete_folder(manager, tmp_path):
+    pages = make_site(40)
+    folder = str(tmp_path / 'site')
+
+    assert manager.save_website_data(pages, folder)
+
+    assert sorted(os.listdir(tmp_path)) == ['site']
+    assert len([name for name in os.listdir(folder) if name.startswith('page_')]) == 40
+    loaded = manager.load_website_data(folder)
+    assert list(loaded) == list(pages)
+    assert all(loaded[url]['content'] == page['content'] for url, page in pages.items())
+
+
+def test_crash_leaves_no_folder(manager, tmp_path):
+    folder = str(tmp_path / 'site')
+    os.makedirs(folder + TEMP_FOLDER_SUFFIX + '1')  # pozostałość wcześniejszego przerwanego zapisu
+
+    assert not manager.save_website_data(CrashingPages(make_site(40), fail_after=25), folder)
+
+    assert os.listdir(tmp_path) == []
+    assert manager.load_website_data(folder) is None
+
+
+def saved_files(folder: str) -> list:
+    return sorted(name for name in os.listdir(folder) if name.startswith('page_'))
+
+
+def test_crash_over_existing_snapshot_keeps_previous_save(manager, tmp_path):
+    folder = str(tmp_path / 'site')
+    previous = make_site(10)
+    manager.save_website_data(previous, folder)
+    files = saved_files(folder)
+    with open(os.path.join(folder, 'notatki.txt'), 'w') as f:
+        f.write('plik użytkownika')
+
+    assert not manager.save_website_data(CrashingPages(make_site(20), fail_after=15), folder)
+
+    loaded = manager.load_website_data(folder)
+    assert list(loaded) == list(previous)
+    assert all(loaded[url]['content'] == page['content'] for url, page in previous.items())
+    assert saved_files(folder) == files  # pliki przerwanego zapisu są usuwane
+
+
+def test_resave_replaces_snapshot_and_keeps_user_files(manager, tmp_path):
+    folder = str(tmp_path / 'site')
+    manager.save_website_data(make_site(10), folder)
+    with open(os.path.join(folder, 'notatki.txt'), 'w') as f:
+        f.write('plik użytkownika')
+
+    for count in (20, 5):
+        pages = make_site(count)
+        assert manager.save_website_data(pages, folder)
+        loaded = manager.load_website_data(folder)
+        assert list(loaded) == list(pages)
+        assert all(loaded[url]['content'] == page['content'] for url, page in pages.items())
+        # pozostają tylko pliki stron bieżącego zapisu
+        assert len(saved_files(folder)) == count
+    assert os.path.exists(os.path.join(folder, 'notatki.txt'))
+    assert not [name for name in os.listdir(folder) if name.endswith('.tmp')]
+
+
+def test_killed_save_before_manifest_keeps_previous_save(manager, tmp_path, monkeypatch):
+    folder = str(tmp_path / 'site')
+    previous = make_site(10)
+    manager.save_website_data(previous, folder)
+
+    def killed(*args):
+        raise KeyboardInterrupt
+    # proces przerwany tuż przed podmianą manifestu - bez sprzątania
+    monkeypatch.setattr(manager, '_save_metadata', killed)
+    monkeypatch.setattr(manager, '_remove_unused_pages', lambda folder_path: None)
+    with pytest.raises(KeyboardInterrupt):
+        manager.save_website_data(make_site(20), folder)
+    monkeypatch.undo()
+
+    assert list(manager.load_website_data(folder)) == list(previous)
+    pages = make_site(20)
+    assert manager.save_website_data(pages, folder)
+    assert list(manager.load_website_data(folder)) == list(pages)
+    assert len(saved_files(folder)) == 20
@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+from urllib.parse import urlparse
+
+from conftest import make_site
+
+from website_analyzer.core.downloader import WebsiteDownloader
+from website_analyzer.core.http_cassette import CassetteReplayer
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Pobranie w osobnym procesie - kolejność zbiorów zależy od PYTHONHASHSEED procesu
+CRAWL_SCRIPT = """
+import json, sys
+from website_analyzer.core.downloader import WebsiteDownloader
+
+start, cassette_path, mode = sys.argv[1:4]
+crawler = WebsiteDownloader(max_pages=10, max_depth=2, timeout=5)
+crawler.request_delay = 0
+with crawler.cassette(cassette_path, record=mode == 'record') as cassette:
+    pages = crawler.download_website(start)
+print(json.dumps({
+    'pages': [[url, page['status_code'], page['content'], page['depth']] for url, page in pages.items()],
+    'misses': getattr(cassette, 'misses', 0),
+}))
+"""
+
+
+def site_routes(count: int = 40) -> dict:
+    """Witryna z make_site - strona główna linkuje do wszystkich stron, więc limit stron ucina pobranie."""
+    site = {urlparse(url).path: page for url, page in make_site(count).items()}
+    routes = {path: (page['status_code'], 'text/html; charset=utf-8', page['content'].encode('utf-8'))
+              for path, page in site.items()}
+    index = ''.join(f"<a href='{path}'>{path}</a>" for path in site)
+    routes['/'] = (200, 'text/html; charset=utf-8', index.encode('utf-8'))
+    return routes
+
+
+def crawl_in_process(start: str, cassette_path: str, mode: str, hash_seed: str) -> dict:
+    env = dict(os.environ, PYTHONHASHSEED=hash_seed, PYTHONPATH=SRC)
+    output = subprocess.run([sys.executable, '-c', CRAWL_SCRIPT, start, cassette_path, mode],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def test_truncated_crawl_replays_in_fresh_process(local_server, tmp_path):
+    server = local_server(site_routes())
+    start = server.url('/')
+    cassette_path = str(tmp_path / 'crawl.sqlite')
+
+    recorded = crawl_in_process(start, cassette_path, 'record', hash_seed='1')
+    assert len(recorded['pages']) == 10  # pobranie ucięte limitem stron
+    server.close()
+
+    replayed = crawl_in_process(start, cassette_path, 'replay', hash_seed='2')
+    assert replayed['misses'] == 0
+    assert replayed['pages'] == recorded['pages']
+
+
+def test_links_keep_document_order(local_server):
+    server = local_server(site_routes())
+    crawler = WebsiteDownloader(max_pages=6, max_depth=1, timeout=5)
+    crawler.request_delay = 0
+
+    pages = crawler.download_website(server.url('/'))
+
+    assert list(pages) == [server.url('/')] + [server.url(f'/sec{i % 3}/page{i}.html') for i in range(5)]
+
+
+def test_stop_cassette_restores_previous_adapters(tmp_path):
+    crawler = WebsiteDownloader(timeout=5)
+    original = dict(crawler.session.adapters)
+    crawler.record_cassette(str(tmp_path / 'a.sqlite'))
+    replayer = crawler.replay_cassette(str(tmp_path / 'a.sqlite'))
+
+    assert crawler.session.get_adapter('https://example.com/') is replayer
+    crawler.stop_cassette()
+    assert dict(crawler.session.adapters) == original
+    assert not any(isinstance(adapter, CassetteReplayer) for adapter in crawler.session.adapters.values())
+    crawler.stop_cassette()  # bez kasety - bez zmian
+    assert dict(crawler.session.adapters) == original
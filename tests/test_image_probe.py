@@ -0,0 +1,62 @@
+import struct
+
+import pytest
+
+from website_analyzer.core.image_probe import ImageInfo, ImageProber, ImageReport, parse_image_header
+
+PNG = b'\x89PNG\r\n\x1a\n' + struct.pack('>I4sII', 13, b'IHDR', 640, 480) + b'\x08\x06\x00\x00\x00'
+GIF = b'GIF89a' + struct.pack('<HH', 16, 8) + b'\x00' * 3
+# SOI, segment APP0, bajt wypełnienia i ramka SOF2 (JPEG progresywny)
+JPEG = (b'\xff\xd8' + b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+        + b'\xff\xff\xc2' + struct.pack('>HBHH', 17, 8, 1080, 1920) + b'\x00' * 10)
+WEBP_VP8X = b'RIFF' + b'\x00' * 4 + b'WEBPVP8X' + b'\x0a\x00\x00\x00' + b'\x00' * 4 \
+    + (299).to_bytes(3, 'little') + (149).to_bytes(3, 'little')
+WEBP_VP8L = b'RIFF' + b'\x00' * 4 + b'WEBPVP8L' + b'\x05\x00\x00\x00' + b'\x2f' \
+    + ((99) | (49 << 14)).to_bytes(4, 'little')
+WEBP_VP8 = b'RIFF' + b'\x00' * 4 + b'WEBPVP8 ' + b'\x00' * 4 + b'\x00' * 3 + b'\x9d\x01\x2a' \
+    + struct.pack('<HH', 320, 240)
+
+
+@pytest.mark.parametrize('data, expected', [
+    (PNG, ('png', 640, 480)),
+    (GIF, ('gif', 16, 8)),
+    (JPEG, ('jpeg', 1920, 1080)),
+    (WEBP_VP8X, ('webp', 300, 150)),
+    (WEBP_VP8L, ('webp', 100, 50)),
+    (WEBP_VP8, ('webp', 320, 240)),
+    (b'<?xml version="1.0"?>\n<svg xmlns="http://www.w3.org/2000/svg"/>', ('svg', None, None)),
+])
+def test_parse_image_header(data, expected):
+    assert parse_image_header(data) == expected
+
+
+def test_truncated_or_unknown_headers():
+    assert parse_image_header(PNG[:20]) is None
+    assert parse_image_header(JPEG[:26]) is None
+    assert parse_image_header(b'<html></html>') is None
+
+
+def test_report_flags_oversized_and_mismatched_images():
+    report = ImageReport({
+        'https://example.com/big.jpg': ImageInfo('jpeg', 4000, 3000, 300_000),
+        'https://example.com/heavy.png': ImageInfo('png', 800, 600, 900_000),
+        'https://example.com/photo.png': ImageInfo('jpeg', 100, 100, 5_000),
+        'https://example.com/icon.svg': ImageInfo('svg'),
+        'https://example.com/broken.gif': ImageInfo('', error='nierozpoznany format'),
+    }, from_cache=0)
+
+    assert report.oversized() == ['https://example.com/big.jpg', 'https://example.com/heavy.png']
+    assert report.mismatched_extensions() == [('https://example.com/photo.png', 'jpeg')]
+    assert report.unreadable() == ['https://example.com/broken.gif']
+    assert report.format_counts() == {'jpeg': 2, 'png': 1, 'svg': 1, '': 1}
+
+
+def test_prober_reads_only_the_header(local_server):
+    body = JPEG + b'\x00' * 100_000
+    server = local_server({'/photo.jpg': (200, 'image/jpeg', body), '/page.gif': (200, 'text/html', b'<html/>')})
+
+    report = ImageProber(max_header_bytes=1024).inspect([server.url('/photo.jpg'), server.url('/page.gif'), 'data:,x'])
+
+    assert report.results[server.url('/photo.jpg')] == ImageInfo('jpeg', 1920, 1080, len(body))
+    assert report.results[server.url('/page.gif')].format == ''
+    assert len(report.results) == 2
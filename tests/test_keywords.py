@@ -0,0 +1,48 @@
+from collections import Counter
+import math
+
+import pytest
+
+from website_analyzer.core.keywords import KeywordIndex
+
+PAGES = {
+    'https://example.com/a': Counter({'python': 4, 'kod': 2, 'strona': 1}),
+    'https://example.com/b': Counter({'ogród': 3, 'kwiaty': 2, 'strona': 1}),
+    'https://example.com/c': Counter({'python': 1, 'ogród': 1, 'strona': 2}),
+}
+
+
+def naive_weights(url: str) -> dict:
+    """TF-IDF liczone wprost ze wzoru - punkt odniesienia dla wersji macierzowej."""
+    counts = PAGES[url]
+    length = sum(counts.values())
+    df = Counter(word for page in PAGES.values() for word in page)
+    raw = {word: count / length * (math.log((1 + len(PAGES)) / (1 + df[word])) + 1) for word, count in counts.items()}
+    norm = math.sqrt(sum(value * value for value in raw.values()))
+    return {word: value / norm for word, value in raw.items()}
+
+
+def test_weights_match_tf_idf_formula():
+    index = KeywordIndex.build(list(PAGES), list(PAGES.values()))
+
+    for url in PAGES:
+        expected = naive_weights(url)
+        keywords = index.page_keywords(url, n=10)
+        assert dict(keywords) == pytest.approx(expected)
+        assert [weight for _, weight in keywords] == sorted(expected.values(), reverse=True)
+
+
+def test_keywords_prefer_distinctive_words():
+    index = KeywordIndex.build(list(PAGES), list(PAGES.values()))
+
+    assert index.page_keywords('https://example.com/a', n=1)[0][0] == 'python'
+    assert index.page_keywords('https://example.com/b', n=2)[0][0] == 'ogród'
+    # słowo obecne na każdej stronie jest mniej charakterystyczne niż słowa wyróżniające strony
+    assert [word for word, _ in index.distinctive_terms(3)] == ['python', 'ogród', 'strona']
+    assert index.page_keywords('https://example.com/brak') == []
+
+
+def test_empty_index():
+    index = KeywordIndex.build([], [])
+    assert index.page_count == 0
+    assert index.distinctive_terms() == []
@@ -0,0 +1,46 @@
+from website_analyzer.core.link_checker import LinkChecker, collect_link_sources
+
+
+def test_sources_are_resolved_and_deduplicated():
+    sources = collect_link_sources(
+        ['https://example.com/a/', 'https://example.com/b.html'],
+        [['x.html', 'x.html#sekcja', 'mailto:a@example.com', 'https://other.org/'], ['/a/x.html']],
+    )
+
+    assert sources == {
+        'https://example.com/a/x.html': ['https://example.com/a/', 'https://example.com/b.html'],
+        'https://other.org/': ['https://example.com/a/'],
+    }
+
+
+def test_each_link_checked_once_with_get_fallback(local_server):
+    server = local_server({
+        '/ok': (200, 'text/html', b'ok'),
+        '/no-head': (200, 'text/html', b'ok', 405),
+    })
+    sources = {server.url(path): ['https://example.com/'] for path in ('/ok', '/no-head', '/missing')}
+
+    report = LinkChecker(max_workers=4).check(sources)
+
+    assert {url: result.status for url, result in report.results.items()} == {
+        server.url('/ok'): 200, server.url('/no-head'): 200, server.url('/missing'): 404,
+    }
+    assert report.broken_links() == [server.url('/missing')]
+    assert report.status_counts() == {200: 2, 404: 1}
+    assert server.requests[('HEAD', '/ok')] == 1 and server.requests[('GET', '/ok')] == 0
+    assert server.requests[('HEAD', '/no-head')] == 1 and server.requests[('GET', '/no-head')] == 1
+
+
+def test_cached_results_skip_requests(local_server, tmp_path):
+    server = local_server({'/ok': (200, 'text/html', b'ok')})
+    sources = {server.url('/ok'): ['https://example.com/'], 'http://127.0.0.1:1/': ['https://example.com/']}
+    cache_path = str(tmp_path / 'links.db')
+
+    first = LinkChecker(cache_path, timeout=2).check(sources)
+    second = LinkChecker(cache_path, timeout=2).check(sources)
+
+    assert first.from_cache == 0
+    # błąd połączenia nie trafia do pamięci podręcznej i jest sprawdzany ponownie
+    assert second.from_cache == 1
+    assert second.broken_links() == ['http://127.0.0.1:1/']
+    assert server.requests[('HEAD', '/ok')] == 1
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from website_analyzer.core.link_graph import LinkGraph
+
+SITE = 'https://example.com'
+PAGES = {
+    f'{SITE}/': ['/b.html', 'c.html#sekcja', 'https://other.org/', '/'],  # link do siebie jest pomijany
+    f'{SITE}/b.html': ['c.html', 'mailto:a@example.com'],
+    f'{SITE}/c.html': ['/'],
+    f'{SITE}/d.html': [f'{SITE}/'],
+    f'{SITE}/e.html': [],
+}
+
+
+def dense_pagerank(graph: LinkGraph, damping: float = 0.85) -> np.ndarray:
+    """PageRank z gęstej macierzy przejść - punkt odniesienia dla wersji CSR."""
+    n = graph.node_count
+    matrix = np.zeros((n, n))
+    for node in range(n):
+        targets = graph.indices[graph.indptr[node]:graph.indptr[node + 1]]
+        if len(targets):
+            matrix[targets, node] = 1 / len(targets)
+        else:
+            matrix[:, node] = 1 / n
+    rank = np.full(n, 1 / n)
+    for _ in range(1000):
+        rank = (1 - damping) / n + damping * matrix @ rank
+    return rank
+
+
+def test_edges_resolve_relative_links_between_crawled_pages():
+    graph = LinkGraph.build(list(PAGES), list(PAGES.values()))
+
+    assert graph.node_count == 5
+    assert graph.edge_count == 5
+    assert graph.in_degree.tolist() == [2, 1, 2, 0, 0]
+    assert graph.out_degree.tolist() == [2, 1, 1, 1, 0]
+
+
+def test_pagerank_and_depth_metrics():
+    graph = LinkGraph.build(list(PAGES), list(PAGES.values()))
+
+    assert graph.pagerank.sum() == pytest.approx(1.0)
+    assert graph.pagerank == pytest.approx(dense_pagerank(graph), abs=1e-8)
+    assert graph.top_pages(1)[0][0] == f'{SITE}/'
+    assert graph.depth.tolist() == [0, 1, 1, -1, -1]
+    assert graph.depth_distribution() == {-1: 2, 0: 1, 1: 2}
+    assert graph.orphan_pages() == [f'{SITE}/d.html', f'{SITE}/e.html']
+    assert graph.dead_end_pages() == [f'{SITE}/e.html']
+    assert graph.unreachable_pages() == [f'{SITE}/d.html', f'{SITE}/e.html']
+
+
+def test_empty_graph():
+    graph = LinkGraph.build([], [])
+    assert graph.node_count == 0
+    assert graph.top_pages() == []
+    assert graph.depth_distribution() == {}
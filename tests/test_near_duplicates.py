@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from website_analyzer.core.near_duplicates import NearDuplicateClusters, lsh_parameters, minhash_signature
+
+
+def shingles(tokens, size=5):
+    return {' '.join(tokens[i:i + size]) for i in range(max(1, len(tokens) - size + 1))}
+
+
+def jaccard(a, b):
+    return len(shingles(a) & shingles(b)) / len(shingles(a) | shingles(b))
+
+
+@pytest.fixture
+def texts():
+    rng = random.Random(3)
+    vocabulary = [f'slowo{i}' for i in range(500)]
+    base = rng.choices(vocabulary, k=400)
+    near = list(base)
+    near[200] = 'zmiana'  # jedno słowo różnicy
+    other_base = rng.choices(vocabulary, k=400)
+    other_near = other_base[:390] + ['koniec']
+    return {'a': base, 'b': rng.choices(vocabulary, k=400), 'c': near,
+            'd': other_base, 'e': other_near, 'f': []}
+
+
+def test_signature_estimates_jaccard(texts):
+    first, second = minhash_signature(texts['a'], 256), minhash_signature(texts['c'], 256)
+
+    estimate = (first == second).mean()
+    assert estimate == pytest.approx(jaccard(texts['a'], texts['c']), abs=0.08)
+    assert (minhash_signature(texts['a'], 256) == first).all()
+    assert minhash_signature([]) is None
+
+
+def test_lsh_parameters_keep_threshold_below_target():
+    bands, rows = lsh_parameters(128, 0.8)
+    assert bands * rows == 128
+    assert (1 / bands) ** (1 / rows) <= 0.8
+
+
+def test_clusters_group_near_copies(texts):
+    urls = list(texts)
+    clusters = NearDuplicateClusters.build(urls, [minhash_signature(texts[url]) for url in urls])
+
+    assert clusters.clusters == [['a', 'c'], ['d', 'e']]
+    assert clusters.duplicate_count == 2
+    assert clusters.page_count == 5  # strona bez tekstu jest pomijana
+    assert clusters.similarity['a'] == 1.0
+    assert clusters.similarity['c'] >= 0.8
+
+
+def test_no_clusters_for_distinct_or_single_pages(texts):
+    assert NearDuplicateClusters.build(['a', 'b'], [minhash_signature(texts['a']), minhash_signature(texts['b'])]).clusters == []
+    assert NearDuplicateClusters.build(['a'], [minhash_signature(texts['a'])]).clusters == []
+    assert NearDuplicateClusters.build([], []).clusters == []
@@ -0,0 +1,34 @@
+"""Testy leniwych źródeł stron zapisanych na dysku."""
+
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+from website_analyzer.core.file_manager import FileManager
+from website_analyzer.core.page_source import FolderSnapshot, PageSource, select_pages
+
+from conftest import make_site
+
+
+def test_folder_snapshot_reads_pages_lazily(tmp_path):
+    pages = make_site(25)
+    folder = str(tmp_path / 'site')
+    assert FileManager().save_website_data(pages, folder)
+    snapshot = FolderSnapshot(folder)
+    assert isinstance(snapshot, PageSource)
+    assert list(snapshot) == list(pages)
+    url = next(iter(pages))
+    assert snapshot.page_info(url)['status_code'] == pages[url]['status_code']
+    assert snapshot.read_content(url) == pages[url]['content']
+    assert [url for url, _ in snapshot.iter_pages(prefetch=3, read_workers=2)] == list(pages)
+
+
+def test_streamed_analysis_equals_in_memory_analysis(tmp_path):
+    pages = make_site(40)
+    folder = str(tmp_path / 'site')
+    FileManager().save_website_data(pages, folder)
+    analyzer = WebsiteAnalyzer()
+    analyzer.stream_batch_pages = 7
+    assert dict(analyzer.analyze_pages(FolderSnapshot(folder))) == dict(WebsiteAnalyzer().analyze_pages(pages))
+
+
+def test_select_pages_filters_metadata():
+    pages = make_site(30)
+    assert select_pages(pages, min_status=400) == [url for url, page in pages.items() if page['status_code'] >= 400]
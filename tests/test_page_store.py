@@ -0,0 +1,75 @@
+from contextlib import closing
+import sqlite3
+
+import pytest
+from conftest import make_page, make_site
+
+from website_analyzer.core.analysis_cache import AnalysisCache
+from website_analyzer.core.file_manager import FileManager
+from website_analyzer.core.http_cassette import HttpCassette
+from website_analyzer.core.page_store import PageStore, is_page_store
+
+
+def test_pages_round_trip_in_crawl_order(tmp_path):
+    pages = make_site(20)
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+
+    assert store.add_pages(pages, batch_size=7) == 20
+    assert is_page_store(store.db_path)
+    assert store.urls() == list(pages)
+    assert len(store) == 20 and list(pages)[3] in store
+    url = list(pages)[5]
+    expected = {key: value for key, value in pages[url].items() if key != 'is_html'}
+    assert store[url] == {**expected, 'depth': 2}
+    assert store.read_content(url) == pages[url]['content']
+    assert store.page_info(url)['status_code'] == 200
+
+
+def test_metadata_queries(tmp_path):
+    pages = make_site(20)
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+    store.add_pages(pages)
+
+    assert store.select(status_code=404) == [url for url, page in pages.items() if page['status_code'] == 404]
+    assert store.status_counts() == {200: 18, 404: 2}
+    big = sorted(page['size'] for page in pages.values())[10]
+    assert store.select(min_size=big) == [url for url, page in pages.items() if page['size'] >= big]
+    assert store.select(content_type='text/') == list(pages)
+    assert store.select(content_type='image/') == []
+    target = 'https://example.com/sec1/page1.html'
+    assert store.links_to(target) == [url for url, page in pages.items() if "href='/sec1/page1.html'" in page['content']]
+    assert store.pages_using_asset('https://example.com/img/p0.png') == [
+        url for url, page in pages.items() if "src='/img/p0.png'" in page['content']]
+
+
+def test_replace_and_remove_pages(tmp_path):
+    store = PageStore(str(tmp_path / 'pages.sqlite'))
+    store.add_pages({'https://example.com/a': make_page('https://example.com/a', "<a href='/x'>x</a>"),
+                     'https://example.com/b': make_page('https://example.com/b', 'b')})
+    store.add_pages({'https://example.com/a': make_page('https://example.com/a', "<a href='/y'>y</a>", 500)})
+
+    assert store.urls() == ['https://example.com/a', 'https://example.com/b']
+    assert store.links_to('https://example.com/x') == []
+    assert store.links_to('https://example.com/y') == ['https://example.com/a']
+    assert store.remove_pages(['https://example.com/a', 'https://example.com/brak']) == 1
+    assert store.urls() == ['https://example.com/b']
+    assert store.links_to('https://example.com/y') == []
+    assert not is_page_store(str(tmp_path / 'brak.sqlite'))
+
+
+@pytest.mark.parametrize('create', [AnalysisCache, HttpCassette])
+def test_other_sqlite_files_are_not_modified(tmp_path, create):
+    path = str(tmp_path / 'inna.sqlite')
+    create(path)
+    with open(path, 'rb') as f:
+        original = f.read()
+
+    assert not is_page_store(path)
+    with pytest.raises(ValueError):
+        PageStore(path)
+    assert FileManager().load_website_data(path) is None
+
+    with open(path, 'rb') as f:
+        assert f.read() == original
+    with closing(sqlite3.connect(path)) as conn:
+        assert not conn.execute("SELECT name FROM sqlite_master WHERE name = 'pages'").fetchall()
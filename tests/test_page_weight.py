@@ -0,0 +1,73 @@
+import pytest
+
+from website_analyzer.core.page_weight import AssetInfo, AssetProber, PageWeightReport, collect_page_assets
+
+
+def categories(**found):
+    return {category: set(found.get(category, ())) for category in ('images', 'css', 'js', 'videos', 'audio', 'links')}
+
+
+def test_collect_page_assets_keeps_http_resources_only():
+    assets = collect_page_assets(
+        ['https://example.com/a', 'https://example.com/b'],
+        [categories(images={'https://example.com/p.png', 'data:image/png;base64,AA'},
+                    css={'https://example.com/s.css'}, links={'https://example.com/b'}),
+         categories()],
+    )
+
+    assert assets == {'https://example.com/a': ['https://example.com/p.png', 'https://example.com/s.css'],
+                      'https://example.com/b': []}
+
+
+def test_report_counts_shared_assets_once():
+    report = PageWeightReport(
+        {'a': 100, 'b': 300, 'c': 200},
+        {'a': ['x.png', 'y.css'], 'b': ['x.png'], 'c': ['z.js']},
+        {'x.png': AssetInfo(1000, 'image/png'), 'y.css': AssetInfo(50, 'text/css'), 'z.js': AssetInfo(None)},
+        from_cache=0,
+    )
+
+    assert report.page_weights == {'a': 1150, 'b': 1300, 'c': 200}
+    assert report.site_bytes == 600 + 1050
+    assert report.heaviest_pages(2) == [('b', 1300), ('a', 1150)]
+    assert report.heaviest_assets() == [('x.png', 1000), ('y.css', 50)]
+    assert report.unknown_assets() == ['z.js']
+    assert report.asset_page_counts()['x.png'] == 2
+    assert report.type_totals() == {'image/png': 1000, 'text/css': 50, 'nieznany': 0}
+    distribution = report.distribution()
+    assert (distribution['min'], distribution['p50'], distribution['max']) == (200, 1150, 1300)
+    assert distribution['mean'] == pytest.approx(2650 / 3)
+
+
+def test_prober_uses_head_then_range_request(local_server):
+    server = local_server({
+        '/p.png': (200, 'image/png', b'x' * 1234),
+        '/s.css': (200, 'text/css; charset=utf-8', b'y' * 77, 405),
+    })
+    page_assets = {'https://example.com/': [server.url('/p.png'), server.url('/s.css'), server.url('/brak.js')]}
+
+    report = AssetProber().profile({'https://example.com/': 500}, page_assets)
+
+    assert report.assets == {
+        server.url('/p.png'): AssetInfo(1234, 'image/png'),
+        server.url('/s.css'): AssetInfo(77, 'text/css'),
+        server.url('/brak.js'): AssetInfo(None, 'text/plain'),
+    }
+    assert report.page_weights == {'https://example.com/': 500 + 1234 + 77}
+    assert server.requests[('GET', '/p.png')] == 0
+    assert server.requests[('GET', '/s.css')] == 1
+
+
+def test_prober_cache_skips_known_sizes(local_server, tmp_path):
+    server = local_server({'/p.png': (200, 'image/png', b'x' * 10)})
+    urls = [server.url('/p.png'), server.url('/brak.png')]
+    cache_path = str(tmp_path / 'assets.db')
+
+    AssetProber(cache_path).probe(urls)
+    assets, from_cache = AssetProber(cache_path).probe(urls)
+
+    # zasób bez znanego rozmiaru jest sprawdzany ponownie
+    assert from_cache == 1
+    assert assets[server.url('/p.png')] == AssetInfo(10, 'image/png')
+    assert server.requests[('HEAD', '/p.png')] == 1
+    assert server.requests[('HEAD', '/brak.png')] == 2
@@ -0,0 +1,68 @@
+"""Testy zapisu stron w tle podczas pobierania."""
+
+import threading
+
+import pytest
+
+from website_analyzer.core.downloader import WebsiteDownloader
+from website_analyzer.core.page_store import PageStore
+from website_analyzer.core.page_writer import CrawlPages
+
+from conftest import make_page, make_site
+
+
+ROOT = 'https://example.com/'
+
+
+def crawl_site(count):
+    """Witryna ze stroną startową w korzeniu, z której crawler dochodzi do wszystkich stron."""
+    site = make_site(count)
+    body = "<html><body>" + ''.join(f"<a href='{url}'>x</a>" for url in site) + "</body></html>"
+    return {ROOT: make_page(ROOT, body), **site}
+
+
+def fake_downloader(tmp_path, pages):
+    """Downloader obsługujący zapytania ze słownika stron - bez sieci."""
+    downloader = WebsiteDownloader(max_pages=len(pages), max_depth=10)
+    downloader.page_store = PageStore(str(tmp_path / 'crawl.sqlite'))
+    downloader.memory_budget = 2000
+    downloader._download_single_page = lambda url: (True, dict(pages[url])) if url in pages else (False, f"brak {url}")
+    return downloader
+
+
+def test_crawl_pages_evicts_saved_content_and_reads_it_back(tmp_path):
+    site = make_site(40)
+    with CrawlPages(PageStore(str(tmp_path / 'pages.sqlite')), memory_budget=3000, batch_size=5) as pages:
+        for url, page_data in site.items():
+            pages[url] = page_data
+        pages.flush()
+        assert pages.memory_used <= 3000
+    assert pages.saved_count == 40
+    assert all(pages[url]['content'] == page_data['content'] for url, page_data in site.items())
+
+
+def test_download_saves_all_pages_to_store(tmp_path):
+    site = crawl_site(30)
+    downloader = fake_downloader(tmp_path, site)
+    pages = downloader.download_website(ROOT)
+    assert isinstance(pages, CrawlPages)
+    assert len(pages) == len(site)
+    assert downloader.page_store.urls() == list(pages)
+
+
+def test_interrupted_download_flushes_queue_and_stops_writer(tmp_path):
+    site = crawl_site(30)
+    downloader = fake_downloader(tmp_path, site)
+    fetched = []
+
+    def progress(message):
+        if message.startswith("Pobieram"):
+            fetched.append(message)
+            if len(fetched) == 10:
+                raise KeyboardInterrupt
+
+    writers_before = set(threading.enumerate())
+    with pytest.raises(KeyboardInterrupt):
+        downloader.download_website(ROOT, progress)
+    assert len(downloader.page_store) == 9
+    assert not [thread for thread in threading.enumerate() if thread not in writers_before and thread.is_alive()]
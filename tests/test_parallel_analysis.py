@@ -0,0 +1,46 @@
+import io
+
+import pytest
+from conftest import make_site
+
+from website_analyzer.core.analysis_partial import AnalysisPartial, extract_content
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+
+
+def json_report(result) -> str:
+    out = io.StringIO()
+    result.write_json(out)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('per_page', [True, False])
+def test_parallel_report_equals_serial_report(per_page):
+    pages = make_site(60)
+    analyzers = [WebsiteAnalyzer(), WebsiteAnalyzer(workers=2)]
+    analyzers[1].parallel_min_pages = 4
+    for analyzer in analyzers:
+        if not per_page:
+            # bez etapów potrzebujących wyników stron - fragmenty są scalane już w procesach
+            analyzer.stages.only('stats_section', 'links_section')
+
+    messages = []
+    serial = analyzers[0].analyze_pages(pages)
+    parallel = analyzers[1].analyze_pages(pages, messages.append)
+
+    assert 'Analizuję 60 stron w 2 procesach...' in messages
+    assert dict(parallel) == dict(serial)
+    assert json_report(parallel) == json_report(serial)
+
+
+def test_merged_shards_equal_single_pass():
+    pages = list(make_site(12).items())
+    whole = AnalysisPartial()
+    for url, page in pages:
+        whole.merge(extract_content(page['content'], 3, url))
+    shards = [AnalysisPartial(), AnalysisPartial()]
+    for i, (url, page) in enumerate(pages):
+        shards[i * 2 // len(pages)].merge(extract_content(page['content'], 3, url))
+
+    merged = shards[0].merge(shards[1])
+    assert merged.to_dict() == whole.to_dict()
+    assert AnalysisPartial.from_dict(merged.to_dict()).to_dict() == whole.to_dict()
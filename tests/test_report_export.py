@@ -0,0 +1,90 @@
+import csv
+from html.parser import HTMLParser
+import json
+import os
+
+import pytest
+from conftest import make_page, make_site
+
+from website_analyzer.core.analysis_result import AnalysisResult
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+from website_analyzer.core.file_manager import FileManager
+
+ODD_URL = 'https://example.com/szukaj?q=<b>&strona=2'
+
+
+@pytest.fixture
+def result():
+    pages = make_site(30)
+    pages[ODD_URL] = make_page(ODD_URL, '<p>wyniki wyszukiwania</p>')
+    return WebsiteAnalyzer().analyze_pages(pages)
+
+
+def test_jsonl_has_one_record_per_page(result, tmp_path):
+    path = str(tmp_path / 'raport.jsonl')
+    assert FileManager().save_analysis_report(result, path)
+
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [record['url'] for record in records] == list(result.page_sizes)
+    first = records[0]
+    assert first['status_code'] == 200 and first['depth'] == 0
+    assert first['assets'] == result.page_assets[first['url']]
+    assert 'https://other.org/x' in first['links']
+    assert sum(record['status_code'] == 404 for record in records) == 3
+
+
+def test_csv_export_writes_every_table(result, tmp_path):
+    assert FileManager().save_analysis_report(result, str(tmp_path / 'raport.csv'))
+
+    assert sorted(os.listdir(tmp_path)) == sorted(f'raport_{table}.csv' for table in AnalysisResult.CSV_TABLES)
+    tables = {}
+    for table in AnalysisResult.CSV_TABLES:
+        with open(tmp_path / f'raport_{table}.csv', encoding='utf-8', newline='') as f:
+            tables[table] = list(csv.reader(f))
+    assert tables['page_status'][1:] == [[url, str(result.page_status[url]), str(size)]
+                                         for url, size in result.page_sizes.items()]
+    assert len(tables['links']) - 1 == sum(len(pages) for pages in result.link_sources.values())
+    assert len(tables['assets']) - 1 == sum(len(assets) for assets in result.page_assets.values())
+    # tabele bez danych (np. bez sprawdzania linków) mają tylko nagłówek
+    assert tables['broken_links'] == [['url', 'status', 'error', 'source_page']]
+
+
+def test_html_report_is_well_formed_and_escaped(result, tmp_path):
+    path = str(tmp_path / 'raport.html')
+    assert FileManager().save_analysis_report(result, path)
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+
+    class Collector(HTMLParser):
+        def __init__(self):
+            super().__init__()
+            self.open_tags = []
+            self.ids = []
+            self.hrefs = []
+
+        def handle_starttag(self, tag, attrs):
+            attrs = dict(attrs)
+            if tag not in ('meta', 'br'):
+                self.open_tags.append(tag)
+            self.ids += [attrs['id']] if 'id' in attrs else []
+            self.hrefs += [attrs['href']] if 'href' in attrs else []
+
+        def handle_endtag(self, tag):
+            assert self.open_tags.pop() == tag
+
+    parser = Collector()
+    parser.feed(html)
+    assert parser.open_tags == []
+    assert parser.ids == list(result.sections) + ['pages']
+    assert ODD_URL in parser.hrefs
+    assert '<b>' not in html
+
+
+def test_text_report(result, tmp_path):
+    path = str(tmp_path / 'raport.txt')
+    assert FileManager().save_analysis_report(result, path)
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    assert text.startswith('RAPORT ANALIZY WITRYNY')
+    assert result['stats'] in text
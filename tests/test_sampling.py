@@ -0,0 +1,38 @@
+"""Testy analizy na podstawie próby warstwowej."""
+
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+from website_analyzer.core.sampling import StratifiedSample
+
+from conftest import make_site
+
+
+def test_sample_allocation_covers_every_stratum():
+    urls = [f"https://example.com/sec{i % 4}/page{i}.html" for i in range(200)]
+    sample = StratifiedSample.draw(urls, 20, seed=3)
+    assert len(sample.indices) == 20
+    assert sample.indices == sorted(sample.indices)
+    assert set(sample.population) == set(sample.sampled)
+    assert sample.population_size == 200
+
+
+def test_keep_first_always_includes_start_page():
+    urls = [f"https://example.com/sec{i % 4}/page{i}.html" for i in range(200)]
+    for seed in range(10):
+        sample = StratifiedSample.draw(urls, 12, seed=seed, keep_first=True)
+        assert sample.indices[0] == 0
+        assert len(sample.indices) == 12
+
+
+def test_sampled_report_uses_start_page_as_site_root():
+    pages = make_site(200)
+    start = next(iter(pages))
+    analyzer = WebsiteAnalyzer()
+    analyzer.sample_size = 20
+    analyzer.sample_seed = 5
+    result = analyzer.analyze_pages(pages)
+    assert result.sampling is not None
+    assert result.site_url == start
+    assert result.link_graph.urls[0] == start
+    assert result.link_graph.depth[0] == 0
+    estimate = result.sampling.totals['size']
+    assert estimate.low <= sum(page['size'] for page in pages.values()) <= estimate.high
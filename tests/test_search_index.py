@@ -0,0 +1,56 @@
+from conftest import make_page, make_site
+
+from website_analyzer.core.content_store import ContentStore
+from website_analyzer.core.search_index import SearchIndex, decode_positions, encode_positions
+
+
+def test_positions_round_trip():
+    positions = [0, 1, 5, 127, 128, 300, 70000]
+    assert decode_positions(encode_positions(positions)) == positions
+
+
+def test_bm25_ranks_by_term_frequency_and_matches_phrases(tmp_path):
+    index = SearchIndex(str(tmp_path / 'index.sqlite'))
+    assert index.update(make_site(30)) == 30
+
+    results = index.search('kot')
+    # 'kot' występuje 3, 2 lub 1 raz (i % 4), na stronach z i % 4 == 0 wcale
+    assert len(results) == 30 - 8
+    assert all('kot ' * 3 in make_site(30)[url]['content'] for url, _ in results[:7])
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+    assert len(index.search('"pies dom"')) == 30
+    assert index.search('"dom pies"') == []
+
+
+def test_update_reindexes_only_changed_pages(tmp_path):
+    index = SearchIndex(str(tmp_path / 'index.sqlite'))
+    pages = make_site(30)
+    index.update(pages)
+    assert index.update(pages) == 0
+
+    url = next(iter(pages))
+    pages[url] = make_page(url, '<p>zupełnie nowa treść żyrafa</p>')
+    del pages['https://example.com/sec1/page1.html']
+    assert index.update(pages) == 1
+    assert index.page_count == 29
+    assert [found for found, _ in index.search('żyrafa')] == [url]
+    assert 'https://example.com/sec1/page1.html' not in dict(index.search('pies'))
+
+
+def test_snapshot_update_reads_content_of_changed_pages_only(tmp_path):
+    store = ContentStore(str(tmp_path / 'store'))
+    pages = make_site(30)
+    store.save_snapshot('a', pages)
+    url = next(iter(pages))
+    pages[url] = make_page(url, '<p>zmiana</p>')
+    store.save_snapshot('b', pages, base='a')
+
+    index = SearchIndex(str(tmp_path / 'index.sqlite'))
+    index.update(store.open_snapshot('a'))
+    reads = []
+    original = store.read_object
+    store.read_object = lambda key: reads.append(key) or original(key)
+
+    assert index.update(store.open_snapshot('b')) == 1
+    assert len(reads) == 1
@@ -0,0 +1,70 @@
+"""Testy archiwum witryny (.wsa)."""
+
+import gc
+import os
+import warnings
+
+import pytest
+
+from website_analyzer.core.file_manager import FileManager
+from website_analyzer.core.snapshot_archive import SnapshotArchive, is_snapshot_archive, write_snapshot_archive
+
+from conftest import make_site
+
+
+def open_descriptors() -> int:
+    return len(os.listdir('/proc/self/fd'))
+
+
+def test_archive_round_trip(tmp_path):
+    pages = make_site(40)
+    path = str(tmp_path / 'site.wsa')
+    assert write_snapshot_archive(pages, path) == 40
+    assert is_snapshot_archive(path)
+    archive = SnapshotArchive(path)
+    assert list(archive) == list(pages)
+    for url, page_data in archive.iter_pages():
+        assert page_data['content'] == pages[url]['content']
+        assert page_data['status_code'] == pages[url]['status_code']
+    archive.close()
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason="wymaga /proc/self/fd")
+def test_failed_write_keeps_archive_and_removes_temp_file(tmp_path):
+    path = str(tmp_path / 'site.wsa')
+    pages = make_site(10)
+    write_snapshot_archive(pages, path)
+    broken = make_site(20)
+    broken[list(broken)[15]]['content'] = None  # błąd w trakcie zapisu rekordów
+
+    with pytest.raises(AttributeError):
+        write_snapshot_archive(broken, path, sample_pages=5)  # strona 15 poza próbką słownika
+
+    assert os.listdir(tmp_path) == ['site.wsa']
+    archive = SnapshotArchive(path)
+    assert list(archive) == list(pages)
+    archive.close()
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/fd'), reason="wymaga /proc/self/fd")
+def test_repeated_iteration_does_not_leak_file_handles(tmp_path):
+    path = str(tmp_path / 'site.wsa')
+    write_snapshot_archive(make_site(40), path)
+    archive = SnapshotArchive(path)
+    list(archive.iter_pages(read_workers=4))
+    baseline = open_descriptors()
+    for _ in range(5):
+        list(archive.iter_pages(read_workers=4))
+    assert open_descriptors() == baseline
+    archive.close()
+    assert open_descriptors() == baseline - 1
+
+
+def test_eager_load_closes_archive(tmp_path):
+    path = str(tmp_path / 'site.wsa')
+    write_snapshot_archive(make_site(40), path)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ResourceWarning)
+        assert len(FileManager().load_website_data(path)) == 40
+        gc.collect()
+    assert not [warning for warning in caught if issubclass(warning.category, ResourceWarning)]
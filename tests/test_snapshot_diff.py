@@ -0,0 +1,57 @@
+from conftest import make_page, make_site
+
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+from website_analyzer.core.content_store import ContentStore
+from website_analyzer.core.snapshot_diff import diff_snapshots
+
+CHANGED = 'https://example.com/sec0/page0.html'
+ADDED = 'https://example.com/sec0/new.html'
+REMOVED = 'https://example.com/sec2/page2.html'
+
+
+def next_crawl(fail_page: bool = False) -> dict:
+    """Kolejne pobranie witryny z make_site - jedna strona zmieniona, jedna dodana, jedna usunięta."""
+    pages = make_site(30)
+    body = pages[CHANGED]['content'].replace(
+        '</body>', "<a href='/sec0/page9.html'>x</a><img src='/img/nowy.png'></body>")
+    pages[CHANGED] = make_page(CHANGED, body)
+    del pages[REMOVED]
+    pages[ADDED] = make_page(ADDED, '<p>nowa</p>')
+    if fail_page:
+        url = 'https://example.com/sec1/page1.html'
+        pages[url] = dict(pages[url], status_code=500)
+    return pages
+
+
+def test_diff_reports_changes_and_new_broken_links():
+    diff = diff_snapshots(make_site(30), next_crawl(), WebsiteAnalyzer(), 'a', 'b')
+
+    assert diff.added == [ADDED]
+    assert diff.removed == [REMOVED]
+    assert diff.changed == [CHANGED]
+    assert diff.unchanged_count == 28
+    assert diff.new_broken_links == [(CHANGED, 'https://example.com/sec0/page9.html', 404)]
+    assert diff.asset_changes == {CHANGED: (['https://example.com/img/nowy.png'], [])}
+    # stan celów linków się nie zmienił - analizowane są tylko zmienione i dodane strony
+    assert diff.analyzed_pages == 3
+
+
+def test_status_change_reanalyzes_unchanged_pages_linking_to_it():
+    diff = diff_snapshots(make_site(30), next_crawl(fail_page=True), WebsiteAnalyzer(), 'a', 'b')
+
+    assert diff.status_changes == [('https://example.com/sec1/page1.html', 200, 500)]
+    assert ('https://example.com/sec1/page4.html', 'https://example.com/sec1/page1.html', 500) \
+        in diff.new_broken_links
+
+
+def test_content_store_snapshots_diff_like_dicts(tmp_path):
+    old, new = make_site(30), next_crawl(fail_page=True)
+    store = ContentStore(str(tmp_path))
+    store.save_snapshot('a', old)
+    store.save_snapshot('b', new, base='a')
+
+    expected = diff_snapshots(old, new, WebsiteAnalyzer(), 'a', 'b')
+    diff = diff_snapshots(store.open_snapshot('a'), store.open_snapshot('b'), WebsiteAnalyzer(), 'a', 'b')
+
+    assert vars(diff) == vars(expected)
+    assert ''.join(diff.iter_text()) == ''.join(expected.iter_text())
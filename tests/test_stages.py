@@ -0,0 +1,83 @@
+import io
+
+import pytest
+
+from website_analyzer.core import analysis_partial
+from website_analyzer.core.analysis_result import AnalysisResult
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+from website_analyzer.core.stages import AnalysisStage, StageRegistry
+
+
+def test_base_sections_follow_stage_order_and_can_be_disabled(site):
+    default = WebsiteAnalyzer().analyze_pages(site)
+    analyzer = WebsiteAnalyzer()
+    analyzer.stages.disable('images_section', 'media_section')
+    analyzer.stages.reorder('documents_section', 'stats_section')
+    result = analyzer.analyze_pages(site)
+
+    assert default.base_sections == AnalysisResult.SECTIONS
+    assert result.base_sections == ('documents', 'stats', 'links', 'resources')
+    assert 'images' not in result and 'images' in default
+    assert result['documents'] == default['documents']
+    report = io.StringIO()
+    result.write_text(report)
+    assert report.getvalue().startswith('ANALIZA DOKUMENTÓW')
+
+
+def test_only_keeps_requested_sections_and_their_dependencies(site):
+    analyzer = WebsiteAnalyzer()
+    analyzer.stages.register(AnalysisStage('pages_count', lambda inputs: len(inputs['page_status']),
+                                           requires=('page_status',), render=lambda n: [f"Stron: {n}"]))
+    analyzer.stages.only('links_section', 'pages_count')
+    result = analyzer.analyze_pages(site)
+
+    assert list(result) == ['links', 'pages_count']
+    assert result['pages_count'] == 'Stron: 30'
+    # wymagany etap zostaje wykonany, choć jest wyłączony
+    assert len(result.page_status) == 30
+    assert result.keywords is None
+
+
+def test_disabled_sections_are_not_extracted(site, monkeypatch):
+    searched = []
+
+    class CountingSoup(analysis_partial.BeautifulSoup):
+        def find_all(self, name=None, *args, **kwargs):
+            searched.append(name)
+            return super().find_all(name, *args, **kwargs)
+
+        def get_text(self, *args, **kwargs):
+            searched.append('text')
+            return super().get_text(*args, **kwargs)
+
+    monkeypatch.setattr(analysis_partial, 'BeautifulSoup', CountingSoup)
+    default = WebsiteAnalyzer().analyze_pages(site)
+    assert set(searched) == {'a', 'source', 'video', 'audio', 'img', 'link', 'script', 'text'}
+
+    searched.clear()
+    analyzer = WebsiteAnalyzer()
+    analyzer.stages.only('links_section', 'images_section')
+    result = analyzer.analyze_pages(site)
+
+    # bez statystyk, słów kluczowych i zasobów stron tekst i pozostałe tagi nie są przeszukiwane
+    assert set(searched) == {'a', 'img'}
+    assert result['links'] == default['links'] and result['images'] == default['images']
+    assert not result.word_freq and not result.urls['css']
+
+
+def test_registry_plan_levels_and_reorder():
+    registry = StageRegistry([
+        AnalysisStage('a', lambda inputs: 1, requires=('urls',)),
+        AnalysisStage('b', lambda inputs: inputs['a'] + 1, requires=('a',)),
+        AnalysisStage('c', lambda inputs: 3),
+    ])
+    assert [[stage.name for stage in level] for level in registry.plan()] == [['a', 'c'], ['b']]
+    assert registry.run({'urls': []}) == {'a': 1, 'c': 3, 'b': 2}
+
+    registry.reorder('c', 'b')
+    assert registry.names == ['c', 'b', 'a']
+    with pytest.raises(KeyError):
+        registry.reorder('missing')
+    registry.register(AnalysisStage('d', lambda inputs: 0, requires=('e',)))
+    with pytest.raises(ValueError):
+        registry.plan()
@@ -0,0 +1,65 @@
+import struct
+import time
+
+from website_analyzer.core.image_probe import ImageInfo, ImageProber
+from website_analyzer.core.link_checker import LinkChecker, LinkStatus
+from website_analyzer.core.page_weight import AssetInfo, AssetProber
+from website_analyzer.core.url_cache import UrlResultCache
+
+PNG = b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', 40, 30) + b'\x08\x02\x00\x00\x00' \
+    + b'\x00' * 2000
+
+
+def test_results_expire_after_ttl(tmp_path):
+    cache = UrlResultCache(str(tmp_path / 'sub' / 'cache.sqlite'), 'results', [('status', 'INTEGER NOT NULL')])
+    urls = [f"https://example.com/{i}" for i in range(1200)]  # więcej niż jedna porcja zapytania IN
+    cache.store((url, (200,)) for url in urls)
+
+    assert cache.load(urls + ['https://example.com/brak'], ttl=60) == {url: (200,) for url in urls}
+    time.sleep(0.05)
+    assert cache.load(urls, ttl=0.01) == {}
+
+
+def test_probers_read_second_run_from_cache(tmp_path, local_server):
+    server = local_server({
+        '/ok.html': (200, 'text/html', b'<p>ok</p>'),
+        '/style.css': (200, 'text/css', b'body{}' * 100),
+        '/logo.png': (200, 'image/png', PNG),
+    })
+    links = {server.url('/ok.html'): ['a'], server.url('/missing.html'): ['a']}
+    assets = [server.url('/style.css'), server.url('/logo.png')]
+    images = [server.url('/logo.png')]
+
+    def run():
+        return (LinkChecker(str(tmp_path / 'links.sqlite')).check(links),
+                AssetProber(str(tmp_path / 'assets.sqlite')).probe(assets),
+                ImageProber(str(tmp_path / 'images.sqlite')).inspect(images))
+
+    first_links, (first_assets, _), first_images = run()
+    requests_after_first = sum(server.requests.values())
+    second_links, (second_assets, from_cache), second_images = run()
+
+    assert first_links.results == {server.url('/ok.html'): LinkStatus(200), server.url('/missing.html'): LinkStatus(404)}
+    assert first_assets == {assets[0]: AssetInfo(600, 'text/css'), assets[1]: AssetInfo(len(PNG), 'image/png')}
+    assert first_images.results == {images[0]: ImageInfo('png', 40, 30, len(PNG))}
+
+    assert sum(server.requests.values()) == requests_after_first
+    assert (second_links.from_cache, from_cache, second_images.from_cache) == (2, 2, 1)
+    assert second_links.results == first_links.results
+    assert second_assets == first_assets
+    assert second_images.results == first_images.results
+
+
+def test_failed_checks_are_not_cached(tmp_path, local_server):
+    server = local_server({})
+    unreachable = 'http://127.0.0.1:9/x.png'  # port bez serwera - błąd połączenia
+    prober = AssetProber(str(tmp_path / 'assets.sqlite'), timeout=2)
+    checker = LinkChecker(str(tmp_path / 'links.sqlite'), timeout=2)
+
+    assert prober.probe([unreachable])[0] == {unreachable: AssetInfo(None, '')}
+    assert checker.check({unreachable: ['a']}).results[unreachable].status is None
+    assert prober.probe([unreachable])[1] == 0
+    assert checker.check({unreachable: ['a']}).from_cache == 0
+    image_prober = ImageProber(str(tmp_path / 'images.sqlite'))
+    assert image_prober.inspect([server.url('/none.png')]).results[server.url('/none.png')].error == 'HTTP 404'
+    assert image_prober.inspect([server.url('/none.png')]).from_cache == 0
@@ -0,0 +1,38 @@
+"""Testy rozwiązywania adresów URL."""
+
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+from website_analyzer.core.url_resolver import UrlResolver
+
+from conftest import make_page
+
+MALFORMED = ['http://[::1', '//[bad', 'https://[x/y']
+
+
+def test_resolve_relative_and_root_links():
+    resolver = UrlResolver()
+    assert resolver.resolve('https://example.com/a/b.html', 'c.html#top') == 'https://example.com/a/c.html'
+    assert resolver.resolve('https://example.com/a/b.html', '/x?q=1') == 'https://example.com/x?q=1'
+    assert resolver.resolve('https://example.com/a/b.html', 'mailto:a@b.pl') == 'mailto:a@b.pl'
+    assert resolver.resolve_link('https://example.com/a/b.html', 'javascript:void(0)') is None
+
+
+def test_malformed_href_is_returned_unchanged_and_not_cached():
+    resolver = UrlResolver()
+    for href in MALFORMED:
+        assert resolver.resolve('https://example.com/', href) == href
+        assert resolver.resolve_link('https://example.com/', href) is None
+        assert resolver.classify(href, 'example.com') == 'other'
+        assert resolver.extension(href) == 'unknown'
+    assert resolver._resolve_cached.cache_info().currsize == 0
+
+
+def test_malformed_href_does_not_abort_analysis():
+    body = "<html><body>" + ''.join(f"<a href='{href}'>x</a><img src='{href}'>" for href in MALFORMED)
+    pages = {f"https://example.com/p{i}": make_page(f"https://example.com/p{i}", body + f"<a href='/p{i + 1}'>n</a></body></html>")
+             for i in range(12)}
+    serial = WebsiteAnalyzer(workers=1).analyze_pages(pages)
+    parallel_analyzer = WebsiteAnalyzer(workers=2)
+    parallel_analyzer.parallel_min_pages = 4
+    parallel = parallel_analyzer.analyze_pages(pages)
+    assert serial.total_pages == 12
+    assert dict(serial) == dict(parallel)
@@ -0,0 +1,78 @@
+import os
+import zlib
+
+from conftest import make_page, make_site
+
+from website_analyzer.core.file_manager import FileManager
+from website_analyzer.core.warc_archive import (CDX_EXTENSION, WarcArchive, build_cdx, cdx_lookup, cdx_url_key,
+                                                is_warc_file)
+
+
+def site_with_charsets() -> dict:
+    pages = make_site(20)
+    latin2 = make_page('https://example.com/latin2.html', '<p>zażółć gęślą jaźń</p>')
+    latin2['headers'] = {'Content-Type': 'text/html; charset=iso-8859-2', 'Content-Length': '10'}
+    ascii_page = make_page('https://example.com/ascii.html', '<p>żółw</p>')
+    ascii_page['headers'] = {'Content-Type': 'text/html; charset=ascii'}
+    pages[latin2['url']] = latin2
+    pages[ascii_page['url']] = ascii_page
+    return pages
+
+
+def test_export_import_round_trip(tmp_path):
+    pages = site_with_charsets()
+    warc_path = str(tmp_path / 'crawl.warc.gz')
+    manager = FileManager()
+
+    assert manager.save_website_warc(pages, warc_path)
+    assert is_warc_file(warc_path) and not is_warc_file(warc_path + CDX_EXTENSION)
+    loaded = manager.load_website_data(warc_path)
+
+    assert list(loaded) == list(pages)
+    for url, page in pages.items():
+        assert loaded[url]['content'] == page['content']
+        assert loaded[url]['status_code'] == page['status_code']
+    # nagłówki transportu (Content-Length) wracają pod pierwotną nazwą
+    assert loaded['https://example.com/latin2.html']['headers'] == pages['https://example.com/latin2.html']['headers']
+    # kodowanie, w którym nie da się zapisać treści, jest zastępowane UTF-8
+    assert loaded['https://example.com/ascii.html']['headers']['Content-Type'] == 'text/html; charset=utf-8'
+
+
+def test_cdx_index_is_sorted_and_points_at_records(tmp_path):
+    pages = site_with_charsets()
+    warc_path = str(tmp_path / 'crawl.warc.gz')
+    FileManager().save_website_warc(pages, warc_path)
+
+    with open(warc_path + CDX_EXTENSION, encoding='utf-8') as f:
+        lines = f.read().splitlines()[1:]
+    assert lines == sorted(lines) and len(lines) == len(pages)
+
+    url = 'https://example.com/sec1/page4.html'
+    [entry] = cdx_lookup(warc_path + CDX_EXTENSION, 'HTTPS://www.example.com:443/sec1/page4.html#sekcja')
+    assert (entry.url, entry.status, entry.mime_type) == (url, '200', 'text/html')
+    with open(warc_path, 'rb') as f:
+        f.seek(entry.offset)
+        record = zlib.decompress(f.read(entry.length), 31)
+    assert record.startswith(b'WARC/1.0') and pages[url]['content'].encode('utf-8') in record
+    assert cdx_lookup(warc_path + CDX_EXTENSION, 'https://example.com/brak.html') == []
+    assert cdx_url_key('http://Example.com/a?b=2&a=1') == 'com,example)/a?a=1&b=2'
+
+
+def test_archive_rebuilds_missing_index(tmp_path):
+    pages = make_site(10)
+    warc_path = str(tmp_path / 'crawl.warc.gz')
+    FileManager().save_website_warc(pages, warc_path)
+    with open(warc_path + CDX_EXTENSION, encoding='utf-8') as f:
+        written = f.read()
+    os.remove(warc_path + CDX_EXTENSION)
+
+    archive = WarcArchive(warc_path)
+    try:
+        with open(warc_path + CDX_EXTENSION, encoding='utf-8') as f:
+            assert f.read() == written
+        url = list(pages)[3]
+        assert archive.page_info(url)['status_code'] == pages[url]['status_code']
+        assert archive.read_content(url) == pages[url]['content']
+    finally:
+        archive.close()
+    assert build_cdx(warc_path, str(tmp_path / 'other.cdx')) == 10
@@ -0,0 +1,110 @@
+from collections import Counter
+import random
+
+import numpy as np
+import pytest
+
+from website_analyzer.core.analyzer import WebsiteAnalyzer
+from website_analyzer.core.word_stats import HeavyHitters
+
+
+def zipf_pages(pages: int = 200, vocabulary: int = 3000, seed: int = 1):
+    """Strony jako liczniki słów o rozkładzie zbliżonym do Zipfa."""
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, vocabulary + 1)]
+    words = [f"slowo{rank}" for rank in range(vocabulary)]
+    return [Counter(rng.choices(words, weights, k=300)) for _ in range(pages)]
+
+
+def assert_within_bound(summary: HeavyHitters, exact: Counter):
+    assert summary.total == sum(exact.values())
+    assert summary.error_bound <= summary.total / (summary.capacity + 1)
+    assert len(summary) <= 2 * summary.capacity
+    for word, count in exact.items():
+        estimate = summary.counts.get(word, 0)
+        assert estimate <= count <= estimate + summary.error_bound
+
+
+def test_counts_stay_within_error_bound():
+    pages = zipf_pages()
+    exact = sum(pages, Counter())
+    summary = HeavyHitters(50)
+    for page in pages:
+        summary.update(page)
+
+    assert_within_bound(summary, exact)
+    # najczęstsze słowa są odnalezione mimo limitu pamięci
+    assert {word for word, _ in summary.most_common(5)} == {word for word, _ in exact.most_common(5)}
+
+
+def test_merged_summaries_keep_the_bound():
+    pages = zipf_pages()
+    shards = [HeavyHitters(50) for _ in range(4)]
+    for i, page in enumerate(pages):
+        shards[i % 4].update(page)
+    merged = HeavyHitters(50)
+    for shard in shards:
+        merged.update(shard)
+
+    assert_within_bound(merged, sum(pages, Counter()))
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        HeavyHitters(0)
+
+
+def test_analyzer_reports_bounded_word_counts(site):
+    analyzer = WebsiteAnalyzer()
+    analyzer.word_capacity = 3
+    result = analyzer.analyze_pages(site)
+    exact = WebsiteAnalyzer().analyze_pages(site).word_freq
+
+    assert isinstance(result.word_freq, HeavyHitters)
+    assert result.word_error_bound > 0
+    assert 'przybliżenie: limit 3 liczników' in result['stats']
+    assert_within_bound(result.word_freq, exact)
+
+
+def page_counts(index, row: int) -> dict:
+    start, end = index.indptr[row], index.indptr[row + 1]
+    return {index.vocabulary[term]: count for term, count in zip(index.indices[start:end], index.counts[start:end])}
+
+
+def test_keyword_index_keeps_top_words_of_each_page(site):
+    analyzer = WebsiteAnalyzer()
+    analyzer.word_capacity = 3
+    bounded = analyzer.analyze_pages(site)
+    exact = WebsiteAnalyzer().analyze_pages(site)
+
+    # liczniki stron nie rosną ze słownictwem strony
+    assert np.diff(bounded.keywords.indptr).max() == 3
+    assert np.diff(exact.keywords.indptr).max() > 3
+    for row in range(len(site)):
+        kept, full = page_counts(bounded.keywords, row), page_counts(exact.keywords, row)
+        # zachowane są dokładne liczniki najczęstszych słów strony
+        assert all(full[word] == count for word, count in kept.items())
+        assert min(kept.values()) >= max((count for word, count in full.items() if word not in kept), default=0)
+
+
+def test_disabled_keywords_keep_no_page_word_counts(site):
+    analyzer = WebsiteAnalyzer()
+    analyzer.word_capacity = 3
+    analyzer.stages.disable('keywords')
+
+    assert 'word_counts' not in analyzer.stages.required_inputs()
+    result = analyzer.analyze_pages(site)
+    assert result.keywords is None
+    assert_within_bound(result.word_freq, WebsiteAnalyzer().analyze_pages(site).word_freq)
+
+
+def test_cached_analysis_keeps_the_bound(site, tmp_path):
+    analyzer = WebsiteAnalyzer(cache_path=str(tmp_path / 'cache.sqlite'))
+    analyzer.word_capacity = 3
+    exact = WebsiteAnalyzer().analyze_pages(site).word_freq
+
+    # pamięć podręczna przechowuje pełne wyniki stron - drugi przebieg daje ten sam wynik
+    first, second = analyzer.analyze_pages(site), analyzer.analyze_pages(site)
+    assert_within_bound(second.word_freq, exact)
+    assert second.word_freq.counts == first.word_freq.counts
+    assert np.diff(second.keywords.indptr).max() == 3